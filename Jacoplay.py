@@ -31,6 +31,13 @@ MENU_FILE = _first_existing_path("jacoplay_data", "jacoplay.properties")
 THUMBS_DIR = _first_existing_path("jacoplay_media", "thumbs")
 FONT_PATH = _first_existing_path("jacoplay_media", "Ov3Read.ttf")
 
+# Telemetria sessioni: ogni gioco scrive il suo riepilogo (jacoplay_sdk.telemetry) nel file indicato
+# da JACOPLAY_TELEMETRY; a fine sessione il launcher lo accoda in TELEMETRY_FILE.
+TELEMETRY_ENV = "JACOPLAY_TELEMETRY"
+TELEMETRY_FILE = os.path.join(DATA_DIR, "telemetry.json")
+TELEMETRY_SESSION_FILE = os.path.join(DATA_DIR, "telemetry_session.json")
+TELEMETRY_MAX_SESSIONS = 100
+
 def resolve_media_path(filename):
     return _first_existing_path("jacoplay_media", filename)
 
@@ -449,6 +456,29 @@ def save_games(games):
     save_json(GAMES_FILE, games)
 
 
+def collect_session_telemetry(name):
+    """Accoda il riepilogo della sessione appena chiusa (se il gioco l'ha scritto) allo storico telemetria."""
+    summary = load_json(TELEMETRY_SESSION_FILE, None)
+    if not summary:
+        return
+    try:
+        os.remove(TELEMETRY_SESSION_FILE)
+    except OSError:
+        pass
+    sessions = load_json(TELEMETRY_FILE, [])
+    if not isinstance(sessions, list):
+        sessions = []
+    sessions.append({
+        "gioco": name,
+        "data": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "summary": summary,
+    })
+    try:
+        save_json(TELEMETRY_FILE, sessions[-TELEMETRY_MAX_SESSIONS:])
+    except OSError:
+        pass
+
+
 # ----------------------------
 # Helpers per path gioco
 # ----------------------------
@@ -615,12 +645,16 @@ class MenuUI:
         try:
             # Tenta di usare lo stesso eseguibile python
             python_exec = sys.executable or "python"
+            env = dict(os.environ)
+            env[TELEMETRY_ENV] = TELEMETRY_SESSION_FILE
             proc = subprocess.run(
                 [python_exec, script, "--score", str(cur_score)],
                 capture_output=True,
                 text=True,
                 check=False,
+                env=env,
             )
+            collect_session_telemetry(name)
             new_score = None
             # Cerca un intero nell'output (ultima riga utile)
             out = (proc.stdout or "").strip().splitlines()
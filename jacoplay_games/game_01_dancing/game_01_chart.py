@@ -0,0 +1,315 @@
+# game_01_chart.py
+# Analisi offline dei brani di game_01_dancing: tempo, primo downbeat, beat e onset.
+#
+# Uso:
+#     python game_01_chart.py                    # tutti i music_XX.mp3 in game_01_media
+#     python game_01_chart.py brano.mp3 ...      # solo i file indicati
+#     python game_01_chart.py --force            # rianalizza anche se la chart è aggiornata
+#
+# Per ogni brano scrive accanto all'mp3 "<nome>.chart.json":
+#     {"version": 1, "audio_sha1": ..., "bpm": ..., "offset_ms": ..., "beats": [ms...], "onsets": [ms...]}
+# La chart vale finché l'hash dell'audio coincide: se l'mp3 cambia, il gioco la ignora
+# (e torna al bpm fisso) finché non si rilancia lo strumento.
+#
+# NumPy è opzionale: se c'è, l'inviluppo degli onset è lo spectral flux (FFT), altrimenti
+# il flusso di energia per blocchi calcolato in puro Python (più lento, risultato simile per la cassa in 4/4).
+
+import os
+import sys
+import json
+import glob
+import math
+import hashlib
+from array import array
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")   # serve solo il decoder, non l'uscita audio
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MEDIA_DIR = os.path.join(BASE_DIR, "game_01_media")
+
+CHART_VERSION = 1
+CHART_SUFFIX = ".chart.json"
+
+SAMPLE_RATE = 22050
+HOP = 256                       # ~11.6 ms per frame d'inviluppo
+FFT_SIZE = 1024
+MIN_BPM, MAX_BPM = 70.0, 140.0  # fascia di tempo dei brani del gioco (evita errori d'ottava)
+BEAT_SNAP_MS = 30.0             # ogni beat può spostarsi al massimo di tanto verso un onset vicino
+ONSET_MIN_GAP_MS = 60.0
+LOW_BAND_HZ = 150.0             # banda della cassa: distingue il beat dal controtempo
+
+
+def audio_sha1(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def chart_path(mp3_path: str) -> str:
+    return os.path.splitext(mp3_path)[0] + CHART_SUFFIX
+
+
+def decode_mono(path: str) -> array:
+    """Decodifica l'mp3 con il mixer pygame (mono 16 bit a SAMPLE_RATE)."""
+    sound = pygame.mixer.Sound(path)
+    samples = array("h")
+    samples.frombytes(sound.get_raw())
+    return samples
+
+
+# -------------------------
+# Inviluppo onset
+# -------------------------
+def onset_envelope(samples: array) -> tuple[list[float], list[float]]:
+    """Ritorna (inviluppo a banda piena, inviluppo della banda bassa), un valore ogni HOP campioni."""
+    if np is not None:
+        return _onset_envelope_fft(samples)
+    return _onset_envelope_energy(samples)
+
+
+def _onset_envelope_fft(samples: array) -> tuple[list[float], list[float]]:
+    x = np.frombuffer(samples, dtype=np.int16).astype(np.float32) / 32768.0
+    n_frames = max(0, (len(x) - FFT_SIZE) // HOP + 1)
+    if n_frames < 2:
+        return [0.0] * n_frames, [0.0] * n_frames
+    idx = np.arange(FFT_SIZE)[None, :] + HOP * np.arange(n_frames)[:, None]
+    spec = np.abs(np.fft.rfft(x[idx] * np.hanning(FFT_SIZE).astype(np.float32), axis=1))
+    flux = np.maximum(0.0, np.diff(np.log1p(100.0 * spec), axis=0))
+    low_bins = max(1, int(LOW_BAND_HZ * FFT_SIZE / SAMPLE_RATE) + 1)
+    full = [0.0] + flux.sum(axis=1).tolist()
+    low = [0.0] + flux[:, :low_bins].sum(axis=1).tolist()
+    return full, low
+
+
+def _log_energy_flux(samples, n: int) -> list[float]:
+    env = []
+    prev = 0.0
+    for start in range(0, n - HOP + 1, HOP):
+        block = samples[start:start + HOP]
+        e = math.log1p(sum(v * v for v in block) / (HOP * 32768.0 * 32768.0) * 1e4)
+        env.append(max(0.0, e - prev))
+        prev = e
+    return env
+
+
+def _onset_envelope_energy(samples: array) -> tuple[list[float], list[float]]:
+    n = len(samples)
+    # passa-basso a un polo per la banda della cassa
+    a = 1.0 - math.exp(-2.0 * math.pi * LOW_BAND_HZ / SAMPLE_RATE)
+    lowpassed = array("d", bytes(8 * n))
+    y = 0.0
+    for i, v in enumerate(samples):
+        y += a * (v - y)
+        lowpassed[i] = y
+    return _log_energy_flux(samples, n), _log_energy_flux(lowpassed, n)
+
+
+def _smooth(env: list[float]) -> list[float]:
+    """Filtro triangolare a 5 punti: il pettine tollera piccoli errori di periodo/fase."""
+    n = len(env)
+    out = [0.0] * n
+    for i in range(n):
+        acc = 0.0
+        wsum = 0.0
+        for k, w in ((-2, 1.0), (-1, 2.0), (0, 3.0), (1, 2.0), (2, 1.0)):
+            j = i + k
+            if 0 <= j < n:
+                acc += env[j] * w
+                wsum += w
+        out[i] = acc / wsum
+    return out
+
+
+# -------------------------
+# Tempo e fase
+# -------------------------
+def _env_at(env: list[float], frame: float) -> float:
+    i = int(frame)
+    if i < 0 or i + 1 >= len(env):
+        return 0.0
+    f = frame - i
+    return env[i] * (1.0 - f) + env[i + 1] * f
+
+
+def _comb_score(env: list[float], period: float, phase: float) -> float:
+    total = 0.0
+    t = phase
+    n = len(env)
+    while t < n - 1:
+        total += _env_at(env, t)
+        t += period
+    return total
+
+
+def _best_phase(env: list[float], period: float, steps: int = 96) -> tuple[float, float]:
+    best = (-1.0, 0.0)
+    for k in range(steps):
+        phase = period * k / steps
+        s = _comb_score(env, period, phase)
+        if s > best[0]:
+            best = (s, phase)
+    return best[1], best[0]
+
+
+def estimate_tempo(env: list[float], low: list[float], frame_ms: float) -> tuple[float, float]:
+    """Ritorna (periodo in frame, fase in frame del primo beat)."""
+    env = _smooth(env)
+    n = len(env)
+    mean = sum(env) / n if n else 0.0
+    x = [v - mean for v in env]
+
+    # 1) autocorrelazione sui lag della fascia di tempo ammessa
+    lag_min = int(60000.0 / MAX_BPM / frame_ms)
+    lag_max = int(math.ceil(60000.0 / MIN_BPM / frame_ms))
+    acf = {}
+    for lag in range(max(1, lag_min - 1), lag_max + 2):
+        acf[lag] = sum(x[i] * x[i + lag] for i in range(n - lag))
+    lag = max(range(lag_min, lag_max + 1), key=lambda l: acf[l])
+
+    # interpolazione parabolica del picco
+    a, b, c = acf[lag - 1], acf[lag], acf[lag + 1]
+    den = a - 2 * b + c
+    period = lag + (0.5 * (a - c) / den if den != 0 else 0.0)
+
+    # 2) raffinamento con filtro a pettine su tutto il brano (l'errore di periodo si accumula sui beat)
+    best = (-1.0, period, 0.0)
+    for k in range(-30, 31):
+        p = period * (1.0 + k * 0.0005)
+        phase, score = _best_phase(env, p)
+        if score > best[0]:
+            best = (score, p, phase)
+    _, period, phase = best
+
+    # 3) beat o controtempo? (con ottavi regolari il pettine vede entrambi): decide la banda bassa
+    low = _smooth(low)
+    half = (phase + period / 2.0) % period
+    if _comb_score(low, period, half) > _comb_score(low, period, phase):
+        phase = half
+    return period, phase
+
+
+def track_beats(env: list[float], period: float, phase: float) -> list[float]:
+    """
+    Beat (in frame) a partire dalla fase: la griglia segue gli onset forti vicini con una correzione
+    smorzata (i picchi sono quantizzati a un frame, agganciarli uno per uno darebbe jitter).
+    """
+    snap = BEAT_SNAP_MS / (1000.0 * HOP / SAMPLE_RATE)
+    mean = sum(env) / len(env)
+    beats = []
+    t = phase
+    while t < len(env) - 1:
+        lo = max(0, int(t - snap))
+        hi = min(len(env) - 1, int(t + snap) + 1)
+        peak = max(range(lo, hi + 1), key=lambda i: env[i])
+        if env[peak] > 2.0 * mean:
+            t += 0.15 * (peak - t)
+        beats.append(t)
+        t += period
+    return beats
+
+
+def pick_downbeat(env: list[float], beats: list[float]) -> int:
+    """
+    Indice (0..3) del primo downbeat: la fase di battuta con gli onset più forti.
+    Con accenti su 1 e 3 le due fasi si equivalgono: a parità (entro il 15%) vince la prima.
+    """
+    scores = [0.0] * 4
+    for i, b in enumerate(beats):
+        scores[i % 4] += _env_at(env, b)
+    top = max(scores)
+    return min(k for k in range(4) if scores[k] >= 0.85 * top)
+
+
+def pick_onsets(env: list[float], frame_ms: float) -> list[float]:
+    """Picchi dell'inviluppo sopra una soglia adattiva (media locale + deviazione)."""
+    w = 32
+    min_gap = ONSET_MIN_GAP_MS / frame_ms
+    out = []
+    last = -min_gap
+    n = len(env)
+    for i in range(1, n - 1):
+        v = env[i]
+        if v < env[i - 1] or v < env[i + 1]:
+            continue
+        seg = env[max(0, i - w):i + w]
+        m = sum(seg) / len(seg)
+        sd = math.sqrt(sum((s - m) ** 2 for s in seg) / len(seg))
+        if v > m + 1.5 * sd and i - last >= min_gap:
+            out.append(i)
+            last = i
+    return out
+
+
+# -------------------------
+# Chart
+# -------------------------
+def analyze(path: str) -> dict:
+    samples = decode_mono(path)
+    env, low = onset_envelope(samples)
+    frame_ms = 1000.0 * HOP / SAMPLE_RATE
+
+    period, phase = estimate_tempo(env, low, frame_ms)
+    beats = track_beats(env, period, phase)
+    downbeat = pick_downbeat(env, beats)
+    beats = beats[downbeat:]
+    onsets = pick_onsets(env, frame_ms)
+
+    return {
+        "version": CHART_VERSION,
+        "audio_sha1": audio_sha1(path),
+        "bpm": round(60000.0 / (period * frame_ms), 2),
+        "offset_ms": round(beats[0] * frame_ms, 1) if beats else 0.0,
+        "beats": [int(round(b * frame_ms)) for b in beats],
+        "onsets": [int(round(o * frame_ms)) for o in onsets],
+    }
+
+
+def is_up_to_date(path: str) -> bool:
+    try:
+        with open(chart_path(path), "r", encoding="utf-8") as f:
+            chart = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return chart.get("version") == CHART_VERSION and chart.get("audio_sha1") == audio_sha1(path)
+
+
+def main(argv: list[str]) -> int:
+    force = "--force" in argv
+    paths = [a for a in argv if not a.startswith("--")]
+    if not paths:
+        paths = sorted(glob.glob(os.path.join(MEDIA_DIR, "music_[0-9]*.mp3")))
+
+    # decode_mono legge get_raw() come mono 16 bit a SAMPLE_RATE: il dispositivo non deve
+    # aprirsi in un altro formato (bpm e offset sbagliati in una chart con hash valido)
+    pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=1, allowedchanges=0)
+    if pygame.mixer.get_init() != (SAMPLE_RATE, -16, 1):
+        print(f"Mixer aperto come {pygame.mixer.get_init()}, serve ({SAMPLE_RATE}, -16, 1): chart non scritte",
+              file=sys.stderr)
+        pygame.mixer.quit()
+        return 1
+    print(f"inviluppo onset: {'spectral flux (numpy)' if np is not None else 'flusso di energia (puro Python)'}")
+    for path in paths:
+        if not force and is_up_to_date(path):
+            print(f"{os.path.basename(path)}: chart aggiornata")
+            continue
+        chart = analyze(path)
+        with open(chart_path(path), "w", encoding="utf-8") as f:
+            json.dump(chart, f, separators=(",", ":"))
+        print(f"{os.path.basename(path)}: {chart['bpm']} bpm, primo downbeat {chart['offset_ms']} ms, "
+              f"{len(chart['beats'])} beat, {len(chart['onsets'])} onset")
+    pygame.mixer.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,8 +1,12 @@
 import sys
 import os
-import json
 import math
 import random
+import hashlib
+import threading
+from bisect import bisect_right
+from io import BytesIO
+from time import perf_counter
 import pygame
 
 # ============================================================
@@ -33,6 +37,7 @@ SCENE_MENU = "menu"
 SCENE_GAME = "game"
 SCENE_INSTRUCTIONS = "instructions"
 SCENE_GAME_OVER = "game_over"
+SCENE_CALIBRATION = "calibration"
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "game_01_data")
@@ -50,54 +55,105 @@ BKG_GAME = os.path.join(MEDIA_DIR, "bkg_game.png")
 
 FONT_PATH = os.path.join(MEDIA_DIR, "Starborn.ttf")
 
+# Chart dei brani (scritte da game_01_chart.py accanto all'mp3)
+CHART_VERSION = 1
+CHART_SUFFIX = ".chart.json"
 
-# ============================================================
-# UTILITY
-# ============================================================
+# Calibrazione audio/input
+CALIBRATION_TRACK = os.path.join(MEDIA_DIR, "music_01.mp3")
+CALIBRATION_BPM = 80
+CALIBRATION_LEAD_BEATS = 4       # primi beat solo ascolto
+CALIBRATION_TAPS = 16            # colpi misurati
+CALIBRATION_MAX_OFFSET_MS = 200  # offset salvato limitato a ±200ms
 
-def load_json(path, default=None):
-    if default is None:
-        default = {}
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return default
+# moduli condivisi (jacoplay_sdk/ nella root di Jacoplay)
+JACOPLAY_ROOT = os.path.dirname(os.path.dirname(BASE_DIR))
+if JACOPLAY_ROOT not in sys.path:
+    sys.path.insert(0, JACOPLAY_ROOT)
 
+from jacoplay_sdk.assets import get_asset_cache
+from jacoplay_sdk.props import PropertiesStore, load_json
+from jacoplay_sdk.result import exit_with_score, parse_score_arg
+from jacoplay_sdk.telemetry import get_profiler
+from jacoplay_sdk.ui import Label, StaticLayer
 
-def save_json(path, data):
-    try:
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-    except Exception as e:
-        print(f"Errore salvataggio JSON {path}: {e}", file=sys.stderr)
 
+# ============================================================
+# UTILITY
+# ============================================================
 
 def format_score(value: int) -> str:
     """Formatta il punteggio con punto separatore delle migliaia."""
     return f"{value:,}".replace(",", ".")
 
 
-def get_arg_score(argv):
-    """Legge il parametro --score dagli argomenti della riga di comando."""
-    best_score = 0
-    if "--score" in argv:
-        idx = argv.index("--score")
-        if idx + 1 < len(argv):
-            try:
-                best_score = int(argv[idx + 1])
-            except ValueError:
-                best_score = 0
-    return best_score
+def load_font(size: int) -> pygame.font.Font:
+    # cache del processo: il countdown chiede un font per frame (dimensione "pulsante")
+    return get_asset_cache().font(FONT_PATH, size)
 
 
-def load_font(size: int) -> pygame.font.Font:
+def load_image(path, alpha=True):
+    """Immagine dalla cache condivisa (None se manca). È condivisa: chi la modifica ne fa una copy()."""
+    return get_asset_cache().image(path, alpha=alpha)
+
+
+def event_time(event) -> float:
+    """
+    Istante (scala perf_counter) in cui è avvenuto l'evento.
+    Se l'evento porta il timestamp SDL (ms, stessa base di pygame.time.get_ticks) lo usiamo,
+    altrimenti (pygame 2.x non lo espone) l'evento viene marcato al momento in cui lo leggiamo.
+    """
+    now = perf_counter()
+    ts = getattr(event, "timestamp", None)
+    if ts is None:
+        return now
+    return now - max(0, pygame.time.get_ticks() - ts) / 1000.0
+
+
+# mp3 -> ((dimensione, mtime) di mp3 e chart, chart o None): l'hash dell'audio si calcola una volta
+# per processo, e di nuovo solo se uno dei due file cambia su disco
+_chart_cache = {}
+
+
+def _file_signature(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def load_chart(mp3_path):
+    """
+    Chart del brano (beat analizzati offline da game_01_chart.py) o None se manca
+    o non corrisponde più all'audio (hash diverso: il brano è stato sostituito).
+    Il risultato resta in _chart_cache: la chart ritornata è condivisa, va solo letta.
+    """
+    path = os.path.splitext(mp3_path)[0] + CHART_SUFFIX
     try:
-        return pygame.font.Font(FONT_PATH, size)
-    except Exception:
-        # Fallback in caso di problema
-        return pygame.font.SysFont(None, size)
+        signature = (_file_signature(mp3_path), _file_signature(path))
+    except OSError:
+        signature = None
+    cached = _chart_cache.get(mp3_path)
+    if signature is not None and cached is not None and cached[0] == signature:
+        return cached[1]
+    chart = _read_chart(mp3_path, path)
+    if signature is not None:
+        _chart_cache[mp3_path] = (signature, chart)
+    return chart
+
+
+def _read_chart(mp3_path, path):
+    chart = load_json(path, None)
+    if not chart or chart.get("version") != CHART_VERSION or len(chart.get("beats", [])) < 2:
+        return None
+    try:
+        h = hashlib.sha1()
+        with open(mp3_path, "rb") as f:
+            h.update(f.read())
+    except OSError:
+        return None
+    if h.hexdigest() != chart.get("audio_sha1"):
+        print(f"Chart non aggiornata per {mp3_path}: uso il bpm fisso", file=sys.stderr)
+        return None
+    return chart
 
 
 def blit_text_center(surface, text, font, color, y):
@@ -125,17 +181,289 @@ def blit_text(surface, text, font, color, x, y, align="left"):
 
 class GameConfig:
     def __init__(self):
+        self.props = PropertiesStore(GAME_PROPERTIES_PATH, defaults={"primorun": True, "audio_offset_ms": 0.0})
         self.primorun = True
+        self.audio_offset_ms = 0.0
         self.load()
 
     def load(self):
-        data = load_json(GAME_PROPERTIES_PATH, {})
-        self.primorun = bool(data.get("primorun", True))
+        self.props.reload()
+        self.primorun = bool(self.props.get("primorun", True))
+        try:
+            self.audio_offset_ms = float(self.props.get("audio_offset_ms", 0.0))
+        except (TypeError, ValueError):
+            self.audio_offset_ms = 0.0
 
     def save_primorun_false(self):
-        data = load_json(GAME_PROPERTIES_PATH, {})
-        data["primorun"] = False
-        save_json(GAME_PROPERTIES_PATH, data)
+        self.props["primorun"] = False
+        self.props.save()
+
+    def save_audio_offset(self, offset_ms: float):
+        self.audio_offset_ms = offset_ms
+        self.props["audio_offset_ms"] = round(offset_ms, 1)
+        self.props.save()
+
+
+class RhythmClock:
+    """
+    Posizione del brano (pygame.mixer.music) ad alta risoluzione.
+    get_pos() avanza a scatti (un buffer audio alla volta): tra due aggiornamenti la posizione
+    viene interpolata con perf_counter, così i tasti si giudicano all'istante in cui sono premuti
+    e non alla posizione campionata una volta per frame.
+    offset_ms = latenza audio/input misurata in calibrazione (va sottratta al momento del colpo).
+    """
+    MAX_EXTRAPOLATION_MS = 100.0  # oltre, get_pos è fermo (pausa/fine brano): non si estrapola
+
+    def __init__(self, offset_ms=0.0):
+        self.offset_ms = offset_ms
+        self.reset()
+
+    def reset(self):
+        """Da chiamare a ogni play() di un nuovo brano."""
+        self._raw_ms = -1
+        self._anchor_pos = 0.0
+        self._anchor_t = 0.0
+
+    def _interp(self, t):
+        dt = min((t - self._anchor_t) * 1000.0, self.MAX_EXTRAPOLATION_MS)
+        return max(0.0, self._anchor_pos + dt)
+
+    def sample(self):
+        """Legge il mixer e riancora l'interpolazione. Ritorna la posizione attuale (ms) o -1 se il brano è finito."""
+        raw = pygame.mixer.music.get_pos()
+        now = perf_counter()
+        if raw < 0:
+            self._raw_ms = -1
+            return -1.0
+        if raw != self._raw_ms:
+            # nuovo valore dal mixer: la posizione interpolata non deve mai tornare indietro
+            pos = float(raw)
+            if self._raw_ms >= 0:
+                pos = max(pos, self._interp(now))
+            self._raw_ms = raw
+            self._anchor_pos = pos
+            self._anchor_t = now
+        return self._interp(now)
+
+    def pos_at(self, t):
+        """Posizione del brano (ms) all'istante perf_counter `t`, -1 se il brano non suona."""
+        if self._raw_ms < 0:
+            return -1.0
+        return self._interp(t)
+
+    def hit_pos(self, t):
+        """Posizione usata per giudicare un colpo avvenuto all'istante `t` (offset di calibrazione applicato)."""
+        pos = self.pos_at(t)
+        if pos < 0:
+            return pos
+        return pos - self.offset_ms
+
+
+class BeatGrid:
+    """
+    Tempi dei beat di un brano (ms dalla partenza). Con la chart sono i beat analizzati
+    (beat 0 = primo downbeat), senza chart una griglia a tempo costante dal bpm.
+    Le domande "in che beat / in che suddivisione siamo" sono una ricerca binaria sui tempi.
+    """
+    def __init__(self, bpm, beats=None):
+        self.beats = [float(b) for b in beats] if beats else [0.0]
+        if beats and len(beats) >= 2:
+            # durata media del beat: per soglie/durate espresse in beat (tenute, rage, puf)
+            self.quarter_ms = (self.beats[-1] - self.beats[0]) / (len(self.beats) - 1)
+        else:
+            self.quarter_ms = 60000.0 / bpm
+
+    @classmethod
+    def for_track(cls, track):
+        chart = track.get("chart")
+        if chart is not None:
+            return cls(chart.get("bpm", track["bpm"]), chart["beats"])
+        return cls(track["bpm"])
+
+    def beat_time(self, index):
+        """Istante (ms) del beat `index` (oltre la chart si prosegue a tempo costante)."""
+        beats = self.beats
+        if index < 0:
+            return beats[0] + index * self.quarter_ms
+        if index < len(beats):
+            return beats[index]
+        return beats[-1] + (index - len(beats) + 1) * self.quarter_ms
+
+    def beat_at(self, pos_ms):
+        """Indice del beat in corso a `pos_ms` (0 anche prima del primo beat)."""
+        beats = self.beats
+        if pos_ms >= beats[-1]:
+            return len(beats) - 1 + int((pos_ms - beats[-1]) / self.quarter_ms)
+        return max(0, bisect_right(beats, pos_ms) - 1)
+
+    def tick_at(self, pos_ms, div):
+        """Indice della suddivisione 1/div di beat in corso (es. div=2 -> ottavi)."""
+        b = self.beat_at(pos_ms)
+        t0 = self.beat_time(b)
+        length = self.beat_time(b + 1) - t0
+        frac = (pos_ms - t0) / length if length > 0 else 0.0
+        return b * div + min(div - 1, max(0, int(frac * div)))
+
+    def nearest_sub_time(self, pos_ms, div):
+        """Istante della suddivisione 1/div di beat più vicina a `pos_ms`."""
+        b = self.beat_at(pos_ms)
+        t0 = self.beat_time(b)
+        step = (self.beat_time(b + 1) - t0) / div
+        if step <= 0:
+            return t0
+        return t0 + round((pos_ms - t0) / step) * step
+
+
+class TrackSequencer:
+    """
+    Sequenza dei brani di gioco senza buchi tra un brano e l'altro.
+    - un thread legge in memoria i file dei brani mentre si gioca (niente I/O sul main thread al cambio)
+    - appena il brano corrente suona, il successivo viene messo in coda con pygame.mixer.music.queue:
+      il mixer lo avvia da solo nell'istante in cui finisce il corrente (get_pos riparte da 0)
+    - all'evento di fine brano (USEREVENT) advance() dice quale brano sta suonando ora
+    """
+    def __init__(self, tracks):
+        self.tracks = tracks
+        self.index = -1
+        self._data = [None] * len(tracks)   # bytes dei file (scritti dal thread di preload)
+        self._queued = None                 # indice del brano già in coda nel mixer
+        self._preload = threading.Thread(target=self._preload_all, daemon=True)
+        self._preload.start()
+
+    def _preload_all(self):
+        for i, track in enumerate(self.tracks):
+            try:
+                with open(track["file"], "rb") as f:
+                    self._data[i] = f.read()
+            except OSError as e:
+                print(f"Errore lettura brano {track['file']}: {e}", file=sys.stderr)
+
+    def _source(self, index):
+        data = self._data[index]
+        if data is not None:
+            return BytesIO(data)
+        return self.tracks[index]["file"]
+
+    def play(self, index):
+        """Avvia il brano `index` (o il primo successivo che si riesce ad aprire). Ritorna l'indice o None."""
+        self._queued = None
+        # fine-brano del brano precedente ancora in coda eventi: già gestito da chi chiama play()
+        pygame.event.get(pygame.USEREVENT)
+        while index < len(self.tracks):
+            try:
+                pygame.mixer.music.load(self._source(index))
+                pygame.mixer.music.play()
+                self.index = index
+                return index
+            except Exception as e:
+                print(f"Errore caricamento brano {self.tracks[index]['file']}: {e}", file=sys.stderr)
+                index += 1
+        self.index = len(self.tracks)
+        return None
+
+    def poll(self):
+        """Da chiamare ogni frame: mette in coda il brano successivo quando il preload è pronto."""
+        nxt = self.index + 1
+        if self._queued is not None or nxt >= len(self.tracks) or self._data[nxt] is None:
+            return
+        try:
+            pygame.mixer.music.queue(BytesIO(self._data[nxt]))
+            self._queued = nxt
+        except Exception as e:
+            print(f"Errore coda brano {self.tracks[nxt]['file']}: {e}", file=sys.stderr)
+            self._data[nxt] = None  # al cambio si ripiega su play() dal file
+
+    def advance(self):
+        """Fine del brano corrente: ritorna l'indice del brano che suona adesso, None se non ce ne sono altri."""
+        if self._queued is not None:
+            # il mixer ha già fatto partire il brano in coda
+            self.index = self._queued
+            self._queued = None
+            return self.index
+        return self.play(self.index + 1)
+
+
+class CalibrationScreen:
+    """
+    Misura la latenza audio/input della macchina:
+    parte un brano a tempo noto, il giocatore preme un tasto su ogni beat,
+    l'offset è la mediana degli scarti dal beat più vicino (salvato in game_01.properties).
+    I beat sono quelli della chart del brano, come in gioco (senza chart: griglia fissa da CALIBRATION_BPM):
+    la fase del primo beat non deve finire nell'offset.
+    """
+    def __init__(self, screen):
+        self.screen = screen
+        self.font_title = load_font(70)
+        self.font = load_font(40)
+        self.grid = BeatGrid.for_track(
+            {"file": CALIBRATION_TRACK, "bpm": CALIBRATION_BPM, "chart": load_chart(CALIBRATION_TRACK)})
+        self.lead_ms = self.grid.beat_time(CALIBRATION_LEAD_BEATS)
+        self.clock = RhythmClock()
+        self.deltas = []
+        self.result_ms = None
+        self.pos_ms = -1.0
+
+    def open(self):
+        self.deltas = []
+        self.result_ms = None
+        self.pos_ms = -1.0
+        self.clock.reset()
+        try:
+            pygame.mixer.music.set_endevent(0)
+            pygame.mixer.music.load(CALIBRATION_TRACK)
+            pygame.mixer.music.play(-1)
+        except Exception as e:
+            print(f"Errore avvio musica calibrazione: {e}", file=sys.stderr)
+
+    def close(self):
+        pygame.mixer.music.stop()
+
+    def handle_event(self, event):
+        """Ritorna "cancel" (ESC), "done" (tasto dopo il risultato) o None."""
+        if event.type != pygame.KEYDOWN:
+            return None
+        if event.key == pygame.K_ESCAPE:
+            return "cancel"
+        if self.result_ms is not None:
+            return "done"
+
+        self.clock.sample()
+        pos = self.clock.pos_at(event_time(event))
+        if pos < self.lead_ms:
+            return None
+
+        beat_ms = self.grid.nearest_sub_time(pos, 1)
+        self.deltas.append(pos - beat_ms)
+        if len(self.deltas) >= CALIBRATION_TAPS:
+            ordered = sorted(self.deltas)
+            mid = len(ordered) // 2
+            median = ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2.0
+            self.result_ms = max(-CALIBRATION_MAX_OFFSET_MS, min(CALIBRATION_MAX_OFFSET_MS, median))
+        return None
+
+    def update(self, dt_ms):
+        self.pos_ms = self.clock.sample()
+
+    def draw(self):
+        self.screen.fill(BIANCO)
+        blit_text_center(self.screen, "CALIBRAZIONE", self.font_title, BLU_SCURO, 200)
+
+        if self.result_ms is not None:
+            blit_text_center(self.screen, f"OFFSET {self.result_ms:+.0f} MS", self.font_title, VERDE_SCURO, 500)
+            blit_text_center(self.screen, "PREMI UN TASTO PER SALVARE", self.font, BLU_SCURO, 700)
+            return
+
+        blit_text_center(self.screen, "PREMI UN TASTO A TEMPO CON LA MUSICA", self.font, BLU_SCURO, 320)
+        blit_text_center(self.screen, f"{len(self.deltas)} / {CALIBRATION_TAPS}", self.font, BLU_SCURO, 800)
+
+        # cerchio che pulsa sul beat (guida visiva)
+        if self.pos_ms >= 0:
+            b = self.grid.beat_at(self.pos_ms)
+            t0 = self.grid.beat_time(b)
+            phase = max(0.0, (self.pos_ms - t0) / (self.grid.beat_time(b + 1) - t0))
+            radius = int(60 + 60 * max(0.0, 1.0 - phase * 4.0))
+            color = GIALLO_SCURO if self.pos_ms < self.lead_ms else AZZURRO_SCURO
+            pygame.draw.circle(self.screen, color, (SCREEN_WIDTH // 2, 560), radius)
 
 
 class IntroImage:
@@ -184,13 +512,11 @@ class IntroManager:
             if not img_name:
                 continue
 
-            path = os.path.join(MEDIA_DIR, img_name)
-            try:
-                surf = pygame.image.load(path).convert_alpha()
-                surf = pygame.transform.smoothscale(surf, (SCREEN_WIDTH, SCREEN_HEIGHT))
-                self.images.append(IntroImage(surf, durata, fadein))
-            except Exception as e:
-                print(f"Errore caricamento immagine intro {path}: {e}", file=sys.stderr)
+            surf = load_image(os.path.join(MEDIA_DIR, img_name))
+            if surf is None:
+                continue
+            surf = pygame.transform.smoothscale(surf, (SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.images.append(IntroImage(surf, durata, fadein))
 
     def reset(self):
         self.current_index = 0
@@ -240,11 +566,7 @@ class IntroManager:
         self.screen.blit(img, (0, 0))
 
     def _load_intro_music(self):
-        try:
-            self.music_sound = pygame.mixer.Sound(MUSIC_INTRO)
-        except Exception as e:
-            print(f"Errore caricamento musica intro {MUSIC_INTRO}: {e}", file=sys.stderr)
-            self.music_sound = None
+        self.music_sound = get_asset_cache().sound(MUSIC_INTRO)
 
     def start_music(self):
         """Avvia la musica dell'intro (loop infinito) se non è già partita."""
@@ -284,6 +606,7 @@ class Menu:
         NUOVA PARTITA
         CONTINUA
         RIVEDI INTRO
+        CALIBRAZIONE
         ISTRUZIONI
         ESCI
     """
@@ -291,33 +614,39 @@ class Menu:
         self.screen = screen
         self.font = load_font(40)
         # Carico immagini
-        try:
-            self.bkg_menu = pygame.image.load(BKG_MENU).convert()
+        self.bkg_menu = load_image(BKG_MENU, alpha=False)
+        if self.bkg_menu is not None:
             self.bkg_menu = pygame.transform.smoothscale(
                 self.bkg_menu, (SCREEN_WIDTH, SCREEN_HEIGHT)
             )
-        except Exception:
-            self.bkg_menu = None
 
-        try:
-            self.bkg_bianco = pygame.image.load(BKG_BIANCO).convert_alpha()
+        self.bkg_bianco = load_image(BKG_BIANCO)
+        if self.bkg_bianco is not None:
             self.bkg_bianco = pygame.transform.smoothscale(
                 self.bkg_bianco, (SCREEN_WIDTH, SCREEN_HEIGHT)
             )
-        except Exception:
-            self.bkg_bianco = None
 
         self.items = [
             "NUOVA PARTITA",
             "CONTINUA",
             "RIVEDI INTRO",
+            "CALIBRAZIONE",
             "ISTRUZIONI",
             "ESCI",
         ]
 
-        self.item_rects = []
+        # voci pre-renderizzate (ri-render solo al cambio di colore: hover / CONTINUA disabilitata)
+        base_y = SCREEN_HEIGHT // 2 - (len(self.items) - 1) * 30
+        self.item_labels = [
+            Label(self.font, text, BLU_SCURO, pos=(SCREEN_WIDTH // 2, base_y + i * 60), anchor="center")
+            for i, text in enumerate(self.items)
+        ]
+        self.item_rects = [lbl.rect for lbl in self.item_labels]
         self.hover_index = None
 
+        # sfondo + overlay bianco composti una volta per ogni open()
+        self.background = StaticLayer((SCREEN_WIDTH, SCREEN_HEIGHT), self._build_background)
+
         self.active = False
         self.can_continue = False
         self.continue_target = None  # "intro" o "game"
@@ -332,6 +661,7 @@ class Menu:
         self.auto_background = auto_background
         self.frozen_background = frozen_background
         self.hover_index = None
+        self.background.invalidate()
         # musica menu solo se arrivo da fine animazione o fine gioco
         if auto_background and not self.menu_music_playing:
             try:
@@ -387,6 +717,8 @@ class Menu:
                 return None
         elif label == "RIVEDI INTRO":
             return "replay_intro"
+        elif label == "CALIBRAZIONE":
+            return "calibration"
         elif label == "ISTRUZIONI":
             return "instructions"
         elif label == "ESCI":
@@ -396,35 +728,32 @@ class Menu:
     def update(self, dt_ms):
         pass  # niente logica temporale particolare per ora
 
-    def draw(self):
+    def _build_background(self, surface):
         # sfondo
         if self.auto_background and self.bkg_menu is not None:
-            self.screen.blit(self.bkg_menu, (0, 0))
+            surface.blit(self.bkg_menu, (0, 0))
         elif self.frozen_background is not None:
-            self.screen.blit(self.frozen_background, (0, 0))
+            surface.blit(self.frozen_background, (0, 0))
         else:
-            self.screen.fill(BIANCO)
+            surface.fill(BIANCO)
 
         # overlay bianco trasparente
         if self.bkg_bianco is not None:
-            self.screen.blit(self.bkg_bianco, (0, 0))
+            surface.blit(self.bkg_bianco, (0, 0))
+
+    def draw(self):
+        self.background.draw(self.screen)
 
         # scritte menu centrate
-        self.item_rects = []
-        base_y = SCREEN_HEIGHT // 2 - 2 * 60
-        for i, text in enumerate(self.items):
-            y = base_y + i * 60
+        for i, lbl in enumerate(self.item_labels):
+            disabled = lbl.text == "CONTINUA" and not self.can_continue
             color = BLU_SCURO
-            if text == "CONTINUA" and not self.can_continue:
+            if disabled:
                 color = (150, 150, 150)  # disabilitato
-            index = i
-            if self.hover_index == index and not (text == "CONTINUA" and not self.can_continue):
+            if self.hover_index == i and not disabled:
                 color = AZZURRO_SCURO
-
-            rendered = self.font.render(text, True, color)
-            rect = rendered.get_rect(center=(SCREEN_WIDTH // 2, y))
-            self.screen.blit(rendered, rect)
-            self.item_rects.append(rect)
+            lbl.set_color(color)
+            lbl.draw(self.screen)
 
 
 class GameCore:
@@ -442,7 +771,7 @@ class GameCore:
     - pulsazioni box_pulse
     - box messaggi
     """
-    def __init__(self, screen, best_score):
+    def __init__(self, screen, best_score, audio_offset_ms=0.0):
         self.screen = screen
         self.best_score = best_score
         self.score = 0
@@ -533,25 +862,40 @@ class GameCore:
         self.font_game_over = load_font(90)
         self.font_game_over_small = load_font(60)
 
+        # scritte HUD con doppio contorno (copia chiara spostata di 2px), pre-renderizzate
+        self.lbl_score_label = Label(self.font_score_label, "SCORE", AZZURRO_SCURO, pos=(552, 45),
+                                     shadow_color=AZZURRO_CHIARO)
+        self.lbl_score = Label(self.font_score_value, "", AZZURRO_SCURO, pos=(1325, 45), anchor="topright",
+                               shadow_color=AZZURRO_CHIARO)
+        self.lbl_mul_dec = Label(self.font_star_mul_small, "", GIALLO_SCURO, pos=(164, 968),
+                                 shadow_color=GIALLO_CHIARO)
+        self.lbl_mul_int = Label(self.font_star_mul_big, "", GIALLO_SCURO, pos=(490, 936), anchor="topright",
+                                 shadow_color=GIALLO_CHIARO)
+
         # caricamento delle immagini di gioco
         self.images = {}
         self._load_images()
 
-        # tre brani musicali
+        # tre brani musicali (bpm usato solo se manca la chart analizzata)
         self.tracks = [
             {"file": os.path.join(MEDIA_DIR, "music_01.mp3"), "bpm": 80},
             {"file": os.path.join(MEDIA_DIR, "music_02.mp3"), "bpm": 100},
             {"file": os.path.join(MEDIA_DIR, "music_03.mp3"), "bpm": 120},
         ]
+        for track in self.tracks:
+            track["chart"] = load_chart(track["file"])
         self.current_track_index = 0
+        self.sequencer = TrackSequencer(self.tracks)
         self.track_started = False
         self.game_finished = False
         self.countdown_active = True  # prime 4 battute
         self.enable_controls = False
 
         # tempo
+        self.grid = BeatGrid(self.tracks[0]["bpm"])
         self.quarter_ms = 0
         self.sixteenth_ms = 0
+        self.clock = RhythmClock(audio_offset_ms)
 
         # BOX PULSE
         self.pulse_active = False
@@ -567,16 +911,15 @@ class GameCore:
         self._start_track(0)
 
     def _load_images(self):
-        def load_and_scale(name, key=None):
+        def load_and_scale(name, key=None, private=False):
+            # private: copia tutta di GameCore, per le immagini che si modificano (es. set_alpha):
+            # quelle della cache degli asset sono condivise dal processo
             if key is None:
                 key = name
-            path = os.path.join(MEDIA_DIR, name)
-            try:
-                img = pygame.image.load(path).convert_alpha()
-                self.images[key] = img
-            except Exception as e:
-                print(f"Errore caricamento immagine {path}: {e}", file=sys.stderr)
-                self.images[key] = None
+            img = load_image(os.path.join(MEDIA_DIR, name))
+            if private and img is not None:
+                img = img.copy()
+            self.images[key] = img
 
         # sfondo e sabry
         load_and_scale("bkg_game.png", "bkg_game")
@@ -603,8 +946,8 @@ class GameCore:
         # cuore
         load_and_scale("heart.png", "heart")
 
-        # box pulse
-        load_and_scale("box_pulse.png", "box_pulse")
+        # box pulse (l'alpha della pulsazione si imposta sulla copia)
+        load_and_scale("box_pulse.png", "box_pulse", private=True)
         
         # stelle
         load_and_scale("stella.png", "stella")
@@ -623,10 +966,21 @@ class GameCore:
         pygame.event.get(pygame.USEREVENT)
         # Attiva l'endevent SOLO per le musiche di gioco
         pygame.mixer.music.set_endevent(pygame.USEREVENT)
-        
+
+        index = self.sequencer.play(index)
+        if index is None:
+            self._finish_game()
+            return
+        self._on_track_started(index)
+
+    def _on_track_started(self, index):
+        """
+        Reset di bpm/beat per il brano `index`, appena partito (da play() o dalla coda del mixer).
+        La posizione riparte da 0 nel momento del passaggio, non quando il file è stato caricato.
+        """
         self.current_track_index = index
-        track = self.tracks[index]
-        self.quarter_ms = 60000.0 / track["bpm"]
+        self.grid = BeatGrid.for_track(self.tracks[index])
+        self.quarter_ms = self.grid.quarter_ms
         self.sixteenth_ms = self.quarter_ms / 4.0
         
         # reset stelle a inizio brano
@@ -639,21 +993,16 @@ class GameCore:
         self.pulse_timer_ms = 0.0
         self.pulse_last_tick_index = -1
         
-        # avvio musica
-        try:
-            pygame.mixer.music.load(track["file"])
-            pygame.mixer.music.play()
-        except Exception as e:
-            print(f"Errore caricamento brano {track['file']}: {e}", file=sys.stderr)
+        self.clock.reset()
         self.track_started = True
         self.countdown_active = True
         self.enable_controls = False
 
     def _on_track_finished(self):
-        # chiamato quando finisce un brano
-        next_index = self.current_track_index + 1
-        if next_index < len(self.tracks):
-            self._start_track(next_index)
+        # chiamato quando finisce un brano: il successivo (se in coda) sta già suonando
+        next_index = self.sequencer.advance()
+        if next_index is not None:
+            self._on_track_started(next_index)
         else:
             self._finish_game()
 
@@ -914,7 +1263,7 @@ class GameCore:
         """
         Gestisce la comparsa e la dissolvenza del box_pulse.
 
-        - Il tempo è diviso in 'tick' da 1/8 di beat (quarter_ms / 2).
+        - Il tempo è diviso in 'tick' da 1/8 di beat (metà di ogni beat della griglia del brano).
         - Ogni battuta (4/4) ha 8 tick:
             tick 0 -> inizio 1° beat
             tick 3 -> 4° ottavo (fra 2° e 3° beat)
@@ -926,11 +1275,7 @@ class GameCore:
         if self.quarter_ms <= 0:
             return
 
-        tick_ms = self.quarter_ms / 2.0  # 1/8 di beat
-        if tick_ms <= 0:
-            return
-
-        tick_index = int(pos_ms / tick_ms)
+        tick_index = self.grid.tick_at(pos_ms, 2)  # 1/8 di beat
 
         # Triggeriamo una nuova pulsazione SOLO quando cambiamo tick
         if tick_index != self.pulse_last_tick_index:
@@ -967,9 +1312,8 @@ class GameCore:
         if self.sixteenth_ms <= 0:
             return None
 
-        # indice del sedicesimo più vicino
-        sixteenth_index = round(pos_ms / self.sixteenth_ms)
-        sixteenth_time_ms = sixteenth_index * self.sixteenth_ms
+        # sedicesimo più vicino (sulla griglia dei beat del brano)
+        sixteenth_time_ms = self.grid.nearest_sub_time(pos_ms, 4)
         delta = abs(pos_ms - sixteenth_time_ms)
 
         # soglie da specifica
@@ -1122,13 +1466,15 @@ class GameCore:
             else:
                 self.limb_state[limb] = 1
 
-    def _on_rhythm_key_down(self, key_char):
+    def _on_rhythm_key_down(self, key_char, t):
         """
         Gestisce:
         - inizio animazione arto (stato=1)
         - calcolo punteggio ritmo (accodato a hit_events_frame)
+        `t` = istante della pressione (perf_counter), il colpo è giudicato lì e non a inizio frame.
         """
-        pos_ms = pygame.mixer.music.get_pos()
+        self.clock.sample()
+        pos_ms = self.clock.pos_at(t)
         if pos_ms < 0:
             return
 
@@ -1136,11 +1482,11 @@ class GameCore:
         if limb:
             if not self.limb_pressed[limb]:
                 self.limb_pressed[limb] = True
-                self.limb_press_start_ms[limb] = float(pos_ms)
+                self.limb_press_start_ms[limb] = pos_ms
                 self.limb_state[limb] = 1
                 self.limb_rage_applied[limb] = False  # nuova pressione -> Rage ancora non applicato
 
-        hit = self._compute_rhythm_hit(float(pos_ms))
+        hit = self._compute_rhythm_hit(self.clock.hit_pos(t))
         if hit is not None:
             quality, base_points = hit
             self.hit_events_frame.append(
@@ -1182,7 +1528,7 @@ class GameCore:
         # CONTROLLI RITMO Q/A/O/K
         if event.type == pygame.KEYDOWN:
             if event.key in self.limb_keys:
-                self._on_rhythm_key_down(event.key)
+                self._on_rhythm_key_down(event.key, event_time(event))
 
         elif event.type == pygame.KEYUP:
             if event.key in self.limb_keys:
@@ -1208,12 +1554,13 @@ class GameCore:
         if self.game_over:
             return
 
-        pos_ms = pygame.mixer.music.get_pos()
+        self.sequencer.poll()
+        pos_ms = self.clock.sample()
         if pos_ms < 0:
             self._on_track_finished()
             return
 
-        current_beat = int(pos_ms / self.quarter_ms) if self.quarter_ms > 0 else 0
+        current_beat = self.grid.beat_at(pos_ms)
 
         # aggiornamento BOX PULSE a tempo
         self._update_pulse(pos_ms, dt_ms)
@@ -1259,10 +1606,10 @@ class GameCore:
     # -------------------- disegno --------------------
 
     def _draw_countdown(self):
-        pos_ms = pygame.mixer.music.get_pos()
+        pos_ms = self.clock.pos_at(perf_counter())
         if pos_ms < 0:
             return
-        beat = int(pos_ms / self.quarter_ms)
+        beat = self.grid.beat_at(pos_ms)
         if beat >= 16:
             return
         # 0..15 -> 4 numeri, uno ogni 4 beat
@@ -1377,23 +1724,19 @@ class GameCore:
                 self.screen.blit(heart, positions[i])
 
         # SCORE label con doppio contorno
-        blit_text(self.screen, "SCORE", self.font_score_label, AZZURRO_CHIARO, 554, 47, align="left")
-        blit_text(self.screen, "SCORE", self.font_score_label, AZZURRO_SCURO, 552, 45, align="left")
+        self.lbl_score_label.draw(self.screen)
 
-        # punteggio con doppio contorno
-        score_str = format_score(self.score)
-        blit_text(self.screen, score_str, self.font_score_value, AZZURRO_CHIARO, 1327, 47, align="right")
-        blit_text(self.screen, score_str, self.font_score_value, AZZURRO_SCURO, 1325, 45, align="right")
+        # punteggio con doppio contorno (ri-render solo quando cambia)
+        self.lbl_score.set_text(format_score(self.score))
+        self.lbl_score.draw(self.screen)
 
         # moltiplicatore stelle piccolo (decimali)
-        mul_dec = f"{self.star_multiplier:.1f}"
-        blit_text(self.screen, mul_dec, self.font_star_mul_small, GIALLO_CHIARO, 166, 970, align="left")
-        blit_text(self.screen, mul_dec, self.font_star_mul_small, GIALLO_SCURO, 164, 968, align="left")
+        self.lbl_mul_dec.set_text(f"{self.star_multiplier:.1f}")
+        self.lbl_mul_dec.draw(self.screen)
 
         # moltiplicatore stelle intero
-        mul_int = f"X{int(self.star_multiplier)}"
-        blit_text(self.screen, mul_int, self.font_star_mul_big, GIALLO_CHIARO, 492, 938, align="right")
-        blit_text(self.screen, mul_int, self.font_star_mul_big, GIALLO_SCURO, 490, 936, align="right")
+        self.lbl_mul_int.set_text(f"X{int(self.star_multiplier)}")
+        self.lbl_mul_int.draw(self.screen)
 
         # BOX MESSAGGI
         self._draw_messages()
@@ -1402,9 +1745,9 @@ class GameCore:
         if self.pulse_active:
             pulse_img = self.images.get("box_pulse")
             if pulse_img is not None and self.pulse_alpha > 0:
-                img = pulse_img.copy()
-                img.set_alpha(self.pulse_alpha)
-                self.screen.blit(img, (1535, 0))
+                # alpha globale sulla copia privata caricata in _load_images: niente copia per frame
+                pulse_img.set_alpha(self.pulse_alpha)
+                self.screen.blit(pulse_img, (1535, 0))
 
         # countdown se attivo
         if self.countdown_active:
@@ -1437,16 +1780,18 @@ def main():
         pygame.FULLSCREEN | pygame.SCALED
     )
     clock = pygame.time.Clock()
+    prof = get_profiler()
 
     # Evento di fine musica
     #pygame.mixer.music.set_endevent(pygame.USEREVENT)
 
     # Lettura parametri e configurazione
-    best_score = get_arg_score(sys.argv)
+    best_score = parse_score_arg(sys.argv[1:])
     config = GameConfig()
 
     intro_manager = IntroManager(screen)
     menu = Menu(screen)
+    calibration = CalibrationScreen(screen)
     game_core = None  # creato quando serve
 
     # stato globale
@@ -1466,19 +1811,19 @@ def main():
             frozen_background=None
         )
 
-    instructions_image = None
-    try:
-        instructions_image = pygame.image.load(os.path.join(MEDIA_DIR, "help.png")).convert_alpha()
+    instructions_image = load_image(os.path.join(MEDIA_DIR, "help.png"))
+    if instructions_image is not None:
         instructions_image = pygame.transform.smoothscale(instructions_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
-    except Exception as e:
-        print(f"Errore caricamento help.png: {e}", file=sys.stderr)
 
     running = True
 
     while running:
         dt_ms = clock.tick(FPS)
+        prof.begin_frame()
 
         for event in pygame.event.get():
+            if prof.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 running = False
 
@@ -1515,13 +1860,21 @@ def main():
                     )
                     current_scene = SCENE_MENU
 
+            # Partita in pausa (menu ESC, istruzioni): la musica di gioco continua e il cambio di brano
+            # (USEREVENT) va dato comunque a GameCore, altrimenti griglia/bpm/countdown restano sul brano
+            # precedente fino alla fine della partita
+            if (event.type == pygame.USEREVENT and game_core is not None
+                    and current_scene in (SCENE_MENU, SCENE_INSTRUCTIONS) and menu.continue_target == SCENE_GAME):
+                game_core.handle_event(event)
+                continue
+
             # Gestione scene specifiche
             if current_scene == SCENE_MENU:
                 action = menu.handle_event(event)
                 if action == "new_game":
                     menu.close()
                     # creo una nuova partita
-                    game_core = GameCore(screen, best_score)
+                    game_core = GameCore(screen, best_score, config.audio_offset_ms)
                     current_scene = SCENE_GAME
 
                 elif action == "continue":
@@ -1537,6 +1890,12 @@ def main():
                     intro_manager.start_music()
                     current_scene = SCENE_INTRO
 
+                elif action == "calibration":
+                    # la calibrazione usa pygame.mixer.music: una partita in pausa non si può più continuare
+                    menu.close()
+                    calibration.open()
+                    current_scene = SCENE_CALIBRATION
+
                 elif action == "instructions":
                     current_scene = SCENE_INSTRUCTIONS
 
@@ -1561,6 +1920,20 @@ def main():
                         )
                         current_scene = SCENE_MENU
 
+            elif current_scene == SCENE_CALIBRATION:
+                action = calibration.handle_event(event)
+                if action is not None:
+                    if action == "done":
+                        config.save_audio_offset(calibration.result_ms)
+                    calibration.close()
+                    menu.open(
+                        can_continue=False,
+                        continue_target=None,
+                        auto_background=True,
+                        frozen_background=None
+                    )
+                    current_scene = SCENE_MENU
+
             elif current_scene == SCENE_INSTRUCTIONS:
                 # qualsiasi tasto o click chiude le istruzioni e torna al menu
                 if event.type == pygame.KEYDOWN or (event.type == pygame.MOUSEBUTTONDOWN):
@@ -1570,7 +1943,8 @@ def main():
         # UPDATE
         # ----------------------------------------------------
         if current_scene == SCENE_INTRO:
-            intro_manager.update(dt_ms)
+            with prof.section("IntroManager.update"):
+                intro_manager.update(dt_ms)
             if intro_manager.finished:
                 # fine intro: musica intro sfuma e non riparte più
                 intro_manager.stop_music(fade_ms=2000)  # fade di 2 secondi
@@ -1587,10 +1961,12 @@ def main():
 
 
         elif current_scene == SCENE_MENU:
-            menu.update(dt_ms)
+            with prof.section("Menu.update"):
+                menu.update(dt_ms)
 
         elif current_scene == SCENE_GAME and game_core:
-            game_core.update(dt_ms)
+            with prof.section("GameCore.update"):
+                game_core.update(dt_ms)
             if game_core.game_over and not game_core.game_finished:
                 # se mai avessimo logica diversa, qui potremmo spostare
                 pass
@@ -1599,6 +1975,9 @@ def main():
                 best_score = game_core.best_score
                 current_scene = SCENE_GAME_OVER
 
+        elif current_scene == SCENE_CALIBRATION:
+            calibration.update(dt_ms)
+
         elif current_scene == SCENE_INSTRUCTIONS:
             # nessun update particolare
             pass
@@ -1611,13 +1990,19 @@ def main():
         # DRAW
         # ----------------------------------------------------
         if current_scene == SCENE_INTRO:
-            intro_manager.draw()
+            with prof.section("IntroManager.draw"):
+                intro_manager.draw()
 
         elif current_scene == SCENE_MENU:
-            menu.draw()
+            with prof.section("Menu.draw"):
+                menu.draw()
 
         elif current_scene == SCENE_GAME and game_core:
-            game_core.draw()
+            with prof.section("GameCore.draw"):
+                game_core.draw()
+
+        elif current_scene == SCENE_CALIBRATION:
+            calibration.draw()
 
         elif current_scene == SCENE_INSTRUCTIONS:
             if instructions_image is not None:
@@ -1630,11 +2015,12 @@ def main():
         elif current_scene == SCENE_GAME_OVER and game_core:
             game_core.draw()
 
+        prof.end_frame()
+        prof.draw_overlay(screen)
         pygame.display.flip()
 
-    pygame.quit()
     # quando esco, torno a Jacoplay passando il best_score corrente
-    sys.exit(best_score)
+    exit_with_score(best_score)
 
 
 if __name__ == "__main__":
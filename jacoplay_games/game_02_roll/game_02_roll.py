@@ -9,11 +9,21 @@
 import sys
 import os
 import math
-import argparse
 import random
+from array import array
 
 import pygame
 
+# moduli condivisi (jacoplay_sdk/ nella root di Jacoplay)
+JACOPLAY_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if JACOPLAY_ROOT not in sys.path:
+    sys.path.insert(0, JACOPLAY_ROOT)
+
+from jacoplay_sdk.assets import get_asset_cache
+from jacoplay_sdk.result import exit_with_score, parse_score_arg
+from jacoplay_sdk.telemetry import get_profiler
+from jacoplay_sdk.ui import Label, StaticLayer
+
 # ---------------------------------------------------------------------------
 # COSTANTI E CONFIGURAZIONE
 # ---------------------------------------------------------------------------
@@ -60,6 +70,9 @@ ROBOT_SPEED_STAGE = {
 # Velocità di rotazione quando rimbalza su un bordo (gradi al secondo)
 ROBOT_ROT_SPEED = 180
 
+# Passo delle rotazioni precalcolate del robot (gradi): a 180°/s e 60 fps è un frame di rotazione
+ROBOT_ANGLE_STEP = 3
+
 # (Per dopo, quando gestiremo la rotazione su carta)
 ROBOT_SPIN_SPEED = 180  # gradi al secondo
 
@@ -92,7 +105,8 @@ PAPER_SPAWN_PROB = {       # probabilità che sia carta (anziché oggetto)
 
 TARGET_OBJECTS_PER_STAGE = 10
 MAX_PAPER_COUNT = 3        # max 3 pezzi di carta “in tasca”
-MIN_DIST_ITEM_FROM_ACTORS = 40  # distanza minima da player/robot allo spawn
+MIN_DIST_ITEM_FROM_ACTORS = 40  # margine attorno ai rect di player/robot escluso dallo spawn
+SPAWN_CELL = 80            # celle della griglia di spawn (un item per cella: gli oggetti sono 80x80)
 MAX_LIVES = 3
 
 
@@ -172,40 +186,184 @@ def resource_path(relative_path):
 
 
 def load_image(rel_path, use_alpha=True):
-    full_path = resource_path(rel_path)
-    img = pygame.image.load(full_path)
-    if use_alpha:
-        return img.convert_alpha()
-    else:
-        return img.convert()
+    return get_asset_cache().image(resource_path(rel_path), alpha=use_alpha)
 
 
 def load_font(size):
-    font_path = resource_path(os.path.join("game_02_media", "VaselineExtra.ttf"))
-    return pygame.font.Font(font_path, size)
+    return get_asset_cache().font(resource_path(os.path.join("game_02_media", "VaselineExtra.ttf")), size)
+
+
+def load_sound(rel_path):
+    """Suono dalla cache condivisa; None se il file manca o il mixer è spento (vedi play_sound)."""
+    return get_asset_cache().sound(resource_path(rel_path))
+
+
+def play_sound(sound, loops=0):
+    if sound is not None:
+        sound.play(loops=loops)
 
 
 # ---------------------------------------------------------------------------
-# CLASSE PLAYER
+# CACHE IMMAGINI / MASCHERE
 # ---------------------------------------------------------------------------
+# Le maschere per le collisioni pixel-perfect si calcolano una volta sola:
+# niente pygame.mask.from_surface a ogni frame di animazione o rotazione.
 
-class Player:
-    def __init__(self):
-        # Carico i 24 frame del personaggio
-        self.frames = []
+_mask_cache = {}
+
+
+def cached_mask(image):
+    """Maschera di una surface condivisa (oggetti, carta): calcolata al primo uso."""
+    mask = _mask_cache.get(image)
+    if mask is None:
+        mask = pygame.mask.from_surface(image)
+        _mask_cache[image] = mask
+    return mask
+
+
+_player_sprites = None
+
+
+def load_player_sprites():
+    """
+    24 frame del personaggio + versioni push (01, 07, 13, 19), con le maschere.
+    Ritorna (frames, masks, push_frames, push_masks); caricati alla prima chiamata e condivisi
+    da tutti i Player (se ne crea uno nuovo a ogni vita persa e a ogni stage).
+    """
+    global _player_sprites
+    if _player_sprites is None:
+        frames = []
         for i in range(1, 25):
             filename = f"frame_{i:02d}.png"
-            self.frames.append(load_image(os.path.join("game_02_media", filename), use_alpha=True))
+            frames.append(load_image(os.path.join("game_02_media", filename), use_alpha=True))
 
         # Carico solo i push per 01, 07, 13, 19
-        self.push_frames = {}
+        push_frames = {}
         for i in (1, 7, 13, 19):
             filename = f"frame_{i:02d}_push.png"
-            try:
-                self.push_frames[i] = load_image(os.path.join("game_02_media", filename), use_alpha=True)
-            except pygame.error:
-                # Se per qualche motivo manca, uso il frame normale
-                self.push_frames[i] = self.frames[i - 1]
+            img = load_image(os.path.join("game_02_media", filename), use_alpha=True)
+            # Se per qualche motivo manca (la cache ritorna None), uso il frame normale
+            push_frames[i] = img if img is not None else frames[i - 1]
+
+        masks = [pygame.mask.from_surface(img) for img in frames]
+        push_masks = {i: pygame.mask.from_surface(img) for i, img in push_frames.items()}
+        _player_sprites = (frames, masks, push_frames, push_masks)
+    return _player_sprites
+
+
+_robot_sprites = None
+
+
+def load_robot_sprites():
+    """
+    Roomba ruotato ogni ROBOT_ANGLE_STEP gradi (orario, 0° = nord), con le maschere.
+    Lista di (image, mask) indicizzata da round(angolo / ROBOT_ANGLE_STEP).
+    """
+    global _robot_sprites
+    if _robot_sprites is None:
+        base_image = load_image(os.path.join("game_02_media", "roomba.png"), use_alpha=True)
+        table = []
+        for k in range(360 // ROBOT_ANGLE_STEP):
+            # pygame ruota in senso antiorario, noi abbiamo angolo orario -> usiamo -angle
+            rotated = pygame.transform.rotate(base_image, -k * ROBOT_ANGLE_STEP) if k else base_image
+            table.append((rotated, pygame.mask.from_surface(rotated)))
+        _robot_sprites = table
+    return _robot_sprites
+
+
+# ---------------------------------------------------------------------------
+# GRIGLIA DI SPAWN
+# ---------------------------------------------------------------------------
+
+class SpawnGrid:
+    """
+    Griglia di occupazione dell'area del player (celle SPAWN_CELL x SPAWN_CELL).
+    - `count[c]` = quanti item coprono la cella c (gli item restano fermi: occupy/release sul loro rect)
+    - `free` = lista densa delle celle libere (+ `_pos` cella -> indice) con rimozione swap-remove O(1)
+    - sample() esclude al volo le celle sotto player/robot (che si muovono) e pesca tra le libere:
+      niente tentativi a vuoto, e se c'è una cella libera la trova sempre
+    """
+
+    def __init__(self):
+        self.cols = PLAYER_AREA_W // SPAWN_CELL
+        self.rows = PLAYER_AREA_H // SPAWN_CELL
+        # griglia centrata nell'area (il resto della divisione si divide tra i due bordi)
+        self.x0 = PLAYER_AREA_X + (PLAYER_AREA_W - self.cols * SPAWN_CELL) // 2
+        self.y0 = PLAYER_AREA_Y + (PLAYER_AREA_H - self.rows * SPAWN_CELL) // 2
+        self.clear()
+
+    def clear(self):
+        n = self.cols * self.rows
+        self.count = array("H", [0]) * n
+        self.free = list(range(n))
+        self._pos = array("i", range(n))
+
+    def _cells(self, rect):
+        """Indici delle celle toccate dal rect (clippato alla griglia)."""
+        c0 = max(0, (rect.left - self.x0) // SPAWN_CELL)
+        c1 = min(self.cols - 1, (rect.right - 1 - self.x0) // SPAWN_CELL)
+        r0 = max(0, (rect.top - self.y0) // SPAWN_CELL)
+        r1 = min(self.rows - 1, (rect.bottom - 1 - self.y0) // SPAWN_CELL)
+        cols = self.cols
+        return [r * cols + c for r in range(r0, r1 + 1) for c in range(c0, c1 + 1)]
+
+    def _swap(self, k, j):
+        free, pos = self.free, self._pos
+        a, b = free[k], free[j]
+        free[k], free[j] = b, a
+        pos[a], pos[b] = j, k
+
+    def occupy(self, rect):
+        for c in self._cells(rect):
+            self.count[c] += 1
+            if self.count[c] == 1:
+                # swap-remove dalla lista delle libere
+                k = self._pos[c]
+                self._swap(k, len(self.free) - 1)
+                self.free.pop()
+                self._pos[c] = -1
+
+    def release(self, rect):
+        for c in self._cells(rect):
+            if self.count[c] == 0:
+                continue
+            self.count[c] -= 1
+            if self.count[c] == 0:
+                self._pos[c] = len(self.free)
+                self.free.append(c)
+
+    def sample(self, image_size, blocked_rects):
+        """
+        Top-left casuale per un item di dimensione image_size dentro una cella libera
+        non coperta dai blocked_rects. None se l'area è piena.
+        """
+        free = self.free
+        pos = self._pos
+        # sposta in coda le celle libere bloccate dagli attori, poi pesca tra le altre
+        n = len(free)
+        for rect in blocked_rects:
+            for c in self._cells(rect):
+                k = pos[c]
+                if 0 <= k < n:
+                    n -= 1
+                    self._swap(k, n)
+        if n <= 0:
+            return None
+        c = free[random.randrange(n)]
+        iw, ih = image_size
+        x = self.x0 + (c % self.cols) * SPAWN_CELL + random.randint(0, max(0, SPAWN_CELL - iw))
+        y = self.y0 + (c // self.cols) * SPAWN_CELL + random.randint(0, max(0, SPAWN_CELL - ih))
+        return x, y
+
+
+# ---------------------------------------------------------------------------
+# CLASSE PLAYER
+# ---------------------------------------------------------------------------
+
+class Player:
+    def __init__(self):
+        # 24 frame del personaggio + push per 01, 07, 13, 19 (con maschere, dalla cache)
+        self.frames, self.frame_masks, self.push_frames, self.push_masks = load_player_sprites()
 
         # Frame corrente (0-23), ma logicamente corrisponde a 1-24
         self.frame_index = 0
@@ -215,7 +373,7 @@ class Player:
         start_x = PLAYER_AREA_X + PLAYER_AREA_W // 2
         start_y = PLAYER_AREA_Y + PLAYER_AREA_H // 2
         self.rect = self.image.get_rect(center=(start_x, start_y))
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = self.frame_masks[self.frame_index]
 
         # Movimento / animazione
         self.active_key = None           # 'A', 'D', 'W', 'S' oppure None
@@ -240,7 +398,7 @@ class Player:
         old_center = self.rect.center
         self.image = self.frames[self.frame_index]
         self.rect = self.image.get_rect(center=old_center)
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = self.frame_masks[self.frame_index]
         self.current_image_is_push = False
 
     def _clamp_in_area(self):
@@ -424,15 +582,15 @@ class Player:
         if self.current_image_is_push:
             # torna a immagine normale
             self.image = self.frames[frame_num - 1]
+            self.mask = self.frame_masks[frame_num - 1]
             self.current_image_is_push = False
         else:
             # passa alla versione push
-            push_img = self.push_frames.get(frame_num, self.frames[frame_num - 1])
-            self.image = push_img
+            self.image = self.push_frames.get(frame_num, self.frames[frame_num - 1])
+            self.mask = self.push_masks.get(frame_num, self.frame_masks[frame_num - 1])
             self.current_image_is_push = True
 
         self.rect = self.image.get_rect(center=center)
-        self.mask = pygame.mask.from_surface(self.image)
 
         # Spostamento di 20px lungo l'asse definito
         if self.push_axis == 'x':
@@ -521,15 +679,14 @@ class Robot:
         self.sound_spin = sound_spin
         self.sound_wrong = sound_wrong
 
-        # immagine di base (orientata "verso nord" nello sprite)
-        self.base_image = load_image(os.path.join("game_02_media", "roomba.png"), use_alpha=True)
-        self.image = self.base_image
+        # rotazioni precalcolate (la prima è l'immagine di base, orientata "verso nord" nello sprite)
+        self.sprites = load_robot_sprites()
+        self.image, self.mask = self.sprites[0]
 
         # posizione (usiamo float per la fisica)
         self.x = float(ROBOT_START_X)
         self.y = float(ROBOT_START_Y)
         self.rect = self.image.get_rect(center=(self.x, self.y))
-        self.mask = pygame.mask.from_surface(self.image)
 
         # angolo in gradi: 0° = NORD (verso l'alto),
         # positivo = rotazione in senso orario (verso EST, SUD, OVEST)
@@ -567,7 +724,7 @@ class Robot:
         self.vy = 0.0
 
         # Avvia suono spin in loop
-        self.sound_spin.play(loops=-1)
+        play_sound(self.sound_spin, loops=-1)
 
     def _update_spin(self, dt_ms, stage):
         dt = dt_ms / 1000.0
@@ -580,7 +737,8 @@ class Robot:
             self.spin_time_left = 0
 
             # Stop suono spin
-            self.sound_spin.stop()
+            if self.sound_spin is not None:
+                self.sound_spin.stop()
 
             # riprende a muoversi nella direzione dell'angolo attuale
             self.speed = self._speed_for_stage(stage)
@@ -606,13 +764,10 @@ class Robot:
         return vx, vy
 
     def _update_rect_from_pos(self):
-        """Aggiorna image e rect in base a x, y e angle."""
-        # pygame ruota in senso antiorario, noi abbiamo angolo orario -> usiamo -angle
-        rotated = pygame.transform.rotate(self.base_image, -self.angle)
-        rect = rotated.get_rect(center=(self.x, self.y))
-        self.image = rotated
-        self.rect = rect
-        self.mask = pygame.mask.from_surface(self.image)
+        """Aggiorna image, mask e rect in base a x, y e angle (rotazione più vicina tra quelle precalcolate)."""
+        k = int(self.angle / ROBOT_ANGLE_STEP + 0.5) % len(self.sprites)
+        self.image, self.mask = self.sprites[k]
+        self.rect = self.image.get_rect(center=(self.x, self.y))
 
     def ensure_speed_for_stage(self, stage):
         """Se cambia stage, adegua il modulo della velocità mantenendo la direzione."""
@@ -860,7 +1015,7 @@ class Item:
         self.image = image
         self.kind = kind
         self.rect = self.image.get_rect(topleft=(x, y))
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = cached_mask(self.image)
 
     def draw(self, surface):
         surface.blit(self.image, self.rect)
@@ -888,7 +1043,7 @@ class PaperShot:
         self.vy = self.speed * (dy / length)
 
         self.rect = self.image.get_rect(center=(int(self.x), int(self.y)))
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = cached_mask(self.image)
 
     def update(self, dt_ms):
         """
@@ -988,9 +1143,9 @@ class PopupMessage:
         return True
 
     def draw(self, surface):
-        surf = self.surface.copy()
-        surf.set_alpha(self.alpha)
-        surface.blit(surf, self.rect)
+        # alpha globale direttamente sulla surface del testo (niente copia per frame)
+        self.surface.set_alpha(self.alpha)
+        surface.blit(self.surface, self.rect)
 
 
 # ---------------------------------------------------------------------------
@@ -999,10 +1154,7 @@ class PopupMessage:
 
 def main():
     # ------------------ parsing argomenti (best_score) -------------------
-    parser = argparse.ArgumentParser(add_help=False)
-    parser.add_argument("--score", type=int, default=0)
-    args, unknown = parser.parse_known_args()
-    best_score = args.score
+    best_score = parse_score_arg(sys.argv[1:])
 
     # ----------------------------- pygame init ---------------------------
     pygame.init()
@@ -1015,6 +1167,7 @@ def main():
     pygame.display.set_caption("Jac n Roll - game_02_roll")
 
     clock = pygame.time.Clock()
+    prof = get_profiler()
 
 
     # ---------------------------- CARICAMENTO ASSET ----------------------
@@ -1023,11 +1176,6 @@ def main():
     bkg_istruzioni = load_image(os.path.join("game_02_media", "bkg_istruzioni.png"))
     bkg_gioco = load_image(os.path.join("game_02_media", "bkg_gioco.png"))
 
-    # Backgrounds
-    bkg_menu = load_image(os.path.join("game_02_media", "bkg_menu.png"))
-    bkg_istruzioni = load_image(os.path.join("game_02_media", "bkg_istruzioni.png"))
-    bkg_gioco = load_image(os.path.join("game_02_media", "bkg_gioco.png"))
-
     # Oggetti e carta
     object_images = [
         load_image(os.path.join("game_02_media", "oggetto_01.png")),
@@ -1051,16 +1199,15 @@ def main():
     music_game_path = resource_path(os.path.join("game_02_media", "music_game.mp3"))
 
     # Suoni singoli
-    sound_bell = pygame.mixer.Sound(resource_path(os.path.join("game_02_media", "sound_bell.mp3")))
-    sound_spin = pygame.mixer.Sound(resource_path(os.path.join("game_02_media", "sound_spin.mp3")))
-    sound_wrong = pygame.mixer.Sound(resource_path(os.path.join("game_02_media", "sound_wrong.mp3")))
-    sound_stage = pygame.mixer.Sound(resource_path(os.path.join("game_02_media", "sound_stage.mp3")))
+    sound_bell = load_sound(os.path.join("game_02_media", "sound_bell.mp3"))
+    sound_spin = load_sound(os.path.join("game_02_media", "sound_spin.mp3"))
+    sound_wrong = load_sound(os.path.join("game_02_media", "sound_wrong.mp3"))
+    sound_stage = load_sound(os.path.join("game_02_media", "sound_stage.mp3"))
 
     # Volume (opzionale)
-    sound_bell.set_volume(0.9)
-    sound_spin.set_volume(0.9)
-    sound_wrong.set_volume(0.9)
-    sound_stage.set_volume(0.9)
+    for snd in (sound_bell, sound_spin, sound_wrong, sound_stage):
+        if snd is not None:
+            snd.set_volume(0.9)
 
 
     def play_menu_music():
@@ -1079,30 +1226,36 @@ def main():
     # ---------------------------- MENU: setup testi ----------------------
     menu_items = ["NUOVA PARTITA", "ISTRUZIONI", "ESCI"]
 
-    def build_menu_surfaces(mouse_pos):
-        """Ritorna lista di (surface, rect, label) con hover gestito."""
-        items = []
-        mid_x = INTERNAL_WIDTH // 2
-        # Partiamo da metà schermo in verticale
-        start_y = INTERNAL_HEIGHT // 2
-        spacing = 100
+    # Voci centrate a partire da metà schermo in verticale; il render si rifà solo al cambio di hover
+    menu_labels = [
+        Label(font_menu, label, VIOLA, pos=(INTERNAL_WIDTH // 2, INTERNAL_HEIGHT // 2 + idx * 100), anchor="center")
+        for idx, label in enumerate(menu_items)
+    ]
+
+    def update_menu_hover(mouse_pos):
+        for lbl in menu_labels:
+            lbl.set_color(BIANCO if lbl.rect.collidepoint(mouse_pos) else VIOLA)
+
+    # ---------------------------- HUD / GAME OVER ------------------------
+    lbl_stage = Label(font_stage, "", BIANCO, pos=(46, 63))
+    lbl_objects = Label(font_stage, "", BIANCO, pos=(121, 345))
+    lbl_paper = Label(font_stage, "", BIANCO, pos=(1738, 931))
 
-        for idx, label in enumerate(menu_items):
-            y = start_y + idx * spacing
-            # testo provvisorio per avere il rect al centro
-            text_surface = font_menu.render(label, True, VIOLA)
-            rect = text_surface.get_rect(center=(mid_x, y))
+    def build_game_over(surface):
+        surface.blit(bkg_menu, (0, 0))
+        Label(font_game_over, "GAME OVER", VIOLA,
+              pos=(INTERNAL_WIDTH // 2, INTERNAL_HEIGHT // 2 - 40), anchor="center").draw(surface)
 
-            if rect.collidepoint(mouse_pos):
-                color = BIANCO
-            else:
-                color = VIOLA
+        if last_completed_stage > 0:
+            msg = f"Complimenti, hai completato {last_completed_stage} stage"
+        else:
+            msg = "Non hai completato il primo stage, riprova!"
 
-            text_surface = font_menu.render(label, True, color)
-            rect = text_surface.get_rect(center=(mid_x, y))
-            items.append((text_surface, rect, label))
+        Label(font_game_over_small, msg, VIOLA,
+              pos=(INTERNAL_WIDTH // 2, INTERNAL_HEIGHT // 2 + 20), anchor="center").draw(surface)
 
-        return items
+    # schermata statica: composta una volta a ogni game over (invalidate quando si entra nello stato)
+    game_over_layer = StaticLayer((INTERNAL_WIDTH, INTERNAL_HEIGHT), build_game_over)
 
     # ---------------------------- STATO INIZIALE -------------------------
     state = STATE_MENU
@@ -1117,8 +1270,9 @@ def main():
     # Oggetto robot
     robot = None
 
-    # Lista degli item (oggetti + carta)
+    # Lista degli item (oggetti + carta) e griglia di occupazione per lo spawn
     items = []
+    spawn_grid = SpawnGrid()
 
     # Contatori
     objects_collected = 0
@@ -1144,9 +1298,9 @@ def main():
         Gestisce la logica di:
         - timer basato su OBJECT_SPAWN_INTERVAL
         - probabilità di comparsa oggetto/carta
-        - scelta posizione casuale nello spazio del player
-        - distanza minima da player e robot
-        Restituisce un Item o None.
+        - scelta posizione casuale tra le celle libere della griglia di spawn
+          (niente item sovrapposti, margine attorno a player e robot)
+        Restituisce un Item o None (niente da spawnare, o area piena).
         """
         nonlocal current_stage, player, robot
 
@@ -1168,41 +1322,29 @@ def main():
             img = random.choice(object_images)
             kind = "object"
 
-        iw, ih = img.get_width(), img.get_height()
-
-        # range coordinate dentro area player, tenendo conto delle dimensioni
-        min_x = PLAYER_AREA_X
-        max_x = PLAYER_AREA_X + PLAYER_AREA_W - iw
-        min_y = PLAYER_AREA_Y
-        max_y = PLAYER_AREA_Y + PLAYER_AREA_H - ih
-
-        if max_x < min_x or max_y < min_y:
-            return None  # area troppo piccola (non dovrebbe mai accadere)
-
-        # fino a N tentativi per trovare una posizione valida
-        for _ in range(50):
-            x = random.randint(min_x, max_x)
-            y = random.randint(min_y, max_y)
+        margin = 2 * MIN_DIST_ITEM_FROM_ACTORS
+        blocked = []
+        if player is not None:
+            blocked.append(player.rect.inflate(margin, margin))
+        if robot is not None:
+            blocked.append(robot.rect.inflate(margin, margin))
 
-            # distanza minima da player e robot
-            ok = True
-            cx_item = x + iw / 2
-            cy_item = y + ih / 2
+        pos = spawn_grid.sample(img.get_size(), blocked)
+        if pos is None:
+            return None  # nessuna cella libera
+        return Item(img, kind, pos[0], pos[1])
 
-            if player is not None:
-                cx_p, cy_p = player.rect.center
-                if math.hypot(cx_item - cx_p, cy_item - cy_p) < MIN_DIST_ITEM_FROM_ACTORS:
-                    ok = False
-
-            if ok and robot is not None:
-                cx_r, cy_r = robot.rect.center
-                if math.hypot(cx_item - cx_r, cy_item - cy_r) < MIN_DIST_ITEM_FROM_ACTORS:
-                    ok = False
+    def add_item(item):
+        items.append(item)
+        spawn_grid.occupy(item.rect)
 
-            if ok:
-                return Item(img, kind, x, y)
+    def remove_item(item):
+        items.remove(item)
+        spawn_grid.release(item.rect)
 
-        return None  # non trovata posizione valida
+    def clear_items():
+        items.clear()
+        spawn_grid.clear()
 
     def add_popup(text, delay=0.0):
         """Crea un popup centrale in basso, viola, con font Vaseline."""
@@ -1219,9 +1361,12 @@ def main():
     running = True
     while running:
         dt = clock.tick(60)  # ms
+        prof.begin_frame()
         mouse_pos = pygame.mouse.get_pos()
 
         for event in pygame.event.get():
+            if prof.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 running = False
 
@@ -1229,8 +1374,9 @@ def main():
             if state == STATE_MENU:
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     # click sinistro
-                    for surf, rect, label in build_menu_surfaces(mouse_pos):
-                        if rect.collidepoint(event.pos):
+                    for lbl in menu_labels:
+                        if lbl.rect.collidepoint(event.pos):
+                            label = lbl.text
                             if label == "NUOVA PARTITA":
                                 # Avvia il gioco
                                 stop_music()
@@ -1240,9 +1386,9 @@ def main():
                                 last_completed_stage = 0
                                 player = Player()
                                 robot = Robot(current_stage, sound_spin, sound_wrong)
-                                sound_stage.play()
-                                items.clear()
-                                paper_shots.clear() 
+                                play_sound(sound_stage)
+                                clear_items()
+                                paper_shots.clear()
                                 objects_collected = 0
                                 paper_collected = 0
                                 spawn_timer = 0.0
@@ -1312,6 +1458,8 @@ def main():
                     play_menu_music()
                     state = STATE_MENU
 
+        prof.lap("events")
+
         # ----------------------------------------------------------------
         # UPDATE LOGICO
         # ----------------------------------------------------------------
@@ -1328,11 +1476,14 @@ def main():
                 spawn_timer -= interval
                 new_item = spawn_random_item()
                 if new_item is not None:
-                    items.append(new_item)
+                    add_item(new_item)
 
             # Collisioni player con oggetti / carta (pixel-perfect)
             if player is not None and player.mask is not None:
                 for item in items[:]:
+                    # prima il test dei rettangoli, la maschera solo se si sovrappongono
+                    if not player.rect.colliderect(item.rect):
+                        continue
                     offset = (item.rect.x - player.rect.x, item.rect.y - player.rect.y)
                     if player.mask.overlap(item.mask, offset):
                         if item.kind == "object":
@@ -1344,34 +1495,35 @@ def main():
                                 paper_collected += 1
                                 add_popup("Carta raccolta!")
                         # Suono raccolta
-                        sound_bell.play()
-                        items.remove(item)
+                        play_sound(sound_bell)
+                        remove_item(item)
 
             # Collisioni robot con oggetti e carta a terra
             if robot is not None and robot.mask is not None:
                 for item in items[:]:
+                    if not robot.rect.colliderect(item.rect):
+                        continue
                     offset = (item.rect.x - robot.rect.x, item.rect.y - robot.rect.y)
                     if robot.mask.overlap(item.mask, offset):
                         if item.kind == "object":
                             # Suono "errore": il robot ha mangiato un oggetto
-                            sound_wrong.play()
+                            play_sound(sound_wrong)
                             # Il robot aspira l'oggetto: sparisce
-                            items.remove(item)
+                            remove_item(item)
                         elif item.kind == "paper":
                             # Carta -> modalità spin
                             robot.start_spin()
-                            items.remove(item)
+                            remove_item(item)
 
             # Collisione player-robot (pixel-perfect) -> perdita vita / game over
-            if player is not None and robot is not None:
-                offset_pr = (robot.rect.x - player.rect.x, robot.rect.y - player.rect.y)
-            if player is not None and robot is not None:
+            if player is not None and robot is not None and player.rect.colliderect(robot.rect):
                 offset_pr = (robot.rect.x - player.rect.x, robot.rect.y - player.rect.y)
                 if player.mask.overlap(robot.mask, offset_pr):
                     lives -= 1
                     if lives <= 0:
                         # Game over per esaurimento vite
                         state = STATE_GAME_OVER
+                        game_over_layer.invalidate()
                         if last_completed_stage > best_score:
                             best_score = last_completed_stage
                     else:
@@ -1392,19 +1544,20 @@ def main():
                     # Passa allo stage successivo
                     current_stage += 1
                     objects_collected = 0
-                    items.clear()
+                    clear_items()
                     spawn_timer = 0.0
 
                     # Reset di player e robot per il nuovo stage
                     player = Player()
                     robot.reset_for_stage(current_stage)
-                    sound_stage.play()
+                    play_sound(sound_stage)
 
                     # Popup "Stage 2!" o "Stage 3!" dopo 1 secondo
                     add_popup(f"Stage {current_stage}!", delay=1.0)
                 else:
                     # Hai completato lo stage 3: vittoria -> GAME OVER "positivo"
                     state = STATE_GAME_OVER
+                    game_over_layer.invalidate()
                     if last_completed_stage > best_score:
                         best_score = last_completed_stage
 
@@ -1413,7 +1566,7 @@ def main():
                 arrived = shot.update(dt)
                 if arrived:
                     # Quando arriva al target, diventa un pezzo di carta per terra
-                    items.append(Item(paper_image, "paper", shot.rect.x, shot.rect.y))
+                    add_item(Item(paper_image, "paper", shot.rect.x, shot.rect.y))
                     paper_shots.remove(shot)
                 else:
                     # se per qualche motivo esce dall'area di gioco, la eliminiamo
@@ -1429,13 +1582,16 @@ def main():
                     popup_messages.remove(msg)
 
 
+        prof.lap("update")
+
         # ----------------------------------------------------------------
         # DISEGNO
         # ----------------------------------------------------------------
         if state == STATE_MENU:
             screen.blit(bkg_menu, (0, 0))
-            for surf, rect, label in build_menu_surfaces(mouse_pos):
-                screen.blit(surf, rect)
+            update_menu_hover(mouse_pos)
+            for lbl in menu_labels:
+                lbl.draw(screen)
 
         elif state == STATE_INSTRUCTIONS:
             screen.blit(bkg_istruzioni, (0, 0))
@@ -1460,8 +1616,8 @@ def main():
                 screen.blit(player.image, player.rect)
 
             # Scritta "Stage n"
-            text_stage = font_stage.render(f"Stage {current_stage}", True, BIANCO)
-            screen.blit(text_stage, (46, 63))
+            lbl_stage.set_text(f"Stage {current_stage}")
+            lbl_stage.draw(screen)
 
             # Vite (3 cuori all'inizio)
             # coordinate indicative (adatta se hai segnaposto precisi nel bkg)
@@ -1473,37 +1629,27 @@ def main():
                 screen.blit(heart_image, (217, 174))
 
             # Contatore oggetti "x/10" a (121,345)
-            text_objs = font_stage.render(f"{objects_collected}/{TARGET_OBJECTS_PER_STAGE}", True, BIANCO)
-            screen.blit(text_objs, (121, 345))
+            lbl_objects.set_text(f"{objects_collected}/{TARGET_OBJECTS_PER_STAGE}")
+            lbl_objects.draw(screen)
 
             # Contatore carta (0..3) a (1738,931)
-            text_paper = font_stage.render(str(paper_collected), True, BIANCO)
-            screen.blit(text_paper, (1738, 931))
+            lbl_paper.set_text(str(paper_collected))
+            lbl_paper.draw(screen)
 
             # Popup messaggi
             for msg in popup_messages:
                 msg.draw(screen)
 
         elif state == STATE_GAME_OVER:
-            screen.blit(bkg_menu, (0, 0))
-            text_go = font_game_over.render("GAME OVER", True, VIOLA)
-            rect_go = text_go.get_rect(center=(INTERNAL_WIDTH // 2, INTERNAL_HEIGHT // 2 - 40))
-            screen.blit(text_go, rect_go)
-
-            if last_completed_stage > 0:
-                msg = f"Complimenti, hai completato {last_completed_stage} stage"
-            else:
-                msg = "Non hai completato il primo stage, riprova!"
-
-            text_msg = font_game_over_small.render(msg, True, VIOLA)
-            rect_msg = text_msg.get_rect(center=(INTERNAL_WIDTH // 2, INTERNAL_HEIGHT // 2 + 20))
-            screen.blit(text_msg, rect_msg)
+            game_over_layer.draw(screen)
 
+        prof.lap("draw")
+        prof.end_frame()
+        prof.draw_overlay(screen)
         pygame.display.flip()
 
-    # Uscita: ritorno il best_score (per ora non lo modifichiamo in questa versione)
-    pygame.quit()
-    sys.exit(best_score)
+    # Uscita: il best_score va a Jacoplay su stdout
+    exit_with_score(best_score)
 
 
 if __name__ == "__main__":
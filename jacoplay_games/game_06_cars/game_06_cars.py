@@ -1,6 +1,5 @@
 ﻿import os
 import sys
-import json
 import math
 import random
 from dataclasses import dataclass
@@ -35,6 +34,23 @@ BEEP_SOUND = os.path.join(MEDIA_DIR, "beep.mp3")
 
 MUSIC_END_EVENT = pygame.USEREVENT + 1
 
+# SFX one-shot (crash/beep) sul mixer condiviso: voci 0..7 riservate,
+# i loop motore restano sui canali dedicati 8..15 (vedi RaceState._init_race_sfx)
+SFX_VOICES = 8
+CRASH_MIN_INTERVAL_MS = 150
+
+# moduli condivisi (jacoplay_sdk/ nella root di Jacoplay)
+JACOPLAY_ROOT = os.path.dirname(os.path.dirname(ROOT_DIR))
+if JACOPLAY_ROOT not in sys.path:
+    sys.path.insert(0, JACOPLAY_ROOT)
+
+from jacoplay_sdk.assets import get_asset_cache
+from jacoplay_sdk.props import load_json
+from jacoplay_sdk.result import exit_with_score, parse_score_arg
+from jacoplay_sdk.sfx import SfxManager
+from jacoplay_sdk.telemetry import get_profiler
+from jacoplay_sdk.ui import Label, StaticLayer
+
 TRACK1_RENDER = os.path.join(MEDIA_DIR, "track1_render.png")
 TRACK1_SURFACE = os.path.join(MEDIA_DIR, "track1_surface.png")
 TRACK2_RENDER = os.path.join(MEDIA_DIR, "track2_render.png")
@@ -48,11 +64,12 @@ TRACK_ASSETS = {
     "track03": (TRACK3_RENDER, TRACK3_SURFACE),
 }
 
-print("ROOT_DIR =", ROOT_DIR)
-print("MEDIA_DIR =", MEDIA_DIR)
-print("DATA_DIR  =", DATA_DIR)
-print("MENU_BKG exists?", os.path.exists(MENU_BKG), MENU_BKG)
-print("INSTR_BKG exists?", os.path.exists(INSTR_BKG), INSTR_BKG)
+# diagnostica su stderr: lo stdout è il canale del punteggio verso Jacoplay
+print("ROOT_DIR =", ROOT_DIR, file=sys.stderr)
+print("MEDIA_DIR =", MEDIA_DIR, file=sys.stderr)
+print("DATA_DIR  =", DATA_DIR, file=sys.stderr)
+print("MENU_BKG exists?", os.path.exists(MENU_BKG), MENU_BKG, file=sys.stderr)
+print("INSTR_BKG exists?", os.path.exists(INSTR_BKG), INSTR_BKG, file=sys.stderr)
 
 # Surface colors (RGB)
 CLR_ROAD = (0, 0, 0)
@@ -105,19 +122,11 @@ def angle_from_velocity(v: pygame.Vector2) -> float:
 # Assets / helpers
 # ==========================
 def load_image(path: str, fallback_size=(64, 64), col=(200, 50, 50)) -> pygame.Surface:
-    try:
-        img = pygame.image.load(path).convert_alpha()
-        return img
-    except Exception:
-        surf = pygame.Surface(fallback_size, pygame.SRCALPHA)
-        surf.fill(col)
-        return surf
+    # surface condivisa dalla cache: chi la modifica deve farne una copy()
+    return get_asset_cache().image(path, fallback_size=fallback_size, fallback_color=col)
 
 def load_font(size: int) -> pygame.font.Font:
-    try:
-        return pygame.font.Font(FONT_PATH, size)
-    except Exception:
-        return pygame.font.SysFont("arial", size)
+    return get_asset_cache().font(FONT_PATH, size)
 
 def draw_text(surf: pygame.Surface, text: str, font: pygame.font.Font, x: int, y: int, color=(255, 255, 255)):
     img = font.render(text, True, color)
@@ -137,6 +146,10 @@ def draw_text_shadowed(
     draw_text(surf, text, font, x + sx, y + sy, shadow_color)
     draw_text(surf, text, font, x, y, color)
 
+def shadowed_label(font: pygame.font.Font, text: str, x: int, y: int, color=(255, 255, 255)) -> Label:
+    """Come draw_text_shadowed, ma pre-renderizzata (testo + ombra in una sola surface)."""
+    return Label(font, text, color, pos=(x, y), shadow_color=(0, 0, 0), shadow_offset=(2, 2))
+
 def compute_letterbox(dst_w: int, dst_h: int) -> Tuple[pygame.Rect, float]:
     sx = dst_w / LOGICAL_W
     sy = dst_h / LOGICAL_H
@@ -182,8 +195,7 @@ def load_cars() -> List[CarModel]:
         return [
             CarModel("Fallback Car", "fallback_car.png", 3, 3, 3, 3, 3)
         ]
-    with open(CARS_JSON, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(CARS_JSON)
     cars = []
     for c in data.get("cars", data.get("lista", data.get("auto", []))):
         cars.append(CarModel(
@@ -211,8 +223,7 @@ def load_tracks_meta() -> Dict[str, TrackInfo]:
             )
         }
 
-    with open(TRACKS_JSON, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(TRACKS_JSON)
 
     out: Dict[str, TrackInfo] = {}
     for t in data.get("tracks", []):
@@ -911,6 +922,17 @@ class MenuState(State):
         self.font = load_font(54)
         self.sel = 0
 
+        # sfondo + titolo composti una volta; voci pre-renderizzate (alzate per restare tutte visibili)
+        self.layer = StaticLayer((LOGICAL_W, LOGICAL_H), self._build_layer)
+        self.item_labels = [
+            Label(self.font, "", pos=(90, LOGICAL_H - 360 + i * 78))
+            for i in range(len(self._menu_items()))
+        ]
+
+    def _build_layer(self, surf: pygame.Surface):
+        surf.blit(self.bkg, (0, 0))
+        draw_text(surf, "CARS", self.font_big, 70, 70)
+
     def _menu_items(self) -> List[str]:
         diff_txt = "alta" if self.game.hard_difficulty else "normale"
         return [
@@ -966,18 +988,13 @@ class MenuState(State):
     def update(self, dt): ...
 
     def draw(self, surf):
-        surf.blit(self.bkg, (0, 0))
-        draw_text(surf, "CARS", self.font_big, 70, 70)
-
-        x = 90
-        y = LOGICAL_H - 360  # alzato per mantenere tutte le voci visibili
-        line_h = 78
-        items = self._menu_items()
+        self.layer.draw(surf)
 
-        for i, it in enumerate(items):
-            col = (255, 220, 80) if i == self.sel else (255, 255, 255)
-            draw_text(surf, it, self.font, x, y, col)
-            y += line_h       
+        for i, it in enumerate(self._menu_items()):
+            lbl = self.item_labels[i]
+            lbl.set_text(it)
+            lbl.set_color((255, 220, 80) if i == self.sel else (255, 255, 255))
+            lbl.draw(surf)
 
 
 class InstructionsState(State):
@@ -986,6 +1003,11 @@ class InstructionsState(State):
         self.bkg = load_image(INSTR_BKG, fallback_size=(LOGICAL_W, LOGICAL_H), col=(60, 20, 20))
         self.bkg = pygame.transform.smoothscale(self.bkg, (LOGICAL_W, LOGICAL_H))
         self.font = load_font(34)
+        self.layer = StaticLayer((LOGICAL_W, LOGICAL_H), self._build_layer)
+
+    def _build_layer(self, surf: pygame.Surface):
+        surf.blit(self.bkg, (0, 0))
+        draw_text(surf, "Premi un tasto per tornare al menu", self.font, 60, 980, (255, 255, 255))
 
     def handle_event(self, e):
         if e.type == pygame.KEYDOWN or e.type == pygame.MOUSEBUTTONDOWN:
@@ -994,8 +1016,7 @@ class InstructionsState(State):
     def update(self, dt): ...
 
     def draw(self, surf):
-        surf.blit(self.bkg, (0, 0))
-        draw_text(surf, "Premi un tasto per tornare al menu", self.font, 60, 980, (255, 255, 255))
+        self.layer.draw(surf)
 
 
 class CarSelectState(State):
@@ -1144,6 +1165,14 @@ class RaceState(State):
         )
         self.track = Track(ti, render_path, surface_path)
 
+        # pista + linea del traguardo (debug) composte una volta; scritte HUD pre-renderizzate
+        self.track_layer = StaticLayer((LOGICAL_W, LOGICAL_H), self._build_track_layer)
+        self.lbl_laps = shadowed_label(self.font, "", 20, 20)
+        self.lbl_phase = shadowed_label(self.font, self.phase_label, 20, 55, (220, 220, 220))
+        self.lbl_hp = shadowed_label(self.font, "HP:", 20, 90)
+        self.lbl_countdown = shadowed_label(self.font_big, "", 950, 500, (255, 220, 80))
+        self.lbl_finish = shadowed_label(self.font_big, "FINISH! Premi ESC", 700, 480, (255, 220, 80))
+
         # spawn cars (player + 7 AI)
         selected = game.selected_car or game.cars[0]
         self.cars: List[Car] = []
@@ -1192,7 +1221,6 @@ class RaceState(State):
         self.sfx_enabled = self.game.audio_enabled
         self.engine_channels: List[Optional[pygame.mixer.Channel]] = []
         self.engine_sounds: List[Optional[pygame.mixer.Sound]] = []
-        self.crash_cooldown = 0.0
 
         if self.sfx_enabled:
             self._init_race_sfx()
@@ -1204,7 +1232,6 @@ class RaceState(State):
 
     def update(self, dt: float):
         keys = pygame.key.get_pressed()
-        self.crash_cooldown = max(0.0, self.crash_cooldown - dt)
 
         # countdown
         if not self.race_started:
@@ -1275,21 +1302,26 @@ class RaceState(State):
             c.pos.x = clamp(c.pos.x, 0, LOGICAL_W)
             c.pos.y = clamp(c.pos.y, 0, LOGICAL_H)
 
-    def draw(self, surf: pygame.Surface):
+    def _build_track_layer(self, surf: pygame.Surface):
         surf.blit(self.track.render_img, (0, 0))
 
         # (debug) finish line
         pygame.draw.rect(surf, (255, 255, 255), self.track.finish_rect, 2)
 
+    def draw(self, surf: pygame.Surface):
+        self.track_layer.draw(surf)
+
         for c in self.cars:
             if not c.race_done:
                 c.draw(surf)
 
-        # UI
-        draw_text_shadowed(surf, f"Giro: {min(self.player.laps_done, self.laps_target)}/{self.laps_target}", self.font, 20, 20)
-        draw_text_shadowed(surf, self.phase_label, self.font, 20, 55, (220, 220, 220))
+        # UI (ri-render solo quando cambiano testo o colore)
+        self.lbl_laps.set_text(f"Giro: {min(self.player.laps_done, self.laps_target)}/{self.laps_target}")
+        self.lbl_laps.draw(surf)
+        self.lbl_phase.draw(surf)
         hp_col = (120, 255, 140) if self.player.hp > self.player.max_hp * 0.40 else (255, 140, 120)
-        draw_text_shadowed(surf, "HP:", self.font, 20, 90, hp_col)
+        self.lbl_hp.set_color(hp_col)
+        self.lbl_hp.draw(surf)
         hp_ratio = clamp(self.player.hp / max(self.player.max_hp, 1.0), 0.0, 1.0)
         bar_x, bar_y = 92, 96
         bar_w, bar_h = 260, 16
@@ -1301,10 +1333,11 @@ class RaceState(State):
 
         if not self.race_started:
             n = max(1, int(math.ceil(self.countdown)))
-            draw_text_shadowed(surf, str(n), self.font_big, 950, 500, (255, 220, 80))
+            self.lbl_countdown.set_text(str(n))
+            self.lbl_countdown.draw(surf)
 
         if self.finished:
-            draw_text_shadowed(surf, "FINISH! Premi ESC", self.font_big, 700, 480, (255, 220, 80))
+            self.lbl_finish.draw(surf)
 
     def _build_standings_snapshot(self) -> List[Dict]:
         wps = self.track.waypoints
@@ -1430,40 +1463,30 @@ class RaceState(State):
     def _play_crash_sfx_if_needed(self):
         if not self.sfx_enabled:
             return
-        if self.crash_cooldown > 0.0:
-            return
         for c in self.cars:
             if c.race_done:
                 continue
-            if c.just_hit_wall and c.wall_hit_speed > 35.0 and self.game.crash_sounds:
-                try:
-                    snd = random.choice(self.game.crash_sounds)
-                    ch = snd.play()
-                    if ch is not None:
-                        # Louder crashes for higher impact speed.
-                        # <=55: normal/lower mix, >55: progressively boosted.
-                        impact = c.wall_hit_speed
-                        if impact > 55.0:
-                            t = clamp((impact - 55.0) / 80.0, 0.0, 1.0)
-                            ch.set_volume(0.88 + 0.12 * t)
-                        else:
-                            ch.set_volume(0.80)
-                    self.crash_cooldown = 0.15
-                except Exception:
-                    pass
+            if c.just_hit_wall and c.wall_hit_speed > 35.0:
+                # Louder crashes for higher impact speed.
+                # <=55: normal/lower mix, >55: progressively boosted.
+                # Cooldown (CRASH_MIN_INTERVAL_MS) e voci sono gestiti dal mixer SFX.
+                impact = c.wall_hit_speed
+                if impact > 55.0:
+                    t = clamp((impact - 55.0) / 80.0, 0.0, 1.0)
+                    vol = 0.88 + 0.12 * t
+                else:
+                    vol = 0.80
+                self.game.sfx.play("crash", volume=vol)
                 break
 
     def _update_countdown_beep(self):
-        if not self.sfx_enabled or self.game.beep_sound is None:
+        if not self.sfx_enabled or not self.game.sfx.has("beep"):
             return
         if self.countdown <= 0:
             return
         n = int(math.ceil(self.countdown))
         if n in (1, 2, 3) and n < self.countdown_last_n:
-            try:
-                self.game.beep_sound.play()
-            except Exception:
-                pass
+            self.game.sfx.play("beep")
         self.countdown_last_n = n
 
     def _stop_engine_sfx(self):
@@ -1843,13 +1866,16 @@ class ConfirmAbandonState(State):
 # Game container
 # ==========================
 class Game:
-    def __init__(self):
+    def __init__(self, best_score: int = 0):
+        # il gioco non ha un punteggio proprio: il best score ricevuto torna invariato a Jacoplay
+        self.best_score = best_score
         pygame.init()
         pygame.display.set_caption("Top-Down Racing (Spec v3)")
 
         info = pygame.display.Info()
         self.screen = pygame.display.set_mode((info.current_w, info.current_h), pygame.RESIZABLE)
         self.clock = pygame.time.Clock()
+        self.prof = get_profiler()
 
         self.logical = pygame.Surface((LOGICAL_W, LOGICAL_H)).convert_alpha()
 
@@ -1859,8 +1885,7 @@ class Game:
         self.music_mode = "none"   # "none" | "menu" | "race"
         self.race_music_idx = 0
         self.engine_sounds: List[pygame.mixer.Sound] = []
-        self.crash_sounds: List[pygame.mixer.Sound] = []
-        self.beep_sound: Optional[pygame.mixer.Sound] = None
+        self.sfx: Optional[SfxManager] = None
 
         self.cars: List[CarModel] = load_cars()
         self.tracks: Dict[str, TrackInfo] = load_tracks_meta()
@@ -1879,38 +1904,25 @@ class Game:
         try:
             pygame.mixer.init()
             self.audio_enabled = True
-            self._load_sfx_assets()
         except Exception:
             self.audio_enabled = False
+        # con mixer assente il manager resta disabilitato (play() no-op)
+        self.sfx = SfxManager(num_voices=SFX_VOICES)
+        self._load_sfx_assets()
 
     def _load_sfx_assets(self):
         self.engine_sounds = []
-        self.crash_sounds = []
-        self.beep_sound = None
         if not self.audio_enabled:
             return
         for p in ENGINE_SOUNDS:
             if os.path.exists(p):
-                try:
-                    s = pygame.mixer.Sound(p)
+                s = get_asset_cache().sound(p)
+                if s is not None:
                     s.set_volume(0.48)
                     self.engine_sounds.append(s)
-                except Exception:
-                    pass
-        for p in CRASH_SOUNDS:
-            if os.path.exists(p):
-                try:
-                    s = pygame.mixer.Sound(p)
-                    s.set_volume(0.72)
-                    self.crash_sounds.append(s)
-                except Exception:
-                    pass
-        if os.path.exists(BEEP_SOUND):
-            try:
-                self.beep_sound = pygame.mixer.Sound(BEEP_SOUND)
-                self.beep_sound.set_volume(0.55)
-            except Exception:
-                self.beep_sound = None
+        # priorità: il beep del via non deve mai essere coperto dai crash
+        self.sfx.register("crash", CRASH_SOUNDS, priority=1, min_interval_ms=CRASH_MIN_INTERVAL_MS, volume=0.72)
+        self.sfx.register("beep", [BEEP_SOUND], priority=2, volume=0.55)
 
     def _start_menu_music(self):
         if not self.audio_enabled or self.music_mode == "menu":
@@ -2111,8 +2123,12 @@ class Game:
     def run(self):
         while self.running:
             dt = self.clock.tick(TARGET_FPS) / 1000.0
+            prof = self.prof
+            prof.begin_frame()
 
             for e in pygame.event.get():
+                if prof.handle_event(e):
+                    continue
                 if e.type == pygame.QUIT:
                     self.running = False
                 elif e.type == pygame.VIDEORESIZE:
@@ -2124,21 +2140,27 @@ class Game:
                         self.current_state().handle_event(e)
 
             if self.states:
-                self.current_state().update(dt)
-                self.current_state().draw(self.logical)
+                state_name = type(self.current_state()).__name__
+                with prof.section(state_name + ".update"):
+                    self.current_state().update(dt)
+                with prof.section(state_name + ".draw"):
+                    self.current_state().draw(self.logical)
 
             # scale with letterbox
-            dst_rect, _scale = compute_letterbox(self.screen.get_width(), self.screen.get_height())
-            scaled = pygame.transform.smoothscale(self.logical, (dst_rect.w, dst_rect.h))
-            self.screen.fill((0, 0, 0))
-            self.screen.blit(scaled, dst_rect)
+            with prof.section("letterbox"):
+                dst_rect, _scale = compute_letterbox(self.screen.get_width(), self.screen.get_height())
+                scaled = pygame.transform.smoothscale(self.logical, (dst_rect.w, dst_rect.h))
+                self.screen.fill((0, 0, 0))
+                self.screen.blit(scaled, dst_rect)
+            prof.end_frame()
+            prof.draw_overlay(self.screen)
             pygame.display.flip()
 
-        pygame.quit()
+        exit_with_score(self.best_score)
 
 
 def main():
-    game = Game()
+    game = Game(best_score=parse_score_arg(sys.argv[1:]))
     game.run()
 
 
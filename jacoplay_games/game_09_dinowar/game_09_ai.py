@@ -0,0 +1,209 @@
+# game_09_ai.py
+# AI di DinoWar con ricerca a tempo: Monte Carlo sulle mosse legali, su un thread separato dalla UI.
+#
+# Uso tipico (vedi play_ai_turn in game_09_dinowar.py):
+#     worker = AIWorker(make_policy("normale"))
+#     worker.start(match)                 # copia la partita e cerca sul thread
+#     while not worker.done():
+#         ...disegna un frame...
+#     apply_action(match, worker.result(), on_event)
+#
+# La ricerca (SearchPolicy):
+#   - le mosse candidate si raggruppano per stato risultante (tabella delle trasposizioni): energie
+#     uguali in posizioni diverse della mano, attacchi in ordine diverso con lo stesso esito, ecc.
+#     contano una volta sola e condividono le statistiche tra una mossa e la successiva del turno
+#   - a ogni giro si rimescolano le informazioni nascoste (mano avversaria e ordine dei mazzi: l'AI
+#     non le conosce) e ogni candidato gioca una simulazione su quella stessa distribuzione: resto del
+#     turno e `horizon` turni successivi con la politica greedy, poi valutazione del tavolo in [0, 1]
+#   - si ferma alla scadenza del budget (tempo reale) e sceglie il candidato con la media più alta,
+#     ma solo se batte la mossa greedy di almeno `margin` (altrimenti resta la greedy)
+# Senza pygame: gira anche nelle simulazioni e nei test headless.
+
+from __future__ import annotations
+
+import math
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+from game_09_rules import (
+    ACT_END, Action, GreedyPolicy, MatchState, apply_action, clone_match, is_dino_token,
+    legal_actions, match_key, opponent,
+)
+
+# livello -> budget di ricerca per mossa (secondi); 0 = AI greedy senza ricerca
+AI_LEVELS = {
+    "facile": 0.0,
+    "normale": 0.3,
+    "difficile": 1.0,
+}
+
+TABLE_MAX = 50_000      # voci della tabella delle trasposizioni prima di svuotarla
+
+
+def evaluate(match: MatchState, side: int) -> float:
+    """Valore del tavolo per `side` in [0, 1]: 1/0 a partita finita, altrimenti dal materiale in gioco."""
+    if match.winner is not None:
+        return 1.0 if match.winner == side else 0.0
+    diff = _material(match, side) - _material(match, opponent(side))
+    return 0.5 + 0.5 * math.tanh(diff / 30.0)
+
+
+def _material(match: MatchState, side: int) -> float:
+    p = match.players[side]
+    total = 0.0
+    for inst in p.field:
+        total += 3.0 + inst.current_hp + 2.0 * inst.base.atk + inst.shield_points
+    total += 2.0 * sum(1 for t in p.hand if is_dino_token(t))
+    total += 1.0 * sum(1 for t in p.deck if is_dino_token(t))
+    total += 0.5 * p.energy
+    return total
+
+
+def determinize(match: MatchState, viewer: int, rng: random.Random) -> None:
+    """
+    Rimescola ciò che `viewer` non può sapere: mano + mazzo avversari (ridistribuiti con
+    gli stessi numeri di carte) e ordine del proprio mazzo.
+    """
+    foe = match.players[opponent(viewer)]
+    hidden = foe.hand + foe.deck
+    rng.shuffle(hidden)
+    n = len(foe.hand)
+    foe.hand[:] = hidden[:n]
+    foe.deck[:] = hidden[n:]
+    rng.shuffle(match.players[viewer].deck)
+
+
+class SearchPolicy:
+    """
+    Ricerca Monte Carlo a tempo (vedi intestazione del modulo). choose() ritorna una mossa alla volta,
+    come GreedyPolicy, entro budget_s secondi; le statistiche restano nella tabella fino al turno successivo.
+    """
+
+    def __init__(self, budget_s: float = 0.3, horizon: int = 2, seed: Optional[int] = None, margin: float = 0.02):
+        self.budget_s = budget_s
+        self.horizon = horizon
+        self.margin = margin        # vantaggio medio minimo per preferire una mossa a quella greedy
+        self.rng = random.Random(seed)
+        self.greedy = GreedyPolicy()
+        self.table: Dict[tuple, List[float]] = {}   # chiave stato -> [simulazioni, somma valori]
+        self._table_turn = -1
+        self.cancelled = threading.Event()
+        self.last_rounds = 0
+
+    def choose(self, match: MatchState) -> Action:
+        deadline = time.perf_counter() + self.budget_s
+        side = match.turn
+        greedy_action = self.greedy.choose(match)
+
+        if match.turn_number != self._table_turn or len(self.table) > TABLE_MAX:
+            self.table.clear()
+            self._table_turn = match.turn_number
+
+        # candidati: una mossa per ogni stato risultante diverso (la greedy sempre per prima)
+        candidates: List[tuple] = []    # (azione, stato dopo la mossa, chiave)
+        seen = set()
+        actions = legal_actions(match)
+        actions.sort(key=lambda a: a != greedy_action)
+        for action in actions:
+            after = clone_match(match)
+            if action.kind == ACT_END:
+                # lo stato "dopo" è il turno avversario con la sua pesca: si simula da qui
+                key = ("END",) + match_key(match, side)
+            else:
+                apply_action(after, action)
+                key = match_key(after, side)
+            if key in seen:
+                continue
+            seen.add(key)
+            candidates.append((action, after, key))
+
+        if len(candidates) == 1:
+            return candidates[0][0]
+
+        # a ogni giro tutti i candidati sono simulati sulla STESSA distribuzione delle carte nascoste:
+        # le differenze tra le medie dipendono dalle mosse, non dalla fortuna del mescolamento
+        stats = [self.table.setdefault(key, [0, 0.0]) for _action, _after, key in candidates]
+        rounds = 0
+        while not self.cancelled.is_set():
+            seed = self.rng.random()
+            for (action, after, _key), st in zip(candidates, stats):
+                st[0] += 1
+                st[1] += self._simulate(after, side, action.kind == ACT_END, seed)
+            rounds += 1
+            if time.perf_counter() >= deadline:
+                break
+
+        self.last_rounds = rounds
+        means = [st[1] / st[0] for st in stats]
+        best = max(range(len(candidates)), key=lambda i: means[i])
+        if means[best] - means[0] < self.margin:
+            best = 0    # nessuna mossa chiaramente migliore: resta la greedy
+        return candidates[best][0]
+
+    def _simulate(self, after: MatchState, side: int, end_turn: bool, seed: float) -> float:
+        sim = clone_match(after)
+        determinize(sim, side, random.Random(seed))
+        if end_turn:
+            apply_action(sim, Action(ACT_END))
+        # resto del turno in corso + `horizon` turni, greedy per entrambi
+        stop_turn = sim.turn_number + self.horizon
+        greedy = self.greedy
+        while sim.winner is None and sim.turn_number <= stop_turn:
+            apply_action(sim, greedy.choose(sim))
+        return evaluate(sim, side)
+
+
+def make_policy(level: str, seed: Optional[int] = None):
+    """Politica per un livello di AI_LEVELS (livello sconosciuto -> "normale")."""
+    budget = AI_LEVELS.get(level, AI_LEVELS["normale"])
+    if budget <= 0:
+        return GreedyPolicy()
+    return SearchPolicy(budget_s=budget, seed=seed)
+
+
+class AIWorker:
+    """
+    Esegue policy.choose() su un thread daemon, su una copia della partita: la UI continua a
+    disegnare e ritira la mossa con done()/result(). Gli indici della mossa valgono anche
+    per la partita originale (la copia è identica finché la UI non la modifica).
+    """
+
+    def __init__(self, policy):
+        self.policy = policy
+        self._thread: Optional[threading.Thread] = None
+        self._result: Optional[Action] = None
+        self._error: Optional[BaseException] = None
+
+    def start(self, match: MatchState) -> None:
+        snapshot = clone_match(match)
+        self._result = None
+        self._error = None
+        cancelled = getattr(self.policy, "cancelled", None)
+        if cancelled is not None:
+            cancelled.clear()
+        self._thread = threading.Thread(target=self._run, args=(snapshot,), name="dinowar-ai", daemon=True)
+        self._thread.start()
+
+    def _run(self, snapshot: MatchState) -> None:
+        try:
+            self._result = self.policy.choose(snapshot)
+        except BaseException as e:  # rilanciata nel thread della UI da result()
+            self._error = e
+
+    def done(self) -> bool:
+        return self._thread is None or not self._thread.is_alive()
+
+    def result(self) -> Action:
+        if self._thread is not None:
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._result if self._result is not None else Action(ACT_END)
+
+    def cancel(self) -> None:
+        """Interrompe la ricerca in corso (la mossa migliore trovata fin lì resta disponibile)."""
+        cancelled = getattr(self.policy, "cancelled", None)
+        if cancelled is not None:
+            cancelled.set()
@@ -4,13 +4,12 @@
 
 from __future__ import annotations
 
-import json
 import math
 import os
 import random
 import sys
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import pygame
 
@@ -32,6 +31,32 @@ JSON_PATH = os.path.join(DATA_DIR, "game_09.properties")
 
 FONT_PATH = os.path.join(MEDIA_DIR, "LuckiestGuy-Regular.ttf")
 
+# moduli condivisi (jacoplay_sdk/ nella root di Jacoplay)
+JACOPLAY_ROOT = os.path.dirname(os.path.dirname(BASE_DIR))
+if JACOPLAY_ROOT not in sys.path:
+    sys.path.insert(0, JACOPLAY_ROOT)
+
+from jacoplay_sdk.assets import get_asset_cache
+from jacoplay_sdk.result import parse_score_arg, report_score
+from jacoplay_sdk.sfx import SfxManager
+from jacoplay_sdk.telemetry import get_profiler
+from jacoplay_sdk.ui import GlyphCache
+
+# regole della partita (senza pygame), modulo accanto a questo file
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from game_09_rules import (
+    ACT_ABILITY, ACT_ATTACK, ACT_END, ACT_ENERGY, ACT_SUMMON, AI, USER,
+    EV_ATTACK, EV_DEATH, EV_DRAW, EV_GAME_OVER, EV_HEAL, EV_HIT, EV_SUMMON,
+    FACTION_CARN, FACTION_HERB, FIELD_MAX, TOKEN_LEAVES, TOKEN_MEAT,
+    Action, CardDef, CardInstance, Event, MatchState, PlayerState,
+    action_error, apply_action, can_cast_ability, can_use_ability_now, deal_initial_hands,
+    is_dino_token, load_cards_from_json, new_match, other_faction,
+    should_atk_for_attack, start_turn, token_dino_id,
+)
+from game_09_ai import AIWorker, make_policy
+
 # Menu assets/coords
 MENU_BG = "bg_menu.png"
 MENU_ITEMS = [
@@ -47,6 +72,8 @@ SFX_HERB_DOWN = "erbivoro_down.mp3"
 ICON_HIT = "colpo.png"
 ICON_HEAL = "cura.png"
 ICON_PROTECT = "scudo.png"
+ICON_SPEED = "speed.png"
+ICON_SHIELD = "shield.png"
 SFX_CARN_ATTACK = "carnivoro_attack.mp3"
 SFX_HERB_ATTACK = "erbivoro_attack.mp3"
 SFX_DEAD = "dead.mp3"
@@ -68,6 +95,18 @@ BTN_COMP_OFF, BTN_COMP_ON = "btn_completa_off.png", "btn_completa_on.png"
 
 SFX_FLIP = "giracarta.mp3"
 
+# Mixer SFX: budget voci e regole per effetto
+# filename -> (priorità, intervallo minimo ms, max voci contemporanee)
+SFX_VOICES = 6
+SFX_RULES = {
+    SFX_FLIP: (0, 40, 2),
+    SFX_CARN_ATTACK: (1, 0, 2),
+    SFX_HERB_ATTACK: (1, 0, 2),
+    SFX_CARN_DOWN: (1, 0, 1),
+    SFX_HERB_DOWN: (1, 0, 1),
+    SFX_DEAD: (2, 0, 2),
+}
+
 # Posizioni aree (da specifica)
 POS_ENERGY_USER = (23, 966)
 POS_ENERGY_AI = (23, 21)
@@ -86,16 +125,12 @@ POS_FIELD_AI = (270, 220)
 POS_FIELD_USER = (270, 560)
 
 FIELD_CARD_W, FIELD_CARD_H = (230, 300)
-FIELD_MAX = 6
 
 # Testi
 TITLE_LEADER = "SCEGLI IL TUO LEADER"
 
-# Fazioni / energie (da JSON)
-FACTION_HERB = "ERBIVORE"
-FACTION_CARN = "CARNIVORE"
-ENERGY_LEAVES = "LEAVES"
-ENERGY_MEAT = "MEAT"
+# Livello AI (game_09_ai.AI_LEVELS): "facile" = greedy, "normale"/"difficile" = ricerca a tempo
+AI_LEVEL = "normale"
 
 
 # =========================
@@ -108,24 +143,32 @@ class Scaler:
         self.logical = pygame.Surface((LOGICAL_W, LOGICAL_H)).convert_alpha()
         self.logical_rect = self.logical.get_rect()
         self.window_rect = self.window.get_rect()
+        self.prof = get_profiler()
 
-    def begin(self) -> pygame.Surface:
-        self.logical.fill((0, 0, 0, 0))
+    def begin(self, clear: bool = True) -> pygame.Surface:
+        # clear=False: il chiamante copre subito tutta la surface (es. BoardLayer), niente fill inutile
+        if clear:
+            self.logical.fill((0, 0, 0, 0))
         return self.logical
 
     def present(self) -> None:
-        ww, wh = self.window_rect.size
-        lw, lh = self.logical_rect.size
-
-        scale = min(ww / lw, wh / lh)
-        sw, sh = int(lw * scale), int(lh * scale)
-
-        scaled = pygame.transform.smoothscale(self.logical, (sw, sh))
-        x = (ww - sw) // 2
-        y = (wh - sh) // 2
-
-        self.window.fill((0, 0, 0))
-        self.window.blit(scaled, (x, y))
+        prof = self.prof
+        with prof.section("present"):
+            ww, wh = self.window_rect.size
+            lw, lh = self.logical_rect.size
+
+            scale = min(ww / lw, wh / lh)
+            sw, sh = int(lw * scale), int(lh * scale)
+
+            scaled = pygame.transform.smoothscale(self.logical, (sw, sh))
+            x = (ww - sw) // 2
+            y = (wh - sh) // 2
+
+            self.window.fill((0, 0, 0))
+            self.window.blit(scaled, (x, y))
+        # chiude il frame aperto dal loop chiamante (menu_loop / start_match); le animazioni non lo aprono
+        prof.end_frame()
+        prof.draw_overlay(self.window)
         pygame.display.flip()
 
     def to_logical_pos(self, window_pos: Tuple[int, int]) -> Tuple[int, int]:
@@ -154,35 +197,57 @@ class Scaler:
 # Cache immagini / audio
 # =========================
 class AssetCache:
+    """
+    Asset di game_09 per nome di file in MEDIA_DIR, caricati dalla cache condivisa del processo.
+    L'indice locale per nome evita os.path.join a ogni lookup (le draw chiedono decine di immagini per frame).
+    """
     def __init__(self):
-        self._images: Dict[str, pygame.Surface] = {}
+        self._shared = get_asset_cache()
+        self._images: Dict[Tuple[str, bool], pygame.Surface] = {}
         self._sounds: Dict[str, pygame.mixer.Sound] = {}
+        self.card_faces = CardFaceCache(self)
 
     def image(self, filename: str, alpha: bool = True) -> pygame.Surface:
-        if filename not in self._images:
+        img = self._images.get((filename, alpha))
+        if img is None:
             path = os.path.join(MEDIA_DIR, filename)
-            if not os.path.exists(path):
+            img = self._shared.image(path, alpha=alpha)
+            if img is None:
                 raise FileNotFoundError(f"Immagine mancante: {path}")
-            img = pygame.image.load(path)
-            img = img.convert_alpha() if alpha else img.convert()
-            self._images[filename] = img
-        return self._images[filename]
+            self._images[(filename, alpha)] = img
+        return img
 
     def sound(self, filename: str) -> pygame.mixer.Sound:
-        if filename not in self._sounds:
+        snd = self._sounds.get(filename)
+        if snd is None:
             path = os.path.join(MEDIA_DIR, filename)
-            if not os.path.exists(path):
+            snd = self._shared.sound(path)
+            if snd is None:
                 raise FileNotFoundError(f"Suono mancante: {path}")
-            self._sounds[filename] = pygame.mixer.Sound(path)
-        return self._sounds[filename]
+            self._sounds[filename] = snd
+        return snd
+
+    def font(self, size: int) -> pygame.font.Font:
+        return self._shared.font(FONT_PATH, size)
 
 
 class Audio:
     """Gestione musica/effetti. Importante: stop totale quando si torna al menu."""
     def __init__(self, cache: AssetCache):
         self.cache = cache
+        # effetti pre-decodificati una volta sola sul mixer a voci limitate
+        self.sfx = SfxManager(num_voices=SFX_VOICES)
+        for filename, (prio, min_ms, max_voices) in SFX_RULES.items():
+            self.sfx.register(
+                filename,
+                [os.path.join(MEDIA_DIR, filename)],
+                priority=prio,
+                min_interval_ms=min_ms,
+                max_voices=max_voices,
+            )
 
     def stop_all(self) -> None:
+        self.sfx.stop_all()
         pygame.mixer.stop()
         pygame.mixer.music.stop()
 
@@ -197,111 +262,10 @@ class Audio:
         pygame.mixer.music.stop()
 
     def play_sfx(self, filename: str, volume: float = 1.0) -> None:
-        s = self.cache.sound(filename)
-        s.set_volume(volume)
-        s.play()
-
-
-# =========================
-# Dati carte
-# =========================
-@dataclass(frozen=True)
-class AbilityDef:
-    name: str
-    type: str       # NONE/ATTACK/HEAL/SHIELD/PROTECT/SPEED
-    targets: str    # NONE/ONE/ALL/SELF
-    point_per_target: int
-    notes: str
-
-
-@dataclass(frozen=True)
-class CardDef:
-    id: int
-    name: str
-    species: str
-    faction: str        # ERBIVORE/CARNIVORE
-    energy_type: str    # LEAVES/MEAT
-    hp: int
-    atk: int
-    image: str
-    ability: AbilityDef
-
-
-@dataclass
-class CardInstance:
-    base: CardDef
-    current_hp: int
-    is_leader: bool = False
-    speed_icon: bool = False
-    protect_active: bool = False
-
-    # stato turno
-    summoned_this_turn: bool = False
-    attacks_left: int = 1
-    ability_used_this_turn: bool = False
-
-    # buff (per step successivi)
-    shield_points: int = 0      # riduce danno, consumabile
-
-    # stato UI
-    selected: bool = False
-    atk: bool = False
-
-    def reset_hp(self) -> None:
-        self.current_hp = self.base.hp
-
-
-
-
-def load_cards_from_json(path: str) -> List[CardDef]:
-    with open(path, "r", encoding="utf-8") as f:
-        raw = json.load(f)
-
-    #  Supporto entrambi i formati:
-    # 1) lista diretta di carte: [ {...}, {...} ]
-    # 2) oggetto con chiave "cards": { "version": 1, "cards": [ {...}, ... ] }
-    if isinstance(raw, dict):
-        raw_cards = raw.get("cards", [])
-    else:
-        raw_cards = raw
-
-    if not isinstance(raw_cards, list):
-        raise ValueError(f"Formato JSON non valido: 'cards' non è una lista. Trovato: {type(raw_cards)}")
-
-    cards: List[CardDef] = []
-    for obj in raw_cards:
-        if not isinstance(obj, dict):
-            raise ValueError(f"Elemento carta non valido (atteso dict, trovato {type(obj)}): {obj}")
-
-        ab = obj.get("ability") or {}
-        if not isinstance(ab, dict):
-            raise ValueError(f"Campo 'ability' non valido per carta id={obj.get('id')}: {type(ab)}")
-
-        ability = AbilityDef(
-            name=str(ab.get("name", "")),
-            type=str(ab.get("type", "NONE")),
-            targets=str(ab.get("targets", "NONE")),
-            point_per_target=int(ab.get("point_per_target", 0)),
-            notes=str(ab.get("notes", "")),
-        )
-
-        cards.append(
-            CardDef(
-                id=int(obj["id"]),
-                name=str(obj.get("name", "")),
-                species=str(obj.get("species", "")),
-                faction=str(obj.get("faction", "")),
-                energy_type=str(obj.get("energy_type", "")),
-                hp=int(obj.get("hp", 1)),
-                atk=int(obj.get("atk", 0)),
-                image=str(obj.get("image", "")),
-                ability=ability,
-            )
-        )
-
-    cards.sort(key=lambda c: c.id)
-    return cards
-
+        if filename not in self.sfx.classes:
+            # effetto non previsto in SFX_RULES: lo registriamo al primo uso
+            self.sfx.register(filename, [self.cache.sound(filename)])
+        self.sfx.play(filename, volume=volume)
 
 
 # =========================
@@ -364,7 +328,7 @@ def draw_toast(surf: pygame.Surface, toast: Optional[Toast], font: pygame.font.F
     surf.blit(shadow, (r.x + 3, r.y + 3))
     surf.blit(txt, r.topleft)
 
-def hand_card_rects(hand: List[str], origin: Tuple[int, int]) -> List[pygame.Rect]:
+def hand_card_rects(hand: Sequence[int], origin: Tuple[int, int]) -> List[pygame.Rect]:
     x0, y0 = origin
     rects = []
     for i in range(len(hand)):
@@ -386,30 +350,11 @@ def hovered_field_index(mouse_pos: Tuple[int, int], rects: List[pygame.Rect]) ->
             return i
     return None
 
-def protected_indices(field: List[CardInstance]) -> List[int]:
-    return [i for i, inst in enumerate(field) if getattr(inst, "protect_active", False)]
-
-def is_attack_target_allowed(defender_field: List[CardInstance], target_idx: int) -> bool:
-    prot = protected_indices(defender_field)
-    if not prot:
-        return True  # nessun protect attivo -> si può colpire chiunque
-    return target_idx in prot
-
-
-def should_atk_for_attack(inst: CardInstance) -> bool:
-    return inst.attacks_left > 0 and (not inst.summoned_this_turn)
-
-def can_use_ability_now(inst: CardInstance) -> bool:
-    ab = inst.base.ability
-    if ab is None:
-        return False
-    if ab.type == "NONE" or ab.targets == "NONE":
-        return False
-    if inst.summoned_this_turn:
-        return False
-    if inst.ability_used_this_turn:
-        return False
-    return True
+def reset_user_card_flags(player: PlayerState) -> None:
+    """Stato UI delle carte utente a inizio turno: nessuna selezione, atk su chi può attaccare."""
+    for inst in player.field:
+        inst.selected = False
+        inst.atk = should_atk_for_attack(inst)
 
 
 def field_image_name(inst: CardInstance) -> str:
@@ -450,32 +395,29 @@ def hovered_hand_index(mouse_pos: Tuple[int, int], rects: List[pygame.Rect]) ->
             hit = i
     return hit
 
-def draw_one_card_with_animation(
+def animate_draw(
     scaler: Scaler,
     cache: AssetCache,
     audio: Audio,
     bg: pygame.Surface,
     deck_img: pygame.Surface,
-    player: PlayerState,
-    is_user: bool,
     fonts: Dict[str, pygame.font.Font],
     icon_user: pygame.Surface,
     icon_ai: pygame.Surface,
     #btns: Tuple[HoverButton, HoverButton, HoverButton],
     btns: Tuple[HoverButton, HoverButton],
-    other_player: PlayerState,
+    user_state: PlayerState,
+    ai_state: PlayerState,
+    token: int,
+    is_user: bool,
     clock: pygame.time.Clock,
+    reveal_ms: int = 2000,
 ) -> None:
-    if not player.deck or len(player.hand) >= 7:
-        return
-
-    #btn_abbandona, btn_completa, btn_skill = btns
-    btn_abbandona, btn_completa = btns
-    font_energy = fonts["energy"]
-    font_hp = fonts["hp"]
-    
-
-    token = player.deck.pop(0)
+    """
+    Carta pescata (già tolta dal mazzo, non ancora in mano):
+      - utente: deck->centro (300ms), poi reveal grande per reveal_ms
+      - AI: deck->slot libero della mano AI (300ms), sempre retro
+    """
     audio.play_sfx(SFX_FLIP, volume=0.9)
 
     if is_user:
@@ -483,62 +425,20 @@ def draw_one_card_with_animation(
         end = (LOGICAL_W // 2 - deck_img.get_width() // 2, LOGICAL_H // 2 - deck_img.get_height() // 2)
     else:
         start = POS_DECK_AI
-        slot_idx = len(player.hand)
+        slot_idx = len(ai_state.hand)
         end = (POS_HAND_AI[0] + slot_idx * HAND_STEP_X, POS_HAND_AI[1])
 
     mover = MovingSprite(deck_img, start, end, 300)
 
-    def render_base() -> pygame.Surface:
-        surf = scaler.begin()
-        surf.blit(bg, (0, 0))
-
-        # deck visibili se ancora carte
-        if other_player.deck_count() > 0:
-            surf.blit(deck_img, POS_DECK_USER if is_user else POS_DECK_AI)
-        if player.deck_count() > 0:
-            surf.blit(deck_img, POS_DECK_AI if is_user else POS_DECK_USER)
-        draw_deck_counts(
-            surf,
-            deck_img,
-            font_energy,
-            ai_count=(other_player.deck_count() if is_user else player.deck_count()),
-            user_count=(player.deck_count() if is_user else other_player.deck_count()),
-        )
-
-        # icone
-        surf.blit(icon_ai, POS_ENERGY_AI)
-        surf.blit(icon_user, POS_ENERGY_USER)
-
-        # energia
-        ai_energy_txt = font_energy.render(str(other_player.energy if is_user else player.energy), True, BIANCO)
-        user_energy_txt = font_energy.render(str(player.energy if is_user else other_player.energy), True, BIANCO)
-        surf.blit(ai_energy_txt, (133, 42))
-        surf.blit(user_energy_txt, (133, 987))
-
-        # bottoni
-        mouse_logical = scaler.to_logical_pos(pygame.mouse.get_pos())
-        btn_abbandona.update(mouse_logical)
-        btn_completa.update(mouse_logical)
-        #btn_skill.update(mouse_logical)
-        btn_abbandona.draw(surf)
-        btn_completa.draw(surf)
-        #btn_skill.draw(surf)
-
-        # campo
-        draw_field_row(surf, cache, other_player.field if is_user else player.field, POS_FIELD_AI, font_hp, use_states=False)
-        draw_field_row(surf, cache, player.field if is_user else other_player.field, POS_FIELD_USER, font_hp, use_states=True)
-
-        # mani
-        draw_hand_row(surf, cache, player.hand if is_user else other_player.hand, POS_HAND_USER, show_faces=True)
-        draw_hand_row(surf, cache, other_player.hand if is_user else player.hand, POS_HAND_AI, show_faces=False)
-        return surf
+    # tavolo statico: si ricompone da solo se il mazzo si svuota
+    layer = BoardLayer(scaler, cache, bg, deck_img, fonts, icon_user, icon_ai, btns, user_state, ai_state)
 
     # movimento
     while not mover.done:
         dt = clock.tick(60)
         _consume_quit_events()
         mover.update(dt)
-        surf = render_base()
+        surf = layer.draw()
         surf.blit(mover.image, mover.pos())
         scaler.present()
 
@@ -547,16 +447,14 @@ def draw_one_card_with_animation(
         reveal_img = token_to_big_image(cache, token)
         reveal_pos = (LOGICAL_W // 2 - reveal_img.get_width() // 2, LOGICAL_H // 2 - reveal_img.get_height() // 2)
         elapsed = 0
-        while elapsed < 2000:
+        while elapsed < reveal_ms:
             dt = clock.tick(60)
             _consume_quit_events()
             elapsed += dt
-            surf = render_base()
+            surf = layer.draw()
             surf.blit(reveal_img, reveal_pos)
             scaler.present()
 
-    player.hand.append(token)
-
 
 
 # =========================
@@ -617,12 +515,6 @@ def animate_normal_attack(
       - mostra colpo + suono (200ms)
       - torna indietro (300ms)
     """
-    #btn_abbandona, btn_completa, btn_skill = btns
-    btn_abbandona, btn_completa = btns
-
-    font_energy = fonts["energy"]
-    font_hp = fonts["hp"]
-
     hit_img = cache.image(ICON_HIT)
 
     # posizioni origine/bersaglio (topleft delle carte)
@@ -634,8 +526,9 @@ def animate_normal_attack(
     tx, ty = t0
     mid = (ax + int((tx - ax) * 0.5), ay + int((ty - ay) * 0.5))
 
+    # lo sprite è la faccia completa (HP e icone), e la carta manca dal suo slot mentre si muove
     attacker = user_state.field[attacker_idx]
-    attacker_img = cache.image(field_image_name(attacker))
+    attacker_img = cache.card_faces.field_face(attacker, fonts["hp"], use_states=True)
 
     # suono attacco in base alla fazione di chi attacca
     if attacker.base.faction == FACTION_CARN:
@@ -643,46 +536,10 @@ def animate_normal_attack(
     else:
         audio.play_sfx(SFX_HERB_ATTACK, volume=0.9)
 
-    def render_base() -> pygame.Surface:
-        surf = scaler.begin()
-        surf.blit(bg, (0, 0))
-
-        if ai_state.deck_count() > 0:
-            surf.blit(deck_img, POS_DECK_AI)
-        if user_state.deck_count() > 0:
-            surf.blit(deck_img, POS_DECK_USER)
-        draw_deck_counts(
-            surf,
-            deck_img,
-            font_energy,
-            ai_count=ai_state.deck_count(),
-            user_count=user_state.deck_count(),
-        )
-
-        surf.blit(icon_ai, POS_ENERGY_AI)
-        surf.blit(icon_user, POS_ENERGY_USER)
-
-        ai_energy_txt = font_energy.render(str(ai_state.energy), True, BIANCO)
-        user_energy_txt = font_energy.render(str(user_state.energy), True, BIANCO)
-        surf.blit(ai_energy_txt, (133, 42))
-        surf.blit(user_energy_txt, (133, 987))
-
-        mouse_logical = scaler.to_logical_pos(pygame.mouse.get_pos())
-        btn_abbandona.update(mouse_logical)
-        btn_completa.update(mouse_logical)
-        #btn_skill.update(mouse_logical)
-
-        btn_abbandona.draw(surf)
-        btn_completa.draw(surf)
-        #btn_skill.draw(surf)
-
-        draw_field_row(surf, cache, ai_state.field, POS_FIELD_AI, font_hp, use_states=False)
-        draw_field_row(surf, cache, user_state.field, POS_FIELD_USER, font_hp, use_states=True)
-
-        draw_hand_row(surf, cache, user_state.hand, POS_HAND_USER, show_faces=True)
-        draw_hand_row(surf, cache, ai_state.hand, POS_HAND_AI, show_faces=False)
-
-        return surf
+    layer = BoardLayer(
+        scaler, cache, bg, deck_img, fonts, icon_user, icon_ai, btns, user_state, ai_state,
+        exclude=(False, attacker_idx),
+    )
 
     # 1) avanti
     mover1 = MovingSprite(attacker_img, a0, mid, 300)
@@ -690,7 +547,7 @@ def animate_normal_attack(
         dt = clock.tick(60)
         _consume_quit_events()
         mover1.update(dt)
-        surf = render_base()
+        surf = layer.draw()
         surf.blit(attacker_img, mover1.pos())
         scaler.present()
 
@@ -703,7 +560,7 @@ def animate_normal_attack(
         dt = clock.tick(60)
         _consume_quit_events()
         elapsed += dt
-        surf = render_base()
+        surf = layer.draw()
         surf.blit(attacker_img, mid)
         surf.blit(hit_img, hit_center)
         scaler.present()
@@ -714,7 +571,7 @@ def animate_normal_attack(
         dt = clock.tick(60)
         _consume_quit_events()
         mover2.update(dt)
-        surf = render_base()
+        surf = layer.draw()
         surf.blit(attacker_img, mover2.pos())
         scaler.present()
 
@@ -741,11 +598,6 @@ def animate_normal_attack_ai(
       - mostra colpo + suono (200ms)
       - torna indietro (300ms)
     """
-    #btn_abbandona, btn_completa, btn_skill = btns
-    btn_abbandona, btn_completa = btns
-    font_energy = fonts["energy"]
-    font_hp = fonts["hp"]
-
     hit_img = cache.image(ICON_HIT)
 
     a0 = (POS_FIELD_AI[0] + attacker_idx * FIELD_CARD_W, POS_FIELD_AI[1])
@@ -756,7 +608,7 @@ def animate_normal_attack_ai(
     mid = (ax + int((tx - ax) * 0.5), ay + int((ty - ay) * 0.5))
 
     attacker = ai_state.field[attacker_idx]
-    attacker_img = cache.image(field_image_name(attacker))
+    attacker_img = cache.card_faces.field_face(attacker, fonts["hp"], use_states=False)
 
     # suono attacco in base alla fazione
     if attacker.base.faction == FACTION_CARN:
@@ -764,46 +616,10 @@ def animate_normal_attack_ai(
     else:
         audio.play_sfx(SFX_HERB_ATTACK, volume=0.9)
 
-    def render_base() -> pygame.Surface:
-        surf = scaler.begin()
-        surf.blit(bg, (0, 0))
-
-        if ai_state.deck_count() > 0:
-            surf.blit(deck_img, POS_DECK_AI)
-        if user_state.deck_count() > 0:
-            surf.blit(deck_img, POS_DECK_USER)
-        draw_deck_counts(
-            surf,
-            deck_img,
-            font_energy,
-            ai_count=ai_state.deck_count(),
-            user_count=user_state.deck_count(),
-        )
-
-        surf.blit(icon_ai, POS_ENERGY_AI)
-        surf.blit(icon_user, POS_ENERGY_USER)
-
-        ai_energy_txt = font_energy.render(str(ai_state.energy), True, BIANCO)
-        user_energy_txt = font_energy.render(str(user_state.energy), True, BIANCO)
-        surf.blit(ai_energy_txt, (133, 42))
-        surf.blit(user_energy_txt, (133, 987))
-
-        mouse_logical = scaler.to_logical_pos(pygame.mouse.get_pos())
-        btn_abbandona.update(mouse_logical)
-        btn_completa.update(mouse_logical)
-        #btn_skill.update(mouse_logical)
-
-        btn_abbandona.draw(surf)
-        btn_completa.draw(surf)
-        #btn_skill.draw(surf)
-
-        draw_field_row(surf, cache, ai_state.field, POS_FIELD_AI, font_hp, use_states=False)
-        draw_field_row(surf, cache, user_state.field, POS_FIELD_USER, font_hp, use_states=True)
-
-        draw_hand_row(surf, cache, user_state.hand, POS_HAND_USER, show_faces=True)
-        draw_hand_row(surf, cache, ai_state.hand, POS_HAND_AI, show_faces=False)
-
-        return surf
+    layer = BoardLayer(
+        scaler, cache, bg, deck_img, fonts, icon_user, icon_ai, btns, user_state, ai_state,
+        exclude=(True, attacker_idx),
+    )
 
     # avanti
     mover1 = MovingSprite(attacker_img, a0, mid, 300)
@@ -811,7 +627,7 @@ def animate_normal_attack_ai(
         dt = clock.tick(60)
         _consume_quit_events()
         mover1.update(dt)
-        surf = render_base()
+        surf = layer.draw()
         surf.blit(attacker_img, mover1.pos())
         scaler.present()
 
@@ -826,7 +642,7 @@ def animate_normal_attack_ai(
         dt = clock.tick(60)
         _consume_quit_events()
         elapsed += dt
-        surf = render_base()
+        surf = layer.draw()
         surf.blit(attacker_img, mid)
         surf.blit(hit_img, hit_center)
         scaler.present()
@@ -837,7 +653,7 @@ def animate_normal_attack_ai(
         dt = clock.tick(60)
         _consume_quit_events()
         mover2.update(dt)
-        surf = render_base()
+        surf = layer.draw()
         surf.blit(attacker_img, mover2.pos())
         scaler.present()
 
@@ -865,10 +681,6 @@ def animate_skill_hit(
     ms: int = 200,
 ) -> None:
     """Animazione semplice per abilità ATTACK: icona colpo sul bersaglio + render per ms."""
-    #btn_abbandona, btn_completa, btn_skill = btns
-    btn_abbandona, btn_completa = btns
-    font_energy = fonts["energy"]
-    font_hp = fonts["hp"]
     hit_img = cache.image(ICON_HIT)
 
     origin = POS_FIELD_AI if target_is_ai else POS_FIELD_USER
@@ -879,52 +691,14 @@ def animate_skill_hit(
         t0[1] + FIELD_CARD_H // 2 - hit_img.get_height() // 2,
     )
 
-    def render_base() -> pygame.Surface:
-        surf = scaler.begin()
-        surf.blit(bg, (0, 0))
-
-        if ai_state.deck_count() > 0:
-            surf.blit(deck_img, POS_DECK_AI)
-        if user_state.deck_count() > 0:
-            surf.blit(deck_img, POS_DECK_USER)
-        draw_deck_counts(
-            surf,
-            deck_img,
-            font_energy,
-            ai_count=ai_state.deck_count(),
-            user_count=user_state.deck_count(),
-        )
-
-        surf.blit(icon_ai, POS_ENERGY_AI)
-        surf.blit(icon_user, POS_ENERGY_USER)
-
-        ai_energy_txt = font_energy.render(str(ai_state.energy), True, BIANCO)
-        user_energy_txt = font_energy.render(str(user_state.energy), True, BIANCO)
-        surf.blit(ai_energy_txt, (133, 42))
-        surf.blit(user_energy_txt, (133, 987))
-
-        mouse_logical = scaler.to_logical_pos(pygame.mouse.get_pos())
-        btn_abbandona.update(mouse_logical)
-        btn_completa.update(mouse_logical)
-        #btn_skill.update(mouse_logical)
-
-        btn_abbandona.draw(surf)
-        btn_completa.draw(surf)
-        #btn_skill.draw(surf)
-
-        draw_field_row(surf, cache, ai_state.field, POS_FIELD_AI, font_hp, use_states=False)
-        draw_field_row(surf, cache, user_state.field, POS_FIELD_USER, font_hp, use_states=True)
-
-        draw_hand_row(surf, cache, user_state.hand, POS_HAND_USER, show_faces=True)
-        draw_hand_row(surf, cache, ai_state.hand, POS_HAND_AI, show_faces=False)
-        return surf
+    layer = BoardLayer(scaler, cache, bg, deck_img, fonts, icon_user, icon_ai, btns, user_state, ai_state)
 
     elapsed = 0
     while elapsed < ms:
         dt = clock.tick(60)
         _consume_quit_events()
         elapsed += dt
-        surf = render_base()
+        surf = layer.draw()
         surf.blit(hit_img, hit_pos)
         scaler.present()
 
@@ -952,54 +726,13 @@ def animate_heal_icon(
     - durata: ms millisecondi
     """
 
-    def render_base() -> pygame.Surface:
-        btn_abbandona, btn_completa = btns
-        font_energy = fonts["energy"]
-        font_hp = fonts["hp"]
-
-        surf = scaler.begin()
-        surf.blit(bg, (0, 0))
-
-        if ai_state.deck_count() > 0:
-            surf.blit(deck_img, POS_DECK_AI)
-        if user_state.deck_count() > 0:
-            surf.blit(deck_img, POS_DECK_USER)
-        draw_deck_counts(
-            surf,
-            deck_img,
-            font_energy,
-            ai_count=ai_state.deck_count(),
-            user_count=user_state.deck_count(),
-        )
-
-        surf.blit(icon_ai, POS_ENERGY_AI)
-        surf.blit(icon_user, POS_ENERGY_USER)
-
-        ai_energy_txt = font_energy.render(str(ai_state.energy), True, BIANCO)
-        user_energy_txt = font_energy.render(str(user_state.energy), True, BIANCO)
-        surf.blit(ai_energy_txt, (133, 42))
-        surf.blit(user_energy_txt, (133, 987))
-
-        mouse_logical = scaler.to_logical_pos(pygame.mouse.get_pos())
-        btn_abbandona.update(mouse_logical)
-        btn_completa.update(mouse_logical)
-
-        btn_abbandona.draw(surf)
-        btn_completa.draw(surf)
-
-        draw_field_row(surf, cache, ai_state.field, POS_FIELD_AI, font_hp, use_states=False)
-        draw_field_row(surf, cache, user_state.field, POS_FIELD_USER, font_hp, use_states=True)
-
-        draw_hand_row(surf, cache, user_state.hand, POS_HAND_USER, show_faces=True)
-        draw_hand_row(surf, cache, ai_state.hand, POS_HAND_AI, show_faces=False)
-
-        return surf
+    layer = BoardLayer(scaler, cache, bg, deck_img, fonts, icon_user, icon_ai, btns, user_state, ai_state)
 
     
     # Disegna base
     elapsed = 0
     while elapsed < ms:
-        surf = render_base()
+        surf = layer.draw()
 
         if target_is_ai:
             rects = field_card_rects(ai_state.field, POS_FIELD_AI)
@@ -1017,562 +750,103 @@ def animate_heal_icon(
 
 
 
-def apply_normal_attack_damage(attacker: CardInstance, target: CardInstance) -> bool:
+class MatchAnimator:
     """
-    Ritorna True se il target muore (HP < 1).
-    Danno base = attacker.atk, ridotto da shield_points (consumandolo).
+    on_event per le regole (game_09_rules): per ogni evento suona l'effetto e gioca l'animazione,
+    con la partita ancora nello stato di quell'istante (ATTACK/HIT prima del danno, DRAW prima che
+    la carta arrivi in mano). Gli eventi senza animazione vengono ignorati.
     """
-    dmg = max(0, int(attacker.base.atk))
-
-    if target.shield_points > 0 and dmg > 0:
-        used = min(dmg, target.shield_points)
-        target.shield_points -= used
-        dmg -= used
-
-    if dmg > 0:
-        target.current_hp -= dmg
-
-    return target.current_hp < 1
-
-
-def ability_cost(ability: AbilityDef, n_targets: int) -> int:
-    """Costo energia abilità (regola aggiornata):
-    - targets == ALL  -> 2 energie (costo fisso)
-    - tutti gli altri targets validi -> 1 energia (costo fisso)
-    - type/targets NONE -> 0
-    NB: point_per_target NON è il costo: è il valore dell'effetto per bersaglio.
-    """
-    a_type = str(getattr(ability, "type", "NONE")).upper()
-    a_tgt = str(getattr(ability, "targets", "NONE")).upper()
-
-    if a_type == "NONE" or a_tgt == "NONE":
-        return 0
-    return 2 if a_tgt == "ALL" else 1
-
-
-def can_cast_ability(caster: CardInstance) -> Tuple[bool, str]:
-    """Checks basic constraints for casting an ability."""
-    if caster.summoned_this_turn:
-        return False, "Non puoi usare abilità nel turno in cui la carta è stata messa in campo"
-    if caster.ability_used_this_turn:
-        return False, "Abilità già usata in questo turno"
-    if caster.base.ability.type in ("", "NONE"):
-        return False, "Questa carta non ha un'abilità"
-    return True, ""
-
-
-def apply_heal(targets: List[CardInstance], points: int) -> None:
-    for t in targets:
-        t.current_hp = min(t.base.hp, t.current_hp + max(0, points))
-
-
-def apply_speed(targets: List[CardInstance], points: int) -> None:
-    # Interpretazione: aggiunge attacchi extra nel turno corrente.
-    for t in targets:
-        t.attacks_left += max(0, points)
-        t.speed_icon = True
-
-
-def apply_shield(targets: List[CardInstance], points: int) -> None:
-    """Aggiunge punti scudo consumabili (riduzione danno) ai target."""
-    add = max(0, int(points))
-    if add <= 0:
-        return
-    for t in targets:
-        t.shield_points += add
-
-
-def apply_ability_attack_damage(points: int, target: CardInstance) -> bool:
-    """Return True if target dies."""
-    dmg = max(0, int(points))
-    if target.shield_points > 0 and dmg > 0:
-        used = min(dmg, target.shield_points)
-        target.shield_points -= used
-        dmg -= used
-    if dmg > 0:
-        target.current_hp -= dmg
-    return target.current_hp < 1
-
-
-def resolve_ability(
-    scaler: Scaler,
-    cache: AssetCache,
-    audio: Audio,
-    bg: pygame.Surface,
-    deck_img: pygame.Surface,
-    fonts: Dict[str, pygame.font.Font],
-    icon_user: pygame.Surface,
-    icon_ai: pygame.Surface,
-    #btns: Tuple[HoverButton, HoverButton, HoverButton],
-    btns: Tuple[HoverButton, HoverButton],
-    caster_state: PlayerState,
-    other_state: PlayerState,
-    caster_idx: int,
-    targets_idx: Optional[List[int]],
-    caster_is_user: bool,
-    clock: pygame.time.Clock,
-) -> Tuple[bool, Optional[str]]:
-    """
-    Applica l'abilità del caster.
-
-    Regole:
-      - point_per_target è l'effetto per bersaglio (danno/cura/scudo/attacchi extra)
-      - costo energia: ALL=2, altri=1
-      - ATTACK colpisce sempre avversario; HEAL/SPEED/SHIELD colpiscono sempre alleati
-    Ritorna (applied, toast_msg_or_None). Se applied=False e msg!=None, mostra toast.
-    """
-    caster = caster_state.field[caster_idx]
-    ok, msg = can_cast_ability(caster)
-    if not ok:
-        return False, msg
-
-    ability = caster.base.ability
-    a_type = ability.type.upper()
-    a_targets = ability.targets.upper()
-
-    # --- risoluzione target ---
-    target_state: PlayerState
-    idxs: List[int]
-
-    if a_type == "ATTACK":
-        target_state = other_state
-    else:
-        target_state = caster_state
-
-    if a_targets == "SELF":
-        target_state = caster_state
-        idxs = [caster_idx]
-    elif a_targets == "ALL":
-        idxs = list(range(len(target_state.field)))
-    elif a_targets == "ONE":
-        if not targets_idx or len(targets_idx) != 1:
-            return False, "Seleziona un bersaglio"
-        idxs = targets_idx
-        if idxs[0] < 0 or idxs[0] >= len(target_state.field):
-            return False, "Bersaglio non valido"
-    else:
-        return False, "Abilità non valida"
-
-    target_cards = [target_state.field[i] for i in idxs if 0 <= i < len(target_state.field)]
-
-    # --- costo energia ---
-    cost = ability_cost(ability, len(target_cards))
-    if caster_state.energy < cost:
-        return False, "Energia insufficiente"
-
-    caster_state.energy -= cost
-    caster.ability_used_this_turn = True
-
-    points = int(ability.point_per_target)
-
-    # --- applica effetto ---
-    if a_type == "HEAL":
-        # salva HP prima
-        before_hps = [t.current_hp for t in target_cards]
-
-        # applica cura
-        apply_heal(target_cards, points)
+    def __init__(
+        self,
+        scaler: Scaler,
+        cache: AssetCache,
+        audio: Audio,
+        bg: pygame.Surface,
+        deck_img: pygame.Surface,
+        fonts: Dict[str, pygame.font.Font],
+        icon_user: pygame.Surface,
+        icon_ai: pygame.Surface,
+        btns: Tuple[HoverButton, HoverButton],
+        match: MatchState,
+        clock: pygame.time.Clock,
+    ):
+        self.scaler = scaler
+        self.cache = cache
+        self.audio = audio
+        self.bg = bg
+        self.deck_img = deck_img
+        self.fonts = fonts
+        self.icon_user = icon_user
+        self.icon_ai = icon_ai
+        self.btns = btns
+        self.match = match
+        self.clock = clock
+        self.reveal_ms = 2000   # reveal grande delle carte pescate dall'utente
+
+    def __call__(self, ev: Event) -> None:
+        match = self.match
+        board = dict(
+            scaler=self.scaler,
+            cache=self.cache,
+            bg=self.bg,
+            deck_img=self.deck_img,
+            fonts=self.fonts,
+            icon_user=self.icon_user,
+            icon_ai=self.icon_ai,
+            btns=self.btns,
+            user_state=match.user,
+            ai_state=match.ai,
+            clock=self.clock,
+        )
 
-        # mostra icona cura SOLO dove gli HP sono aumentati
-        for i, t in enumerate(target_cards):
-            if t.current_hp > before_hps[i]:
-                # idxs è la lista degli indici di campo corrispondenti a target_cards
-                animate_heal_icon(
-                    scaler=scaler,
-                    cache=cache,
-                    bg=bg,
-                    deck_img=deck_img,
-                    fonts=fonts,
-                    icon_user=icon_user,
-                    icon_ai=icon_ai,
-                    btns=btns,  # oppure la tua tupla reale
-                    user_state=caster_state,
-                    ai_state=other_state,
-                    target_is_ai=False,     # HEAL cura sempre alleati (campo caster)
-                    target_idx=idxs[i],     # IMPORTANTISSIMO: indice nel field
-                    clock=clock,
-                    ms=200,
-                )
+        if ev.kind == EV_DRAW:
+            animate_draw(audio=self.audio, token=ev.token, is_user=(ev.side == USER), reveal_ms=self.reveal_ms, **board)
 
-    elif a_type == "SPEED":
-        apply_speed(target_cards, points)
-        # aggiorna atk del giocatore che sta lanciando, se è l'utente
-        if caster_is_user:
-            for inst in caster_state.field:
-                if not inst.selected:
-                    inst.atk = should_atk_for_attack(inst)
+        elif ev.kind == EV_SUMMON:
+            # suono down coerente con fazione della carta
+            inst = match.players[ev.side].field[ev.idx]
+            if inst.base.faction == FACTION_CARN:
+                self.audio.play_sfx(SFX_CARN_DOWN, volume=0.9)
+            else:
+                self.audio.play_sfx(SFX_HERB_DOWN, volume=0.9)
 
-    elif a_type == "SHIELD":
-        apply_shield(target_cards, points)
-
-    elif a_type == "PROTECT":
-        # applica protect ai target (di norma SELF o ALL, ma lo gestiamo genericamente)
-        for t in target_cards:
-            t.protect_active = True
-        
-
-    elif a_type == "ATTACK":
-
-        # ===== ENFORCE PROTECT (QUI!) =====
-        prot = [i for i, inst in enumerate(target_state.field) if getattr(inst, "protect_active", False)]
-        if prot:
-            if a_targets == "ONE":
-                # idxs deve contenere esattamente 1 indice (già garantito sopra)
-                if idxs[0] not in prot:
-                    return False, "Devi attaccare un dinosauro protetto"
-            elif a_targets == "ALL":
-                # con ALL colpisci solo i protetti
-                idxs = [i for i in idxs if i in prot]
-                target_cards = [target_state.field[i] for i in idxs]
-
-        # Animazione semplice: icona colpo + suono.
-        # Se targets=ALL: sequenza una dopo l'altra (non insieme).
-        render_user_state = caster_state if caster_is_user else other_state
-        render_ai_state = other_state if caster_is_user else caster_state
-
-        # se caster è utente, i target sono AI (alto); altrimenti target sono USER (basso)
-        target_is_ai = caster_is_user
-
-        # snapshot per iterare in sicurezza anche se si rimuovono carte
-        targets_snapshot = list(target_cards)
-
-        for target_obj in targets_snapshot:
-            # trova indice corrente (può cambiare per rimozioni)
-            current_idx = None
-            for j, inst in enumerate(target_state.field):
-                if inst is target_obj:
-                    current_idx = j
-                    break
-            if current_idx is None:
-                continue
+        elif ev.kind == EV_ATTACK:
+            if ev.side == USER:
+                animate_normal_attack(audio=self.audio, attacker_idx=ev.src, target_idx=ev.idx, **board)
+            else:
+                pygame.time.delay(120)  # micro pausa tra gli attacchi AI
+                animate_normal_attack_ai(audio=self.audio, attacker_idx=ev.src, target_idx=ev.idx, **board)
 
-            # suono colpo
+        elif ev.kind == EV_HIT:
+            # suono colpo in base alla fazione di chi lancia l'abilità
+            caster = match.players[1 - ev.side].field[ev.src]
             if caster.base.faction == FACTION_CARN:
-                audio.play_sfx(SFX_CARN_ATTACK, volume=0.9)
+                self.audio.play_sfx(SFX_CARN_ATTACK, volume=0.9)
             else:
-                audio.play_sfx(SFX_HERB_ATTACK, volume=0.9)
-
-            # animazione icona colpo sul bersaglio
-            animate_skill_hit(
-                scaler=scaler,
-                cache=cache,
-                audio=audio,
-                bg=bg,
-                deck_img=deck_img,
-                fonts=fonts,
-                icon_user=icon_user,
-                icon_ai=icon_ai,
-                btns=btns,
-                user_state=render_user_state,
-                ai_state=render_ai_state,
-                target_is_ai=target_is_ai,
-                target_idx=current_idx,
-                clock=clock,
-                ms=200,
-            )
-
-            # applica danno (con consumo shield se presente)
-            died = apply_ability_attack_damage(points, target_state.field[current_idx])
-
-            if died:
-                audio.play_sfx(SFX_DEAD, volume=0.9)
-                pygame.time.delay(120)
-                target_state.field.pop(current_idx)
-
-                # game over check (energie non contano)
-                res = check_and_handle_game_over(
-                    scaler=scaler, cache=cache, audio=audio, fonts=fonts,
-                    user_state=render_user_state, ai_state=render_ai_state, clock=clock
-                )
-                if res is not None:
-                    return True, "MENU"
-
-    else:
-        return False, "Abilità non supportata"
-
-    return True, None
-
-
-def is_energy_token(token: str) -> bool:
-    return token.startswith("E:")
-
-def is_dino_token(token: str) -> bool:
-    return token.startswith("DINO:")
-
-def token_dino_id(token: str) -> int:
-    return int(token.split(":")[1])
-
-def is_player_out_of_moves(p: PlayerState) -> bool:
-    if len(p.field) > 0:
-        return False
-    has_dino_in_hand = any(t.startswith("DINO:") for t in p.hand)
-    has_dino_in_deck = any(t.startswith("DINO:") for t in p.deck)
-    return not (has_dino_in_hand or has_dino_in_deck)
-
-def check_and_handle_game_over(
-    scaler: Scaler,
-    cache: AssetCache,
-    audio: Audio,
-    fonts: Dict[str, pygame.font.Font],
-    user_state: PlayerState,
-    ai_state: PlayerState,
-    clock: pygame.time.Clock,
-) -> Optional[str]:
-    """
-    Ritorna:
-      - "USER_WON" se AI out-of-moves
-      - "USER_LOST" se USER out-of-moves
-      - None se si continua
-    """
-    if is_player_out_of_moves(ai_state):
-        end_screen(scaler, cache, audio, fonts, won=True, clock=clock)
-        return "USER_WON"
-    if is_player_out_of_moves(user_state):
-        end_screen(scaler, cache, audio, fonts, won=False, clock=clock)
-        return "USER_LOST"
-    return None
-
-def ai_play_cards(
-    audio: Audio,
-    ai_state: PlayerState,
-    def_by_id: Dict[int, CardDef],
-) -> None:
-    """
-    Strategia semplice (coerente con la tua logica attuale):
-      1) gioca fino a 2 energie (se in mano) -> aumenta ai_state.energy
-      2) evoca dinosauri finché:
-            - campo < 6
-            - ha dinos in mano
-    NOTA: evocare dinosauri NON consuma energia (energia serve solo per abilità).
-    """
-    # 1) energie max 2
-    while ai_state.energy_played_this_turn < 2:
-        idx = next((i for i, t in enumerate(ai_state.hand) if t.startswith("E:")), None)
-        if idx is None:
-            break
-        ai_state.hand.pop(idx)
-        ai_state.energy += 1
-        ai_state.energy_played_this_turn += 1
-
-    # 2) evoca AL MASSIMO 1 dinosauro per turno
-    if ai_state.dinos_played_this_turn >= 1:
-        return
-
-    if len(ai_state.field) >= 6:
-        return
-
-    dino_idx = next((i for i, t in enumerate(ai_state.hand) if t.startswith("DINO:")), None)
-    if dino_idx is None:
-        return
-
-    token = ai_state.hand.pop(dino_idx)
-    cid = int(token.split(":")[1])
-
-    inst = CardInstance(base=def_by_id[cid], current_hp=def_by_id[cid].hp)
-    inst.summoned_this_turn = True
-    inst.attacks_left = 0
-    inst.ability_used_this_turn = True
-    ai_state.field.append(inst)
-
-    ai_state.dinos_played_this_turn += 1  # ✅ conta il dinos giocato
-
-    # suono down coerente con fazione
-    if inst.base.faction == FACTION_CARN:
-        audio.play_sfx(SFX_CARN_DOWN, volume=0.9)
-    else:
-        audio.play_sfx(SFX_HERB_DOWN, volume=0.9)
+                self.audio.play_sfx(SFX_HERB_ATTACK, volume=0.9)
+            animate_skill_hit(audio=self.audio, target_is_ai=(ev.side == AI), target_idx=ev.idx, ms=200, **board)
 
-def ai_take_turn_normal_attack(
-    scaler: Scaler,
-    cache: AssetCache,
-    audio: Audio,
-    bg: pygame.Surface,
-    deck_img: pygame.Surface,
-    fonts: Dict[str, pygame.font.Font],
-    icon_user: pygame.Surface,
-    icon_ai: pygame.Surface,
-    btns: Tuple[HoverButton, HoverButton],
-    user_state: PlayerState,
-    ai_state: PlayerState,
-    clock: pygame.time.Clock,
-) -> bool:
-    """
-    Turno AI: esegue tutti gli attacchi normali possibili (uno per ogni dinosauro con attacks_left>0
-    e non evocato in questo turno). Ritorna True se la partita termina.
-    """
+        elif ev.kind == EV_HEAL:
+            animate_heal_icon(target_is_ai=(ev.side == AI), target_idx=ev.idx, ms=200, **board)
 
-    # Helper: indici protetti nel campo difensore
-    def protected_indices(field):
-        return [i for i, inst in enumerate(field) if getattr(inst, "protect_active", False)]
-
-    def pick_target_index() -> Optional[int]:
-        # Se ci sono protetti, target SOLO tra i protetti
-        prot = protected_indices(user_state.field)
-        candidate_idxs = prot if prot else list(range(len(user_state.field)))
-
-        # Filtra target validi (es. se vuoi evitare leader finché ci sono altri)
-        # Se non ti serve la regola sul leader, puoi togliere il filtro.
-        non_leader = [idx for idx in candidate_idxs if not getattr(user_state.field[idx], "is_leader", False)]
-        if non_leader:
-            return non_leader[0]  # semplice: primo valido
-        if candidate_idxs:
-            return candidate_idxs[0]
-        return None
-
-    # Attaccanti AI in ordine (per tutti quelli che possono ancora attaccare)
-    for attacker_idx, attacker in list(enumerate(ai_state.field)):
-        if attacker_idx >= len(ai_state.field):
-            break  # campo modificato (morti) -> safety
-
-        attacker = ai_state.field[attacker_idx]
-        can_attack = (attacker.attacks_left > 0 and not attacker.summoned_this_turn)
-        if not can_attack:
-            continue
-
-        # Se non ci sono target, termina (utente "annientato" lato campo)
-        if not user_state.field:
-            return True
-
-        # scegli bersaglio rispettando PROTECT
-        target_idx = pick_target_index()
-        if target_idx is None or target_idx >= len(user_state.field):
-            return True
-
-        # animazione attacco AI (se la tua firma differisce, adatta parametri)
-        animate_normal_attack_ai(
-            scaler=scaler,
-            cache=cache,
-            audio=audio,
-            bg=bg,
-            deck_img=deck_img,
-            fonts=fonts,
-            icon_user=icon_user,
-            icon_ai=icon_ai,
-            btns=btns,
-            user_state=user_state,
-            ai_state=ai_state,
-            attacker_idx=attacker_idx,
-            target_idx=target_idx,
-            clock=clock,
-        )
-
-        target = user_state.field[target_idx]
-        died = apply_normal_attack_damage(attacker, target)
-
-        if died:
-            audio.play_sfx(SFX_DEAD, volume=0.9)
+        elif ev.kind == EV_DEATH:
+            self.audio.play_sfx(SFX_DEAD, volume=0.9)
             pygame.time.delay(120)
-            user_state.field.pop(target_idx)
-
-            res = check_and_handle_game_over(
-                scaler=scaler, cache=cache, audio=audio, fonts=fonts,
-                user_state=user_state, ai_state=ai_state, clock=clock
-            )
-            if res is not None:
-                return True
-
-        attacker.attacks_left = max(0, attacker.attacks_left - 1)
-
-        # Se hai un flag visivo tipo atk/glow per l'AI, in genere non serve, ma se lo usi:
-        if hasattr(attacker, "atk"):
-            attacker.atk = should_atk_for_attack(attacker)
-
-        # micro pausa tra attacchi (opzionale)
-        pygame.time.delay(120)
-
-    return False
-
-
-
-##def ai_take_turn_normal_attack(
-##    scaler: Scaler,
-##    cache: AssetCache,
-##    audio: Audio,
-##    bg: pygame.Surface,
-##    deck_img: pygame.Surface,
-##    fonts: Dict[str, pygame.font.Font],
-##    icon_user: pygame.Surface,
-##    icon_ai: pygame.Surface,
-##    #btns: Tuple[HoverButton, HoverButton, HoverButton],
-##    btns: Tuple[HoverButton, HoverButton],
-##    user_state: PlayerState,
-##    ai_state: PlayerState,
-##    clock: pygame.time.Clock,
-##) -> bool:
-##    """Ritorna True se la partita termina durante gli attacchi."""
-##    """
-##    AI: attacca con TUTTI gli attaccanti validi (in ordine da sinistra a destra).
-##    Target: preferisce non-leader con HP più bassi, altrimenti leader.
-##    """
-##    while True:
-##        # trova prossimo attaccante valido
-##        attacker_idx = None
-##        for i, inst in enumerate(ai_state.field):
-##            if inst.attacks_left > 0 and not inst.summoned_this_turn:
-##                attacker_idx = i
-##                break
-##        if attacker_idx is None:
-##            return  # nessun altro attacco
-##
-##        if not user_state.field:
-##            return
-##
-##        prot = protected_indices(user_state.field)
-##        candidate_targets = prot if prot else list(range(len(user_state.field)))
-##        # poi scegli da candidate_targets (la tua logica attuale)
-##
-##        # scegli target
-##        candidates = [(i, c) for i, c in enumerate(candidate_targets) if not c.is_leader]
-##        if candidates:
-##            target_idx = min(candidates, key=lambda x: x[1].current_hp)[0]
-##        else:
-##            target_idx = 0
-##
-##        attacker = ai_state.field[attacker_idx]
-##        target = user_state.field[target_idx]
-##
-##        # animazione
-##        animate_normal_attack_ai(
-##            scaler=scaler,
-##            cache=cache,
-##            audio=audio,
-##            bg=bg,
-##            deck_img=deck_img,
-##            fonts=fonts,
-##            icon_user=icon_user,
-##            icon_ai=icon_ai,
-##            btns=btns,
-##            user_state=user_state,
-##            ai_state=ai_state,
-##            attacker_idx=attacker_idx,
-##            target_idx=target_idx,
-##            clock=clock,
-##        )
-##
-##        # danno
-##        died = apply_normal_attack_damage(attacker, target)
-##
-##        if died:
-##            audio.play_sfx(SFX_DEAD, volume=0.9)
-##            pygame.time.delay(120)
-##            user_state.field.pop(target_idx)
-##            # game over check
-##            if is_player_out_of_moves(user_state):
-##                end_screen(scaler, cache, audio, fonts, won=False, clock=clock)
-##                return True
-##
-##
-##        attacker.attacks_left = max(0, attacker.attacks_left - 1)
-##        attacker.selected = False
-##        attacker.atk = (attacker.attacks_left > 0 and not attacker.summoned_this_turn)
-##        return False
 
+        elif ev.kind == EV_GAME_OVER:
+            end_screen(self.scaler, self.cache, self.audio, self.fonts, won=(ev.side == USER), clock=self.clock)
 
 
 
 # =========================
 # Rendering HP sulle carte in campo
 # =========================
+CARD_FACE_CACHE_MAX = 256
+
+# numeri (HP, scudi, contatori mazzo): pochi valori che tornano a ogni frame
+GLYPHS = GlyphCache()
+
+
 def draw_card_hp_on_field(
     card_img: pygame.Surface,
     hp_current: int,
@@ -1582,8 +856,8 @@ def draw_card_hp_on_field(
     surf = card_img.copy()
 
     color = BIANCO if hp_current == hp_max else GIALLO
-    txt = font.render(str(hp_current), True, color)
-    shadow = font.render(str(hp_current), True, NERO)
+    txt = GLYPHS.render(font, str(hp_current), color)
+    shadow = GLYPHS.render(font, str(hp_current), NERO)
 
     # 🎯 coordinate RELATIVE ALLA CARTA
     x, y = 179, 22
@@ -1595,54 +869,68 @@ def draw_card_hp_on_field(
     return surf
 
 
-# =========================
-# Stato partita (solo setup iniziale per ora)
-# =========================
-@dataclass
-class PlayerState:
-    faction: str
-    energy_type: str
-    leader: CardInstance
-    deck: List[str]          # "DINO:<id>" oppure "E:LEAVES"/"E:MEAT"
-    hand: List[str]          # stesso encoding del deck
-    field: List[CardInstance]
-    energy: int = 0
-    energy_played_this_turn: int = 0
-    dinos_played_this_turn: int = 0
-
-
-    def deck_count(self) -> int:
-        return len(self.deck)
-
-    def hand_count(self) -> int:
-        return len(self.hand)
-
-
-def build_deck_for_faction(
-    all_cards: List[CardDef],
-    faction: str,
-    leader_id: int,
-) -> List[str]:
-    dinos = [c for c in all_cards if c.faction == faction and c.id != leader_id]
-    if not dinos:
-        raise ValueError(f"Nessun dinosauro disponibile per fazione {faction}")
-
-    picked = [random.choice(dinos).id for _ in range(10)]  # 10 dinos (anche duplicati)
-    energy_type = dinos[0].energy_type  # coerente con fazione (da JSON)
-    energy_token = f"E:{energy_type}"
+class CardFaceCache:
+    """
+    Facce delle carte in campo già composte: immagine di stato (field_image_name) + HP + icone speed/scudo/protezione.
+    La chiave è lo stato visibile della carta, quindi una faccia si ricompone solo quando quello cambia:
+    a regime ogni carta sul tavolo costa un solo blit per frame.
+    """
+    def __init__(self, cache: AssetCache):
+        self.cache = cache
+        self._faces: Dict[tuple, pygame.Surface] = {}
+        self.builds = 0
+
+    def face(
+        self,
+        image_name: str,
+        hp_current: int,
+        hp_max: int,
+        font_hp: pygame.font.Font,
+        shield_points: int = 0,
+        speed_icon: bool = False,
+        protect_active: bool = False,
+    ) -> pygame.Surface:
+        key = (image_name, hp_current, hp_max, font_hp, shield_points, speed_icon, protect_active)
+        surf = self._faces.get(key)
+        if surf is None:
+            if len(self._faces) >= CARD_FACE_CACHE_MAX:
+                self._faces.clear()
+            surf = self._build(key)
+            self._faces[key] = surf
+            self.builds += 1
+        return surf
 
-    deck = [f"DINO:{cid}" for cid in picked] + [energy_token] * 10  # +10 energia
-    random.shuffle(deck)
-    return deck
+    @staticmethod
+    def field_key(inst: CardInstance, use_states: bool) -> tuple:
+        """Stato visibile di una carta in campo (tutto ciò che cambia la sua faccia)."""
+        # use_states: usa atk/glow/selected (carte dell'utente), altrimenti l'immagine base
+        image_name = field_image_name(inst) if use_states else f"{inst.base.id}.png"
+        return (image_name, inst.current_hp, inst.base.hp, inst.shield_points, inst.speed_icon, inst.protect_active)
+
+    def field_face(self, inst: CardInstance, font_hp: pygame.font.Font, use_states: bool) -> pygame.Surface:
+        image_name, hp_current, hp_max, shield_points, speed_icon, protect_active = self.field_key(inst, use_states)
+        return self.face(image_name, hp_current, hp_max, font_hp, shield_points, speed_icon, protect_active)
+
+    def _build(self, key: tuple) -> pygame.Surface:
+        image_name, hp_current, hp_max, font_hp, shield_points, speed_icon, protect_active = key
+        cache = self.cache
+        surf = draw_card_hp_on_field(cache.image(image_name), hp_current, hp_max, font_hp)
+        if speed_icon:
+            surf.blit(cache.image(ICON_SPEED), (24, 185))
+        if shield_points > 0:
+            surf.blit(cache.image(ICON_SHIELD), (92, 70))
+            # testo punti scudo sopra l'icona
+            font_shield = get_asset_cache().font(None, 60)
+            surf.blit(GLYPHS.render(font_shield, str(shield_points), BIANCO), (92 + 34, 70 + 19))
+        if protect_active:
+            surf.blit(cache.image(ICON_PROTECT), (10, 70))
+        return surf
 
 
 def faction_to_icon(faction: str) -> str:
     return ICON_LEAVES if faction == FACTION_HERB else ICON_MEAT
 
 
-def other_faction(faction: str) -> str:
-    return FACTION_CARN if faction == FACTION_HERB else FACTION_HERB
-
 def end_screen(
     scaler: Scaler,
     cache: AssetCache,
@@ -1752,12 +1040,15 @@ def menu_loop(
     while running:
         dt_ms = clock.tick(60)
         _ = dt_ms  # attualmente non usato qui
+        scaler.prof.begin_frame()
 
         mouse_logical = scaler.to_logical_pos(pygame.mouse.get_pos())
         left_up = False
         right_up = False
 
         for event in pygame.event.get():
+            if scaler.prof.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 return "QUIT", None, best_score
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
@@ -1886,9 +1177,7 @@ def select_leader_screen(
 
         # draw cards
         for cid, hp_max, rect in cards_rects:
-            img = cache.image(f"{cid}.png")
-            img_hp = draw_card_hp_on_field(img, hp_max, hp_max, font_hp)
-            surf.blit(img_hp, rect.topleft)
+            surf.blit(cache.card_faces.face(f"{cid}.png", hp_max, hp_max, font_hp), rect.topleft)
 
         scaler.present()
 
@@ -1896,128 +1185,28 @@ def select_leader_screen(
     return leader_user_id, leader_ai_id
 
 
-def protected_indices(field):
-    return [i for i, inst in enumerate(field) if getattr(inst, "protect_active", False)]
-
-def candidate_target_indices(defender_field):
-    prot = protected_indices(defender_field)
-    return prot if prot else list(range(len(defender_field)))
-
-def pick_best_enemy_target(user_field):
-    # Sceglie il target "migliore" tra quelli consentiti (rispetta PROTECT)
-    idxs = candidate_target_indices(user_field)
-    if not idxs:
-        return None
-    # euristica semplice: più basso HP prima (finish), altrimenti leader alla fine
-    def score(i):
-        inst = user_field[i]
-        return (inst.current_hp, 1 if getattr(inst, "is_leader", False) else 0)
-    return sorted(idxs, key=score)[0]
-
-def pick_best_ally_target(ai_field):
-    if not ai_field:
-        return None
-    # euristica: cura/proteggi chi ha meno hp%, o leader se rischia
-    def score(i):
-        inst = ai_field[i]
-        frac = inst.current_hp / max(1, inst.base.hp)
-        return (frac, 0 if getattr(inst, "is_leader", False) else 1)
-    return sorted(range(len(ai_field)), key=score)[0]
-
-def ai_take_turn_use_abilities(
-    scaler, cache, audio, bg, deck_img, fonts, icon_user, icon_ai, btns,
-    user_state, ai_state, clock
-) -> None:
-    # costo: 2 per ALL, 1 per altri (come hai stabilito)
-    def ability_cost(ab):
-        return 2 if ab.targets.upper() == "ALL" else 1
-
-    for caster_idx, caster in enumerate(list(ai_state.field)):
-        # può essere cambiato se muore qualcosa, ma lato AI va bene
-        ok, msg = can_cast_ability(caster)
-        if not ok:
-            continue
-
-        ab = caster.base.ability
-        if ab is None:
-            continue
-        a_type = ab.type.upper()
-        a_tgt = ab.targets.upper()
-        if a_type == "NONE" or a_tgt == "NONE":
-            continue
-
-        cost = ability_cost(ab)
-        if ai_state.energy < cost:
-            continue
-
-        targets_idx = None
-
-        if a_tgt == "ONE":
-            if a_type == "ATTACK":
-                t = pick_best_enemy_target(user_state.field)
-                if t is None:
-                    continue
-                targets_idx = [t]
-            elif a_type in ("HEAL", "SPEED", "SHIELD", "PROTECT"):
-                t = pick_best_ally_target(ai_state.field)
-                if t is None:
-                    continue
-                targets_idx = [t]
-            else:
-                continue
-
-        elif a_tgt in ("SELF", "ALL"):
-            # per SELF/ALL non serve targets_idx
-            targets_idx = None
-
-        else:
-            continue
-
-        # lancia abilità
-        applied, result = resolve_ability(
-            scaler=scaler, cache=cache, audio=audio, bg=bg, deck_img=deck_img,
-            fonts=fonts, icon_user=icon_user, icon_ai=icon_ai,
-            btns=btns,
-            caster_state=ai_state, other_state=user_state,
-            caster_idx=caster_idx,
-            targets_idx=targets_idx,
-            caster_is_user=False,
-            clock=clock,
+def play_ai_turn(worker: AIWorker, animator: MatchAnimator) -> None:
+    """
+    Turno AI mossa per mossa: la ricerca gira sul thread del worker mentre qui si continua a
+    disegnare il tavolo (finestra reattiva), poi la mossa viene applicata con le sue animazioni.
+    """
+    match = animator.match
+    while match.turn == AI and match.winner is None:
+        worker.start(match)
+        layer = BoardLayer(
+            animator.scaler, animator.cache, animator.bg, animator.deck_img, animator.fonts,
+            animator.icon_user, animator.icon_ai, animator.btns, match.user, match.ai,
         )
-
-        # se result porta al menu o gameover lo gestisci dove già lo gestisci nel tuo flusso.
-        # qui basta uscire se serve:
-        if result == "MENU":
-            return
-
-def ai_take_turn_play_cards(ai_state, max_field_size=5) -> None:
-    # 1) gioca 1 dinosauro se possibile e non già fatto
-    if not getattr(ai_state, "played_dino_this_turn", False):
-        if len(ai_state.field) < max_field_size:
-            # trova dinosauri in mano
-            dinos = [(i, c) for i, c in enumerate(ai_state.hand) if c.base.type.upper() == "DINO"]
-            if dinos:
-                # euristica: più hp base
-                dinos.sort(key=lambda x: x[1].base.hp, reverse=True)
-                hand_idx, inst = dinos[0]
-                ai_state.hand.pop(hand_idx)
-                inst.summoned_this_turn = True
-                inst.attacks_left = inst.base.speed  # o come fai per user
-                inst.ability_used_this_turn = False
-                ai_state.field.append(inst)
-                ai_state.played_dino_this_turn = True
-
-    # 2) (opzionale) gioca energie dalla mano
-    # se le energie aumentano ai_state.energy nel tuo codice, qui le puoi “consumare”
-    # e.g. mentre esistono carte ENERGY in mano, le giochi:
-    i = 0
-    while i < len(ai_state.hand):
-        c = ai_state.hand[i]
-        if c.base.type.upper() == "ENERGY":
-            ai_state.hand.pop(i)
-            ai_state.energy += 1
-            continue
-        i += 1
+        try:
+            while not worker.done():
+                animator.clock.tick(60)
+                _consume_quit_events()
+                layer.draw()
+                animator.scaler.present()
+        except SystemExit:
+            worker.cancel()
+            raise
+        apply_action(match, worker.result(), animator)
 
 
 def start_match(
@@ -2028,6 +1217,7 @@ def start_match(
     faction_user: str,
     all_cards: List[CardDef],
     clock: pygame.time.Clock,
+    ai_level: str = AI_LEVEL,
 ) -> str:
     """
     Setup partita:
@@ -2059,33 +1249,9 @@ def start_match(
         clock=clock,
     )
 
-    # Crea istanze leader
-    def_by_id = {c.id: c for c in all_cards}
-    user_leader = CardInstance(base=def_by_id[leader_user_id], current_hp=def_by_id[leader_user_id].hp, is_leader=True)
-    ai_leader = CardInstance(base=def_by_id[leader_ai_id], current_hp=def_by_id[leader_ai_id].hp, is_leader=True)
-
-    # Mazzi
-    user_deck = build_deck_for_faction(all_cards, faction_user, leader_user_id)
-    ai_deck = build_deck_for_faction(all_cards, other_faction(faction_user), leader_ai_id)
-
-    user_state = PlayerState(
-        faction=faction_user,
-        energy_type=user_leader.base.energy_type,
-        leader=user_leader,
-        deck=user_deck,
-        hand=[],
-        field=[user_leader],
-        energy=0,
-    )
-    ai_state = PlayerState(
-        faction=other_faction(faction_user),
-        energy_type=ai_leader.base.energy_type,
-        leader=ai_leader,
-        deck=ai_deck,
-        hand=[],
-        field=[ai_leader],
-        energy=0,
-    )
+    # Leader in campo e mazzi (regole in game_09_rules)
+    match = new_match(all_cards, faction_user, leader_user_id, leader_ai_id)
+    user_state, ai_state = match.user, match.ai
 
     # Bottoni
     btn_abbandona = HoverButton(cache, BTN_ABB_OFF, BTN_ABB_ON, (14, 488))
@@ -2099,36 +1265,33 @@ def start_match(
     # Deck backs
     deck_img = cache.image(DECK_IMG)
 
-    # Font HP + energia
-    font_energy = fonts["energy"]
-    font_hp = fonts["hp"]
-
-    # Pesca iniziale: 7 carte ciascuno
-    # Implementazione minimale: animazione base con easing per utente e AI come struttura.
-    # Nei prossimi step: big reveal (utente) e spostamento in mano con slot liberi.
-    run_initial_draw_animations(
+    # Suoni e animazioni degli eventi delle regole (pesca, attacchi, abilità, morti, fine partita)
+    animator = MatchAnimator(
         scaler=scaler,
         cache=cache,
         audio=audio,
         bg=bg,
         deck_img=deck_img,
-        user_state=user_state,
-        ai_state=ai_state,
         fonts=fonts,
         icon_user=icon_user,
         icon_ai=icon_ai,
         #btns=(btn_abbandona, btn_completa, btn_skill),
         btns=(btn_abbandona, btn_completa),
+        match=match,
         clock=clock,
     )
+    ai_worker = AIWorker(make_policy(ai_level))
 
-    # Turno utente (per ora: solo gestione abbandona + hover bottoni)
-    user_turn = True  # inizio con utente come da specifica
+    # Pesca iniziale: 7 carte ciascuno
+    run_initial_draw_animations(animator)
+
+    # Turno utente (inizio con utente come da specifica): reset + pesca automatica
+    start_turn(match, animator)
+    reset_user_card_flags(user_state)
 
-    user_turn = True
-    turn_started = True
+    pass_turn = False
     toast: Optional[Toast] = None
-    hover_big_token: Optional[str] = None
+    hover_big_token: Optional[int] = None
 
     selected_attacker_idx: Optional[int] = None
     confirm_abandon = False
@@ -2140,12 +1303,27 @@ def start_match(
     btn_ok_rect = pygame.Rect(popup_rect.centerx - btn_w - 40, btn_y, btn_w, btn_h)
     btn_cancel_rect = pygame.Rect(popup_rect.centerx + 40, btn_y, btn_w, btn_h)
 
+    def user_ability(caster_idx: int, target_idx: int = -1) -> Optional[str]:
+        """Abilità dell'utente: None se lanciata, altrimenti il messaggio per il toast."""
+        action = Action(ACT_ABILITY, caster_idx, target_idx)
+        err = action_error(match, action)
+        if err is None:
+            apply_action(match, action, animator)
+            # SPEED può ridare attacchi: aggiorna atk delle carte non selezionate
+            for inst in user_state.field:
+                if not inst.selected:
+                    inst.atk = should_atk_for_attack(inst)
+        return err
+
     # Skill system (latched btn_skill)
     #skill_active: bool = False
     #skill_waiting_target: bool = False
 
+    prof = scaler.prof
+
     while True:
         dt = clock.tick(60)
+        prof.begin_frame()
         mouse_logical = scaler.to_logical_pos(pygame.mouse.get_pos())
 
         if toast and toast.ms_left > 0:
@@ -2153,6 +1331,8 @@ def start_match(
             if toast.ms_left <= 0:
                 toast = None
 
+        user_turn = match.turn == USER
+
         # btn_completa interattivo solo su turno utente
         btn_completa.set_enabled(user_turn)
         # btn_skill utilizzabile solo nel turno utente
@@ -2165,6 +1345,8 @@ def start_match(
         left_up = False
         right_up = False
         for event in pygame.event.get():
+            if prof.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 return "MENU"
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
@@ -2189,117 +1371,37 @@ def start_match(
 
             # Cambio turno (utente -> AI)
             if left_up and user_turn and btn_completa.is_clicked(mouse_logical, True):
-                user_turn = False
-                turn_started = True
+                pass_turn = True
 
-        def_by_id = {c.id: c for c in all_cards}
+        # ===== Turno AI: tutto in una volta, poi torna all'utente =====
+        if not confirm_abandon and pass_turn:
+            pass_turn = False
 
-        # ===== Inizio turno: reset contatori + pesca automatica (1 carta se <7) =====
-        if not confirm_abandon and turn_started:
-            current = user_state if user_turn else ai_state
-            current.energy_played_this_turn = 0
-            current.dinos_played_this_turn = 0
+            # 1) inizio turno AI: reset + pesca
+            apply_action(match, Action(ACT_END), animator)
 
+            # 2) mosse AI (energie + max 1 dinosauro, abilità, attacchi) fino a ACT_END,
+            #    che apre il turno utente con la sua pesca
+            play_ai_turn(ai_worker, animator)
+            if match.winner is not None:
+                return "MENU"
 
-            # reset minimi (per step futuri)
-            for inst in current.field:
-                inst.attacks_left = 1
-                inst.atk = False
-                inst.selected = False
-                inst.ability_used_this_turn = False
-                inst.summoned_this_turn = False  # dopo il cambio turno, tutte diventano "vecchie"
+            reset_user_card_flags(user_state)
+            selected_attacker_idx = None
 
-            for inst in user_state.field:
-                inst.speed_icon = False
-            for inst in ai_state.field:
-                inst.speed_icon = False
-
-            #resetta scudo di shield
-            if user_turn:
-                # Inizia TURNO UTENTE: scadono gli shield dell'UTENTE (messi nel suo turno precedente)
-                for inst in user_state.field:
-                    inst.shield_points = 0
-            else:
-                # Inizia TURNO AI: scadono gli shield dell'AI (messi nel suo turno precedente)
-                for inst in ai_state.field:
-                    inst.shield_points = 0
-
-            #resettta scudo di protect
-            if user_turn:
-                # inizia turno utente -> scadono i protect dell'utente
-                for inst in user_state.field:
-                    inst.protect_active = False
-            else:
-                # inizia turno AI -> scadono i protect dell'AI
-                for inst in ai_state.field:
-                    inst.protect_active = False
-
-
-
-            # aggiorna atk per il turno utente
-            if user_turn:
-                for inst in user_state.field:
-                    inst.atk = (inst.attacks_left > 0 and not inst.summoned_this_turn)
-
-
-            # pesca automatica
-            draw_one_card_with_animation(
-                scaler=scaler,
-                cache=cache,
-                audio=audio,
-                bg=bg,
-                deck_img=deck_img,
-                player=current,
-                is_user=user_turn,          # reveal solo se utente
-                fonts=fonts,
-                icon_user=icon_user,
-                icon_ai=icon_ai,
-                #btns=(btn_abbandona, btn_completa, btn_skill),
-                btns=(btn_abbandona, btn_completa),
-                other_player=ai_state if user_turn else user_state,
-                clock=clock,
+            # 3) Frame finale "stabile" prima del toast (così non appare durante animazioni)
+            # (render “normale” senza hover big)
+            surf = scaler.begin(clear=False)
+            draw_board(
+                surf, cache, bg, deck_img, fonts, icon_user, icon_ai,
+                (btn_abbandona, btn_completa), user_state, ai_state,
             )
 
-            # ----- Se è iniziato il turno AI, esegui l'intero turno AI in una volta sola -----
-            if not user_turn:
-                # 1) AI gioca carte (energie + max 1 dinosauro/turno) - usa la tua funzione già presente
-                ai_play_cards(audio=audio, ai_state=ai_state, def_by_id=def_by_id)
-
-                # 2) AI usa abilità (se può)
-                ai_take_turn_use_abilities(
-                    scaler=scaler, cache=cache, audio=audio, bg=bg, deck_img=deck_img,
-                    fonts=fonts, icon_user=icon_user, icon_ai=icon_ai,
-                    btns=(btn_abbandona, btn_completa),
-                    user_state=user_state, ai_state=ai_state,
-                    clock=clock,
-                )
-
-                # 3) AI attacca con tutti i dinosauri che possono (già rispetta PROTECT)
-                ended = ai_take_turn_normal_attack(
-                    scaler=scaler,
-                    cache=cache,
-                    audio=audio,
-                    bg=bg,
-                    deck_img=deck_img,
-                    fonts=fonts,
-                    icon_user=icon_user,
-                    icon_ai=icon_ai,
-                    btns=(btn_abbandona, btn_completa),
-                    user_state=user_state,
-                    ai_state=ai_state,
-                    clock=clock,
-                )
-                if ended:
-                    return "MENU"
-
-                # 4) fine turno AI -> passa a utente
-                user_turn = True
-                turn_started = True
-                toast = Toast("Tocca a te", 1500)
-                continue  # IMPORTANTISSIMO: evita di settare turn_started=False qui sotto
+            scaler.present()
+            pygame.time.delay(150)  # piccolo respiro
 
-            # fine "inizio turno" normale
-            turn_started = False
+            toast = Toast("Tocca a te", 1500)
+            continue
 
         # ===== Hover big sulla mano utente (sempre, anche fuori turno) =====
         hover_big_token = None
@@ -2317,38 +1419,13 @@ def start_match(
             if idx_click is not None and 0 <= idx_click < len(user_state.hand):
                 token = user_state.hand[idx_click]
 
-                # Energia
-                if token.startswith("E:"):
-                    if user_state.energy_played_this_turn >= 2:
-                        toast = Toast("Non si possono giocare più di due carte energia per turno", 2000)
-                    else:
-                        user_state.energy += 1
-                        user_state.energy_played_this_turn += 1
-                        # rimuovi carta e shift a sinistra
-                        user_state.hand.pop(idx_click)
-
-                # Dinosauro
-                elif token.startswith("DINO:"):
-                    if user_state.dinos_played_this_turn >= 1:
-                        toast = Toast("Non puoi giocare più di 1 dinosauro per turno", 2000)
-                    elif len(user_state.field) >= 6:
-                        toast = Toast("Non è possibile avere più di 6 carte in campo", 2000)
-                    else:
-                        cid = int(token.split(":")[1])
-                        inst = CardInstance(base=def_by_id[cid], current_hp=def_by_id[cid].hp)
-                        inst.summoned_this_turn = True
-                        inst.attacks_left = 0               # non può attaccare nel turno in cui entra :contentReference[oaicite:6]{index=6}
-                        inst.ability_used_this_turn = True  # non può usare abilità nello stesso turno :contentReference[oaicite:7]{index=7}
-                        user_state.field.append(inst)
-
-                        # suono down coerente con fazione della carta
-                        if inst.base.faction == FACTION_CARN:
-                            audio.play_sfx(SFX_CARN_DOWN, volume=0.9)
-                        else:
-                            audio.play_sfx(SFX_HERB_DOWN, volume=0.9)
-
-                        user_state.hand.pop(idx_click)
-                        user_state.dinos_played_this_turn += 1 
+                # Dinosauro (evocazione) oppure energia; i limiti per turno li controllano le regole
+                action = Action(ACT_SUMMON if is_dino_token(token) else ACT_ENERGY, idx_click)
+                err = action_error(match, action)
+                if err:
+                    toast = Toast(err, 2000)
+                else:
+                    apply_action(match, action, animator)
 
         # ===== ATTACCO NORMALE (solo turno utente) =====
         if not confirm_abandon and user_turn:
@@ -2375,20 +1452,11 @@ def start_match(
                     # SELF/ALL: solo right-click sul caster stesso
                     if a_tgt in ("SELF", "ALL"):
                         if idx_u is not None and idx_u == selected_attacker_idx:
-                            applied, result = resolve_ability(
-                                scaler=scaler, cache=cache, audio=audio, bg=bg, deck_img=deck_img,
-                                fonts=fonts, icon_user=icon_user, icon_ai=icon_ai,
-                                btns=(btn_abbandona, btn_completa),  # o lascia la tua tupla attuale
-                                caster_state=user_state, other_state=ai_state,
-                                caster_idx=selected_attacker_idx,
-                                targets_idx=None,
-                                caster_is_user=True,
-                                clock=clock,
-                            )
-                            if result == "MENU":
+                            err = user_ability(selected_attacker_idx)
+                            if match.winner is not None:
                                 return "MENU"
-                            if isinstance(result, str):
-                                toast = Toast(result, 2000)
+                            if err:
+                                toast = Toast(err, 2000)
 
                             caster.selected = False
                             caster.atk = should_atk_for_attack(caster)
@@ -2397,30 +1465,21 @@ def start_match(
 
                     # ONE: dipende dal tipo
                     if a_tgt == "ONE":
-                        target_idxs = None
+                        target_idx = None
 
                         if a_type == "ATTACK":
                             if idx_a is not None:
-                                target_idxs = [idx_a]
+                                target_idx = idx_a
                         elif a_type in ("HEAL", "SPEED", "SHIELD"):
                             if idx_u is not None:
-                                target_idxs = [idx_u]
-
-                        if target_idxs is not None:
-                            applied, result = resolve_ability(
-                                scaler=scaler, cache=cache, audio=audio, bg=bg, deck_img=deck_img,
-                                fonts=fonts, icon_user=icon_user, icon_ai=icon_ai,
-                                btns=(btn_abbandona, btn_completa),
-                                caster_state=user_state, other_state=ai_state,
-                                caster_idx=selected_attacker_idx,
-                                targets_idx=target_idxs,
-                                caster_is_user=True,
-                                clock=clock,
-                            )
-                            if result == "MENU":
+                                target_idx = idx_u
+
+                        if target_idx is not None:
+                            err = user_ability(selected_attacker_idx, target_idx)
+                            if match.winner is not None:
                                 return "MENU"
-                            if isinstance(result, str):
-                                toast = Toast(result, 2000)
+                            if err:
+                                toast = Toast(err, 2000)
 
                             caster.selected = False
                             caster.atk = should_atk_for_attack(caster)
@@ -2461,52 +1520,19 @@ def start_match(
                 elif selected_attacker_idx is not None and idx_a is not None:
                     attacker = user_state.field[selected_attacker_idx]
 
-                    can_attack = (attacker.attacks_left > 0 and not attacker.summoned_this_turn)
-                    if not can_attack:
-                        toast = Toast("Questa carta non può attaccare in questo turno", 1500)
-                        # NON deselezionare: resta selezionata (utile per skill)
+                    action = Action(ACT_ATTACK, selected_attacker_idx, idx_a)
+                    err = action_error(match, action)
+                    if err:
+                        # es. carta che non può attaccare o PROTECT: NON deselezionare
+                        # (resta selezionata, utile per skill)
+                        toast = Toast(err, 1500)
                         continue
 
-                    target = ai_state.field[idx_a]
-
-                    if not is_attack_target_allowed(ai_state.field, idx_a):
-                        toast = Toast("Devi attaccare un dinosauro protetto", 1500)
-                        continue
+                    # animazione (evento ATTACK), danno, eventuale morte e fine partita
+                    apply_action(match, action, animator)
+                    if match.winner is not None:
+                        return "MENU"
 
-
-                    animate_normal_attack(
-                        scaler=scaler,
-                        cache=cache,
-                        audio=audio,
-                        bg=bg,
-                        deck_img=deck_img,
-                        fonts=fonts,
-                        icon_user=icon_user,
-                        icon_ai=icon_ai,
-                        #btns=(btn_abbandona, btn_completa, btn_skill),
-                        btns=(btn_abbandona, btn_completa),
-                        user_state=user_state,
-                        ai_state=ai_state,
-                        attacker_idx=selected_attacker_idx,
-                        target_idx=idx_a,
-                        clock=clock,
-                    )
-
-                    died = apply_normal_attack_damage(attacker, target)
-
-                    if died:
-                        audio.play_sfx(SFX_DEAD, volume=0.9)
-                        pygame.time.delay(120)
-                        ai_state.field.pop(idx_a)
-
-                        res = check_and_handle_game_over(
-                            scaler=scaler, cache=cache, audio=audio, fonts=fonts,
-                            user_state=user_state, ai_state=ai_state, clock=clock
-                        )
-                        if res is not None:
-                            return "MENU"
-
-                    attacker.attacks_left = max(0, attacker.attacks_left - 1)
                     attacker.selected = False
                     attacker.atk = should_atk_for_attack(attacker)
                     selected_attacker_idx = None
@@ -2521,42 +1547,17 @@ def start_match(
 
 
 
-        # ===== Render =====
-        surf = scaler.begin()
-        surf.blit(bg, (0, 0))
+        prof.lap("match.update")
 
-        if ai_state.deck_count() > 0:
-            surf.blit(deck_img, POS_DECK_AI)
-        if user_state.deck_count() > 0:
-            surf.blit(deck_img, POS_DECK_USER)
-        draw_deck_counts(
-            surf,
-            deck_img,
-            font_energy,
-            ai_count=ai_state.deck_count(),
-            user_count=user_state.deck_count(),
+        # ===== Render =====
+        surf = scaler.begin(clear=False)
+        draw_board(
+            surf, cache, bg, deck_img, fonts, icon_user, icon_ai,
+            (btn_abbandona, btn_completa), user_state, ai_state,
         )
 
-        surf.blit(icon_ai, POS_ENERGY_AI)
-        surf.blit(icon_user, POS_ENERGY_USER)
-
-        ai_energy_txt = font_energy.render(str(ai_state.energy), True, BIANCO)
-        user_energy_txt = font_energy.render(str(user_state.energy), True, BIANCO)
-        surf.blit(ai_energy_txt, (133, 42))
-        surf.blit(user_energy_txt, (133, 987))
-
-        btn_abbandona.draw(surf)
-        btn_completa.draw(surf)
-        #btn_skill.draw(surf)
-
-        draw_field_row(surf, cache, ai_state.field, POS_FIELD_AI, font_hp, use_states=False)
-        draw_field_row(surf, cache, user_state.field, POS_FIELD_USER, font_hp, use_states=True)
-
-        draw_hand_row(surf, cache, user_state.hand, POS_HAND_USER, show_faces=True)
-        draw_hand_row(surf, cache, ai_state.hand, POS_HAND_AI, show_faces=False)
-
         # hover big carta mano (utente)
-        if hover_big_token:
+        if hover_big_token is not None:
             big = token_to_big_image(cache, hover_big_token)
             big_pos = (LOGICAL_W // 2 - big.get_width() // 2, LOGICAL_H // 2 - big.get_height() // 2)
             surf.blit(big, big_pos)
@@ -2584,81 +1585,15 @@ def start_match(
             cancel_rect = cancel_txt.get_rect(center=btn_cancel_rect.center)
             surf.blit(cancel_txt, cancel_rect.topleft)
 
+        prof.lap("match.draw")
         scaler.present()
 
-        # ===== Turno AI: per ora solo "passa" (poi nel prossimo step faremo la sequenza AI) =====
-        if not confirm_abandon and not user_turn:
-            # 1) AI gioca carte
-            ai_play_cards(audio=audio, ai_state=ai_state, def_by_id=def_by_id)
-
-            # 2) AI attacca (ora potenzialmente più attacchi)
-            ended = ai_take_turn_normal_attack(
-                scaler=scaler,
-                cache=cache,
-                audio=audio,
-                bg=bg,
-                deck_img=deck_img,
-                fonts=fonts,
-                icon_user=icon_user,
-                icon_ai=icon_ai,
-                #btns=(btn_abbandona, btn_completa, btn_skill),
-                btns=(btn_abbandona, btn_completa),
-                user_state=user_state,
-                ai_state=ai_state,
-                clock=clock,
-            )
-            if ended:
-                return "MENU"
-
-            # 3) Frame finale "stabile" prima del toast (così non appare durante animazioni)
-            # (render “normale” senza hover big)
-            surf = scaler.begin()
-            surf.blit(bg, (0, 0))
-
-            if ai_state.deck_count() > 0:
-                surf.blit(deck_img, POS_DECK_AI)
-            if user_state.deck_count() > 0:
-                surf.blit(deck_img, POS_DECK_USER)
-            draw_deck_counts(
-                surf,
-                deck_img,
-                font_energy,
-                ai_count=ai_state.deck_count(),
-                user_count=user_state.deck_count(),
-            )
-
-            surf.blit(icon_ai, POS_ENERGY_AI)
-            surf.blit(icon_user, POS_ENERGY_USER)
-
-            ai_energy_txt = font_energy.render(str(ai_state.energy), True, BIANCO)
-            user_energy_txt = font_energy.render(str(user_state.energy), True, BIANCO)
-            surf.blit(ai_energy_txt, (133, 42))
-            surf.blit(user_energy_txt, (133, 987))
-
-            btn_abbandona.draw(surf)
-            btn_completa.draw(surf)
-            #btn_skill.draw(surf)
-
-            draw_field_row(surf, cache, ai_state.field, POS_FIELD_AI, font_hp, use_states=False)
-            draw_field_row(surf, cache, user_state.field, POS_FIELD_USER, font_hp, use_states=True)
-
-            draw_hand_row(surf, cache, user_state.hand, POS_HAND_USER, show_faces=True)
-            draw_hand_row(surf, cache, ai_state.hand, POS_HAND_AI, show_faces=False)
-
-            scaler.present()
-            pygame.time.delay(150)  # piccolo respiro
-
-            toast = Toast("Tocca a te", 1500)
-
-            user_turn = True
-            turn_started = True
-
 
 
 def draw_hand_row(
     surf: pygame.Surface,
     cache: AssetCache,
-    hand: List[str],
+    hand: Sequence[int],
     origin: Tuple[int, int],
     show_faces: bool,
 ) -> None:
@@ -2673,19 +1608,27 @@ def draw_hand_row(
         surf.blit(img, (x, y))
 
 
-def token_to_hand_image(cache: AssetCache, token: str) -> pygame.Surface:
-    # token: "DINO:<id>" o "E:LEAVES"/"E:MEAT"
-    if token.startswith("DINO:"):
-        cid = int(token.split(":")[1])
-        return cache.image(f"{cid}_small.png")
+# token -> (immagine piccola, immagine grande): nomi risolti una volta per token, non a ogni frame
+_TOKEN_IMAGES: Dict[int, Tuple[str, str]] = {
+    TOKEN_LEAVES: ("e_leaves_small.png", "e_leaves_big.png"),
+    TOKEN_MEAT: ("e_meat_small.png", "e_meat_big.png"),
+}
 
-    if token == "E:LEAVES":
-        return cache.image("e_leaves_small.png")
 
-    if token == "E:MEAT":
-        return cache.image("e_meat_small.png")
+def token_image_names(token: int) -> Tuple[str, str]:
+    names = _TOKEN_IMAGES.get(token)
+    if names is None:
+        if is_dino_token(token):
+            cid = token_dino_id(token)
+            names = (f"{cid}_small.png", f"{cid}_big.png")
+        else:
+            names = (DECK_IMG, DECK_IMG)
+        _TOKEN_IMAGES[token] = names
+    return names
+
 
-    return cache.image(DECK_IMG)
+def token_to_hand_image(cache: AssetCache, token: int) -> pygame.Surface:
+    return cache.image(token_image_names(token)[0])
 
 
 
@@ -2695,35 +1638,16 @@ def draw_field_row(
     player_field: List[CardInstance],
     origin: Tuple[int, int],
     font_hp: pygame.font.Font,
-    use_states: bool
+    use_states: bool,
+    skip: Optional[int] = None,
 ) -> None:
-    ICON_SPEED = "speed.png"
-    ICON_SHIELD = "shield.png"
+    # una faccia già composta per carta (HP e icone inclusi): un blit ciascuna
+    # skip: indice della carta da non disegnare (è lo sprite che si sta muovendo)
+    faces = cache.card_faces
     ox, oy = origin
     for idx, inst in enumerate(player_field[:FIELD_MAX]):
-        x = ox + idx * FIELD_CARD_W
-        y = oy
-        if use_states:
-            base_img = cache.image(field_image_name(inst))  # usa atk/glow/selected
-        else:
-            cid = inst.base.id
-            base_img = cache.image(f"{cid}.png")
-        img = draw_card_hp_on_field(base_img, inst.current_hp, inst.base.hp, font_hp)
-        surf.blit(img, (x, y))
-        if inst.speed_icon:
-            sp = cache.image(ICON_SPEED)
-            surf.blit(sp, (x + 24, y + 185))
-        if inst.shield_points > 0:
-            font_shield = pygame.font.Font(None, 60)
-            sh = cache.image(ICON_SHIELD)
-            surf.blit(sh, (x + 92, y + 70))
-
-            # testo punti scudo sopra l'icona
-            shield_txt = font_shield.render(str(inst.shield_points), True, BIANCO)
-            surf.blit(shield_txt, (x + 92 + 34, y + 70 + 19))
-    if inst.protect_active:
-        ico = cache.image(ICON_PROTECT)
-        surf.blit(ico, (x + 10, y + 70))
+        if idx != skip:
+            surf.blit(faces.field_face(inst, font_hp, use_states), (ox + idx * FIELD_CARD_W, oy))
 
 
 def draw_deck_counts(
@@ -2736,8 +1660,8 @@ def draw_deck_counts(
     ai_rect = deck_img.get_rect(topleft=POS_DECK_AI)
     user_rect = deck_img.get_rect(topleft=POS_DECK_USER)
 
-    ai_txt = font.render(str(ai_count), True, BIANCO)
-    user_txt = font.render(str(user_count), True, BIANCO)
+    ai_txt = GLYPHS.render(font, str(ai_count), BIANCO)
+    user_txt = GLYPHS.render(font, str(user_count), BIANCO)
 
     ai_pos = ai_txt.get_rect(midtop=(ai_rect.centerx, ai_rect.bottom + 6))
     user_pos = user_txt.get_rect(midbottom=(user_rect.centerx, user_rect.top - 6))
@@ -2746,173 +1670,152 @@ def draw_deck_counts(
     surf.blit(user_txt, user_pos.topleft)
 
 
-
-
-def run_initial_draw_animations(
-    scaler: Scaler,
+# =========================
+# Tavolo di gioco
+# =========================
+def draw_board(
+    surf: pygame.Surface,
     cache: AssetCache,
-    audio: Audio,
     bg: pygame.Surface,
     deck_img: pygame.Surface,
-    user_state: PlayerState,
-    ai_state: PlayerState,
     fonts: Dict[str, pygame.font.Font],
     icon_user: pygame.Surface,
     icon_ai: pygame.Surface,
-    #btns: Tuple[HoverButton, HoverButton, HoverButton],
-    btns: Tuple[HoverButton, HoverButton],
-    clock: pygame.time.Clock,
+    btns: Tuple[HoverButton, ...],
+    user_state: PlayerState,
+    ai_state: PlayerState,
+    exclude: Optional[Tuple[bool, int]] = None,
 ) -> None:
     """
-    Pesca iniziale:
-      - 7 volte utente: deck->centro (300ms), reveal big 2s, poi in mano (slot)
-      - 7 volte AI: deck->mano AI (300ms), sempre retro
-    Qui: implementazione compatta ma fedele a tempi/easing.
+    Tavolo completo: sfondo, mazzi con contatori, icone ed energia, bottoni, campo, mani.
+    exclude = (is_ai, indice) toglie dal campo la carta che un'animazione sta spostando.
     """
-    #btn_abbandona, btn_completa, btn_skill = btns
-    btn_abbandona, btn_completa = btns
     font_energy = fonts["energy"]
     font_hp = fonts["hp"]
+    surf.blit(bg, (0, 0))
+
+    if ai_state.deck_count() > 0:
+        surf.blit(deck_img, POS_DECK_AI)
+    if user_state.deck_count() > 0:
+        surf.blit(deck_img, POS_DECK_USER)
+    draw_deck_counts(
+        surf,
+        deck_img,
+        font_energy,
+        ai_count=ai_state.deck_count(),
+        user_count=user_state.deck_count(),
+    )
 
-    center_pos = (LOGICAL_W // 2 - deck_img.get_width() // 2, LOGICAL_H // 2 - deck_img.get_height() // 2)
-
-    # helper render static UI
-    def render_base() -> pygame.Surface:
-        surf = scaler.begin()
-        surf.blit(bg, (0, 0))
-
-        # Deck backs (sotto l'animazione)
-        if ai_state.deck_count() > 0:
-            surf.blit(deck_img, POS_DECK_AI)
-        if user_state.deck_count() > 0:
-            surf.blit(deck_img, POS_DECK_USER)
-        draw_deck_counts(
-            surf,
-            deck_img,
-            font_energy,
-            ai_count=ai_state.deck_count(),
-            user_count=user_state.deck_count(),
-        )
-
-        # Icone energia
-        surf.blit(icon_ai, POS_ENERGY_AI)
-        surf.blit(icon_user, POS_ENERGY_USER)
-
-        # Energia
-        ai_energy_txt = font_energy.render(str(ai_state.energy), True, BIANCO)
-        user_energy_txt = font_energy.render(str(user_state.energy), True, BIANCO)
-        surf.blit(ai_energy_txt, (133, 42))
-        surf.blit(user_energy_txt, (133, 987))
-
-        # Bottoni (in avvio partita sono già presenti)
-        mouse_logical = scaler.to_logical_pos(pygame.mouse.get_pos())
-        btn_abbandona.update(mouse_logical)
-        btn_completa.update(mouse_logical)
-        #btn_skill.update(mouse_logical)
-
-        btn_abbandona.draw(surf)
-        btn_completa.draw(surf)
-        #btn_skill.draw(surf)
+    surf.blit(icon_ai, POS_ENERGY_AI)
+    surf.blit(icon_user, POS_ENERGY_USER)
 
-        # Leader in campo
-        draw_field_row(surf, cache, ai_state.field, POS_FIELD_AI, font_hp, use_states=False)
-        draw_field_row(surf, cache, user_state.field, POS_FIELD_USER, font_hp, use_states=True)
+    surf.blit(GLYPHS.render(font_energy, str(ai_state.energy), BIANCO), (133, 42))
+    surf.blit(GLYPHS.render(font_energy, str(user_state.energy), BIANCO), (133, 987))
 
-        # Mano (già parzialmente riempita durante anim)
-        draw_hand_row(surf, cache, user_state.hand, POS_HAND_USER, show_faces=True)
-        draw_hand_row(surf, cache, ai_state.hand, POS_HAND_AI, show_faces=False)
+    for btn in btns:
+        btn.draw(surf)
 
-        return surf
+    skip_ai = exclude[1] if exclude is not None and exclude[0] else None
+    skip_user = exclude[1] if exclude is not None and not exclude[0] else None
+    draw_field_row(surf, cache, ai_state.field, POS_FIELD_AI, font_hp, use_states=False, skip=skip_ai)
+    draw_field_row(surf, cache, user_state.field, POS_FIELD_USER, font_hp, use_states=True, skip=skip_user)
 
-    # 7 carte utente con reveal
-    for _ in range(7):
-        if not user_state.deck:
-            break
+    draw_hand_row(surf, cache, user_state.hand, POS_HAND_USER, show_faces=True)
+    draw_hand_row(surf, cache, ai_state.hand, POS_HAND_AI, show_faces=False)
 
-        token = user_state.deck.pop(0)
-        audio.play_sfx(SFX_FLIP, volume=0.9)
 
-        mover = MovingSprite(
-            image=deck_img,
-            start=POS_DECK_USER,
-            end=center_pos,
-            duration_ms=300,
+class BoardLayer:
+    """
+    Tavolo "fermo" delle animazioni, composto una volta in una surface opaca: ogni frame d'animazione
+    costa un blit del tavolo più lo sprite che si muove.
+    A ogni draw si confronta una firma dello stato visibile (mazzi, energia, mani, facce in campo, bottoni):
+    se lo stato cambia a metà animazione (carta pescata, HP, hover) il tavolo si ricompone.
+    """
+    def __init__(
+        self,
+        scaler: Scaler,
+        cache: AssetCache,
+        bg: pygame.Surface,
+        deck_img: pygame.Surface,
+        fonts: Dict[str, pygame.font.Font],
+        icon_user: pygame.Surface,
+        icon_ai: pygame.Surface,
+        btns: Tuple[HoverButton, ...],
+        user_state: PlayerState,
+        ai_state: PlayerState,
+        exclude: Optional[Tuple[bool, int]] = None,
+    ):
+        self.scaler = scaler
+        self.cache = cache
+        self.bg = bg
+        self.deck_img = deck_img
+        self.fonts = fonts
+        self.icon_user = icon_user
+        self.icon_ai = icon_ai
+        self.btns = btns
+        self.user_state = user_state
+        self.ai_state = ai_state
+        self.exclude = exclude
+        self._surf: Optional[pygame.Surface] = None
+        self._sig: Optional[tuple] = None
+        self.builds = 0
+
+    def invalidate(self) -> None:
+        self._sig = None
+
+    def signature(self) -> tuple:
+        u, a = self.user_state, self.ai_state
+        key = CardFaceCache.field_key
+        return (
+            len(u.deck), len(a.deck), u.energy, a.energy,
+            u.hand.tobytes(), len(a.hand),
+            tuple(key(inst, True) for inst in u.field[:FIELD_MAX]),
+            tuple(key(inst, False) for inst in a.field[:FIELD_MAX]),
+            tuple((b.hovered or b.forced_on) and b.enabled for b in self.btns),
+            self.exclude,
         )
 
-        # fase movimento
-        while not mover.done:
-            dt = clock.tick(60)
-            _consume_quit_events()
-            mover.update(dt)
-
-            surf = render_base()
-            surf.blit(mover.image, mover.pos())
-            scaler.present()
-
-        # reveal big per 2s al centro
-        reveal_img = token_to_big_image(cache, token)
-        reveal_pos = (LOGICAL_W // 2 - reveal_img.get_width() // 2, LOGICAL_H // 2 - reveal_img.get_height() // 2)
-
-        reveal_time = 500 #2000
-        elapsed = 0
-        while elapsed < reveal_time:
-            dt = clock.tick(60)
-            _consume_quit_events()
-            elapsed += dt
-
-            surf = render_base()
-            surf.blit(reveal_img, reveal_pos)
-            scaler.present()
-
-        # aggiungi in mano nel primo slot libero (fine animazione)
-        if len(user_state.hand) < 7:
-            user_state.hand.append(token)
-
-        # se era l'ultima carta, l'immagine mazzo sparirà nel render_base (perché deck_count() == 0)
+    def draw(self) -> pygame.Surface:
+        """Inizia il frame (scaler.begin) con il tavolo già disegnato e ritorna la surface logica."""
+        mouse_logical = self.scaler.to_logical_pos(pygame.mouse.get_pos())
+        for btn in self.btns:
+            btn.update(mouse_logical)
 
-    # 7 carte AI (retro che vola verso mano AI)
-    for _ in range(7):
-        if not ai_state.deck:
-            break
+        sig = self.signature()
+        if sig != self._sig or self._surf is None:
+            if self._surf is None:
+                self._surf = pygame.Surface((LOGICAL_W, LOGICAL_H)).convert()
+            self._surf.fill(NERO)
+            draw_board(
+                self._surf, self.cache, self.bg, self.deck_img, self.fonts, self.icon_user, self.icon_ai,
+                self.btns, self.user_state, self.ai_state, exclude=self.exclude,
+            )
+            self._sig = sig
+            self.builds += 1
 
-        token = ai_state.deck.pop(0)
-        audio.play_sfx(SFX_FLIP, volume=0.9)
+        surf = self.scaler.begin(clear=False)
+        surf.blit(self._surf, (0, 0))
+        return surf
 
-        # prossima posizione in mano AI
-        slot_idx = len(ai_state.hand)
-        target_x = POS_HAND_AI[0] + slot_idx * HAND_STEP_X
-        target_y = POS_HAND_AI[1]
-
-        mover = MovingSprite(
-            image=deck_img,
-            start=POS_DECK_AI,
-            end=(target_x, target_y),
-            duration_ms=300,
-        )
 
-        while not mover.done:
-            dt = clock.tick(60)
-            _consume_quit_events()
-            mover.update(dt)
 
-            surf = render_base()
-            surf.blit(mover.image, mover.pos())
-            scaler.present()
 
-        if len(ai_state.hand) < 7:
-            ai_state.hand.append(token)
+def run_initial_draw_animations(animator: MatchAnimator) -> None:
+    """
+    Pesca iniziale (deal_initial_hands delle regole, animata evento per evento):
+      - 7 volte utente: deck->centro (300ms), reveal big breve, poi in mano (slot)
+      - 7 volte AI: deck->mano AI (300ms), sempre retro
+    """
+    reveal_ms = animator.reveal_ms
+    animator.reveal_ms = 500  # 2000 nelle pescate di turno
+    try:
+        deal_initial_hands(animator.match, animator)
+    finally:
+        animator.reveal_ms = reveal_ms
 
 
-def token_to_big_image(cache: AssetCache, token: str) -> pygame.Surface:
-    # token: "DINO:<id>" o "E:LEAVES"/"E:MEAT"
-    if token.startswith("DINO:"):
-        cid = int(token.split(":")[1])
-        return cache.image(f"{cid}_big.png")
-    if token == "E:LEAVES":
-        return cache.image("e_leaves_big.png")
-    if token == "E:MEAT":
-        return cache.image("e_meat_big.png")
-    return cache.image(DECK_IMG)
+def token_to_big_image(cache: AssetCache, token: int) -> pygame.Surface:
+    return cache.image(token_image_names(token)[1])
 
 
 def _consume_quit_events() -> None:
@@ -2944,11 +1847,11 @@ def run_game(best_score: int = 0) -> int:
         raise FileNotFoundError(f"Font mancante: {FONT_PATH}")
 
     fonts = {
-        "title": pygame.font.Font(FONT_PATH, 40),   # “SCEGLI IL TUO LEADER”
-        "energy": pygame.font.Font(FONT_PATH, 50),  # numeri energia
-        "hp": pygame.font.Font(FONT_PATH, 18),      # HP sulle carte
-        "shield": pygame.font.Font(FONT_PATH, 45),      # HP sugli shield
-        "end": pygame.font.Font(FONT_PATH, 70),
+        "title": cache.font(40),   # “SCEGLI IL TUO LEADER”
+        "energy": cache.font(50),  # numeri energia
+        "hp": cache.font(18),      # HP sulle carte
+        "shield": cache.font(45),      # HP sugli shield
+        "end": cache.font(70),
     }
 
     clock = pygame.time.Clock()
@@ -3003,12 +1906,6 @@ def main(best_score: int = 0) -> int:
 
 
 if __name__ == "__main__":
-    # esecuzione standalone
-    bs = 0
-    if len(sys.argv) > 1:
-        try:
-            bs = int(sys.argv[1])
-        except ValueError:
-            bs = 0
-    out = main(bs)
-    print(out)
+    # Jacoplay passa "--score N" (a mano va bene anche il solo numero)
+    out = main(parse_score_arg(sys.argv[1:]))
+    report_score(out)
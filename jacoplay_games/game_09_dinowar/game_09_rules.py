@@ -0,0 +1,915 @@
+# game_09_rules.py
+# Regole di DinoWar senza pygame: stato della partita, mosse legali, attacchi, abilità, fine partita.
+#
+# Il gioco (game_09_dinowar.py) e le simulazioni usano le stesse funzioni:
+#     match = new_match(all_cards, FACTION_HERB, leader_user_id, leader_ai_id)
+#     deal_initial_hands(match)                   # 7 carte a testa
+#     start_turn(match)                           # reset di turno + pesca del giocatore di turno
+#     actions = legal_actions(match)
+#     events = apply_action(match, action)        # Action(ACT_END) passa il turno all'avversario
+#
+# Ogni cambiamento produce un Event. Se si passa on_event, viene chiamato nel momento in cui
+# l'evento accade, con la partita esattamente in quello stato (così le animazioni lo possono mostrare):
+#   - EV_ATTACK e EV_HIT arrivano PRIMA del danno (si vedono ancora gli HP vecchi)
+#   - EV_DRAW arriva con la carta già tolta dal mazzo e non ancora in mano
+#   - tutti gli altri arrivano a cambiamento applicato
+# Senza on_event le funzioni restituiscono solo la lista degli eventi (simulazioni, test).
+
+from __future__ import annotations
+
+import json
+import random
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# =========================
+# Costanti
+# =========================
+FACTION_HERB = "ERBIVORE"
+FACTION_CARN = "CARNIVORE"
+ENERGY_LEAVES = "LEAVES"
+ENERGY_MEAT = "MEAT"
+
+FIELD_MAX = 6               # carte in campo per giocatore
+HAND_MAX = 7                # oltre questo numero non si pesca
+INITIAL_HAND = 7
+ENERGY_PER_TURN = 2         # carte energia giocabili per turno
+DINOS_PER_TURN = 1          # dinosauri evocabili per turno
+DECK_DINOS = 10             # composizione mazzo: 10 dinosauri (anche duplicati) + 10 energie
+DECK_ENERGY = 10
+
+# lati della partita (indice in MatchState.players)
+USER = 0
+AI = 1
+
+# Carte di mazzo e mano: interi piccoli in array('H'), niente stringhe da analizzare
+#   dinosauro: id della carta (< TOKEN_ENERGY_BASE), si usa direttamente con def_by_id
+#   energia: TOKEN_ENERGY_BASE + posizione del tipo in ENERGY_TYPES
+TOKEN_TYPECODE = "H"
+TOKEN_ENERGY_BASE = 0x8000
+ENERGY_TYPES = (ENERGY_LEAVES, ENERGY_MEAT)
+TOKEN_LEAVES = TOKEN_ENERGY_BASE
+TOKEN_MEAT = TOKEN_ENERGY_BASE + 1
+
+# mosse
+ACT_ENERGY = "ENERGY"       # src = indice in mano
+ACT_SUMMON = "SUMMON"       # src = indice in mano
+ACT_ATTACK = "ATTACK"       # src = attaccante nel proprio campo, dst = bersaglio nel campo avversario
+ACT_ABILITY = "ABILITY"     # src = caster nel proprio campo, dst = bersaglio (solo targets ONE)
+ACT_END = "END"             # fine turno
+
+# eventi
+EV_TURN = "TURN"            # side = chi inizia il turno, value = numero del turno
+EV_DRAW = "DRAW"            # side, token pescato
+EV_ENERGY = "ENERGY"        # side, value = energia dopo la giocata
+EV_SUMMON = "SUMMON"        # side, idx = posizione in campo, card_id
+EV_ATTACK = "ATTACK"        # side = attaccante, src = attaccante, idx = bersaglio (campo avversario)
+EV_ABILITY = "ABILITY"      # side = caster, src = caster, ability = tipo, value = energia spesa
+EV_HIT = "HIT"              # side = bersaglio, idx = bersaglio, src = caster (campo avversario)
+EV_DAMAGE = "DAMAGE"        # side = bersaglio, idx, value = HP persi (dopo lo scudo)
+EV_HEAL = "HEAL"            # side, idx, value = HP recuperati (solo se > 0)
+EV_BUFF = "BUFF"            # side, idx, ability = SPEED/SHIELD/PROTECT, value = punti
+EV_DEATH = "DEATH"          # side, idx = posizione che occupava, card_id
+EV_GAME_OVER = "GAME_OVER"  # side = vincitore
+
+
+class IllegalAction(ValueError):
+    """Mossa non consentita: il messaggio è quello da mostrare all'utente (toast)."""
+
+
+# =========================
+# Dati carte
+# =========================
+@dataclass(frozen=True)
+class AbilityDef:
+    name: str
+    type: str       # NONE/ATTACK/HEAL/SHIELD/PROTECT/SPEED
+    targets: str    # NONE/ONE/ALL/SELF
+    point_per_target: int
+    notes: str
+
+
+@dataclass(frozen=True)
+class CardDef:
+    id: int
+    name: str
+    species: str
+    faction: str        # ERBIVORE/CARNIVORE
+    energy_type: str    # LEAVES/MEAT
+    hp: int
+    atk: int
+    image: str
+    ability: AbilityDef
+
+
+@dataclass
+class CardInstance:
+    base: CardDef
+    current_hp: int
+    is_leader: bool = False
+    speed_icon: bool = False
+    protect_active: bool = False
+
+    # stato turno
+    summoned_this_turn: bool = False
+    attacks_left: int = 1
+    ability_used_this_turn: bool = False
+
+    # buff (per step successivi)
+    shield_points: int = 0      # riduce danno, consumabile
+
+    # stato UI (le regole non lo leggono)
+    selected: bool = False
+    atk: bool = False
+
+    def reset_hp(self) -> None:
+        self.current_hp = self.base.hp
+
+
+def load_cards_from_json(path: str) -> List[CardDef]:
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    #  Supporto entrambi i formati:
+    # 1) lista diretta di carte: [ {...}, {...} ]
+    # 2) oggetto con chiave "cards": { "version": 1, "cards": [ {...}, ... ] }
+    if isinstance(raw, dict):
+        raw_cards = raw.get("cards", [])
+    else:
+        raw_cards = raw
+
+    if not isinstance(raw_cards, list):
+        raise ValueError(f"Formato JSON non valido: 'cards' non è una lista. Trovato: {type(raw_cards)}")
+
+    cards: List[CardDef] = []
+    for obj in raw_cards:
+        if not isinstance(obj, dict):
+            raise ValueError(f"Elemento carta non valido (atteso dict, trovato {type(obj)}): {obj}")
+
+        ab = obj.get("ability") or {}
+        if not isinstance(ab, dict):
+            raise ValueError(f"Campo 'ability' non valido per carta id={obj.get('id')}: {type(ab)}")
+
+        # l'id è anche il token della carta nel mazzo (vedi TOKEN_ENERGY_BASE)
+        if not 0 <= int(obj["id"]) < TOKEN_ENERGY_BASE:
+            raise ValueError(f"Id carta fuori intervallo (0..{TOKEN_ENERGY_BASE - 1}): {obj['id']}")
+
+        ability = AbilityDef(
+            name=str(ab.get("name", "")),
+            type=str(ab.get("type", "NONE")),
+            targets=str(ab.get("targets", "NONE")),
+            point_per_target=int(ab.get("point_per_target", 0)),
+            notes=str(ab.get("notes", "")),
+        )
+
+        cards.append(
+            CardDef(
+                id=int(obj["id"]),
+                name=str(obj.get("name", "")),
+                species=str(obj.get("species", "")),
+                faction=str(obj.get("faction", "")),
+                energy_type=str(obj.get("energy_type", "")),
+                hp=int(obj.get("hp", 1)),
+                atk=int(obj.get("atk", 0)),
+                image=str(obj.get("image", "")),
+                ability=ability,
+            )
+        )
+
+    cards.sort(key=lambda c: c.id)
+    return cards
+
+
+# =========================
+# Stato partita
+# =========================
+@dataclass
+class PlayerState:
+    faction: str
+    energy_type: str
+    leader: CardInstance
+    deck: array              # token interi (vedi TOKEN_ENERGY_BASE), si pesca dall'inizio
+    hand: array              # stesso encoding del deck
+    field: List[CardInstance]
+    energy: int = 0
+    energy_played_this_turn: int = 0
+    dinos_played_this_turn: int = 0
+
+
+    def deck_count(self) -> int:
+        return len(self.deck)
+
+    def hand_count(self) -> int:
+        return len(self.hand)
+
+
+@dataclass
+class MatchState:
+    players: List[PlayerState]      # [USER, AI]
+    def_by_id: Dict[int, CardDef]
+    turn: int = USER                # lato di turno
+    turn_number: int = 0
+    winner: Optional[int] = None    # USER/AI a partita finita
+
+    @property
+    def user(self) -> PlayerState:
+        return self.players[USER]
+
+    @property
+    def ai(self) -> PlayerState:
+        return self.players[AI]
+
+
+def _copy_card(inst: CardInstance) -> CardInstance:
+    # copia di campo senza passare da __init__ (CardDef resta condiviso: è immutabile)
+    out = object.__new__(CardInstance)
+    out.__dict__.update(inst.__dict__)
+    return out
+
+
+def clone_match(match: MatchState) -> MatchState:
+    """
+    Copia indipendente della partita per le simulazioni: si copiano solo le parti mutabili
+    (liste di mazzo/mano/campo e stato delle carte), le definizioni delle carte sono condivise.
+    """
+    players = []
+    for p in match.players:
+        field = [_copy_card(inst) for inst in p.field]
+        leader = next((c for c, inst in zip(field, p.field) if inst is p.leader), None)
+        players.append(PlayerState(
+            faction=p.faction,
+            energy_type=p.energy_type,
+            leader=leader if leader is not None else _copy_card(p.leader),
+            deck=p.deck[:],
+            hand=p.hand[:],
+            field=field,
+            energy=p.energy,
+            energy_played_this_turn=p.energy_played_this_turn,
+            dinos_played_this_turn=p.dinos_played_this_turn,
+        ))
+    return MatchState(
+        players=players,
+        def_by_id=match.def_by_id,
+        turn=match.turn,
+        turn_number=match.turn_number,
+        winner=match.winner,
+    )
+
+
+def match_key(match: MatchState, viewer: int) -> tuple:
+    """
+    Chiave hashable dello stato visto da `viewer`: la sua mano (senza ordine), della mano
+    avversaria e dei mazzi solo il numero di carte. Due sequenze di mosse che portano
+    allo stesso tavolo danno la stessa chiave.
+    """
+    parts = [match.turn, match.winner]
+    for side, p in enumerate(match.players):
+        parts.append((
+            p.energy, p.energy_played_this_turn, p.dinos_played_this_turn,
+            tuple(sorted(p.hand)) if side == viewer else len(p.hand),
+            len(p.deck),
+            tuple(
+                (inst.base.id, inst.current_hp, inst.is_leader, inst.attacks_left, inst.summoned_this_turn,
+                 inst.ability_used_this_turn, inst.shield_points, inst.protect_active, inst.speed_icon)
+                for inst in p.field
+            ),
+        ))
+    return tuple(parts)
+
+
+@dataclass(frozen=True)
+class Action:
+    kind: str
+    src: int = -1
+    dst: int = -1
+
+
+@dataclass(frozen=True)
+class Event:
+    kind: str
+    side: int
+    idx: int = -1
+    src: int = -1
+    value: int = 0
+    token: int = 0
+    card_id: int = 0
+    ability: str = ""
+
+
+EventSink = Optional[Callable[[Event], None]]
+
+
+def other_faction(faction: str) -> str:
+    return FACTION_CARN if faction == FACTION_HERB else FACTION_HERB
+
+
+def opponent(side: int) -> int:
+    return AI if side == USER else USER
+
+
+def energy_token(energy_type: str) -> int:
+    if energy_type not in ENERGY_TYPES:
+        raise ValueError(f"Tipo di energia sconosciuto: {energy_type!r}")
+    return TOKEN_ENERGY_BASE + ENERGY_TYPES.index(energy_type)
+
+def is_energy_token(token: int) -> bool:
+    return token >= TOKEN_ENERGY_BASE
+
+def is_dino_token(token: int) -> bool:
+    return token < TOKEN_ENERGY_BASE
+
+def token_dino_id(token: int) -> int:
+    return token
+
+def token_name(token: int) -> str:
+    """Forma testuale storica ("DINO:12", "E:LEAVES"), per log e debug."""
+    if is_dino_token(token):
+        return f"DINO:{token}"
+    return f"E:{ENERGY_TYPES[token - TOKEN_ENERGY_BASE]}"
+
+def new_tokens(tokens=()) -> array:
+    return array(TOKEN_TYPECODE, tokens)
+
+
+def build_deck_for_faction(
+    all_cards: List[CardDef],
+    faction: str,
+    leader_id: int,
+    rng=random,
+) -> array:
+    dinos = [c for c in all_cards if c.faction == faction and c.id != leader_id]
+    if not dinos:
+        raise ValueError(f"Nessun dinosauro disponibile per fazione {faction}")
+
+    picked = [rng.choice(dinos).id for _ in range(DECK_DINOS)]  # 10 dinos (anche duplicati)
+    energy = energy_token(dinos[0].energy_type)  # coerente con fazione (da JSON)
+
+    deck = picked + [energy] * DECK_ENERGY  # +10 energia
+    rng.shuffle(deck)
+    return new_tokens(deck)
+
+
+def new_player(all_cards: List[CardDef], def_by_id: Dict[int, CardDef], faction: str, leader_id: int, rng=random) -> PlayerState:
+    leader_def = def_by_id[leader_id]
+    leader = CardInstance(base=leader_def, current_hp=leader_def.hp, is_leader=True)
+    return PlayerState(
+        faction=faction,
+        energy_type=leader_def.energy_type,
+        leader=leader,
+        deck=build_deck_for_faction(all_cards, faction, leader_id, rng),
+        hand=new_tokens(),
+        field=[leader],
+        energy=0,
+    )
+
+
+def new_match(
+    all_cards: List[CardDef],
+    faction_user: str,
+    leader_user_id: int,
+    leader_ai_id: int,
+    rng=random,
+) -> MatchState:
+    """Leader in campo e mazzi mescolati; le mani sono vuote (vedi deal_initial_hands)."""
+    def_by_id = {c.id: c for c in all_cards}
+    user = new_player(all_cards, def_by_id, faction_user, leader_user_id, rng)
+    ai = new_player(all_cards, def_by_id, other_faction(faction_user), leader_ai_id, rng)
+    return MatchState(players=[user, ai], def_by_id=def_by_id)
+
+
+# =========================
+# Regole di base
+# =========================
+def protected_indices(field: List[CardInstance]) -> List[int]:
+    return [i for i, inst in enumerate(field) if inst.protect_active]
+
+def candidate_target_indices(defender_field: List[CardInstance]) -> List[int]:
+    # con PROTECT attivo si possono colpire solo i protetti
+    prot = protected_indices(defender_field)
+    return prot if prot else list(range(len(defender_field)))
+
+def is_attack_target_allowed(defender_field: List[CardInstance], target_idx: int) -> bool:
+    prot = protected_indices(defender_field)
+    if not prot:
+        return True  # nessun protect attivo -> si può colpire chiunque
+    return target_idx in prot
+
+
+def should_atk_for_attack(inst: CardInstance) -> bool:
+    return inst.attacks_left > 0 and (not inst.summoned_this_turn)
+
+def can_use_ability_now(inst: CardInstance) -> bool:
+    ab = inst.base.ability
+    if ab is None:
+        return False
+    if ab.type == "NONE" or ab.targets == "NONE":
+        return False
+    if inst.summoned_this_turn:
+        return False
+    if inst.ability_used_this_turn:
+        return False
+    return True
+
+
+def ability_cost(ability: AbilityDef, n_targets: int) -> int:
+    """Costo energia abilità (regola aggiornata):
+    - targets == ALL  -> 2 energie (costo fisso)
+    - tutti gli altri targets validi -> 1 energia (costo fisso)
+    - type/targets NONE -> 0
+    NB: point_per_target NON è il costo: è il valore dell'effetto per bersaglio.
+    """
+    a_type = str(getattr(ability, "type", "NONE")).upper()
+    a_tgt = str(getattr(ability, "targets", "NONE")).upper()
+
+    if a_type == "NONE" or a_tgt == "NONE":
+        return 0
+    return 2 if a_tgt == "ALL" else 1
+
+
+def can_cast_ability(caster: CardInstance) -> Tuple[bool, str]:
+    """Checks basic constraints for casting an ability."""
+    if caster.summoned_this_turn:
+        return False, "Non puoi usare abilità nel turno in cui la carta è stata messa in campo"
+    if caster.ability_used_this_turn:
+        return False, "Abilità già usata in questo turno"
+    if caster.base.ability.type in ("", "NONE"):
+        return False, "Questa carta non ha un'abilità"
+    return True, ""
+
+
+def apply_heal(targets: List[CardInstance], points: int) -> None:
+    for t in targets:
+        t.current_hp = min(t.base.hp, t.current_hp + max(0, points))
+
+
+def apply_speed(targets: List[CardInstance], points: int) -> None:
+    # Interpretazione: aggiunge attacchi extra nel turno corrente.
+    for t in targets:
+        t.attacks_left += max(0, points)
+        t.speed_icon = True
+
+
+def apply_shield(targets: List[CardInstance], points: int) -> None:
+    """Aggiunge punti scudo consumabili (riduzione danno) ai target."""
+    add = max(0, int(points))
+    if add <= 0:
+        return
+    for t in targets:
+        t.shield_points += add
+
+
+def apply_damage(target: CardInstance, points: int) -> int:
+    """Danno ridotto dagli shield_points (che si consumano). Ritorna gli HP effettivamente persi."""
+    dmg = max(0, int(points))
+    if target.shield_points > 0 and dmg > 0:
+        used = min(dmg, target.shield_points)
+        target.shield_points -= used
+        dmg -= used
+    if dmg > 0:
+        target.current_hp -= dmg
+    return dmg
+
+
+def is_player_out_of_moves(p: PlayerState) -> bool:
+    if len(p.field) > 0:
+        return False
+    has_dino_in_hand = any(is_dino_token(t) for t in p.hand)
+    has_dino_in_deck = any(is_dino_token(t) for t in p.deck)
+    return not (has_dino_in_hand or has_dino_in_deck)
+
+
+def check_winner(match: MatchState) -> Optional[int]:
+    """USER se l'AI non ha più mosse, AI se non ne ha l'utente, altrimenti None (energie non contano)."""
+    if is_player_out_of_moves(match.ai):
+        return USER
+    if is_player_out_of_moves(match.user):
+        return AI
+    return None
+
+
+# =========================
+# Turni
+# =========================
+def _emitter(events: List[Event], on_event: EventSink) -> Callable[[Event], None]:
+    if on_event is None:
+        return events.append
+
+    def emit(ev: Event) -> None:
+        events.append(ev)
+        on_event(ev)
+    return emit
+
+
+def _draw(match: MatchState, side: int, emit: Callable[[Event], None]) -> bool:
+    p = match.players[side]
+    if not p.deck or len(p.hand) >= HAND_MAX:
+        return False
+    token = p.deck.pop(0)
+    emit(Event(EV_DRAW, side, token=token))
+    p.hand.append(token)
+    return True
+
+
+def draw_card(match: MatchState, side: int, on_event: EventSink = None) -> List[Event]:
+    """Pesca una carta se il mazzo non è vuoto e la mano ha meno di HAND_MAX carte."""
+    events: List[Event] = []
+    _draw(match, side, _emitter(events, on_event))
+    return events
+
+
+def deal_initial_hands(match: MatchState, on_event: EventSink = None) -> List[Event]:
+    """Pesca iniziale: prima tutte le carte dell'utente, poi quelle dell'AI."""
+    events: List[Event] = []
+    emit = _emitter(events, on_event)
+    for side in (USER, AI):
+        for _ in range(INITIAL_HAND):
+            if not _draw(match, side, emit):
+                break
+    return events
+
+
+def _start_turn(match: MatchState, emit: Callable[[Event], None]) -> None:
+    side = match.turn
+    current = match.players[side]
+    current.energy_played_this_turn = 0
+    current.dinos_played_this_turn = 0
+
+    for inst in current.field:
+        inst.attacks_left = 1
+        inst.ability_used_this_turn = False
+        inst.summoned_this_turn = False  # dopo il cambio turno, tutte diventano "vecchie"
+
+    for p in match.players:
+        for inst in p.field:
+            inst.speed_icon = False
+
+    # scadono shield e protect del giocatore di turno (messi nel suo turno precedente)
+    for inst in current.field:
+        inst.shield_points = 0
+        inst.protect_active = False
+
+    match.turn_number += 1
+    emit(Event(EV_TURN, side, value=match.turn_number))
+
+    # pesca automatica
+    _draw(match, side, emit)
+
+
+def start_turn(match: MatchState, on_event: EventSink = None) -> List[Event]:
+    """Inizio turno di match.turn: reset contatori e stati del turno, scadenza shield/protect, pesca."""
+    events: List[Event] = []
+    _start_turn(match, _emitter(events, on_event))
+    return events
+
+
+# =========================
+# Mosse
+# =========================
+def _ability_targets(match: MatchState, side: int, caster_idx: int, dst: int) -> Tuple[Optional[str], int, List[int]]:
+    """(errore, lato bersagli, indici bersagli) per l'abilità del caster."""
+    caster_state = match.players[side]
+    ability = caster_state.field[caster_idx].base.ability
+    a_type = ability.type.upper()
+    a_targets = ability.targets.upper()
+
+    if a_type not in ("ATTACK", "HEAL", "SPEED", "SHIELD", "PROTECT"):
+        return "Abilità non supportata", side, []
+
+    # ATTACK colpisce sempre l'avversario; HEAL/SPEED/SHIELD/PROTECT sempre gli alleati
+    target_side = opponent(side) if a_type == "ATTACK" else side
+    target_field = match.players[target_side].field
+
+    if a_targets == "SELF":
+        return None, side, [caster_idx]
+    if a_targets == "ALL":
+        idxs = list(range(len(target_field)))
+        if a_type == "ATTACK":
+            # con ALL si colpiscono solo i protetti (se ce ne sono)
+            idxs = candidate_target_indices(target_field)
+        return None, target_side, idxs
+    if a_targets == "ONE":
+        if dst < 0:
+            return "Seleziona un bersaglio", target_side, []
+        if dst >= len(target_field):
+            return "Bersaglio non valido", target_side, []
+        if a_type == "ATTACK" and not is_attack_target_allowed(target_field, dst):
+            return "Devi attaccare un dinosauro protetto", target_side, []
+        return None, target_side, [dst]
+    return "Abilità non valida", target_side, []
+
+
+def action_error(match: MatchState, action: Action) -> Optional[str]:
+    """None se la mossa è legale per il giocatore di turno, altrimenti il messaggio per l'utente."""
+    if match.winner is not None:
+        return "Partita terminata"
+    side = match.turn
+    me = match.players[side]
+    foe = match.players[opponent(side)]
+    kind = action.kind
+
+    if kind == ACT_END:
+        return None
+
+    if kind in (ACT_ENERGY, ACT_SUMMON):
+        if not 0 <= action.src < len(me.hand):
+            return "Carta non valida"
+        token = me.hand[action.src]
+        if kind == ACT_ENERGY:
+            if not is_energy_token(token):
+                return "Carta non valida"
+            if me.energy_played_this_turn >= ENERGY_PER_TURN:
+                return "Non si possono giocare più di due carte energia per turno"
+            return None
+        if not is_dino_token(token):
+            return "Carta non valida"
+        if me.dinos_played_this_turn >= DINOS_PER_TURN:
+            return "Non puoi giocare più di 1 dinosauro per turno"
+        if len(me.field) >= FIELD_MAX:
+            return "Non è possibile avere più di 6 carte in campo"
+        return None
+
+    if not 0 <= action.src < len(me.field):
+        return "Carta non valida"
+    inst = me.field[action.src]
+
+    if kind == ACT_ATTACK:
+        if not should_atk_for_attack(inst):
+            return "Questa carta non può attaccare in questo turno"
+        if not 0 <= action.dst < len(foe.field):
+            return "Bersaglio non valido"
+        if not is_attack_target_allowed(foe.field, action.dst):
+            return "Devi attaccare un dinosauro protetto"
+        return None
+
+    if kind == ACT_ABILITY:
+        ok, msg = can_cast_ability(inst)
+        if not ok:
+            return msg
+        err, _target_side, idxs = _ability_targets(match, side, action.src, action.dst)
+        if err:
+            return err
+        if me.energy < ability_cost(inst.base.ability, len(idxs)):
+            return "Energia insufficiente"
+        return None
+
+    return "Mossa non valida"
+
+
+def legal_actions(match: MatchState) -> List[Action]:
+    """
+    Mosse legali del giocatore di turno (ACT_END compresa).
+    Le carte uguali in mano danno una sola mossa; le abilità senza bersagli non sono proposte.
+    """
+    if match.winner is not None:
+        return []
+    side = match.turn
+    me = match.players[side]
+    foe = match.players[opponent(side)]
+    out: List[Action] = []
+
+    if me.energy_played_this_turn < ENERGY_PER_TURN:
+        idx = next((i for i, t in enumerate(me.hand) if is_energy_token(t)), None)
+        if idx is not None:
+            out.append(Action(ACT_ENERGY, idx))
+
+    if me.dinos_played_this_turn < DINOS_PER_TURN and len(me.field) < FIELD_MAX:
+        seen = set()
+        for i, t in enumerate(me.hand):
+            if is_dino_token(t) and t not in seen:
+                seen.add(t)
+                out.append(Action(ACT_SUMMON, i))
+
+    for i, inst in enumerate(me.field):
+        if not can_use_ability_now(inst):
+            continue
+        ability = inst.base.ability
+        if me.energy < ability_cost(ability, 1):
+            continue
+        if ability.targets.upper() == "ONE":
+            for t in range(len(foe.field if ability.type.upper() == "ATTACK" else me.field)):
+                if action_error(match, Action(ACT_ABILITY, i, t)) is None:
+                    out.append(Action(ACT_ABILITY, i, t))
+        else:
+            err, _target_side, idxs = _ability_targets(match, side, i, -1)
+            if err is None and idxs:
+                out.append(Action(ACT_ABILITY, i))
+
+    targets = candidate_target_indices(foe.field)
+    for i, inst in enumerate(me.field):
+        if should_atk_for_attack(inst):
+            for t in targets:
+                out.append(Action(ACT_ATTACK, i, t))
+
+    out.append(Action(ACT_END))
+    return out
+
+
+def _kill_if_dead(match: MatchState, side: int, target: CardInstance, emit: Callable[[Event], None]) -> bool:
+    """Toglie dal campo il bersaglio morto e controlla la fine partita. True se la partita è finita."""
+    if target.current_hp >= 1:
+        return False
+    field = match.players[side].field
+    idx = next(i for i, inst in enumerate(field) if inst is target)
+    field.pop(idx)
+    emit(Event(EV_DEATH, side, idx=idx, card_id=target.base.id))
+
+    winner = check_winner(match)
+    if winner is not None:
+        match.winner = winner
+        emit(Event(EV_GAME_OVER, winner))
+        return True
+    return False
+
+
+def _resolve_ability(match: MatchState, side: int, caster_idx: int, dst: int, emit: Callable[[Event], None]) -> None:
+    caster_state = match.players[side]
+    caster = caster_state.field[caster_idx]
+    ability = caster.base.ability
+    a_type = ability.type.upper()
+    points = int(ability.point_per_target)
+
+    _err, target_side, idxs = _ability_targets(match, side, caster_idx, dst)
+    target_field = match.players[target_side].field
+    target_cards = [target_field[i] for i in idxs]
+
+    cost = ability_cost(ability, len(target_cards))
+    caster_state.energy -= cost
+    caster.ability_used_this_turn = True
+    emit(Event(EV_ABILITY, side, src=caster_idx, value=cost, ability=a_type))
+
+    if a_type == "HEAL":
+        for i, t in zip(idxs, target_cards):
+            before = t.current_hp
+            apply_heal([t], points)
+            if t.current_hp > before:
+                emit(Event(EV_HEAL, target_side, idx=i, value=t.current_hp - before))
+
+    elif a_type in ("SPEED", "SHIELD", "PROTECT"):
+        if a_type == "SPEED":
+            apply_speed(target_cards, points)
+        elif a_type == "SHIELD":
+            apply_shield(target_cards, points)
+        else:
+            for t in target_cards:
+                t.protect_active = True
+        for i in idxs:
+            emit(Event(EV_BUFF, target_side, idx=i, value=points, ability=a_type))
+
+    elif a_type == "ATTACK":
+        # un bersaglio alla volta: gli indici si ricalcolano perché i morti escono dal campo
+        for target in target_cards:
+            idx = next((j for j, inst in enumerate(target_field) if inst is target), None)
+            if idx is None:
+                continue
+            emit(Event(EV_HIT, target_side, idx=idx, src=caster_idx))
+            lost = apply_damage(target, points)
+            emit(Event(EV_DAMAGE, target_side, idx=idx, value=lost))
+            if _kill_if_dead(match, target_side, target, emit):
+                return
+
+
+def _apply(match: MatchState, action: Action, emit: Callable[[Event], None]) -> None:
+    side = match.turn
+    me = match.players[side]
+    kind = action.kind
+
+    if kind == ACT_END:
+        match.turn = opponent(side)
+        _start_turn(match, emit)
+
+    elif kind == ACT_ENERGY:
+        me.hand.pop(action.src)
+        me.energy += 1
+        me.energy_played_this_turn += 1
+        emit(Event(EV_ENERGY, side, value=me.energy))
+
+    elif kind == ACT_SUMMON:
+        cid = token_dino_id(me.hand.pop(action.src))
+        card = match.def_by_id[cid]
+        inst = CardInstance(base=card, current_hp=card.hp)
+        inst.summoned_this_turn = True
+        inst.attacks_left = 0               # non può attaccare nel turno in cui entra
+        inst.ability_used_this_turn = True  # non può usare abilità nello stesso turno
+        me.field.append(inst)
+        me.dinos_played_this_turn += 1
+        emit(Event(EV_SUMMON, side, idx=len(me.field) - 1, card_id=cid))
+
+    elif kind == ACT_ATTACK:
+        foe_side = opponent(side)
+        attacker = me.field[action.src]
+        target = match.players[foe_side].field[action.dst]
+        emit(Event(EV_ATTACK, side, idx=action.dst, src=action.src))
+        lost = apply_damage(target, attacker.base.atk)
+        emit(Event(EV_DAMAGE, foe_side, idx=action.dst, value=lost))
+        attacker.attacks_left = max(0, attacker.attacks_left - 1)
+        _kill_if_dead(match, foe_side, target, emit)
+
+    elif kind == ACT_ABILITY:
+        _resolve_ability(match, side, action.src, action.dst, emit)
+
+
+def apply_action(match: MatchState, action: Action, on_event: EventSink = None) -> List[Event]:
+    """Esegue la mossa del giocatore di turno. IllegalAction (col messaggio per il toast) se non è consentita."""
+    err = action_error(match, action)
+    if err is not None:
+        raise IllegalAction(err)
+    events: List[Event] = []
+    _apply(match, action, _emitter(events, on_event))
+    return events
+
+
+# =========================
+# AI
+# =========================
+def pick_best_enemy_target(user_field: List[CardInstance]) -> Optional[int]:
+    # Sceglie il target "migliore" tra quelli consentiti (rispetta PROTECT)
+    idxs = candidate_target_indices(user_field)
+    if not idxs:
+        return None
+    # euristica semplice: più basso HP prima (finish), altrimenti leader alla fine
+    def score(i):
+        inst = user_field[i]
+        return (inst.current_hp, 1 if inst.is_leader else 0)
+    return sorted(idxs, key=score)[0]
+
+def pick_best_ally_target(ai_field: List[CardInstance]) -> Optional[int]:
+    if not ai_field:
+        return None
+    # euristica: cura/proteggi chi ha meno hp%, o leader se rischia
+    def score(i):
+        inst = ai_field[i]
+        frac = inst.current_hp / max(1, inst.base.hp)
+        return (frac, 0 if inst.is_leader else 1)
+    return sorted(range(len(ai_field)), key=score)[0]
+
+
+class GreedyPolicy:
+    """
+    L'AI a un passo di sempre, una mossa alla volta:
+      1) energie (max 2), poi 1 dinosauro (il primo in mano)
+      2) abilità in ordine di campo (bersaglio nemico col meno HP, alleato più ferito)
+      3) attacchi normali in ordine di campo (primo bersaglio consentito non leader)
+      4) fine turno
+    choose() non tiene stato: ricalcola la fase dalla partita.
+    """
+
+    def choose(self, match: MatchState) -> Action:
+        side = match.turn
+        me = match.players[side]
+        foe = match.players[opponent(side)]
+
+        # 1) carte dalla mano
+        if me.energy_played_this_turn < ENERGY_PER_TURN:
+            idx = next((i for i, t in enumerate(me.hand) if is_energy_token(t)), None)
+            if idx is not None:
+                return Action(ACT_ENERGY, idx)
+        if me.dinos_played_this_turn < DINOS_PER_TURN and len(me.field) < FIELD_MAX:
+            idx = next((i for i, t in enumerate(me.hand) if is_dino_token(t)), None)
+            if idx is not None:
+                return Action(ACT_SUMMON, idx)
+
+        # 2) abilità
+        for caster_idx, caster in enumerate(me.field):
+            if not can_use_ability_now(caster):
+                continue
+            ab = caster.base.ability
+            if me.energy < ability_cost(ab, 1):
+                continue
+            dst = -1
+            if ab.targets.upper() == "ONE":
+                if ab.type.upper() == "ATTACK":
+                    t = pick_best_enemy_target(foe.field)
+                else:
+                    t = pick_best_ally_target(me.field)
+                if t is None:
+                    continue
+                dst = t
+            else:
+                _err, _target_side, idxs = _ability_targets(match, side, caster_idx, -1)
+                if not idxs:
+                    continue  # es. ATTACK ALL con il campo nemico vuoto: energia sprecata
+            action = Action(ACT_ABILITY, caster_idx, dst)
+            if action_error(match, action) is None:
+                return action
+
+        # 3) attacchi
+        if foe.field:
+            candidates = candidate_target_indices(foe.field)
+            non_leader = [i for i in candidates if not foe.field[i].is_leader]
+            target = non_leader[0] if non_leader else candidates[0]
+            for attacker_idx, attacker in enumerate(me.field):
+                if should_atk_for_attack(attacker):
+                    return Action(ACT_ATTACK, attacker_idx, target)
+
+        return Action(ACT_END)
+
+
+def play_turn(match: MatchState, policy, on_event: EventSink = None) -> List[Event]:
+    """Gioca il turno di match.turn con le mosse di policy.choose() fino a ACT_END o fine partita."""
+    events: List[Event] = []
+    side = match.turn
+    while match.winner is None and match.turn == side:
+        events.extend(apply_action(match, policy.choose(match), on_event))
+    return events
@@ -0,0 +1,219 @@
+# game_09_sim.py
+# Simulatore di bilanciamento di DinoWar: partite AI contro AI senza grafica, su tutti i core.
+#
+#     python game_09_sim.py                              # 100000 partite, tutti i core
+#     python game_09_sim.py --matches 2000000 --seed 7 --json balance.json
+#     python game_09_sim.py --cards altre_carte.properties --workers 1
+#
+# Ogni partita nasce da un seed (stesso seed = stessa partita): fazione dell'utente, leader di
+# entrambi i lati (a caso tra le carte della fazione, come il leader dell'AI nel gioco) e mazzi.
+# Entrambi i lati giocano con GreedyPolicy (l'AI "facile"); la ricerca di game_09_ai è troppo lenta
+# per milioni di partite. L'utente inizia sempre, come nel gioco.
+#
+# Report (percentuale di vittorie del lato che ha quella caratteristica):
+#   - per fazione, per lato (chi inizia), per leader
+#   - per carta e per tipo di abilità: partite in cui il mazzo ne contiene almeno una copia
+#   - durata media in turni, partite senza vincitore entro --max-turns
+# In fondo il throughput in partite al secondo, da confrontare dopo ogni modifica alle carte.
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Tuple
+
+from game_09_rules import (
+    AI, FACTION_CARN, FACTION_HERB, USER,
+    CardDef, GreedyPolicy, deal_initial_hands, is_dino_token, load_cards_from_json, new_match,
+    other_faction, play_turn, start_turn, token_dino_id,
+)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JSON_PATH = os.path.join(BASE_DIR, "game_09_data", "game_09.properties")
+
+DEFAULT_MATCHES = 100_000
+DEFAULT_MAX_TURNS = 200     # oltre: partita senza vincitore (stallo)
+CHUNK = 2_000               # partite per pacchetto di lavoro di un processo
+
+SIDE_NAMES = {USER: "utente (inizia)", AI: "AI (secondo)"}
+
+# stato del processo di lavoro (impostato da _init_worker)
+_cards: List[CardDef] = []
+_by_faction: Dict[str, List[CardDef]] = {}
+_max_turns = DEFAULT_MAX_TURNS
+
+
+def _init_worker(cards_path: str, max_turns: int) -> None:
+    global _cards, _by_faction, _max_turns
+    _cards = load_cards_from_json(cards_path)
+    _by_faction = {f: [c for c in _cards if c.faction == f] for f in (FACTION_HERB, FACTION_CARN)}
+    _max_turns = max_turns
+
+
+def play_match(seed: int) -> Tuple[Optional[int], int, List[dict]]:
+    """Una partita dal seed. Ritorna (vincitore o None, turni giocati, descrizione dei due lati)."""
+    rng = random.Random(seed)
+    faction_user = rng.choice((FACTION_HERB, FACTION_CARN))
+    leader_user = rng.choice(_by_faction[faction_user]).id
+    leader_ai = rng.choice(_by_faction[other_faction(faction_user)]).id
+    match = new_match(_cards, faction_user, leader_user, leader_ai, rng)
+
+    # il mazzo va letto prima della pesca: poi le carte finiscono in mano, in campo e negli scarti
+    sides = []
+    for p in match.players:
+        ids = {token_dino_id(t) for t in p.deck if is_dino_token(t)}
+        sides.append({
+            "faction": p.faction,
+            "leader": p.leader.base.id,
+            "cards": ids,
+            "abilities": {match.def_by_id[cid].ability.type for cid in ids},
+        })
+
+    policy = GreedyPolicy()
+    deal_initial_hands(match)
+    start_turn(match)
+    while match.winner is None and match.turn_number <= _max_turns:
+        play_turn(match, policy)
+    return match.winner, match.turn_number, sides
+
+
+def run_chunk(seeds: range) -> dict:
+    """Aggregati di un pacchetto di partite (sommabili con merge_stats)."""
+    games: Counter = Counter()      # (categoria, chiave) -> partite
+    wins: Counter = Counter()       # (categoria, chiave) -> vittorie
+    turns = 0
+    stalls = 0
+    for seed in seeds:
+        winner, n_turns, sides = play_match(seed)
+        turns += n_turns
+        if winner is None:
+            stalls += 1
+        for side, info in enumerate(sides):
+            keys = [("faction", info["faction"]), ("side", side), ("leader", info["leader"])]
+            keys += [("card", cid) for cid in info["cards"]]
+            keys += [("ability", ab) for ab in info["abilities"]]
+            games.update(keys)
+            if winner == side:
+                wins.update(keys)
+    return {"matches": len(seeds), "turns": turns, "stalls": stalls, "games": games, "wins": wins}
+
+
+def merge_stats(total: dict, part: dict) -> None:
+    total["matches"] += part["matches"]
+    total["turns"] += part["turns"]
+    total["stalls"] += part["stalls"]
+    total["games"].update(part["games"])
+    total["wins"].update(part["wins"])
+
+
+def simulate(matches: int, seed: int = 0, workers: Optional[int] = None,
+             cards_path: str = JSON_PATH, max_turns: int = DEFAULT_MAX_TURNS) -> dict:
+    """Gioca `matches` partite dai seed seed..seed+matches-1, divise in pacchetti tra `workers` processi."""
+    workers = workers or os.cpu_count() or 1
+    chunks = [range(s, min(s + CHUNK, seed + matches)) for s in range(seed, seed + matches, CHUNK)]
+    total = {"matches": 0, "turns": 0, "stalls": 0, "games": Counter(), "wins": Counter()}
+
+    t0 = time.perf_counter()
+    if workers == 1:
+        _init_worker(cards_path, max_turns)
+        for chunk in chunks:
+            merge_stats(total, run_chunk(chunk))
+    else:
+        with Pool(workers, initializer=_init_worker, initargs=(cards_path, max_turns)) as pool:
+            for part in pool.imap_unordered(run_chunk, chunks):
+                merge_stats(total, part)
+    total["seconds"] = time.perf_counter() - t0
+    total["workers"] = workers
+    return total
+
+
+def build_report(total: dict, cards: List[CardDef]) -> dict:
+    """
+    Tabelle per categoria: [{"key", "name", "games", "wins", "win_rate"}, ...] ordinate per win rate.
+    Leader e carte hanno anche "vs_faction": win rate meno quello della loro fazione (le carte di
+    una fazione forte vincono comunque, conta la differenza).
+    """
+    names = {c.id: c.name for c in cards}
+    faction_of = {c.id: c.faction for c in cards}
+    faction_rate = {
+        key: total["wins"][(cat, key)] / n for (cat, key), n in total["games"].items() if cat == "faction"
+    }
+    tables: Dict[str, List[dict]] = {}
+    for (cat, key), n in total["games"].items():
+        w = total["wins"][(cat, key)]
+        if cat in ("leader", "card"):
+            name = f"{key} {names.get(key, '?')}"
+        elif cat == "side":
+            name = SIDE_NAMES[key]
+        else:
+            name = str(key)
+        row = {"key": key, "name": name, "games": n, "wins": w, "win_rate": w / n}
+        if cat in ("leader", "card") and faction_of.get(key) in faction_rate:
+            row["vs_faction"] = w / n - faction_rate[faction_of[key]]
+        tables.setdefault(cat, []).append(row)
+    for rows in tables.values():
+        rows.sort(key=lambda r: r["win_rate"], reverse=True)
+
+    matches = max(1, total["matches"])
+    return {
+        "matches": total["matches"],
+        "avg_turns": total["turns"] / matches,
+        "stall_rate": total["stalls"] / matches,
+        "seconds": round(total["seconds"], 3),
+        "workers": total["workers"],
+        "matches_per_s": round(total["matches"] / max(1e-9, total["seconds"]), 1),
+        "tables": tables,
+    }
+
+
+def print_report(report: dict) -> None:
+    titles = [
+        ("faction", "Fazione"),
+        ("side", "Lato"),
+        ("leader", "Leader"),
+        ("card", "Carta nel mazzo"),
+        ("ability", "Tipo di abilità nel mazzo"),
+    ]
+    for cat, title in titles:
+        rows = report["tables"].get(cat, [])
+        print(f"\n{title}")
+        for r in rows:
+            line = f"  {r['name']:<28} {r['win_rate'] * 100:6.2f}%   ({r['wins']}/{r['games']})"
+            if "vs_faction" in r:
+                line += f"   {r['vs_faction'] * 100:+6.2f} vs fazione"
+            print(line)
+
+    print(f"\nPartite: {report['matches']}   durata media: {report['avg_turns']:.2f} turni"
+          f"   senza vincitore: {report['stall_rate'] * 100:.2f}%")
+    print(f"Throughput: {report['matches_per_s']:.0f} partite/s"
+          f" ({report['seconds']:.1f} s, {report['workers']} processi)")
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="Simulatore di bilanciamento DinoWar (AI contro AI)")
+    p.add_argument("--matches", type=int, default=DEFAULT_MATCHES, help="numero di partite")
+    p.add_argument("--seed", type=int, default=0, help="primo seed (le partite usano seed..seed+matches-1)")
+    p.add_argument("--workers", type=int, default=None, help="processi (default: tutti i core)")
+    p.add_argument("--cards", default=JSON_PATH, help="file delle carte (default: game_09.properties)")
+    p.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS, help="turni massimi per partita")
+    p.add_argument("--json", default=None, help="salva anche il report in JSON")
+    args = p.parse_args(argv)
+
+    total = simulate(args.matches, args.seed, args.workers, args.cards, args.max_turns)
+    report = build_report(total, load_cards_from_json(args.cards))
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,10 @@
 import os
 import sys
-import json
-import argparse
-import time
 import math
 import random
 
 import pygame
 
-# Tenta di importare python-vlc per il video intro
-try:
-    import vlc
-except ImportError:
-    vlc = None
-
 # ----------------------------------------------------------------------
 # COSTANTI GENERALI
 # ----------------------------------------------------------------------
@@ -61,6 +52,17 @@ MEDIA_DIR = os.path.join(BASE_DIR, "game_12_media")
 PROPERTIES_PATH = os.path.join(DATA_DIR, "game_12.properties")
 FONT_PATH = os.path.join(MEDIA_DIR, "Sadannes.ttf")
 
+# moduli condivisi (jacoplay_sdk/ nella root di Jacoplay)
+JACOPLAY_ROOT = os.path.dirname(os.path.dirname(BASE_DIR))
+if JACOPLAY_ROOT not in sys.path:
+    sys.path.insert(0, JACOPLAY_ROOT)
+
+from jacoplay_sdk.assets import get_asset_cache
+from jacoplay_sdk.loop import GameLoop, Scene
+from jacoplay_sdk.props import PropertiesStore
+from jacoplay_sdk.result import exit_with_score, parse_score_arg
+from jacoplay_sdk.video import play_video
+
 INTRO_VIDEO_PATH = os.path.join(MEDIA_DIR, "intro.mp4")
 
 BKG_MENU_PATH = os.path.join(MEDIA_DIR, "bkg_menu.png")
@@ -102,6 +104,9 @@ CHAR_FRAMES_FILES = [
     "jac_08.png",  # 8 - fermo in piedi
 ]
 
+# Rotazione del salto pre-calcolata a passi di JUMP_ANGLE_STEP gradi (90 frame)
+JUMP_ANGLE_STEP = 4
+
 MUSIC_MENU_PATH = os.path.join(MEDIA_DIR, "music_menu.mp3")
 MUSIC_GAME_PATH = os.path.join(MEDIA_DIR, "music_game.mp3")
 
@@ -115,6 +120,9 @@ AQUILA2_PATH = os.path.join(MEDIA_DIR, "aquila02.png")
 # Spawn ostacoli: ogni X secondi con X casuale tra 3 e 5
 OBST_MIN_GAP_TIME = 3.0
 OBST_MAX_GAP_TIME = 5.0
+# Ostacoli vivi al massimo (a 20% attraversano lo schermo in ~6s: ne bastano 2-3; se pieno lo spawn salta)
+OBSTACLE_POOL_SIZE = 8
+OBSTACLE_CULL_X = INTERNAL_RESOLUTION[0] + 200  # oltre questa X l'ostacolo è uscito a destra
 
 # Quote Y fisse (top-left) da specifica
 FOCA_Y = 575
@@ -126,94 +134,48 @@ AQUILA_Y = 317
 AQUILA_EXTRA_SPEED = 100.0
 AQUILA_ANIM_PERIOD = 0.18  # alternanza frame (puoi tarare)
 
-# ----------------------------------------------------------------------
-# UTILITÀ LETTURA/SCRITTURA PROPERTIES
-# ----------------------------------------------------------------------
+# Simulazione a passo fisso (accumulatore in run_game)
+SIM_DT = 1.0 / 60.0
+SIM_MAX_STEPS = 5          # passi massimi per frame: oltre, il tempo in eccesso si perde
+END_FREEZE_TIME = 0.0      # "freeze frame" dopo auto/camion prima della schermata OK/KO (s)
 
-def load_properties():
-    """Carica game_12.properties; se non esiste, crea default con primorun=True."""
-    props = {"primorun": True}
-    os.makedirs(DATA_DIR, exist_ok=True)
+# Azioni per RunnerSimulation.step()
+INPUT_JUMP = "jump"
+INPUT_SLIDE = "slide"
+JUMP_KEYS = (pygame.K_UP, pygame.K_w, pygame.K_SPACE)
+SLIDE_KEYS = (pygame.K_DOWN, pygame.K_s, pygame.K_LCTRL, pygame.K_RCTRL)
 
-    if os.path.exists(PROPERTIES_PATH):
-        try:
-            with open(PROPERTIES_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                if isinstance(data, dict):
-                    props.update(data)
-        except Exception as e:
-            print(f"Impossibile leggere {PROPERTIES_PATH}: {e}", file=sys.stderr)
+# Animazione corsa: jac_00..jac_03, 1/32 s per frame a 100% (molto veloce)
+RUN_FRAME_COUNT = 4
+TIME_PER_FRAME_AT_MAX_SPEED = 1.0 / 32.0
 
-    return props
-
-
-def save_properties(props):
-    """Salva le properties sul disco."""
-    os.makedirs(DATA_DIR, exist_ok=True)
-    try:
-        with open(PROPERTIES_PATH, "w", encoding="utf-8") as f:
-            json.dump(props, f, indent=2, ensure_ascii=False)
-    except Exception as e:
-        print(f"Impossibile scrivere {PROPERTIES_PATH}: {e}", file=sys.stderr)
+# Auto/camion: nel gioco 200px = 1m
+PX_PER_M = 200.0
+AUTO_Y = 362
+TRUCK_Y = 56
+WHEEL_DEG_PER_SEC = 720.0  # rotazione antioraria 360° ogni 0.5s
 
+# Barra distanza: inizia da X=168, larga 1524px
+BAR_START_X = 168
+BAR_WIDTH_PX = 1524
+BAR_METERS = 200.0
 
 # ----------------------------------------------------------------------
-# RIPRODUZIONE INTRO CON VLC
+# UTILITÀ LETTURA/SCRITTURA PROPERTIES
 # ----------------------------------------------------------------------
 
-def play_intro_video():
-    """
-    Riproduce il video di intro in fullscreen con python-vlc.
-    Ritorna quando il video è terminato o quando l'utente chiude/ESC.
-    Se vlc non è disponibile o il file manca, non fa nulla.
-    """
-    if vlc is None:
-        print("python-vlc non disponibile: salto il video di intro.", file=sys.stderr)
-        return
-
-    if not os.path.exists(INTRO_VIDEO_PATH):
-        print(f"Video intro non trovato: {INTRO_VIDEO_PATH}", file=sys.stderr)
-        return
-
-    # Istanza VLC
-    instance = vlc.Instance()
-    player = instance.media_player_new()
-
-    media = instance.media_new(INTRO_VIDEO_PATH)
-    player.set_media(media)
-
-    # Fullscreen
-    try:
-        player.set_fullscreen(True)
-    except Exception:
-        pass
-
-    # Avvia riproduzione
-    player.play()
-    time.sleep(0.2)  # piccolo delay per far partire il video
-
-    # Loop finché il video è in riproduzione
-    running = True
-    while running:
-        state = player.get_state()
-        if state in (vlc.State.Ended, vlc.State.Error, vlc.State.Stopped):
-            break
+def load_properties():
+    """Properties di game_12 (game_12.properties); se il file non esiste, default con primorun=True."""
+    return PropertiesStore(PROPERTIES_PATH, defaults={"primorun": True})
 
-        # Gestione di ESC / chiusura finestra Pygame
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                running = False
 
-        time.sleep(0.01)
+# ----------------------------------------------------------------------
+# RIPRODUZIONE INTRO
+# ----------------------------------------------------------------------
 
-    player.stop()
-    # Esce da fullscreen se possibile
-    try:
-        player.set_fullscreen(False)
-    except Exception:
-        pass
+def play_intro_video():
+    """Video di intro a schermo intero (saltato se python-vlc o il file mancano)."""
+    play_video(INTRO_VIDEO_PATH)
 
 
 # ----------------------------------------------------------------------
@@ -226,11 +188,7 @@ def show_instructions_screen(screen, clock, font_menu):
     La musica del menu NON viene interrotta.
     Si esce con un tasto qualunque o click.
     """
-    try:
-        bkg_instr = pygame.image.load(BKG_ISTRUZIONI_PATH).convert()
-    except Exception as e:
-        print(f"Errore caricando bkg_istruzioni: {e}", file=sys.stderr)
-        bkg_instr = None
+    bkg_instr = get_asset_cache().image(BKG_ISTRUZIONI_PATH, alpha=False)
 
     running = True
     while running:
@@ -260,699 +218,601 @@ def show_instructions_screen(screen, clock, font_menu):
 
 def load_character_frames():
     """Carica tutti i frame del personaggio."""
-    frames = []
-    for fname in CHAR_FRAMES_FILES:
-        path = os.path.join(MEDIA_DIR, fname)
-        try:
-            img = pygame.image.load(path).convert_alpha()
-        except Exception as e:
-            print(f"Errore caricando frame personaggio {fname}: {e}", file=sys.stderr)
-            # fallback: piccolo quadrato visibile
-            img = pygame.Surface((50, 50), pygame.SRCALPHA)
-            img.fill((255, 0, 255, 255))
-        frames.append(img)
-    return frames
+    cache = get_asset_cache()
+    # fallback: piccolo quadrato visibile
+    return [cache.image(os.path.join(MEDIA_DIR, fname), fallback_size=(50, 50)) for fname in CHAR_FRAMES_FILES]
 
 
-def run_game(screen, clock, font_menu):
+def _frame_asset(surf, offset=(0, 0), size=None):
     """
-    Loop di gioco:
-    - sfondo a due livelli con parallasse
-    - personaggio che corre / salta / scivola in posizione fissa
-    - ostacoli che arrivano da sinistra
-    - musica di gioco in loop
-    ESC → ritorno al menu.
+    (surface, mask, pixel opachi, offset, size) di un frame del personaggio.
+    size = rect "logico" del frame (quello usato per posizione e punteggio),
+    offset = posizione della surface dentro quel rect.
     """
+    mask = pygame.mask.from_surface(surf)
+    return (surf, mask, mask.count() or 1, offset, size or surf.get_size())
 
-    game_result = None  # None / "ok" / "ko"
-    frozen = False
-    freeze_timer = 0.0
-
-
-    # Musica di gioco
-    if os.path.exists(MUSIC_GAME_PATH):
-        try:
-            pygame.mixer.music.load(MUSIC_GAME_PATH)
-            pygame.mixer.music.play(-1)
-        except Exception as e:
-            print(f"Errore caricando music_game: {e}", file=sys.stderr)
-    else:
-        print(f"File musica gioco non trovato: {MUSIC_GAME_PATH}", file=sys.stderr)
-
-    # Carica sfondi mantenendo l'alpha (PNG con trasparenza)
-    try:
-        bkg0_1 = pygame.image.load(BKG0_1_PATH).convert_alpha()
-    except Exception as e:
-        print(f"Errore caricando bkg_0_1: {e}", file=sys.stderr)
-        bkg0_1 = pygame.Surface(INTERNAL_RESOLUTION, pygame.SRCALPHA)
-        bkg0_1.fill((30, 30, 30, 255))
-
-    try:
-        bkg0_2 = pygame.image.load(BKG0_2_PATH).convert_alpha()
-    except Exception as e:
-        print(f"Errore caricando bkg_0_2: {e}", file=sys.stderr)
-        bkg0_2 = bkg0_1.copy()
-
-    try:
-        bkg1 = pygame.image.load(BKG1_PATH).convert_alpha()
-    except Exception as e:
-        print(f"Errore caricando bkg_1: {e}", file=sys.stderr)
-        bkg1 = pygame.Surface(INTERNAL_RESOLUTION, pygame.SRCALPHA)
-        bkg1.fill((60, 60, 60, 255))
-
-    bkg0_width = bkg0_1.get_width()
-    bkg1_width = bkg1.get_width()
-
-    # UI distanza (barra + testa)
-    try:
-        barra_img = pygame.image.load(BARRA_PATH).convert_alpha()
-    except Exception as e:
-        print(f"Errore caricando barra.png: {e}", file=sys.stderr)
-        barra_img = None
-
-    try:
-        testa_img = pygame.image.load(TESTA_PATH).convert_alpha()
-    except Exception as e:
-        print(f"Errore caricando testa.png: {e}", file=sys.stderr)
-        testa_img = None
-
-    testa_w = testa_img.get_width() if testa_img else 78  # in specifica 78px
-    testa_half = testa_w // 2  # centro orizzontale (39 se 78)
-
-
-    # Tachimetro (UI)
-    try:
-        tachimetro_img = pygame.image.load(TACHIMETRO_PATH).convert_alpha()
-    except Exception as e:
-        print(f"Errore caricando tachimetro.png: {e}", file=sys.stderr)
-        tachimetro_img = None
 
-    # -------------------------
-    # AUTO + CAMION (sprite + maschere + suoni)
-    # -------------------------
-    def _load_img(path, fallback_size=(100, 60)):
-        try:
-            return pygame.image.load(path).convert_alpha()
-        except Exception as e:
-            print(f"Errore caricando {path}: {e}", file=sys.stderr)
-            s = pygame.Surface(fallback_size, pygame.SRCALPHA)
-            s.fill((255, 0, 255, 200))
-            return s
-
-    auto_img = _load_img(AUTO_PATH, (300, 150))
-    camion_img = _load_img(CAMION_PATH, (500, 250))
-    ruota_auto_img = _load_img(RUOTA_AUTO_PATH, (80, 80))
-    ruota_camion_img = _load_img(RUOTA_CAMION_PATH, (120, 120))
-
-    auto_mask = pygame.mask.from_surface(auto_img)
-    camion_mask = pygame.mask.from_surface(camion_img)
-
-    # Ruote: rotazione antioraria 360° ogni 0.5s => 720°/s
-    wheel_angle = 0.0
-    WHEEL_DEG_PER_SEC = 720.0
-
-    # Distanze iniziali (metri)
-    # auto: 50m a sinistra (già la usi come car_distance_m)
-    # camion: ora lo hai portato a 150m a destra
-    truck_distance_m = 150.0
-
-    # Suoni su canali dedicati
-    auto_motor_snd = None
-    truck_motor_snd = None
-    truck_horn_snd = None
-
-    try:
-        auto_motor_snd = pygame.mixer.Sound(MOTORE_AUTO_PATH)
-    except Exception as e:
-        print(f"Errore caricando {MOTORE_AUTO_PATH}: {e}", file=sys.stderr)
-
-    try:
-        truck_motor_snd = pygame.mixer.Sound(MOTORE_CAMION_PATH)
-    except Exception as e:
-        print(f"Errore caricando {MOTORE_CAMION_PATH}: {e}", file=sys.stderr)
-
-    try:
-        truck_horn_snd = pygame.mixer.Sound(CLACSON_CAMION_PATH)
-    except Exception as e:
-        print(f"Errore caricando {CLACSON_CAMION_PATH}: {e}", file=sys.stderr)
-
-    ch_auto = pygame.mixer.Channel(1)
-    ch_truck = pygame.mixer.Channel(2)
-    ch_horn = pygame.mixer.Channel(3)
-
-    def stop_vehicle_audio():
-        try:
-            ch_auto.stop()
-            ch_truck.stop()
-            ch_horn.stop()
-        except Exception:
-            pass
-    
-
-    auto_motor_on = False
-    truck_motor_on = False
-    truck_was_visible = False
-
-    # Carica frame personaggio
-    char_frames = load_character_frames()
-    run_frames = char_frames[0:4]  # jac_00..jac_03
-
-    # Stati/parametri legati al personaggio
-    speed_level = 1  # 20% all'avvio
-    speed_factor = SPEED_LEVEL_FACTORS[speed_level]
-    current_speed = speed_factor * MAX_SPEED_PX  # px/s
-
-    char_y = float(CHAR_Y)
-    char_state = "run"     # "run", "jump", "slide"
-    jump_vy = 0.0          # velocità verticale nel salto
-    slide_timer = 0.0      # tempo residuo di scivolata
-    jump_elapsed = 0.0     # tempo trascorso dall'inizio del salto
-    # Salto dinamico (gravità e velocità iniziale scalate col livello)
-    jump_g = GRAVITY
-    jump_v0 = JUMP_VELOCITY
-
-    # Frame base per la rotazione del salto
-    jump_base_frame = char_frames[5]  # jac_05.png
-
-    # Animazione corsa
-    run_frame_index = 0
-    run_frame_timer = 0.0
-    TIME_PER_FRAME_AT_MAX_SPEED = 1.0 / 32.0  # 1/32 s per frame a 100% (molto veloce)
-
-    # Punteggio e gestione impatti ostacoli
-    points = 0
-    # Progressione dentro al livello corrente (0,1,2) -> larghezze 15/30/45 solo per l'ULTIMO rettangolo
-    level_progress = 0
-    # Distanza tra auto e personaggio in metri (positiva se l'auto è più avanti a sinistra)
-    # Inizio: 50m come da specifica
-    car_distance_m = 50.0
-
-    # Blink per urto <5%
-    invuln_timer = 0.0
-    blink_timer = 0.0
-    blink_visible = True
-
-    # Knockdown per urto >5%
-    knock_timer = 0.0
-    knock_frame = None  # 6 o 7
-
-    # Scroll sfondi (offset iniziali)
-    offset0 = 0.0  # livello 0
-    offset1 = 0.0  # livello 1
-
-    # -------------------------
-    # Ostacoli (specifica)
-    # -------------------------
-    def _load_png_or_fallback(path, size, rgba):
-        try:
-            return pygame.image.load(path).convert_alpha()
-        except Exception:
-            s = pygame.Surface(size, pygame.SRCALPHA)
-            s.fill(rgba)
-            return s
-
-    foca_img = _load_png_or_fallback(FOCA_PATH, (140, 110), (200, 200, 255, 255))
-    renna_img = _load_png_or_fallback(RENNA_PATH, (140, 140), (200, 255, 200, 255))
-    wolp_img = _load_png_or_fallback(WOLPERTINGER_PATH, (150, 120), (255, 200, 200, 255))
-    aquila1_img = _load_png_or_fallback(AQUILA1_PATH, (120, 80), (255, 255, 0, 255))
-    aquila2_img = _load_png_or_fallback(AQUILA2_PATH, (120, 80), (255, 220, 0, 255))
-
-    foca_mask = pygame.mask.from_surface(foca_img)
-    renna_mask = pygame.mask.from_surface(renna_img)
-    wolp_mask = pygame.mask.from_surface(wolp_img)
-    aquila1_mask = pygame.mask.from_surface(aquila1_img)
-    aquila2_mask = pygame.mask.from_surface(aquila2_img)
-
-    # Stato animazione aquila
-    aquila_anim_timer = 0.0
-    aquila_anim_idx = 0  # 0 -> aquila01, 1 -> aquila02
-
-    obstacles = []  # lista di dict: {"type": "low"/"high", "x": float, "y": float, "img": surf}
-    spawn_timer = 0.0
-    next_spawn_time = random.uniform(OBST_MIN_GAP_TIME, OBST_MAX_GAP_TIME)
-
-    running = True
-    while running:
-        dt = clock.tick(60) / 1000.0  # secondi
-        if frozen:
-            # Congela tutto: niente update logica/animazioni.
-            freeze_timer -= dt
-            if freeze_timer <= 0.0:
-                running = False  # usciamo dal loop e andiamo alla schermata OK/KO
-            dt_logic = 0.0
-        else:
-            dt_logic = dt
-        
-
-        # Aggiorna animazione aquila (alternanza aquila01/aquila02)
-        aquila_anim_timer += dt_logic
-        if aquila_anim_timer >= AQUILA_ANIM_PERIOD:
-            aquila_anim_timer -= AQUILA_ANIM_PERIOD
-            aquila_anim_idx = 1 - aquila_anim_idx
-   
-        # -------------------------
-        # EVENTI
-        # -------------------------
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit(0)
-
-            elif event.type == pygame.KEYDOWN:
-                # ESC → esci dal gioco e torna al menu
-                if event.key == pygame.K_ESCAPE:
-                    running = False
+def build_character_assets(char_frames):
+    """
+    Pre-calcola surface/maschera/conteggio pixel per ogni frame del personaggio e per gli
+    angoli del salto quantizzati: nel loop di gioco la collisione pixel-perfect è solo una lettura.
+    Ritorna (asset per indice di frame, asset del salto per indice di angolo).
+    """
+    frames = [_frame_asset(f) for f in char_frames]
 
-                # SALTO: freccia su / W / SPAZIO
-                elif event.key in (pygame.K_UP, pygame.K_w, pygame.K_SPACE):
-                    if char_state == "run":
-                        char_state = "jump"
+    # salto: si ruota solo il riquadro non trasparente di jac_05 (molta meno memoria),
+    # rimettendolo dove starebbe ruotando l'intero frame attorno al suo centro
+    base = char_frames[5]
+    bw, bh = base.get_size()
+    crop = base.get_bounding_rect()
+    if crop.width == 0 or crop.height == 0:
+        crop = base.get_rect()
+    cropped = base.subsurface(crop).copy()
+    vx = crop.centerx - bw / 2.0
+    vy = crop.centery - bh / 2.0
 
-                        duration_scale = 0.99 ** max(0, speed_level - 1)
+    jump = []
+    for i in range(360 // JUMP_ANGLE_STEP):
+        angle = i * JUMP_ANGLE_STEP
+        t = math.radians(angle)
+        cos_t, sin_t = math.cos(t), math.sin(t)
+        # dimensione del frame intero ruotato (come pygame.transform.rotate)
+        full_w = int(abs(bw * cos_t) + abs(bh * sin_t) + 1e-6)
+        full_h = int(abs(bw * sin_t) + abs(bh * cos_t) + 1e-6)
 
-                        # Per avere un salto PIÙ CORTO quando vai veloce,
-                        # bisogna aumentare "k" (accelera la fisica):
-                        # k = 1/duration_scale  -> livello 2: 1/0.9=1.111...  (salto -10%)
-                        k = 1.0 / duration_scale
+        rotated = pygame.transform.rotate(cropped, angle)
+        rx = vx * cos_t + vy * sin_t       # rotazione antioraria (y verso il basso)
+        ry = -vx * sin_t + vy * cos_t
+        ox = math.floor(full_w / 2.0 + rx - rotated.get_width() / 2.0 + 0.5)
+        oy = math.floor(full_h / 2.0 + ry - rotated.get_height() / 2.0 + 0.5)
+        jump.append(_frame_asset(rotated, (ox, oy), (full_w, full_h)))
+    return frames, jump
 
-                        # Scaliamo insieme v0 e g con k: altezza invariata, tempo /k
-                        jump_v0 = JUMP_VELOCITY * k
-                        jump_g = GRAVITY * k
 
-                        jump_vy = -jump_v0
-                        jump_elapsed = 0.0
+def _load_img(path, fallback_size=(100, 60), rgba=(255, 0, 255, 200)):
+    return get_asset_cache().image(path, fallback_size=fallback_size, fallback_color=rgba)
 
-                # SCIVOLATA: freccia giù / S / CTRL
-                elif event.key in (pygame.K_DOWN, pygame.K_s, pygame.K_LCTRL, pygame.K_RCTRL):
-                    if char_state == "run":
-                        char_state = "slide"
-                        duration_scale = 0.9 ** max(0, speed_level - 1)
-                        slide_timer = SLIDE_DURATION * duration_scale
 
-        # -------------------------
-        # LOGICA GIOCO
-        # -------------------------
+def _load_img_optional(path):
+    return get_asset_cache().image(path)
 
-        # Aggiorna velocità (per ora resta fissa al 20%)
-        speed_factor = SPEED_LEVEL_FACTORS[speed_level]
-        current_speed = speed_factor * MAX_SPEED_PX
 
-        # Auto: velocità costante = 50% della velocità massima del personaggio (px/s)
-        car_speed_px = 0.5 * MAX_SPEED_PX
+def _load_sound(path):
+    return get_asset_cache().sound(path)
 
-        # Nel gioco 200px = 1m
-        # Se il bambino è più veloce dell'auto, la distanza diminuisce (si avvicina).
-        # Se è più lento, la distanza aumenta (si allontana).
-        rel_speed_px = car_speed_px - current_speed  # + => auto scappa
-        car_distance_m += (rel_speed_px * dt_logic) / 200.0
 
-        # Camion: velocità costante = 50% MAX, ma sta dietro (a destra).
-        truck_speed_px = 0.5 * MAX_SPEED_PX
+class ObstacleKind:
+    """Tipo di ostacolo: frame (surface, mask) precalcolati, quota Y e velocità extra rispetto allo sfondo."""
 
-        # Se il bambino è più veloce del camion, la distanza aumenta (si allontana).
-        # Se è più lento, la distanza diminuisce (il camion si avvicina).
-        truck_distance_m += ((current_speed - truck_speed_px) * dt_logic) / 200.0
-     
-        # Aggiorna scroll sfondi
-        # Il personaggio corre verso sinistra → sfondi scorrono verso destra (x crescente)
-        offset1 += current_speed * dt_logic
-        offset0 += current_speed * 0.1 * dt_logic  # livello 0 al 10% della velocità del personaggio
+    __slots__ = ("name", "frames", "y", "extra_speed", "spawn_x")
 
-        # Fisica salto / scivolata
-        if char_state == "jump":
-            jump_vy += jump_g * dt_logic
-            char_y += jump_vy * dt_logic
-            jump_elapsed += dt_logic
-
-            if char_y >= CHAR_Y:
-                char_y = float(CHAR_Y)
-                char_state = "run"
-                jump_vy = 0.0
-                jump_elapsed = 0.0
-
-        elif char_state == "slide":
-            slide_timer -= dt_logic
-            if slide_timer <= 0.0:
-                char_state = "run"
+    def __init__(self, name, images, y, extra_speed=0.0):
+        self.name = name
+        self.frames = tuple((img, pygame.mask.from_surface(img)) for img in images)
+        self.y = float(y)
+        self.extra_speed = extra_speed
+        self.spawn_x = float(-images[0].get_width() - 50)  # “compaiono a sinistra”
 
-        # Wrapping orizzontale per sfondi
-        if bkg1_width > 0:
-            while offset1 > bkg1_width:
-                offset1 -= bkg1_width
 
-        if bkg0_width > 0:
-            while offset0 > bkg0_width:
-                offset0 -= bkg0_width
+class Obstacle:
+    """Record di un ostacolo del pool (riusato: niente allocazioni durante la partita)."""
 
-        # Animazione corsa (solo quando corre)
-        animation_speed_factor = max(speed_factor, 0.05)  # evita divisioni per 0
-        time_per_frame = TIME_PER_FRAME_AT_MAX_SPEED / animation_speed_factor
+    __slots__ = ("kind", "x", "y", "w", "h", "hit_once", "scored", "dead")
 
-        if char_state == "run" and current_speed > 0:
-            run_frame_timer += dt_logic
-            if run_frame_timer >= time_per_frame:
-                run_frame_timer -= time_per_frame
-                run_frame_index = (run_frame_index + 1) % len(run_frames)
+    def __init__(self):
+        self.kind = None
+        self.x = 0.0
+        self.y = 0.0
+        self.w = 0
+        self.h = 0
+        self.hit_once = False
+        self.scored = False
+        self.dead = False
 
-        # -------------------------
-        # OSTACOLI: spawn e movimento
-        # -------------------------
-        spawn_timer += dt_logic
-        if spawn_timer >= next_spawn_time:
-            spawn_timer -= next_spawn_time
-
-            obst_type = random.choice(["foca", "renna", "wolpertinger", "aquila"])
-
-            if obst_type == "foca":
-                img = foca_img
-                mask = foca_mask
-                y = FOCA_Y
-            elif obst_type == "renna":
-                img = renna_img
-                mask = renna_mask
-                y = RENNA_Y
-            elif obst_type == "wolpertinger":
-                img = wolp_img
-                mask = wolp_mask
-                y = WOLPERTINGER_Y
-            else:
-                # aquila: animata (img/mask cambiano al volo)
-                img = aquila1_img
-                mask = aquila1_mask
-                y = AQUILA_Y
 
-            x = -img.get_width() - 50  # “compaiono a sinistra”
-            obstacles.append({
-                "type": obst_type,
-                "x": float(x),
-                "y": float(y),
-                "img": img,
-                "mask": mask,
-                "hit_once": False,
-                "scored": False,
-            })
+class ObstaclePool:
+    """
+    Pool a capacità fissa: i vivi sono items[0:count], in ordine di spawn (= ordine di disegno).
+    kill() marca soltanto; compact() li toglie con un passaggio in place che conserva l'ordine
+    (i record morti finiscono in coda, pronti per il prossimo spawn).
+    """
 
-            next_spawn_time = random.uniform(OBST_MIN_GAP_TIME, OBST_MAX_GAP_TIME)
+    def __init__(self, capacity):
+        self.items = [Obstacle() for _ in range(capacity)]
+        self.count = 0
+
+    def spawn(self, kind):
+        """Ritorna il record attivato, None se il pool è pieno."""
+        if self.count >= len(self.items):
+            return None
+        o = self.items[self.count]
+        self.count += 1
+        img = kind.frames[0][0]  # i frame di un tipo hanno la stessa dimensione
+        o.kind = kind
+        o.x = kind.spawn_x
+        o.y = kind.y
+        o.w, o.h = img.get_size()
+        o.hit_once = False
+        o.scored = False
+        o.dead = False
+        return o
+
+    def compact(self):
+        items = self.items
+        j = 0
+        for i in range(self.count):
+            o = items[i]
+            if not o.dead:
+                if i != j:
+                    items[i], items[j] = items[j], o
+                j += 1
+        self.count = j
+
+
+class RunnerAssets:
+    """
+    Immagini, maschere, font e suoni della partita.
+    Caricati una volta per processo (get_assets): rientrare in partita dal menu non ricarica nulla.
+    """
 
+    def __init__(self):
+        # Sfondi (PNG con trasparenza)
+        self.bkg0_1 = _load_img(BKG0_1_PATH, INTERNAL_RESOLUTION, (30, 30, 30, 255))
+        bkg0_2 = _load_img_optional(BKG0_2_PATH)
+        self.bkg0_2 = bkg0_2 if bkg0_2 is not None else self.bkg0_1.copy()
+        self.bkg1 = _load_img(BKG1_PATH, INTERNAL_RESOLUTION, (60, 60, 60, 255))
+        self.bkg0_width = self.bkg0_1.get_width()
+        self.bkg1_width = self.bkg1.get_width()
+
+        # UI distanza (barra + testa) e tachimetro
+        self.barra_img = _load_img_optional(BARRA_PATH)
+        self.testa_img = _load_img_optional(TESTA_PATH)
+        self.tachimetro_img = _load_img_optional(TACHIMETRO_PATH)
+        testa_w = self.testa_img.get_width() if self.testa_img else 78  # in specifica 78px
+        self.testa_half = testa_w // 2  # centro orizzontale (39 se 78)
+        self.font_26 = get_asset_cache().font(FONT_PATH, 26)
+
+        # Auto + camion
+        self.auto_img = _load_img(AUTO_PATH, (300, 150))
+        self.camion_img = _load_img(CAMION_PATH, (500, 250))
+        self.ruota_auto_img = _load_img(RUOTA_AUTO_PATH, (80, 80))
+        self.ruota_camion_img = _load_img(RUOTA_CAMION_PATH, (120, 120))
+        self.auto_mask = pygame.mask.from_surface(self.auto_img)
+        self.camion_mask = pygame.mask.from_surface(self.camion_img)
+
+        self.auto_motor_snd = _load_sound(MOTORE_AUTO_PATH)
+        self.truck_motor_snd = _load_sound(MOTORE_CAMION_PATH)
+        self.truck_horn_snd = _load_sound(CLACSON_CAMION_PATH)
+
+        # Personaggio
+        self.char_frames = load_character_frames()
+        self.char_assets, self.jump_assets = build_character_assets(self.char_frames)
+
+        # Ostacoli
+        self.foca_img = _load_img(FOCA_PATH, (140, 110), (200, 200, 255, 255))
+        self.renna_img = _load_img(RENNA_PATH, (140, 140), (200, 255, 200, 255))
+        self.wolp_img = _load_img(WOLPERTINGER_PATH, (150, 120), (255, 200, 200, 255))
+        self.aquila1_img = _load_img(AQUILA1_PATH, (120, 80), (255, 255, 0, 255))
+        self.aquila2_img = _load_img(AQUILA2_PATH, (120, 80), (255, 220, 0, 255))
+
+        # Tipi di ostacolo, nell'ordine dell'estrazione casuale; l'aquila è animata (2 frame)
+        self.obstacle_kinds = (
+            ObstacleKind("foca", (self.foca_img,), FOCA_Y),
+            ObstacleKind("renna", (self.renna_img,), RENNA_Y),
+            ObstacleKind("wolpertinger", (self.wolp_img,), WOLPERTINGER_Y),
+            ObstacleKind("aquila", (self.aquila1_img, self.aquila2_img), AQUILA_Y, AQUILA_EXTRA_SPEED),
+        )
+
+        # Schermate di fine partita
+        self.bkg_gameover = {
+            "ok": _load_img_optional(BKG_GAMEOVER_OK_PATH),
+            "ko": _load_img_optional(BKG_GAMEOVER_KO_PATH),
+        }
+
+
+_ASSETS = None
+
+
+def get_assets():
+    """Asset della partita: caricati alla prima partita, riusati dalle successive."""
+    global _ASSETS
+    if _ASSETS is None:
+        _ASSETS = RunnerAssets()
+    return _ASSETS
+
+
+def input_for_key(key):
+    """Azione di gioco (INPUT_JUMP / INPUT_SLIDE) associata al tasto, None se nessuna."""
+    if key in JUMP_KEYS:
+        return INPUT_JUMP
+    if key in SLIDE_KEYS:
+        return INPUT_SLIDE
+    return None
+
+
+class RunnerSimulation:
+    """
+    Una partita: tutto lo stato e la logica (fisica, ostacoli, collisioni, punteggio, auto/camion).
+    - step(dt, inputs): avanza di dt secondi; inputs = azioni premute dall'ultimo step
+    - render(surface): disegna lo stato corrente (non modifica lo stato)
+    Non usa finestra, clock né audio: gira anche headless. Con lo stesso seed (e gli stessi input)
+    la sequenza degli ostacoli è identica.
+    """
 
-        # Muovi ostacoli con il mondo (verso destra)
-        for obst in obstacles:
-            extra = AQUILA_EXTRA_SPEED if obst["type"] == "aquila" else 0.0
-            obst["x"] += (current_speed + extra) * dt_logic
+    def __init__(self, assets, seed=None):
+        self.assets = assets
+        self.rng = random.Random(seed)
+
+        self.result = None  # None / "ok" / "ko"
+
+        # Stati/parametri legati al personaggio
+        self.speed_level = 1  # 20% all'avvio
+        self.current_speed = SPEED_LEVEL_FACTORS[self.speed_level] * MAX_SPEED_PX  # px/s
+
+        self.char_y = float(CHAR_Y)
+        self.char_state = "run"     # "run", "jump", "slide"
+        self.jump_vy = 0.0          # velocità verticale nel salto
+        self.slide_timer = 0.0      # tempo residuo di scivolata
+        self.jump_elapsed = 0.0     # tempo trascorso dall'inizio del salto
+        # Salto dinamico (gravità e velocità iniziale scalate col livello)
+        self.jump_g = GRAVITY
+        self.jump_v0 = JUMP_VELOCITY
+
+        # Animazione corsa
+        self.run_frame_index = 0
+        self.run_frame_timer = 0.0
+
+        # Punteggio e gestione impatti ostacoli
+        self.points = 0
+        # Progressione dentro al livello corrente (0,1,2) -> larghezze 15/30/45 solo per l'ULTIMO rettangolo
+        self.level_progress = 0
+        # Distanza tra auto e personaggio in metri (positiva se l'auto è più avanti a sinistra)
+        # Inizio: 50m come da specifica
+        self.car_distance_m = 50.0
+        # camion: 150m a destra
+        self.truck_distance_m = 150.0
+
+        # Blink per urto <5%
+        self.invuln_timer = 0.0
+        self.blink_timer = 0.0
+        self.blink_visible = True
+
+        # Knockdown per urto >5%
+        self.knock_timer = 0.0
+        self.knock_frame = None  # 6 o 7
+
+        # Scroll sfondi (offset iniziali)
+        self.offset0 = 0.0  # livello 0
+        self.offset1 = 0.0  # livello 1
+
+        # Ruote: rotazione antioraria 360° ogni 0.5s
+        self.wheel_angle = 0.0
+
+        # Stato animazione aquila
+        self.aquila_anim_timer = 0.0
+        self.aquila_anim_idx = 0  # 0 -> aquila01, 1 -> aquila02
+
+        self.obstacles = ObstaclePool(OBSTACLE_POOL_SIZE)
+        self.spawn_timer = 0.0
+        self.next_spawn_time = self.rng.uniform(OBST_MIN_GAP_TIME, OBST_MAX_GAP_TIME)
+
+        self._update_vehicles()
+        self._select_character_frame()
 
-        # Rimuovi ostacoli che sono usciti a destra
-        obstacles = [
-            o for o in obstacles
-            if o["x"] < INTERNAL_RESOLUTION[0] + 200
-        ]
+    # -------------------------
+    # Input
+    # -------------------------
+    def _handle_input(self, action):
+        if self.char_state != "run":
+            return
 
-        # AUTO/CAMION: posizione X (in px) riferita alla posizione del personaggio
-        PX_PER_M = 200.0
+        if action == INPUT_JUMP:
+            self.char_state = "jump"
 
-        auto_x = CHAR_X - (car_distance_m * PX_PER_M)
-        auto_y = 362
+            duration_scale = 0.99 ** max(0, self.speed_level - 1)
 
-        truck_x = CHAR_X + (truck_distance_m * PX_PER_M)
-        truck_y = 56
+            # Per avere un salto PIÙ CORTO quando vai veloce,
+            # bisogna aumentare "k" (accelera la fisica):
+            # k = 1/duration_scale  -> livello 2: 1/0.9=1.111...  (salto -10%)
+            k = 1.0 / duration_scale
 
+            # Scaliamo insieme v0 e g con k: altezza invariata, tempo /k
+            self.jump_v0 = JUMP_VELOCITY * k
+            self.jump_g = GRAVITY * k
 
-        # Ruote: aggiorna angolo
-        wheel_angle = (wheel_angle + WHEEL_DEG_PER_SEC * dt_logic) % 360.0
+            self.jump_vy = -self.jump_v0
+            self.jump_elapsed = 0.0
 
-        # Visibilità (parziale) a schermo
-        auto_visible = (auto_x < INTERNAL_RESOLUTION[0]) and (auto_x + auto_img.get_width() > 0)
-        truck_visible = (truck_x < INTERNAL_RESOLUTION[0]) and (truck_x + camion_img.get_width() > 0)
+        elif action == INPUT_SLIDE:
+            self.char_state = "slide"
+            duration_scale = 0.9 ** max(0, self.speed_level - 1)
+            self.slide_timer = SLIDE_DURATION * duration_scale
 
-        # -------------------------
-        # AUDIO AUTO (motore in loop con volume dinamico)
-        # Soglie: start a X=-1525, volume 100% quando X>-1225, 0 quando X<-1525
-        # -------------------------
-        if auto_motor_snd is not None:
-            if auto_x >= -1525 and not auto_motor_on:
-                ch_auto.play(auto_motor_snd, loops=-1)
-                auto_motor_on = True
+    # -------------------------
+    # Step
+    # -------------------------
+    def step(self, dt, inputs=()):
+        if self.result is not None:
+            return  # partita finita: stato congelato
 
-            if auto_motor_on:
-                if auto_x <= -1525:
-                    vol = 0.0
-                elif auto_x >= -1225:
-                    vol = 1.0
-                else:
-                    vol = (auto_x + 1525.0) / 300.0  # 0..1 tra -1525 e -1225
-                vol = max(0.0, min(1.0, vol))
-                ch_auto.set_volume(vol)
+        a = self.assets
 
-                if vol <= 0.0 and auto_x < -1525:
-                    ch_auto.stop()
-                    auto_motor_on = False
+        # Aggiorna animazione aquila (alternanza aquila01/aquila02)
+        self.aquila_anim_timer += dt
+        if self.aquila_anim_timer >= AQUILA_ANIM_PERIOD:
+            self.aquila_anim_timer -= AQUILA_ANIM_PERIOD
+            self.aquila_anim_idx = 1 - self.aquila_anim_idx
 
-        # -------------------------
-        # AUDIO CAMION (motore in loop + clacson quando compare)
-        # Soglie: start a X=2400, volume 100% quando X<1921, 0 quando X>2400
-        # -------------------------
-        if truck_motor_snd is not None:
-            if truck_x <= 2400 and not truck_motor_on:
-                ch_truck.play(truck_motor_snd, loops=-1)
-                truck_motor_on = True
+        for action in inputs:
+            self._handle_input(action)
 
-            if truck_motor_on:
-                if truck_x >= 2400:
-                    vol = 0.0
-                elif truck_x <= 1921:
-                    vol = 1.0
-                else:
-                    vol = (2400.0 - truck_x) / (2400.0 - 1921.0)  # 0..1 tra 2400 e 1921
-                vol = max(0.0, min(1.0, vol))
-                ch_truck.set_volume(vol)
+        # Velocità dal livello
+        speed_factor = SPEED_LEVEL_FACTORS[self.speed_level]
+        self.current_speed = speed_factor * MAX_SPEED_PX
 
-                if vol <= 0.0 and truck_x > 2400:
-                    ch_truck.stop()
-                    truck_motor_on = False
+        # Auto: velocità costante = 50% della velocità massima del personaggio (px/s)
+        car_speed_px = 0.5 * MAX_SPEED_PX
 
-        # Clacson: una volta quando compare a schermo, e di nuovo se scompare e ricompare
-        if truck_visible and not truck_was_visible:
-            if truck_horn_snd is not None:
-                ch_horn.play(truck_horn_snd)
-        truck_was_visible = truck_visible
+        # Nel gioco 200px = 1m
+        # Se il bambino è più veloce dell'auto, la distanza diminuisce (si avvicina).
+        # Se è più lento, la distanza aumenta (si allontana).
+        rel_speed_px = car_speed_px - self.current_speed  # + => auto scappa
+        self.car_distance_m += (rel_speed_px * dt) / PX_PER_M
 
+        # Camion: velocità costante = 50% MAX, ma sta dietro (a destra).
+        truck_speed_px = 0.5 * MAX_SPEED_PX
 
-        # -------------------------
-        # DISEGNO
-        # -------------------------
-        # Livello 0 (più lontano)
-        x0_1 = int(offset0)
-        x0_2 = x0_1 - bkg0_width
-        screen.blit(bkg0_1, (x0_1, 0))
-        screen.blit(bkg0_2, (x0_2, 0))
+        # Se il bambino è più veloce del camion, la distanza aumenta (si allontana).
+        # Se è più lento, la distanza diminuisce (il camion si avvicina).
+        self.truck_distance_m += ((self.current_speed - truck_speed_px) * dt) / PX_PER_M
 
-        # Livello 1 (più vicino / strada)
-        x1_1 = int(offset1)
-        x1_2 = x1_1 - bkg1_width
-        screen.blit(bkg1, (x1_1, 0))
-        screen.blit(bkg1, (x1_2, 0))
+        # Aggiorna scroll sfondi
+        # Il personaggio corre verso sinistra → sfondi scorrono verso destra (x crescente)
+        self.offset1 += self.current_speed * dt
+        self.offset0 += self.current_speed * 0.1 * dt  # livello 0 al 10% della velocità del personaggio
 
-        # Personaggio in primo piano
-        # (se knockdown attivo, forza frame 6/7)
-        if knock_timer > 0.0 and knock_frame is not None:
-            current_frame = char_frames[knock_frame]  # 6 o 7
-            rect = current_frame.get_rect(topleft=(CHAR_X, int(char_y)))
+        # Fisica salto / scivolata
+        if self.char_state == "jump":
+            self.jump_vy += self.jump_g * dt
+            self.char_y += self.jump_vy * dt
+            self.jump_elapsed += dt
+
+            if self.char_y >= CHAR_Y:
+                self.char_y = float(CHAR_Y)
+                self.char_state = "run"
+                self.jump_vy = 0.0
+                self.jump_elapsed = 0.0
+
+        elif self.char_state == "slide":
+            self.slide_timer -= dt
+            if self.slide_timer <= 0.0:
+                self.char_state = "run"
 
-        else:
-            if char_state == "run":
-                current_frame = run_frames[run_frame_index]
-                rect = current_frame.get_rect(topleft=(CHAR_X, int(char_y)))
-
-            elif char_state == "jump":
-                # Progresso del salto 0..1 (clippato per sicurezza)
-                if JUMP_TOTAL_TIME > 0:
-                    jump_total_time = (2.0 * jump_v0 / jump_g) if jump_g > 0 else 0.001
-                    progress = max(0.0, min(jump_elapsed / jump_total_time, 1.0))
-                else:
-                    progress = 1.0
+        # Wrapping orizzontale per sfondi
+        if a.bkg1_width > 0:
+            while self.offset1 > a.bkg1_width:
+                self.offset1 -= a.bkg1_width
 
-                angle = 360.0 * progress  # rotazione antioraria
+        if a.bkg0_width > 0:
+            while self.offset0 > a.bkg0_width:
+                self.offset0 -= a.bkg0_width
 
-                base_rect = jump_base_frame.get_rect(topleft=(CHAR_X, int(char_y)))
-                rotated = pygame.transform.rotate(jump_base_frame, angle)
-                rect = rotated.get_rect(center=base_rect.center)
-                current_frame = rotated
+        # Animazione corsa (solo quando corre)
+        animation_speed_factor = max(speed_factor, 0.05)  # evita divisioni per 0
+        time_per_frame = TIME_PER_FRAME_AT_MAX_SPEED / animation_speed_factor
 
-            elif char_state == "slide":
-                current_frame = char_frames[4]  # jac_04.png - scivolata
-                rect = current_frame.get_rect(topleft=(CHAR_X, int(char_y)))
+        if self.char_state == "run" and self.current_speed > 0:
+            self.run_frame_timer += dt
+            if self.run_frame_timer >= time_per_frame:
+                self.run_frame_timer -= time_per_frame
+                self.run_frame_index = (self.run_frame_index + 1) % RUN_FRAME_COUNT
 
-            else:
-                current_frame = run_frames[run_frame_index]
-                rect = current_frame.get_rect(topleft=(CHAR_X, int(char_y)))
+        self._update_obstacles(dt)
 
+        # Ruote: aggiorna angolo
+        self.wheel_angle = (self.wheel_angle + WHEEL_DEG_PER_SEC * dt) % 360.0
+        self._update_vehicles()
 
         # Blink (urto <5%): alterna visibilità
-        if invuln_timer > 0.0:
-            blink_timer += dt_logic
-            if blink_timer >= 0.10:
-                blink_timer -= 0.10
-                blink_visible = not blink_visible
+        if self.invuln_timer > 0.0:
+            self.blink_timer += dt
+            if self.blink_timer >= 0.10:
+                self.blink_timer -= 0.10
+                self.blink_visible = not self.blink_visible
         else:
-            blink_visible = True
-
-        if blink_visible:
-            screen.blit(current_frame, rect.topleft)
-
-        # Disegna ostacoli (davanti al personaggio come da specifica)
-        obstacle_rects = []
-        for obst in obstacles:
-            # Aquila: scegli frame corrente
-            if obst["type"] == "aquila":
-                if aquila_anim_idx == 0:
-                    obst["img"] = aquila1_img
-                    obst["mask"] = aquila1_mask
-                else:
-                    obst["img"] = aquila2_img
-                    obst["mask"] = aquila2_mask
-
-            img = obst["img"]
-            ox = int(obst["x"])
-            oy = int(obst["y"])
-            screen.blit(img, (ox, oy))
-            obstacle_rects.append((obst, img.get_rect(topleft=(ox, oy))))
-
-        # -------------------------
-        # DISEGNO AUTO + CAMION (sopra ostacoli e personaggio)
-        # -------------------------
-        # Auto
-        auto_rect = auto_img.get_rect(topleft=(int(auto_x), auto_y))
-        if auto_visible:
-            screen.blit(auto_img, auto_rect.topleft)
-
-            wheel_rot = pygame.transform.rotate(ruota_auto_img, wheel_angle)
-
-            # 1a ruota
-            wrect = wheel_rot.get_rect()
-            wrect.center = (auto_rect.left + 160 + ruota_auto_img.get_width() // 2,
-                            auto_rect.top + 376 + ruota_auto_img.get_height() // 2)
-            screen.blit(wheel_rot, wrect.topleft)
-
-            # 2a ruota (X=945)
-            wrect2 = wheel_rot.get_rect()
-            wrect2.center = (auto_rect.left + 945 + ruota_auto_img.get_width() // 2,
-                             auto_rect.top + 376 + ruota_auto_img.get_height() // 2)
-            screen.blit(wheel_rot, wrect2.topleft)
-
-
+            self.blink_visible = True
+
+        self._select_character_frame()
+        self._check_collisions(dt)
+
+        # Clamp distanza nel range della barra
+        if self.car_distance_m < 0.0:
+            self.car_distance_m = 0.0
+        elif self.car_distance_m > BAR_METERS:
+            self.car_distance_m = BAR_METERS
+
+    def _update_obstacles(self, dt):
+        pool = self.obstacles
+
+        # Spawn
+        self.spawn_timer += dt
+        if self.spawn_timer >= self.next_spawn_time:
+            self.spawn_timer -= self.next_spawn_time
+            pool.spawn(self.rng.choice(self.assets.obstacle_kinds))
+            self.next_spawn_time = self.rng.uniform(OBST_MIN_GAP_TIME, OBST_MAX_GAP_TIME)
+
+        # Muovi ostacoli con il mondo (verso destra); quelli usciti a destra si rimuovono
+        items = pool.items
+        speed = self.current_speed
+        culled = False
+        for i in range(pool.count):
+            o = items[i]
+            o.x += (speed + o.kind.extra_speed) * dt
+            if o.x >= OBSTACLE_CULL_X:
+                o.dead = True
+                culled = True
+        if culled:
+            pool.compact()
+
+    def _update_vehicles(self):
+        """Posizione X (in px) di auto/camion riferita alla posizione del personaggio + visibilità."""
+        a = self.assets
+        self.auto_x = CHAR_X - (self.car_distance_m * PX_PER_M)
+        self.truck_x = CHAR_X + (self.truck_distance_m * PX_PER_M)
 
+        # Visibilità (parziale) a schermo
+        self.auto_visible = (self.auto_x < INTERNAL_RESOLUTION[0]) and (self.auto_x + a.auto_img.get_width() > 0)
+        self.truck_visible = (self.truck_x < INTERNAL_RESOLUTION[0]) and (self.truck_x + a.camion_img.get_width() > 0)
+        self.auto_rect = a.auto_img.get_rect(topleft=(int(self.auto_x), AUTO_Y))
+        self.truck_rect = a.camion_img.get_rect(topleft=(int(self.truck_x), TRUCK_Y))
 
-        # Camion
-        truck_rect = camion_img.get_rect(topleft=(int(truck_x), truck_y))
-        if truck_visible:
-            screen.blit(camion_img, truck_rect.topleft)
-
-            # Ruota camion: 1 istanza offset (266,662) (spec)
-            wheel_rot_t = pygame.transform.rotate(ruota_camion_img, wheel_angle)
-            tw = wheel_rot_t.get_rect()
-            tw.center = (truck_rect.left + 266 + ruota_camion_img.get_width() // 2,
-                         truck_rect.top + 662 + ruota_camion_img.get_height() // 2)
-            screen.blit(wheel_rot_t, tw.topleft)
+    def _select_character_frame(self):
+        """Frame corrente del personaggio (dalla cache) e relative rect."""
+        a = self.assets
 
+        # (se knockdown attivo, forza frame 6/7)
+        jump_center = None
+        if self.knock_timer > 0.0 and self.knock_frame is not None:
+            asset = a.char_assets[self.knock_frame]  # 6 o 7
+
+        elif self.char_state == "jump":
+            # Progresso del salto 0..1 (clippato per sicurezza)
+            if JUMP_TOTAL_TIME > 0:
+                jump_total_time = (2.0 * self.jump_v0 / self.jump_g) if self.jump_g > 0 else 0.001
+                progress = max(0.0, min(self.jump_elapsed / jump_total_time, 1.0))
+            else:
+                progress = 1.0
 
-        # Mask pixel-perfect del personaggio (frame corrente)
-        char_mask = pygame.mask.from_surface(current_frame)
-        char_pixels = char_mask.count() or 1
+            angle = 360.0 * progress  # rotazione antioraria
+            asset = a.jump_assets[int(angle / JUMP_ANGLE_STEP + 0.5) % len(a.jump_assets)]
+            # il frame ruotato resta centrato sul frame di salto dritto
+            jump_center = a.char_frames[5].get_rect(topleft=(CHAR_X, int(self.char_y))).center
 
+        elif self.char_state == "slide":
+            asset = a.char_assets[4]  # jac_04.png - scivolata
 
-        # -------------------------
-        # COLLISIONI + REGOLE SPECIFICA (PIXEL PERFECT)
-        # -------------------------
+        else:
+            asset = a.char_assets[self.run_frame_index]  # jac_00..jac_03
+
+        frame, mask, pixels, (spr_dx, spr_dy), size = asset
+        rect = pygame.Rect((CHAR_X, int(self.char_y)), size)
+        if jump_center is not None:
+            rect.center = jump_center
+
+        self.char_frame = frame
+        self.char_mask = mask
+        self.char_pixels = pixels
+        self.char_rect = rect
+        # rect della surface disegnata (coincide con char_rect tranne nel salto, dove è ritagliata)
+        self.sprite_rect = pygame.Rect((rect.left + spr_dx, rect.top + spr_dy), frame.get_size())
+
+    def _check_collisions(self, dt):
+        """Collisioni pixel-perfect con ostacoli e auto/camion + punteggio (regole da specifica)."""
+        a = self.assets
+        rect = self.char_rect
+        sprite_rect = self.sprite_rect
+        char_mask = self.char_mask
 
         # Aggiorna timer invuln/knock
-        if invuln_timer > 0.0:
-            invuln_timer = max(0.0, invuln_timer - dt_logic)
+        if self.invuln_timer > 0.0:
+            self.invuln_timer = max(0.0, self.invuln_timer - dt)
 
-        if knock_timer > 0.0:
-            knock_timer = max(0.0, knock_timer - dt_logic)
-            if knock_timer == 0.0:
+        if self.knock_timer > 0.0:
+            self.knock_timer = max(0.0, self.knock_timer - dt)
+            if self.knock_timer == 0.0:
                 # Ripartenza dopo 2s: velocità minima 20% e torna a correre
-                speed_level = 1
-                level_progress = 0
-                knock_frame = None
+                self.speed_level = 1
+                self.level_progress = 0
+                self.knock_frame = None
 
         # Se sei in knockdown o invulnerabile, ignora nuove collisioni (evita spam)
-        can_collide = (knock_timer <= 0.0 and invuln_timer <= 0.0)
+        can_collide = (self.knock_timer <= 0.0 and self.invuln_timer <= 0.0)
 
         collided_obstacle = None
         collided_rect = None
         collision_ratio = 0.0
 
+        pool = self.obstacles
+        items = pool.items
+        frame_idx = self.aquila_anim_idx
+
         if can_collide:
-            for obst in obstacles:
-                if obst.get("hit_once", False):
+            for i in range(pool.count):
+                obst = items[i]
+                if obst.hit_once:
                     continue
 
-                o_rect = obst["img"].get_rect(topleft=(int(obst["x"]), int(obst["y"])))
+                o_rect = pygame.Rect(int(obst.x), int(obst.y), obst.w, obst.h)
 
                 # Check veloce rect
-                if not rect.colliderect(o_rect):
+                if not sprite_rect.colliderect(o_rect):
                     continue
 
-                offset = (o_rect.left - rect.left, o_rect.top - rect.top)
-                overlap = char_mask.overlap_area(obst["mask"], offset)
+                # l'aquila usa il frame corrente dell'animazione, gli altri tipi hanno un solo frame
+                frames = obst.kind.frames
+                o_mask = frames[frame_idx % len(frames)][1]
+                offset = (o_rect.left - sprite_rect.left, o_rect.top - sprite_rect.top)
+                overlap = char_mask.overlap_area(o_mask, offset)
 
                 if overlap > 0:
-                    ratio = overlap / char_pixels
+                    ratio = overlap / self.char_pixels
                     if ratio > collision_ratio:
                         collision_ratio = ratio
                         collided_obstacle = obst
                         collided_rect = o_rect
 
         if collided_obstacle is not None:
-            collided_obstacle["hit_once"] = True
+            collided_obstacle.hit_once = True
 
             if collision_ratio < 0.05:
                 # <5%: blink 1s + -1 livello (min 20%)
-                invuln_timer = 1.0
-                blink_timer = 0.0
-                blink_visible = True
-                speed_level = max(1, speed_level - 1)
-                level_progress = 0
-
+                self.invuln_timer = 1.0
+                self.blink_timer = 0.0
+                self.blink_visible = True
+                self.speed_level = max(1, self.speed_level - 1)
+                self.level_progress = 0
 
             else:
                 # >5%: velocità 0%, frame 6/7 per 2s, ostacolo scompare, poi riparte a 20%
-                speed_level = 0
-                level_progress = 0
+                self.speed_level = 0
+                self.level_progress = 0
 
                 # Se personaggio a destra del centro orizzontale dell'ostacolo -> frame 6, altrimenti 7
                 if rect.centerx > collided_rect.centerx:
-                    knock_frame = 6
+                    self.knock_frame = 6
                 else:
-                    knock_frame = 7
+                    self.knock_frame = 7
 
-                knock_timer = 2.0
+                self.knock_timer = 2.0
 
                 # Rimuovi ostacolo colpito
-                collided_obstacle["remove"] = True
+                collided_obstacle.dead = True
 
         # Punteggio: se l'ostacolo passa oltre il personaggio senza essere colpito
-        for obst in obstacles:
-            if obst.get("remove", False) or obst.get("hit_once", False) or obst.get("scored", False):
+        for i in range(pool.count):
+            obst = items[i]
+            if obst.dead or obst.hit_once or obst.scored:
                 continue
             # quando il suo lato sinistro supera il lato destro del personaggio -> “superato”
-            if obst["x"] > rect.right:
-                obst["scored"] = True
-                points += 1
+            if obst.x > rect.right:
+                obst.scored = True
+                self.points += 1
 
                 # Avanza solo la progressione dell'ultimo livello
-                if speed_level > 0 and speed_level < 5:
-                    level_progress += 1
+                if self.speed_level > 0 and self.speed_level < 5:
+                    self.level_progress += 1
 
                     # al terzo punto: completa il livello, passa al livello successivo
-                    if level_progress >= 3:
-                        level_progress = 0
-                        speed_level = min(5, speed_level + 1)
+                    if self.level_progress >= 3:
+                        self.level_progress = 0
+                        self.speed_level = min(5, self.speed_level + 1)
 
                 # Se sei già al livello 5, i punti continuano ma non aumentano oltre
 
         # Ripulisci ostacoli rimossi
-        obstacles = [o for o in obstacles if not o.get("remove", False)]
+        if collided_obstacle is not None and collided_obstacle.dead:
+            pool.compact()
 
         # -------------------------
         # COLLISIONI con AUTO/CAMION (fine partita)
@@ -963,37 +823,89 @@ def run_game(screen, clock, font_menu):
             off = (b_rect.left - a_rect.left, b_rect.top - a_rect.top)
             return a_mask.overlap(b_mask, off) is not None
 
-        # maschera personaggio (già calcolata: char_mask) e rect (rect)
         # AUTO: successo
-        if auto_visible:
-            auto_mask_now = auto_mask
-            if mask_overlap(char_mask, rect, auto_mask_now, auto_rect):
-                game_result = "ok"
-                frozen = True
-                freeze_timer = 0.0  # freeze immediato (puoi mettere 0.2 se vuoi "freeze frame")
-                stop_vehicle_audio()
-                running = False
+        if self.auto_visible:
+            if mask_overlap(char_mask, sprite_rect, a.auto_mask, self.auto_rect):
+                self.result = "ok"
 
         # CAMION: fallimento
-        if truck_visible:
-            camion_mask_now = camion_mask
-            if mask_overlap(char_mask, rect, camion_mask_now, truck_rect):
-                game_result = "ko"
-                frozen = True
-                freeze_timer = 0.0
-                stop_vehicle_audio()
-                running = False
+        if self.truck_visible:
+            if mask_overlap(char_mask, sprite_rect, a.camion_mask, self.truck_rect):
+                self.result = "ko"
 
+    # -------------------------
+    # Render
+    # -------------------------
+    def render(self, screen):
+        a = self.assets
 
-        points_in_level = points % 3   # 0,1,2
+        # Livello 0 (più lontano)
+        x0_1 = int(self.offset0)
+        x0_2 = x0_1 - a.bkg0_width
+        screen.blit(a.bkg0_1, (x0_1, 0))
+        screen.blit(a.bkg0_2, (x0_2, 0))
+
+        # Livello 1 (più vicino / strada)
+        x1_1 = int(self.offset1)
+        x1_2 = x1_1 - a.bkg1_width
+        screen.blit(a.bkg1, (x1_1, 0))
+        screen.blit(a.bkg1, (x1_2, 0))
+
+        # Personaggio in primo piano
+        if self.blink_visible:
+            screen.blit(self.char_frame, self.sprite_rect.topleft)
+
+        # Ostacoli (davanti al personaggio come da specifica)
+        pool = self.obstacles
+        items = pool.items
+        frame_idx = self.aquila_anim_idx
+        for i in range(pool.count):
+            obst = items[i]
+            frames = obst.kind.frames
+            screen.blit(frames[frame_idx % len(frames)][0], (int(obst.x), int(obst.y)))
+
+        # Auto + camion (sopra ostacoli e personaggio)
+        if self.auto_visible:
+            auto_rect = self.auto_rect
+            screen.blit(a.auto_img, auto_rect.topleft)
+
+            wheel_rot = pygame.transform.rotate(a.ruota_auto_img, self.wheel_angle)
+            half_w = a.ruota_auto_img.get_width() // 2
+            half_h = a.ruota_auto_img.get_height() // 2
+
+            # 1a ruota
+            wrect = wheel_rot.get_rect()
+            wrect.center = (auto_rect.left + 160 + half_w, auto_rect.top + 376 + half_h)
+            screen.blit(wheel_rot, wrect.topleft)
+
+            # 2a ruota (X=945)
+            wrect2 = wheel_rot.get_rect()
+            wrect2.center = (auto_rect.left + 945 + half_w, auto_rect.top + 376 + half_h)
+            screen.blit(wheel_rot, wrect2.topleft)
+
+        if self.truck_visible:
+            truck_rect = self.truck_rect
+            screen.blit(a.camion_img, truck_rect.topleft)
+
+            # Ruota camion: 1 istanza offset (266,662) (spec)
+            wheel_rot_t = pygame.transform.rotate(a.ruota_camion_img, self.wheel_angle)
+            tw = wheel_rot_t.get_rect()
+            tw.center = (truck_rect.left + 266 + a.ruota_camion_img.get_width() // 2,
+                         truck_rect.top + 662 + a.ruota_camion_img.get_height() // 2)
+            screen.blit(wheel_rot_t, tw.topleft)
+
+        self._render_hud(screen)
+
+    def _render_hud(self, screen):
+        a = self.assets
 
         # -------------------------
         # UI VELOCITÀ (tachimetro.png + rettangoli)
         # -------------------------
 
         # 1) Tachimetro fisso
-        if tachimetro_img is not None:
-            screen.blit(tachimetro_img, (19, 15))
+        if a.tachimetro_img is not None:
+            screen.blit(a.tachimetro_img, (19, 15))
 
         # 2) Rettangoli velocità come da specifica
         # Rettangolo 1 (20%) a (193,27), h=72
@@ -1001,12 +913,9 @@ def run_game(screen, clock, font_menu):
         base_y = 27
         rect_h = 72
 
-        # larghezza 15/30/45 in base a 0/1/2 punti nel livello
-        rect_w = 15 * (points_in_level + 1)
-
         colors = [SPEED1, SPEED2, SPEED3, SPEED4, SPEED5]
 
-        n = max(0, min(speed_level, 5))
+        n = max(0, min(self.speed_level, 5))
         for i in range(n):
             rx = base_x + i * 51
 
@@ -1015,7 +924,7 @@ def run_game(screen, clock, font_menu):
                 w = 45
             else:
                 # Solo l'ultimo cresce: 15/30/45 in base a level_progress (0/1/2)
-                w = 15 * (max(0, min(level_progress, 2)) + 1)
+                w = 15 * (max(0, min(self.level_progress, 2)) + 1)
 
             r = pygame.Rect(rx, base_y, w, rect_h)
             pygame.draw.rect(screen, colors[i], r)
@@ -1025,57 +934,180 @@ def run_game(screen, clock, font_menu):
         # -------------------------
 
         # Barra fissa a (0, 960)
-        if barra_img is not None:
-            screen.blit(barra_img, (0, 960))
-
-        # Spazio barra: inizia da X=168, largo 1524px => 75m
-        BAR_START_X = 168
-        BAR_WIDTH_PX = 1524
-        BAR_METERS = 200.0
-
-        # Clamp distanza nel range 0..75m (la barra rappresenta 75m)
-        if car_distance_m < 0.0:
-            car_distance_m = 0.0
-        elif car_distance_m > BAR_METERS:
-            car_distance_m = BAR_METERS
+        if a.barra_img is not None:
+            screen.blit(a.barra_img, (0, 960))
 
         # La testa ha Y fissa 970 e si muove in X in base ai metri
         # La specifica parla del "centro orizzontale della testa"
-        head_center_x = BAR_START_X + (car_distance_m / BAR_METERS) * BAR_WIDTH_PX
+        head_center_x = BAR_START_X + (self.car_distance_m / BAR_METERS) * BAR_WIDTH_PX
 
         # Convertiamo in top-left X
-        head_x = int(head_center_x - testa_half)
+        head_x = int(head_center_x - a.testa_half)
         head_y = 970
 
-        if testa_img is not None:
-            screen.blit(testa_img, (head_x, head_y))
+        if a.testa_img is not None:
+            screen.blit(a.testa_img, (head_x, head_y))
+
+        # Testo "Xm" in viola a (25, 932), altezza 26px
+        dist_txt = a.font_26.render(f"{int(round(self.car_distance_m))}m", True, VIOLA)
+        screen.blit(dist_txt, (25, 932))
+
+
+class VehicleAudio:
+    """Motori di auto/camion in loop e clacson, su canali dedicati, pilotati dalla posizione dei veicoli."""
 
-        # Testo "Xm" in viola a (25, 932)
-        # Altezza 26px: usiamo un font da 26 (o vicino)
+    def __init__(self, assets):
+        self.assets = assets
+        self.ch_auto = pygame.mixer.Channel(1)
+        self.ch_truck = pygame.mixer.Channel(2)
+        self.ch_horn = pygame.mixer.Channel(3)
+        self.auto_motor_on = False
+        self.truck_motor_on = False
+        self.truck_was_visible = False
+
+    def update(self, sim):
+        a = self.assets
+        auto_x = sim.auto_x
+        truck_x = sim.truck_x
+
+        # -------------------------
+        # AUDIO AUTO (motore in loop con volume dinamico)
+        # Soglie: start a X=-1525, volume 100% quando X>-1225, 0 quando X<-1525
+        # -------------------------
+        if a.auto_motor_snd is not None:
+            if auto_x >= -1525 and not self.auto_motor_on:
+                self.ch_auto.play(a.auto_motor_snd, loops=-1)
+                self.auto_motor_on = True
+
+            if self.auto_motor_on:
+                if auto_x <= -1525:
+                    vol = 0.0
+                elif auto_x >= -1225:
+                    vol = 1.0
+                else:
+                    vol = (auto_x + 1525.0) / 300.0  # 0..1 tra -1525 e -1225
+                vol = max(0.0, min(1.0, vol))
+                self.ch_auto.set_volume(vol)
+
+                if vol <= 0.0 and auto_x < -1525:
+                    self.ch_auto.stop()
+                    self.auto_motor_on = False
+
+        # -------------------------
+        # AUDIO CAMION (motore in loop + clacson quando compare)
+        # Soglie: start a X=2400, volume 100% quando X<1921, 0 quando X>2400
+        # -------------------------
+        if a.truck_motor_snd is not None:
+            if truck_x <= 2400 and not self.truck_motor_on:
+                self.ch_truck.play(a.truck_motor_snd, loops=-1)
+                self.truck_motor_on = True
+
+            if self.truck_motor_on:
+                if truck_x >= 2400:
+                    vol = 0.0
+                elif truck_x <= 1921:
+                    vol = 1.0
+                else:
+                    vol = (2400.0 - truck_x) / (2400.0 - 1921.0)  # 0..1 tra 2400 e 1921
+                vol = max(0.0, min(1.0, vol))
+                self.ch_truck.set_volume(vol)
+
+                if vol <= 0.0 and truck_x > 2400:
+                    self.ch_truck.stop()
+                    self.truck_motor_on = False
+
+        # Clacson: una volta quando compare a schermo, e di nuovo se scompare e ricompare
+        if sim.truck_visible and not self.truck_was_visible:
+            if a.truck_horn_snd is not None:
+                self.ch_horn.play(a.truck_horn_snd)
+        self.truck_was_visible = sim.truck_visible
+
+    def stop(self):
         try:
-            font_26 = pygame.font.Font(FONT_PATH, 26)
+            self.ch_auto.stop()
+            self.ch_truck.stop()
+            self.ch_horn.stop()
         except Exception:
-            font_26 = pygame.font.SysFont(None, 26)
+            pass
 
-        dist_txt = font_26.render(f"{int(round(car_distance_m))}m", True, VIOLA)
-        screen.blit(dist_txt, (25, 932))
 
+class RunnerScene(Scene):
+    """
+    Partita in corso: la simulazione avanza a passo fisso (GameLoop), il disegno una volta per frame.
+    A partita finita (ok/ko) la scena resta congelata per END_FREEZE_TIME, poi passa al game over.
+    ESC → ritorno al menu.
+    """
+
+    def __init__(self, assets):
+        self.assets = assets
+        self.sim = RunnerSimulation(assets)
+        self.audio = VehicleAudio(assets)
+        self.pending_inputs = []       # azioni premute non ancora consumate da uno step
+        self.freeze_timer = END_FREEZE_TIME
+        self.aborted = False
+
+    def enter(self):
+        # Musica di gioco
+        if os.path.exists(MUSIC_GAME_PATH):
+            try:
+                pygame.mixer.music.load(MUSIC_GAME_PATH)
+                pygame.mixer.music.play(-1)
+            except Exception as e:
+                print(f"Errore caricando music_game: {e}", file=sys.stderr)
+        else:
+            print(f"File musica gioco non trovato: {MUSIC_GAME_PATH}", file=sys.stderr)
+
+    def exit(self):
+        # Stop musica di gioco
+        pygame.mixer.music.stop()
+        self.audio.stop()
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            # ESC → esci dal gioco e torna al menu
+            if event.key == pygame.K_ESCAPE:
+                self.aborted = True
+            else:
+                action = input_for_key(event.key)
+                if action is not None:
+                    self.pending_inputs.append(action)
+
+    def update(self, dt):
+        sim = self.sim
+        if sim.result is None:
+            sim.step(dt, self.pending_inputs)
+            self.pending_inputs.clear()
+            if sim.result is None:
+                self.audio.update(sim)
+            else:
+                self.audio.stop()
+        else:
+            # Congela tutto: niente update logica/animazioni.
+            self.freeze_timer -= dt
 
+    def draw(self, screen):
+        self.sim.render(screen)
 
-        pygame.display.flip()
+    def next_scene(self):
+        result = self.sim.result
+        if result is not None and (self.freeze_timer <= 0.0 or self.aborted):
+            # fine partita (ok/ko): schermata OK/KO
+            return GameOverScene(self.assets.bkg_gameover[result])
+        if self.aborted:
+            return None
+        return self
 
-    # Stop musica di gioco
-    pygame.mixer.music.stop()
-    stop_vehicle_audio()   
 
-    # Se fine partita (ok/ko) mostra schermata e avvia music_menu.mp3 in loop
-    if game_result in ("ok", "ko"):
-        try:
-            bkg = pygame.image.load(BKG_GAMEOVER_OK_PATH if game_result == "ok" else BKG_GAMEOVER_KO_PATH).convert()
-        except Exception as e:
-            print(f"Errore caricando bkg gameover: {e}", file=sys.stderr)
-            bkg = None
+class GameOverScene(Scene):
+    """Schermata OK/KO: resta finché non si preme un tasto o si clicca."""
 
+    fixed_step = False
+
+    def __init__(self, bkg):
+        self.bkg = bkg
+        self.done = False
+
+    def enter(self):
         # Avvia music_menu.mp3 e LA LASCIA SUONARE anche quando torni al menu
         if os.path.exists(MUSIC_MENU_PATH):
             try:
@@ -1084,27 +1116,40 @@ def run_game(screen, clock, font_menu):
             except Exception as e:
                 print(f"Errore caricando music_menu (gameover): {e}", file=sys.stderr)
 
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit(0)
-                if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
-                    waiting = False
-
-            if bkg:
-                screen.blit(bkg, (0, 0))
-            else:
-                screen.fill((0, 0, 0))
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
+            self.done = True
 
-            pygame.display.flip()
-            clock.tick(60)
+    def draw(self, screen):
+        if self.bkg:
+            screen.blit(self.bkg, (0, 0))
+        else:
+            screen.fill((0, 0, 0))
+
+    def next_scene(self):
+        return None if self.done else self
+
+
+def run_game(screen, clock, font_menu):
+    """
+    Loop di gioco:
+    - sfondo a due livelli con parallasse
+    - personaggio che corre / salta / scivola in posizione fissa
+    - ostacoli che arrivano da sinistra
+    - musica di gioco in loop
+    ESC → ritorno al menu.
+    Ritorna True se è stata mostrata la schermata di fine partita (music_menu già in riproduzione).
+    """
 
-        # Ritorna un flag per dire al menu: "la music_menu sta già suonando, non riavviarla"
-        return True
+    scene = RunnerScene(get_assets())
+    loop = GameLoop(screen, clock, step=SIM_DT, max_steps=SIM_MAX_STEPS)
+    loop.run(scene)
+    if loop.quit_requested:
+        pygame.quit()
+        sys.exit(0)
 
-    return False
+    # Ritorna un flag per dire al menu: "la music_menu sta già suonando, non riavviarla"
+    return scene.sim.result in ("ok", "ko")
 
 
 # ----------------------------------------------------------------------
@@ -1120,11 +1165,7 @@ def main_menu(screen, clock, font_menu, props, best_score):
     Ritorna il best_score aggiornato (anche se per ora non cambia).
     """
     # Carica background menu
-    try:
-        bkg_menu = pygame.image.load(BKG_MENU_PATH).convert()
-    except Exception as e:
-        print(f"Errore caricando bkg_menu: {e}", file=sys.stderr)
-        bkg_menu = None
+    bkg_menu = get_asset_cache().image(BKG_MENU_PATH, alpha=False)
 
     # Avvia musica menu
     if os.path.exists(MUSIC_MENU_PATH):
@@ -1169,8 +1210,7 @@ def main_menu(screen, clock, font_menu, props, best_score):
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit(0)
+                exit_with_score(best_score)
 
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
@@ -1242,16 +1282,8 @@ def main_menu(screen, clock, font_menu, props, best_score):
 # MAIN
 # ----------------------------------------------------------------------
 
-def parse_args(argv):
-    parser = argparse.ArgumentParser(description="Game 12 Left")
-    parser.add_argument("--score", type=int, default=0,
-                        help="Miglior punteggio preesistente (best_score)")
-    return parser.parse_args(argv)
-
-
 def main():
-    args = parse_args(sys.argv[1:])
-    best_score = args.score
+    best_score = parse_score_arg(sys.argv[1:])
 
     pygame.init()
     pygame.mixer.init()
@@ -1264,26 +1296,19 @@ def main():
 
     clock = pygame.time.Clock()
 
-    try:
-        font_menu = pygame.font.Font(FONT_PATH, 56)
-    except Exception as e:
-        print(f"Errore caricando il font Sadannes.ttf: {e}", file=sys.stderr)
-        font_menu = pygame.font.SysFont(None, 56)
+    font_menu = get_asset_cache().font(FONT_PATH, 56)
 
     props = load_properties()
 
     if props.get("primorun", True):
         play_intro_video()
         props["primorun"] = False
-        save_properties(props)
+        props.save()
 
     best_score = main_menu(screen, clock, font_menu, props, best_score)
 
     # Alla fine, stampa best_score così Jacoplay può leggerlo da stdout
-    print(best_score)
-
-    pygame.quit()
-    sys.exit(0)
+    exit_with_score(best_score)
 
 
 if __name__ == "__main__":
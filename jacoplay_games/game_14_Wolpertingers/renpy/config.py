@@ -105,6 +105,10 @@ image_cache_size_mb = 300
 # path. The current node is counted in this number.
 predict_statements = 32
 
+# The number of threads that load predicted images in the background.
+# If None, one less than the number of cores, from 1 to 4.
+preload_threads = None
+
 # Causes the contents of the image cache to be printed to stdout when
 # it changes.
 debug_image_cache = ("RENPY_DEBUG_IMAGE_CACHE" in os.environ)
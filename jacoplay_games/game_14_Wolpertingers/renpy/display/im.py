@@ -30,8 +30,10 @@ import renpy.display
 import renpy.webloader
 
 import math
+import heapq
 import zipfile
 import threading
+import multiprocessing
 import time
 import io
 import os.path
@@ -63,6 +65,21 @@ class CacheEntry(object):
         # The time when this cache entry was last used.
         self.time = 0
 
+        # The size of this entry, as last added to the cache's total_size.
+        self.counted_size = 0
+
+        # The files this entry was loaded from (its predict_files), as
+        # indexed in the cache's file_index.
+        self.files = ()
+
+        # The order in which the entry was added to the cache, used to
+        # break ties between entries of the same time in the heap.
+        self.serial = 0
+
+        # True if this entry was loaded by a preload, and hasn't been
+        # used for anything but prediction since.
+        self.unused_preload = False
+
     def size(self):
         rv = 0
 
@@ -88,9 +105,35 @@ class Cache(object):
         # A map from Image object to CacheEntry.
         self.cache = { }
 
-        # A list of Image objects that we want to preload.
+        # The sum of the size() of the entries in the cache, kept up to
+        # date by add, update_size and kill.
+        self.total_size = 0
+
+        # A heap of (time, serial, CacheEntry) tuples, for least recently
+        # used eviction. The time in the tuple may be older than ce.time,
+        # as using an entry doesn't touch the heap. cleanout fixes that
+        # when the entry reaches the top. Entries that have been killed
+        # stay in the heap until they reach the top.
+        self.heap = [ ]
+
+        # The serial number of the last entry added.
+        self.serial = 0
+
+        # A map from filename to the set of Image objects in the cache
+        # that were loaded from that file, for flush_file.
+        self.file_index = { }
+
+        # A heap of (distance, serial, image) tuples, giving the Image
+        # objects that we want to preload, nearest prediction first.
         self.preloads = [ ]
 
+        # The serial number of the last image added to preloads, used to
+        # keep images of the same distance in prediction order.
+        self.preload_serial = 0
+
+        # The images that a preload thread is currently loading.
+        self.preloading = set()
+
         # False if this is not the first preload in this tick.
         self.first_preload_in_tick = True
 
@@ -113,11 +156,25 @@ class Cache(object):
         # The size of the cache, in pixels.
         self.cache_limit = 0
 
-        # The preload thread.
+        # Held by the preload thread that is loading pinned images.
+        self.pin_lock = threading.Lock()
+
+        # The first preload thread. More are started by init.
         self.preload_thread = threading.Thread(target=self.preload_thread_main, name="preloader")
         self.preload_thread.daemon = True
         self.preload_thread.start()
 
+        # All of the preload threads.
+        self.preload_threads = [ self.preload_thread ]
+
+        # Preloading statistics, returned by get_preload_stats.
+        self.preload_queue_max = 0
+        self.preloads_dropped = 0
+        self.preloads_wasted = 0
+        self.decode_count = 0
+        self.decode_time = 0.0
+        self.decode_failures = 0
+
         # Have we been added this tick?
         self.added = set()
 
@@ -137,7 +194,7 @@ class Cache(object):
         """
 
         with self.lock:
-            rv = sum(i.size() for i in self.cache.values())
+            rv = self.total_size
 
         # print("Total cache size: {:.1f}/{:.1f} MB (Textures {:.1f} MB)".format(
         #     4.0 * rv / 1024 / 1024,
@@ -171,15 +228,72 @@ class Cache(object):
         else:
             self.cache_limit = int(renpy.config.image_cache_size_mb * 1024 * 1024 // 4)
 
+        threads = renpy.config.preload_threads
+
+        if threads is None:
+            try:
+                threads = max(1, min(4, multiprocessing.cpu_count() - 1))
+            except NotImplementedError:
+                threads = 1
+
+        if renpy.emscripten:
+            threads = 1
+
+        while self.keep_preloading and len(self.preload_threads) < threads:
+            t = threading.Thread(target=self.preload_thread_main, name="preloader-{}".format(len(self.preload_threads)))
+            t.daemon = True
+            t.start()
+
+            self.preload_threads.append(t)
+
+    def get_preload_stats(self):
+        """
+        Returns a dictionary of statistics about preloading:
+
+        `threads`
+            The number of preload threads.
+        `queued`
+            The number of images waiting to be preloaded.
+        `max_queued`
+            The largest number of images that have been waiting at once.
+        `decoded`
+            The number of images that preloading decoded. (Images that
+            were already in the cache when their turn came aren't counted.)
+        `decode_time`
+            The total time spent decoding those images, in seconds.
+        `failed`
+            The number of images that failed to preload, and were
+            blacklisted.
+        `wasted`
+            The number of preloaded images that were removed from the cache
+            without being shown.
+        `dropped`
+            The number of images that were removed from the queue without
+            being preloaded.
+        """
+
+        with self.lock:
+            return {
+                "threads" : len(self.preload_threads),
+                "queued" : len(self.preloads),
+                "max_queued" : self.preload_queue_max,
+                "decoded" : self.decode_count,
+                "decode_time" : self.decode_time,
+                "failed" : self.decode_failures,
+                "wasted" : self.preloads_wasted,
+                "dropped" : self.preloads_dropped,
+                }
+
     def quit(self): # @ReservedAssignment
         if not self.preload_thread.is_alive():
             return
 
         with self.preload_lock:
             self.keep_preloading = False
-            self.preload_lock.notify()
+            self.preload_lock.notify_all()
 
-        self.preload_thread.join()
+        for t in self.preload_threads:
+            t.join()
 
         self.clear()
 
@@ -191,6 +305,9 @@ class Cache(object):
         self.preloads = [ ]
         self.pin_cache = { }
         self.cache = { }
+        self.total_size = 0
+        self.heap = [ ]
+        self.file_index = { }
         self.first_preload_in_tick = True
 
         self.added.clear()
@@ -219,6 +336,7 @@ class Cache(object):
 
         with self.lock:
             self.time += 1
+            self.preloads_dropped += len(self.preloads)
             self.preloads = [ ]
             self.first_preload_in_tick = True
             self.added.clear()
@@ -259,6 +377,9 @@ class Cache(object):
 
             ce.time = self.time
 
+            if not predict:
+                ce.unused_preload = False
+
             if texture and (ce.texture is not None):
 
                 if predict:
@@ -277,6 +398,10 @@ class Cache(object):
         # Otherwise, we load the image ourselves.
         if ce is None:
 
+            # How long a preload took to decode the image, for the preload
+            # statistics. (None if it wasn't a preload, or wasn't decoded.)
+            decode_time = None
+
             try:
                 if image in self.pin_cache:
                     surf = self.pin_cache[image]
@@ -286,7 +411,9 @@ class Cache(object):
                         with renpy.game.ExceptionInfo("While loading %r:", image):
                             surf = image.load()
                     else:
+                        start = time.time()
                         surf = image.load()
+                        decode_time = time.time() - start
 
             except:
                 raise
@@ -304,7 +431,12 @@ class Cache(object):
             with self.lock:
 
                 ce = CacheEntry(image, surf, bounds)
-                self.cache[image] = ce
+                ce.unused_preload = predict
+                self.add(ce)
+
+                if decode_time is not None:
+                    self.decode_count += 1
+                    self.decode_time += decode_time
 
                 # Indicate that this surface had changed.
                 renpy.display.render.mutated_surface(ce.surf)
@@ -333,6 +465,9 @@ class Cache(object):
 
                 ce.texture = renpy.display.draw.load_texture(texsurf)
 
+                with self.lock:
+                    self.update_size(ce)
+
             if not predict:
                 if render:
                     rv = renpy.display.render.Render(ce.width, ce.height)
@@ -350,7 +485,10 @@ class Cache(object):
             if ce.surf is not None:
                 renpy.display.draw.mutated_surface(ce.surf)
 
-            ce.surf = None
+                ce.surf = None
+
+                with self.lock:
+                    self.update_size(ce)
 
         if (ce.surf is None) and (ce.texture is None):
             with self.lock:
@@ -359,14 +497,83 @@ class Cache(object):
         # Done... return the surface.
         return rv
 
+    # The following methods must be called with the lock held.
+
+    def add(self, ce):
+        """
+        Adds `ce` to the cache, replacing any entry for the same image.
+        """
+
+        old = self.cache.get(ce.what, None)
+        if old is not None:
+            self.unlink(old)
+
+        self.cache[ce.what] = ce
+
+        try:
+            ce.files = tuple(ce.what.predict_files())
+        except Exception:
+            ce.files = ()
+
+        for fn in ce.files:
+            self.file_index.setdefault(fn, set()).add(ce.what)
+
+        self.serial += 1
+        ce.serial = self.serial
+
+        # Rebuild the heap if killed entries make up most of it.
+        if len(self.heap) > 2 * len(self.cache) + 64:
+            self.heap = [ (i.time, i.serial, i) for i in self.cache.values() ]
+            heapq.heapify(self.heap)
+        else:
+            heapq.heappush(self.heap, (ce.time, ce.serial, ce))
+
+        self.update_size(ce)
+
+    def update_size(self, ce):
+        """
+        Updates total_size after the surface or texture of `ce` has
+        changed.
+        """
+
+        if self.cache.get(ce.what, None) is not ce:
+            return
+
+        size = ce.size()
+        self.total_size += size - ce.counted_size
+        ce.counted_size = size
+
+    def unlink(self, ce):
+        """
+        Removes `ce` from total_size and file_index. (It stays in the heap,
+        and cleanout skips it.)
+        """
+
+        self.total_size -= ce.counted_size
+        ce.counted_size = 0
+
+        for fn in ce.files:
+            images = self.file_index.get(fn, None)
+            if images is not None:
+                images.discard(ce.what)
+                if not images:
+                    del self.file_index[fn]
+
     # This kills off a given cache entry.
     def kill(self, ce):
 
+        if self.cache.get(ce.what, None) is not ce:
+            return
+
         # Let the texture cache know we're not needed.
         if ce.surf is not None:
             renpy.display.draw.mutated_surface(ce.surf)
 
         del self.cache[ce.what]
+        self.unlink(ce)
+
+        if ce.unused_preload:
+            self.preloads_wasted += 1
 
         if renpy.config.debug_image_cache:
             renpy.display.ic_log.write("Removed %r", ce.what)
@@ -379,13 +586,28 @@ class Cache(object):
         """
 
         # If we're within the limit, return.
-        if self.get_total_size() <= self.cache_limit:
+        if self.total_size <= self.cache_limit:
             return True
 
         # If we're outside the cache limit, we need to go and start
-        # killing off some of the entries until we're back inside it.
+        # killing off the least recently used entries until we're back
+        # inside it.
 
-        for ce in sorted(self.cache.values(), key=lambda a : a.time):
+        heap = self.heap
+
+        while heap:
+
+            time, serial, ce = heap[0]
+
+            # Killed or replaced.
+            if self.cache.get(ce.what, None) is not ce:
+                heapq.heappop(heap)
+                continue
+
+            # Used since it was pushed - move it to its real time.
+            if ce.time != time:
+                heapq.heapreplace(heap, (ce.time, serial, ce))
+                continue
 
             if ce.time == self.time:
                 # If we're bigger than the limit, and there's nothing
@@ -393,10 +615,11 @@ class Cache(object):
                 return False
 
             # Otherwise, kill off the given cache entry.
+            heapq.heappop(heap)
             self.kill(ce)
 
             # If we're in the limit, we're done.
-            if self.get_total_size() <= self.cache_limit:
+            if self.total_size <= self.cache_limit:
                 break
 
         return True
@@ -406,14 +629,12 @@ class Cache(object):
         This flushes all cache entries that refer to `fn` from the cache.
         """
 
-        to_flush = [ ]
+        with self.lock:
 
-        for ce in self.cache.values():
-            if fn in ce.what.predict_files():
-                to_flush.append(ce)
+            to_flush = [ self.cache[i] for i in self.file_index.get(fn, ()) ]
 
-        for ce in to_flush:
-            self.kill(ce)
+            for ce in to_flush:
+                self.kill(ce)
 
         if to_flush:
             renpy.display.render.free_memory()
@@ -453,7 +674,9 @@ class Cache(object):
                 ce.time = self.time
                 in_cache = True
             else:
-                self.preloads.append(im)
+                self.preload_serial += 1
+                heapq.heappush(self.preloads, (renpy.display.predict.distance, self.preload_serial, im))
+                self.preload_queue_max = max(self.preload_queue_max, len(self.preloads))
                 in_cache = False
 
         if not in_cache:
@@ -484,6 +707,13 @@ class Cache(object):
             self.preload_thread_pass()
 
     def preload_thread_pass(self):
+        """
+        Preloads images until the queue is empty, then pinned images. This
+        can run on several threads at once, each taking the nearest image
+        from the queue, and the first to finish loading the pinned images.
+        Only the surfaces are loaded here - the draw object uploads textures
+        on the main thread, in ready_one_texture.
+        """
 
         while self.preloads and self.keep_preloading:
 
@@ -495,66 +725,86 @@ class Cache(object):
                 if not self.cleanout():
 
                     if renpy.config.debug_image_cache:
-                        for i in self.preloads:
+                        for _distance, _serial, i in self.preloads:
                             renpy.display.ic_log.write("Overfull %r", i)
 
+                    self.preloads_dropped += len(self.preloads)
                     self.preloads = [ ]
 
                     break
 
-            try:
-                image = self.preloads.pop(0)
+                if not self.preloads:
+                    break
 
-                if image not in self.preload_blacklist:
-                    try:
-                        self.preload_texture(image)
-                    except:
-                        self.preload_blacklist.add(image)
+                image = heapq.heappop(self.preloads)[2]
+
+                # Another thread is loading it, or it failed before.
+                if (image in self.preloading) or (image in self.preload_blacklist):
+                    continue
+
+                self.preloading.add(image)
+
+            try:
+                self.preload_texture(image)
+                failed = False
             except:
-                pass
+                self.preload_blacklist.add(image)
+                failed = True
+
+            with self.lock:
+                self.preloading.discard(image)
+
+                if failed:
+                    self.decode_failures += 1
 
         with self.lock:
             self.cleanout()
 
-        # If we have time, preload pinned images.
-        if self.keep_preloading and not renpy.game.less_memory:
+        # If we have time, preload pinned images. The first thread to get
+        # here does this, the others go back to waiting.
+        if self.keep_preloading and not renpy.game.less_memory and self.pin_lock.acquire(False):
 
-            workset = set(renpy.store._cache_pin_set)
+            try:
 
-            # Remove things that are not in the workset from the pin cache,
-            # and remove things that are in the workset from pin cache.
-            for i in list(self.pin_cache.keys()):
+                workset = set(renpy.store._cache_pin_set)
 
-                if i in workset:
-                    workset.remove(i)
-                else:
-                    surf = self.pin_cache[i]
+                # Remove things that are not in the workset from the pin cache,
+                # and remove things that are in the workset from pin cache.
+                for i in list(self.pin_cache.keys()):
 
-                    del self.pin_cache[i]
+                    if i in workset:
+                        workset.remove(i)
+                    else:
+                        surf = self.pin_cache[i]
 
-            # For each image in the worklist...
-            for image in workset:
+                        del self.pin_cache[i]
 
-                if image in self.preload_blacklist:
-                    continue
+                # For each image in the worklist...
+                for image in workset:
 
-                # If we have normal preloads, break out.
-                if self.preloads:
-                    break
+                    if image in self.preload_blacklist:
+                        continue
+
+                    # If we have normal preloads, break out.
+                    if self.preloads:
+                        break
 
-                try:
-                    surf = image.load()
-                    self.pin_cache[image] = surf
-                    renpy.display.draw.load_texture(surf)
-                except:
-                    self.preload_blacklist.add(image)
+                    try:
+                        surf = image.load()
+                        self.pin_cache[image] = surf
+                        renpy.display.draw.load_texture(surf)
+                    except:
+                        self.preload_blacklist.add(image)
+
+            finally:
+                self.pin_lock.release()
 
     def add_load_log(self, filename):
 
         if not renpy.config.developer:
             return
 
-        preload = (threading.current_thread() is self.preload_thread)
+        preload = (threading.current_thread() in self.preload_threads)
 
         self.load_log.insert(0, (time.time(), filename, preload))
 
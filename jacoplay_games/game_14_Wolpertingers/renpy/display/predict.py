@@ -37,6 +37,11 @@ predicted = set()
 # A flag that indicates if we're currently predicting.
 predicting = False
 
+# How far ahead of the current statement the images being predicted
+# will be shown, in statements. The image cache preloads the nearest
+# images first.
+distance = 0
+
 # A list of (screen name, argument dict) tuples, giving the screens we'd
 # like to predict.
 screens = [ ]
@@ -66,7 +71,9 @@ def screen(_screen_name, *args, **kwargs):
 
 def reset():
     global image
+    global distance
     image = renpy.display.im.cache.get_texture
+    distance = 0
     predicted.clear()
     del screens[:]
 
@@ -86,6 +93,7 @@ def prediction_coroutine(root_widget):
     """
 
     global predicting
+    global distance
 
     # Start the prediction thread (to clean out the cache).
     renpy.display.im.cache.start_prediction()
@@ -98,6 +106,7 @@ def prediction_coroutine(root_widget):
     image = renpy.display.im.cache.preload_image
 
     predicting = True
+    distance = 0
 
     # Predict displayables given to renpy.start_predict.
     for d in renpy.store._predict_set:
@@ -120,6 +129,8 @@ def prediction_coroutine(root_widget):
     # shortly. Otherwise, call the functions in
     # config.predict_callbacks.
 
+    distance = renpy.config.predict_statements
+
     if len(renpy.game.contexts) >= 2:
         sls = renpy.game.contexts[-2].scene_lists
 
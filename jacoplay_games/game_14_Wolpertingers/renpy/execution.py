@@ -795,7 +795,7 @@ class Context(renpy.object.Object):
 
         old_images = self.images
 
-        # A worklist of (node, images, return_stack) tuples.
+        # A worklist of (node, images, return_stack, distance) tuples.
         nodes = [ ]
 
         # The set of nodes we've seen. (We only consider each node once.)
@@ -812,7 +812,7 @@ class Context(renpy.object.Object):
             if node in seen:
                 continue
 
-            nodes.append((node, self.images, self.return_stack))
+            nodes.append((node, self.images, self.return_stack, 0))
             seen.add(node)
 
         # Predict statements.
@@ -821,10 +821,11 @@ class Context(renpy.object.Object):
             if i >= len(nodes):
                 break
 
-            node, images, return_stack = nodes[i]
+            node, images, return_stack, distance = nodes[i]
 
             self.images = renpy.display.image.ShownImageInfo(images)
             self.predict_return_stack = return_stack
+            renpy.display.predict.distance = distance
 
             try:
 
@@ -833,7 +834,7 @@ class Context(renpy.object.Object):
                         continue
 
                     if n not in seen:
-                        nodes.append((n, self.images, self.predict_return_stack))
+                        nodes.append((n, self.images, self.predict_return_stack, distance + 1))
                         seen.add(n)
 
             except:
@@ -30,6 +30,7 @@ import threading
 import zlib
 import re
 import io
+import mmap
 import unicodedata
 
 from renpy.compat.pickle import loads
@@ -96,6 +97,15 @@ else:
 # other things, using a new version of bytecode.rpyb will break.
 archives = [ ]
 
+# A map from filename to (ArchiveFile, index entry) for the first archive
+# containing that filename, merged from archives by index_archives. This
+# lets load_from_archive and loadable_core use a single dict lookup.
+archive_map = { }
+
+# A map from the path of an archive file to the ArchiveFile sharing its
+# file handle.
+archive_files = { }
+
 # The value of renpy.config.archives the last time index_archives was
 # run.
 old_config_archives = None
@@ -188,6 +198,131 @@ class RPAv1ArchiveHandler(object):
 
 archive_handlers.append(RPAv1ArchiveHandler)
 
+# Positional reads, where the platform has them (not on Windows).
+pread = getattr(os, "pread", None)
+
+# Archives are memory-mapped only in 64-bit processes, where mapping a
+# large archive can't exhaust the address space.
+mmap_archives = sys.maxsize > 2 ** 32
+
+
+class ArchiveFile(object):
+    """
+    A file handle shared by every file loaded from one archive. Reads are
+    positional, so any number of SubFiles (and threads) can use the handle
+    at once, without each load opening the archive again.
+
+    When the archive can be memory-mapped, reads are slices of the mapping,
+    and view returns parts of it without copying.
+    """
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.f = None
+
+        # A read-only mmap of the whole archive, False if the archive can't
+        # be mapped, or None if that hasn't been tried yet.
+        self.mm = None
+
+        # The mapping as a memoryview, for copy-free slices (Python 3).
+        self.mv = None
+
+        # Protects opening the file and, where os.pread is not available,
+        # the seek-and-read pair.
+        self.lock = threading.Lock()
+
+    def open(self):
+        with self.lock:
+            if self.f is None:
+                self.f = open(self.fn, "rb")
+
+        return self.f
+
+    def mapping(self):
+        """
+        Returns the mmap of the archive, or None if it can't be mapped.
+        """
+
+        if self.mm is None:
+            f = self.f
+            if f is None:
+                f = self.open()
+
+            with self.lock:
+                if self.mm is None:
+                    mm = False
+
+                    if mmap_archives:
+                        try:
+                            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                        except Exception:
+                            mm = False
+
+                    if mm and not PY2:
+                        self.mv = memoryview(mm)
+
+                    self.mm = mm
+
+        return self.mm or None
+
+    def view(self, offset, length):
+        """
+        Returns `length` bytes starting at `offset` as a read-only object
+        supporting the buffer protocol (memoryview on Python 3, buffer on
+        Python 2). This is a view of the mapping when the archive is mapped,
+        and a copy otherwise.
+        """
+
+        mm = self.mapping()
+
+        if PY2:
+            if mm is not None:
+                return buffer(mm, offset, length) # @UndefinedVariable
+            return buffer(self.pread(offset, length)) # @UndefinedVariable
+
+        if mm is not None:
+            return self.mv[offset:offset + length]
+
+        return memoryview(self.pread(offset, length))
+
+    def pread(self, offset, length):
+        """
+        Reads up to `length` bytes starting at `offset` in the archive.
+        """
+
+        mm = self.mm
+        if mm is None:
+            mm = self.mapping()
+
+        if mm:
+            return mm[offset:offset + length]
+
+        f = self.f
+        if f is None:
+            f = self.open()
+
+        if pread is None:
+            with self.lock:
+                f.seek(offset)
+                return f.read(length)
+
+        rv = [ ]
+        fd = f.fileno()
+
+        while length > 0:
+            data = pread(fd, length, offset)
+            if not data:
+                break
+
+            rv.append(data)
+            offset += len(data)
+            length -= len(data)
+
+        if len(rv) == 1:
+            return rv[0]
+
+        return b''.join(rv)
+
 
 def index_archives():
     """
@@ -211,6 +346,10 @@ def index_archives():
     global archives
     archives = [ ]
 
+    # Handles already given to SubFiles stay open until those are gone.
+    archive_map.clear()
+    archive_files.clear()
+
     max_header_length = 0
     for handler in archive_handlers:
         for header in handler.get_supported_headers():
@@ -243,6 +382,15 @@ def index_archives():
                                 f.seek(0, 0)
                                 index = handler.read_index(f)
                                 archives.append((prefix + ext, index))
+
+                                archive = archive_files.get(fn, None)
+                                if archive is None:
+                                    archive = archive_files[fn] = ArchiveFile(fn)
+
+                                for name, entry in index.items():
+                                    if name not in archive_map:
+                                        archive_map[name] = (archive, entry)
+
                                 archive_handled = True
                                 break
                         if archive_handled == True:
@@ -599,6 +747,147 @@ class SubFile(object):
         raise Exception("Write not supported by SubFile")
 
 
+class ArchiveSubFile(SubFile):
+    """
+    A SubFile that reads from a shared ArchiveFile, rather than opening
+    the archive itself.
+    """
+
+    def __init__(self, archive, base, length, start):
+        super(ArchiveSubFile, self).__init__(archive.fn, base, length, start)
+        self.archive = archive
+
+    def open(self):
+        return
+
+    def read(self, length=None):
+
+        maxlength = self.length - self.offset
+
+        if length is not None:
+            length = min(length, maxlength)
+        else:
+            length = maxlength
+
+        rv1 = self.start[self.offset:self.offset + length]
+        length -= len(rv1)
+        self.offset += len(rv1)
+
+        if length:
+            rv2 = self.archive.pread(self.base + self.offset - len(self.start), length)
+            self.offset += len(rv2)
+        else:
+            rv2 = b""
+
+        return (rv1 + rv2)
+
+    def readline(self, length=None):
+
+        maxlength = self.length - self.offset
+        if length is not None:
+            length = min(length, maxlength)
+        else:
+            length = maxlength
+
+        rv = [ ]
+
+        # The part of the line in the start.
+        if self.offset < len(self.start):
+            data = self.start[self.offset:self.offset + length]
+
+            end = data.find(b"\n")
+            if end != -1:
+                data = data[:end + 1]
+
+            rv.append(data)
+            self.offset += len(data)
+            length -= len(data)
+
+            if end != -1:
+                return b"".join(rv)
+
+        # The rest, read from the archive a block at a time.
+        while length:
+            data = self.archive.pread(self.base + self.offset - len(self.start), min(length, 4096))
+            if not data:
+                break
+
+            end = data.find(b"\n")
+            if end != -1:
+                data = data[:end + 1]
+
+            rv.append(data)
+            self.offset += len(data)
+            length -= len(data)
+
+            if end != -1:
+                break
+
+        return b"".join(rv)
+
+    def readinto(self, b):
+        """
+        Reads into the writable buffer `b`, returning the number of bytes
+        read. With a mapped archive and Python 3, the data is copied once,
+        straight from the mapping into `b`.
+        """
+
+        if PY2 or (self.archive.mapping() is None):
+            data = self.read(len(b))
+            b[:len(data)] = data
+            return len(data)
+
+        dest = memoryview(b).cast("B")
+        length = min(len(dest), self.length - self.offset)
+
+        done = 0
+
+        if self.offset < len(self.start):
+            data = self.start[self.offset:self.offset + length]
+            dest[:len(data)] = data
+            done = len(data)
+            self.offset += done
+
+        if done < length:
+            pos = self.base + self.offset - len(self.start)
+            dest[done:length] = self.archive.mv[pos:pos + length - done]
+            self.offset += length - done
+
+        return length
+
+    def getbuffer(self):
+        """
+        Returns the whole contents of the file as a read-only buffer (see
+        ArchiveFile.view), without copying when the archive is mapped and
+        the file has no start.
+        """
+
+        if self.start:
+            data = self.start + self.archive.pread(self.base, self.length - len(self.start))
+
+            if PY2:
+                return buffer(data) # @UndefinedVariable
+            return memoryview(data)
+
+        return self.archive.view(self.base, self.length)
+
+    def seek(self, offset, whence=0):
+
+        if whence == 1:
+            offset = self.offset + offset
+        elif whence == 2:
+            offset = self.length + offset
+
+        if offset > self.length:
+            offset = self.length
+
+        self.offset = offset
+
+    def close(self):
+        # The handle belongs to the ArchiveFile, and is shared.
+        return
+
+
 open_file = open
 
 if "RENPY_FORCE_SUBFILE" in os.environ:
@@ -688,38 +977,30 @@ def load_from_archive(name):
     Returns an open python file object of the given type from an archive file.
     """
 
-    for prefix, index in archives:
-        if not name in index:
-            continue
-
-        afn = transfn(prefix)
-
-        data = [ ]
-
-        # Direct path.
-        if len(index[name]) == 1:
+    entry = archive_map.get(name, None)
+    if entry is None:
+        return None
 
-            t = index[name][0]
-            if len(t) == 2:
-                offset, dlen = t
-                start = b''
-            else:
-                offset, dlen, start = t
+    archive, index = entry
 
-            rv = SubFile(afn, offset, dlen, start)
+    # Direct path.
+    if len(index) == 1:
 
-        # Compatibility path.
+        t = index[0]
+        if len(t) == 2:
+            offset, dlen = t
+            start = b''
         else:
-            with open(afn, "rb") as f:
-                for offset, dlen in index[name]:
-                    f.seek(offset)
-                    data.append(f.read(dlen))
+            offset, dlen, start = t
 
-                rv = io.BytesIO(b''.join(data))
+        rv = ArchiveSubFile(archive, offset, dlen, start)
 
-        return rv
+    # Compatibility path.
+    else:
+        data = [ archive.pread(offset, dlen) for offset, dlen in index ]
+        rv = io.BytesIO(b''.join(data))
 
-    return None
+    return rv
 
 
 file_open_callbacks.append(load_from_archive)
@@ -798,6 +1079,21 @@ def load(name, tl=True):
     raise IOError("Couldn't find file '%s'." % name)
 
 
+def load_buffer(name, tl=True):
+    """
+    Returns the contents of `name` as an object supporting the buffer
+    protocol, for readers that accept one (zlib, struct, ...). Files in a
+    mapped archive are returned as a view of the mapping, without copying;
+    other files are read into bytes.
+    """
+
+    with load(name, tl) as f:
+        if isinstance(f, ArchiveSubFile):
+            return f.getbuffer()
+
+        return f.read()
+
+
 def loadable_core(name):
     """
     Returns True if the name is loadable with load, False if it is not.
@@ -821,10 +1117,9 @@ def loadable_core(name):
             loadable_cache[name] = True
             return True
 
-    for _prefix, index in archives:
-        if name in index:
-            loadable_cache[name] = True
-            return True
+    if name in archive_map:
+        loadable_cache[name] = True
+        return True
 
     if name in remote_files:
         loadable_cache[name] = True
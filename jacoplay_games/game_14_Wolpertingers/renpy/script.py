@@ -805,10 +805,10 @@ class Script(object):
 
         # Load the oldcache.
         try:
-            with renpy.loader.load(BYTECODE_FILE) as f:
-                version, cache = loads(zlib.decompress(f.read()))
-                if version == BYTECODE_VERSION:
-                    self.bytecode_oldcache = cache
+            data = renpy.loader.load_buffer(BYTECODE_FILE)
+            version, cache = loads(zlib.decompress(data))
+            if version == BYTECODE_VERSION:
+                self.bytecode_oldcache = cache
 
         except:
             pass
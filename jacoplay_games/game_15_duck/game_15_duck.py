@@ -5,10 +5,9 @@
 
 import os
 import sys
-import json
 import math
 import random
-import argparse
+from array import array
 from dataclasses import dataclass
 import pygame
 
@@ -22,6 +21,18 @@ MEDIA_DIR = os.path.join(BASE_DIR, "game_15_media")
 
 PROPS_PATH = os.path.join(DATA_DIR, "game_15.properties")
 
+# moduli condivisi (jacoplay_sdk/ nella root di Jacoplay)
+JACOPLAY_ROOT = os.path.dirname(os.path.dirname(BASE_DIR))
+if JACOPLAY_ROOT not in sys.path:
+    sys.path.insert(0, JACOPLAY_ROOT)
+
+from jacoplay_sdk.assets import get_asset_cache
+from jacoplay_sdk.props import PropertiesStore
+from jacoplay_sdk.result import exit_with_score, parse_score_arg
+from jacoplay_sdk.sfx import SfxManager
+from jacoplay_sdk.telemetry import get_profiler
+from jacoplay_sdk.ui import Label, StaticLayer
+
 FONT_PATH = os.path.join(MEDIA_DIR, "DirtyWar.otf")
 BKG_MENU_PATH = os.path.join(MEDIA_DIR, "bkg_menu.png")
 BKG_ISTR_PATH = os.path.join(MEDIA_DIR, "bkg_istruzioni.png")
@@ -67,11 +78,20 @@ WAVE_SPAWN_MARGIN = 40         # “appena fuori” dallo schermo
 DUCK_SPRITE_W = 96
 DUCK_SPRITE_H = 96
 
+# corpo nemico per i colpi: cerchio inscritto nello sprite (test swept segmento-cerchio)
+DUCK_BODY_R = DUCK_SPRITE_W / 2
+
 # hitbox nemico = SOLO quarto inferiore ("piedi")
 DUCK_FOOT_W = 60
 DUCK_FOOT_H = DUCK_SPRITE_H // 4  # 24
 
 
+# quack: cooldown per papera + regole del mixer SFX
+QUACK_COOLDOWN_MS = 1000           # ogni papera starnazza al massimo 1 volta/sec
+QUACK_MIN_INTERVAL_MS = 60         # tra due quack qualsiasi (onde dense)
+QUACK_MAX_VOICES = 4               # quack contemporanei
+SFX_VOICES = 8                     # budget voci del gioco
+
 # energia a prossimità nemici
 ENERGY_DRAIN_RADIUS = 120.0        # px (tweak)
 ENERGY_DRAIN_RATE_PER_DUCK = 3.0   # 3 punti al secondo per nemico vicino
@@ -103,13 +123,26 @@ BIANCO = (255, 255, 255)
 VERDE_SCURO = (13, 53, 18)
 ARANCIO = (192, 79, 21)
 
-WORLD_W, WORLD_H = 5760, 3240           # 3x3 schermate 1920x1080
 TILE_W, TILE_H = 1920, 1080
+# mondo a chunk (toroidale): ogni chunk è una schermata generata dal seed quando il player si avvicina
+CHUNK_W, CHUNK_H = TILE_W, TILE_H
+WORLD_CHUNKS_X, WORLD_CHUNKS_Y = 3, 3   # 3x3 schermate (si può allargare: il costo non cresce col mondo)
+WORLD_W, WORLD_H = CHUNK_W * WORLD_CHUNKS_X, CHUNK_H * WORLD_CHUNKS_Y
+CHUNK_LOAD_RADIUS = 1                   # chunk caricati attorno a quello del player (3x3)
+CHUNK_EVICT_RADIUS = 2                  # oltre questa distanza (in chunk) vengono scaricati
+
+OBST_W, OBST_H = 249, 159
+OBSTACLES_PER_CHUNK = (4, 5)            # ~40 ostacoli su 3x3 come prima
+OBST_MIN_DIST = math.hypot(OBST_W, OBST_H)  # raggio Poisson: a questa distanza due ostacoli non si sovrappongono
+START_AVOID_R = 280                     # niente ostacoli attorno al punto di partenza
+SLOT_MARGIN = 200
+SLOT_START_AVOID_R = 260
 PLAYER_SPEED = 240.0                     # px/s (virtuali)
 
 BULLET_POOL_SIZE = 20
 BULLET_SPEED = 1400.0          # px/s virtuali
 BULLET_LIFE_MS = 1400          # durata massima prima di tornare nel pool
+BULLET_RADIUS = 12             # raggio di collisione (sprite 24x24)
 BULLET2_ENERGY_COST = 0        # costo energia per colpo_02 (1 = “1 energia”)
 
 SLOT_W, SLOT_H = 220, 120
@@ -127,43 +160,76 @@ GRID_ROWS = H // CELL   # 1080/40 = 27
 # -----------------------------
 # Utilities
 # -----------------------------
-def load_json(path: str) -> dict:
-    if not os.path.exists(path):
-        return {}
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-def save_json(path: str, obj: dict) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(obj, f, ensure_ascii=False, indent=2)
-
 def safe_image(path: str, fallback_size=None) -> pygame.Surface:
-    if not os.path.exists(path):
-        if fallback_size is None:
-            fallback_size = (W, H)
-        surf = pygame.Surface(fallback_size)
-        surf.fill((255, 0, 255))
-        return surf.convert()
-    img = pygame.image.load(path)
-    return img.convert_alpha() if img.get_alpha() else img.convert()
+    """Immagine dalla cache condivisa (alpha solo se il PNG lo ha); se manca, segnaposto magenta."""
+    return get_asset_cache().image(path, alpha=None, fallback_size=fallback_size or (W, H))
 
 def safe_font(path: str, size: int) -> pygame.font.Font:
-    if os.path.exists(path):
-        return pygame.font.Font(path, size)
-    return pygame.font.SysFont(None, size)
+    return get_asset_cache().font(path, size)
 
 def render_centered(font: pygame.font.Font, text: str, color, center_xy):
     surf = font.render(text, True, color)
     rect = surf.get_rect(center=center_xy)
     return surf, rect
 
+def create_sfx() -> SfxManager:
+    """Mixer SFX del gioco: i quack vengono decodificati una volta sola."""
+    sfx = SfxManager(num_voices=SFX_VOICES)
+    sfx.register(
+        "quack",
+        QUACK_PATHS,
+        priority=0,
+        min_interval_ms=QUACK_MIN_INTERVAL_MS,
+        max_voices=QUACK_MAX_VOICES,
+    )
+    return sfx
+
 def wrap_pos(x: float, y: float) -> tuple[float, float]:
     """Toro: coordinate sempre in [0..WORLD_W), [0..WORLD_H)."""
     x %= WORLD_W
     y %= WORLD_H
     return x, y
 
+def poisson_disk_sample(rng: random.Random, x0: float, y0: float, w: float, h: float, r: float,
+                        max_points: int, tries: int = 30, reject=None) -> list[tuple[float, float]]:
+    """
+    Punti casuali nel rettangolo (x0,y0,w,h) a distanza >= r l'uno dall'altro (dart throwing su griglia
+    di celle r/sqrt(2): ogni cella contiene al massimo un punto, il controllo è sulle 5x5 celle vicine).
+    `reject(x, y)` opzionale scarta candidati (es. zona di partenza).
+    """
+    cell = r / math.sqrt(2.0)
+    cols = max(1, int(math.ceil(w / cell)))
+    rows = max(1, int(math.ceil(h / cell)))
+    grid: list[tuple[float, float] | None] = [None] * (cols * rows)
+    r2 = r * r
+    out: list[tuple[float, float]] = []
+
+    for _ in range(max_points * tries):
+        if len(out) >= max_points:
+            break
+        x = rng.uniform(0.0, w)
+        y = rng.uniform(0.0, h)
+        gx = min(cols - 1, int(x / cell))
+        gy = min(rows - 1, int(y / cell))
+        if grid[gy * cols + gx] is not None:
+            continue
+        ok = True
+        for ny in range(max(0, gy - 2), min(rows, gy + 3)):
+            for nx in range(max(0, gx - 2), min(cols, gx + 3)):
+                q = grid[ny * cols + nx]
+                if q is not None and (q[0] - x) ** 2 + (q[1] - y) ** 2 < r2:
+                    ok = False
+                    break
+            if not ok:
+                break
+        if not ok:
+            continue
+        if reject is not None and reject(x0 + x, y0 + y):
+            continue
+        grid[gy * cols + gx] = (x, y)
+        out.append((x0 + x, y0 + y))
+    return out
+
 def shortest_delta(a: float, b: float, period: float) -> float:
     """Delta b-a sulla circonferenza, scegliendo il cammino più corto ([-period/2, +period/2])."""
     d = b - a
@@ -236,17 +302,19 @@ class MenuItem:
     action: str  # "NEW", "HELP", "QUIT"
     rect: pygame.Rect | None = None
     hovered: bool = False
+    widget: Label | None = None   # testo pre-renderizzato: ri-render solo al cambio di hover
 
     def compute_rect(self, font: pygame.font.Font, x_center: int):
-        surf = font.render(self.label, True, VERDE_SCURO)
-        self.rect = surf.get_rect(center=(x_center, self.y))
+        self.widget = Label(font, self.label, VERDE_SCURO, pos=(x_center, self.y), anchor="center")
+        self.rect = self.widget.rect
 
     def draw(self, screen: pygame.Surface, font: pygame.font.Font, x_center: int):
-        color = ARANCIO if self.hovered else VERDE_SCURO
-        surf = font.render(self.label, True, color)
-        rect = surf.get_rect(center=(x_center, self.y))
-        self.rect = rect
-        screen.blit(surf, rect)
+        if self.widget is None or self.widget.font is not font:
+            self.compute_rect(font, x_center)
+        self.widget.set_pos((x_center, self.y))
+        self.widget.set_color(ARANCIO if self.hovered else VERDE_SCURO)
+        self.rect = self.widget.rect
+        self.widget.draw(screen)
 
 
 # -----------------------------
@@ -299,70 +367,109 @@ class Slot:
         sy = (H // 2) + dy - WEAPON_H // 2
         return pygame.Rect(int(sx), int(sy), WEAPON_W, WEAPON_H)
 
+@dataclass
 
 # -----------------------------
-# class BULLET
+# class WORLD CHUNK
 # -----------------------------
-class Bullet:
-    def __init__(self):
-        self.active = False
-        self.kind = 1  # 1=colpo_01, 2=colpo_02
-        self.x = 0.0
-        self.y = 0.0
-        self.vx = 0.0
-        self.vy = 0.0
-        self.spawn_ms = 0
-        self.hits_left = 1
+class WorldChunk:
+    cx: int
+    cy: int
+    obstacles: list
+    slot: Slot | None
 
-    def spawn(self, kind: int, x: float, y: float, vx: float, vy: float, now_ms: int):
-        self.active = True
-        self.kind = kind
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.spawn_ms = now_ms
-        self.hits_left = 3 if kind == 2 else 1
-
-    def deactivate(self):
-        self.active = False
-
-    def update(self, dt: float, now_ms: int):
-        if not self.active:
-            return
-        # lifespan
-        if now_ms - self.spawn_ms >= BULLET_LIFE_MS:
-            self.active = False
-            return
-
-        self.x = (self.x + self.vx * dt) % WORLD_W
-        self.y = (self.y + self.vy * dt) % WORLD_H
 
 # -----------------------------
 # class BULLET POOL
 # -----------------------------
 class BulletPool:
+    """
+    Pool proiettili "struct of arrays": niente oggetti per proiettile, solo array paralleli per slot.
+    - free-list (stack di slot liberi): spawn O(1)
+    - `active` = lista densa degli slot vivi (+ `_pos` slot -> indice) con rimozione swap-remove O(1)
+    - update() integra e scade tutti i vivi in un solo ciclo stretto
+    Gli slot si iterano sempre all'indietro su `active`, così si può disattivare durante il ciclo.
+    """
+
     def __init__(self, capacity: int):
-        self.bullets = [Bullet() for _ in range(capacity)]
-        self._cursor = 0  # round-robin
+        self.capacity = capacity
+        self.kind = array("b", [0]) * capacity        # 1=colpo_01, 2=colpo_02
+        self.x = array("d", [0.0]) * capacity
+        self.y = array("d", [0.0]) * capacity
+        self.vx = array("d", [0.0]) * capacity
+        self.vy = array("d", [0.0]) * capacity
+        self.spawn_ms = array("q", [0]) * capacity
+        self.hits_left = array("b", [0]) * capacity
+
+        self.active: list[int] = []
+        self._pos = array("i", [-1]) * capacity
+        self._free = list(range(capacity - 1, -1, -1))
+        self.last_dt = 0.0   # dt dell'ultima integrazione (per il test swept)
 
     def spawn(self, kind: int, x: float, y: float, vx: float, vy: float, now_ms: int) -> bool:
         """Ritorna True se ha spawnato, False se il pool è pieno (tutti attivi)."""
-        # prova a trovare un proiettile libero partendo dal cursore
-        n = len(self.bullets)
-        for i in range(n):
-            idx = (self._cursor + i) % n
-            b = self.bullets[idx]
-            if not b.active:
-                b.spawn(kind, x, y, vx, vy, now_ms)
-                self._cursor = (idx + 1) % n
-                return True
-        return False  # pool pieno
+        if not self._free:
+            return False
+        i = self._free.pop()
+        self.kind[i] = kind
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.spawn_ms[i] = now_ms
+        self.hits_left[i] = 3 if kind == 2 else 1
+        self._pos[i] = len(self.active)
+        self.active.append(i)
+        return True
+
+    def deactivate(self, i: int):
+        k = self._pos[i]
+        if k < 0:
+            return
+        last = self.active.pop()
+        if last != i:
+            self.active[k] = last
+            self._pos[last] = k
+        self._pos[i] = -1
+        self._free.append(i)
 
     def update(self, dt: float, now_ms: int):
-        for b in self.bullets:
-            if b.active:
-                b.update(dt, now_ms)
+        xs, ys, vxs, vys, born = self.x, self.y, self.vx, self.vy, self.spawn_ms
+        act = self.active
+        self.last_dt = dt
+        for k in range(len(act) - 1, -1, -1):
+            i = act[k]
+            # lifespan
+            if now_ms - born[i] >= BULLET_LIFE_MS:
+                self.deactivate(i)
+                continue
+            xs[i] = (xs[i] + vxs[i] * dt) % WORLD_W
+            ys[i] = (ys[i] + vys[i] * dt) % WORLD_H
+
+
+def segment_circle_t(x0: float, y0: float, x1: float, y1: float, cx: float, cy: float, r: float) -> float:
+    """
+    Primo istante t in [0,1] in cui il segmento (x0,y0)->(x1,y1) entra nel cerchio (cx,cy,r).
+    -1 se non lo tocca. Con l'inizio già dentro il cerchio ritorna 0.
+    """
+    fx = x0 - cx
+    fy = y0 - cy
+    c = fx * fx + fy * fy - r * r
+    if c <= 0.0:
+        return 0.0
+    dx = x1 - x0
+    dy = y1 - y0
+    a = dx * dx + dy * dy
+    if a <= 1e-12:
+        return -1.0
+    b = fx * dx + fy * dy          # metà del coefficiente lineare
+    if b >= 0.0:
+        return -1.0                # si allontana dal centro
+    disc = b * b - a * c
+    if disc < 0.0:
+        return -1.0
+    t = (-b - math.sqrt(disc)) / a
+    return t if t <= 1.0 else -1.0
 
 # -----------------------------
 # class ENEMY
@@ -375,6 +482,7 @@ class Enemy:
         self.x = 0.0
         self.y = 0.0
         self.hp = 1
+        self.next_quack_ms = 0  # cooldown quack (vive nel record, niente dict esterni)
 
     def spawn(self, elite: bool, x: float, y: float):
         self.active = True
@@ -382,6 +490,7 @@ class Enemy:
         self.x = x
         self.y = y
         self.hp = DUCK_HP_ELITE if elite else DUCK_HP_NORMAL
+        self.next_quack_ms = 0
 
     def deactivate(self):
         self.active = False
@@ -467,7 +576,7 @@ class DuckPool:
 # class GAME SESSION
 # -----------------------------
 class GameSession:
-    def __init__(self):
+    def __init__(self, sfx: SfxManager | None = None):
         # player
         self.px = WORLD_W / 2
         self.py = WORLD_H / 2
@@ -497,6 +606,10 @@ class GameSession:
         self.colpo2 = safe_image(COLPO2_PATH, fallback_size=(24, 24))
         self.bullet_pool = BulletPool(BULLET_POOL_SIZE)
 
+        # scritte HUD (create al primo draw_hud, col font passato dal gioco)
+        self._hud_font: pygame.font.Font | None = None
+        self._hud_labels: list[Label] = []
+
         # duck sprites (normali + élite)
         self.papera_dx_01 = safe_image(PAPERA_DX_01, fallback_size=(96, 96))
         self.papera_dx_02 = safe_image(PAPERA_DX_02, fallback_size=(96, 96))
@@ -512,16 +625,20 @@ class GameSession:
         self.player_img = self.jac_front
         self.player_rect = self.player_img.get_rect(center=(W // 2, H // 2))
 
-        # obstacles
+        # mondo a chunk: ostacoli e slot dei soli chunk vicini al player (generati dal seed)
+        self.world_seed = random.getrandbits(32)
+        self._obstacle_imgs = [safe_image(p, fallback_size=(OBST_W, OBST_H)) for p in OBSTACLE_PATHS]
+        self.chunks: dict[tuple[int, int], WorldChunk] = {}
+        self._slot_memory: dict[tuple[int, int], tuple[int, bool, int]] = {}  # stato slot dei chunk scaricati
+        self._player_chunk: tuple[int, int] | None = None
         self.obstacles: list[Obstacle] = []
-        self._spawn_obstacles()
-
         self.slots: list[Slot] = []
-        self._spawn_slots()
+        self._update_chunks()
 
         # pool papere
         self.ducks_normal = DuckPool(DUCK_POOL_NORMAL)
         self.ducks_elite = DuckPool(DUCK_POOL_ELITE)
+        self._duck_pools = (self.ducks_normal, self.ducks_elite)
 
         # wave timer
         self.wave = 1
@@ -536,110 +653,94 @@ class GameSession:
         # spatial grid
         self.grid = SpatialGrid(GRID_COLS, GRID_ROWS)
 
-        # quack sounds + cooldown per papera (1 suono/sec per papera)
-        self.quacks: list[pygame.mixer.Sound] = []
-        for p in QUACK_PATHS:
-            if os.path.exists(p):
-                try:
-                    s = pygame.mixer.Sound(p)
-                    self.quacks.append(s)
-                except pygame.error:
-                    pass
-
-        # key = id(enemy), value = last_play_ms
-        self._last_quack_ms: dict[int, int] = {}
-        
-
-
-    def _spawn_obstacles(self):
-        # specifiche: 40 ostacoli 249x159, random su 5760x3240, no overlap col punto di start (centro)
-        target = 40
-        ow, oh = 249, 159
+        # quack: mixer condiviso (se non passato dal Game, ne creiamo uno)
+        self.sfx = sfx if sfx is not None else create_sfx()
 
-        imgs = [safe_image(p, fallback_size=(ow, oh)) for p in OBSTACLE_PATHS]
-        start_x, start_y = WORLD_W / 2, WORLD_H / 2
 
-        # area di esclusione attorno allo start (un po' conservativa)
-        avoid_r = 280
+    # -------------------------
+    # Mondo a chunk
+    # -------------------------
+    def _chunk_rng(self, cx: int, cy: int) -> random.Random:
+        # stesso seed + stesso chunk => stesso contenuto (anche dopo uno scaricamento)
+        return random.Random((self.world_seed * 73856093) ^ (cx * 19349663) ^ (cy * 83492791))
+
+    def _near_start(self, x: float, y: float, r: float) -> bool:
+        dx0 = shortest_delta(WORLD_W / 2, x, WORLD_W)
+        dy0 = shortest_delta(WORLD_H / 2, y, WORLD_H)
+        return dx0 * dx0 + dy0 * dy0 < r * r
+
+    def _generate_chunk(self, cx: int, cy: int) -> WorldChunk:
+        rng = self._chunk_rng(cx, cy)
+        x0 = cx * CHUNK_W
+        y0 = cy * CHUNK_H
+
+        # ostacoli: Poisson-disk dentro il chunk, con bordo di OBST_MIN_DIST/2 così anche
+        # gli ostacoli di chunk vicini restano a distanza >= OBST_MIN_DIST (nessun controllo incrociato)
+        inset = OBST_MIN_DIST / 2
+        pts = poisson_disk_sample(
+            rng,
+            x0 + inset, y0 + inset, CHUNK_W - 2 * inset, CHUNK_H - 2 * inset,
+            OBST_MIN_DIST,
+            rng.randint(*OBSTACLES_PER_CHUNK),
+            reject=lambda x, y: self._near_start(x, y, START_AVOID_R),
+        )
+        obstacles = [
+            Obstacle(img=rng.choice(self._obstacle_imgs), x=x, y=y, w=OBST_W, h=OBST_H)
+            for x, y in pts
+        ]
 
-        placed = 0
-        tries = 0
-        max_tries = 15000
+        # slot arma: uno per chunk, lontano dagli ostacoli del chunk (bbox approssimato)
+        sx = sy = 0.0
+        for tries in range(400):
+            sx = rng.uniform(x0 + SLOT_MARGIN, x0 + CHUNK_W - SLOT_MARGIN)
+            sy = rng.uniform(y0 + SLOT_MARGIN, y0 + CHUNK_H - SLOT_MARGIN)
+            if tries < 200 and self._near_start(sx, sy, SLOT_START_AVOID_R):
+                continue
+            if not any(
+                abs(sx - ob.x) < (SLOT_W + ob.w) / 2 and abs(sy - ob.y) < (SLOT_H + ob.h) / 2
+                for ob in obstacles
+            ):
+                break
+        slot = Slot(x=sx, y=sy, weapon_kind=1 if rng.random() < 0.75 else 2)
+
+        mem = self._slot_memory.pop((cx, cy), None)
+        if mem is not None:
+            slot.weapon_kind, slot.weapon_active, slot.respawn_at_ms = mem
+
+        return WorldChunk(cx=cx, cy=cy, obstacles=obstacles, slot=slot)
+
+    def _update_chunks(self):
+        """Carica i chunk vicini al player e scarica quelli lontani (solo quando cambia chunk)."""
+        pc = (int(self.px // CHUNK_W) % WORLD_CHUNKS_X, int(self.py // CHUNK_H) % WORLD_CHUNKS_Y)
+        if pc == self._player_chunk:
+            return
+        self._player_chunk = pc
 
-        while placed < target and tries < max_tries:
-            tries += 1
-            x = random.uniform(0, WORLD_W)
-            y = random.uniform(0, WORLD_H)
+        def chunk_dist(cx: int, cy: int) -> int:
+            dx = abs(cx - pc[0])
+            dy = abs(cy - pc[1])
+            return max(min(dx, WORLD_CHUNKS_X - dx), min(dy, WORLD_CHUNKS_Y - dy))
 
-            # evita start
-            dx0 = shortest_delta(start_x, x, WORLD_W)
-            dy0 = shortest_delta(start_y, y, WORLD_H)
-            if (dx0 * dx0 + dy0 * dy0) ** 0.5 < avoid_r:
-                continue
+        for key in [k for k in self.chunks if chunk_dist(*k) > CHUNK_EVICT_RADIUS]:
+            ch = self.chunks.pop(key)
+            sl = ch.slot
+            if sl is not None and not sl.weapon_active:
+                self._slot_memory[key] = (sl.weapon_kind, sl.weapon_active, sl.respawn_at_ms)
 
-            # evita overlap tra ostacoli (in torus: usiamo delta corto rispetto al candidato)
-            ok = True
-            for ob in self.obstacles:
-                dx = shortest_delta(x, ob.x, WORLD_W)
-                dy = shortest_delta(y, ob.y, WORLD_H)
-                if abs(dx) < (ow + ob.w) / 2 and abs(dy) < (oh + ob.h) / 2:
-                    # rettangoli potenzialmente sovrapposti -> scartiamo
-                    ok = False
-                    break
-            if not ok:
-                continue
+        for dy in range(-CHUNK_LOAD_RADIUS, CHUNK_LOAD_RADIUS + 1):
+            for dx in range(-CHUNK_LOAD_RADIUS, CHUNK_LOAD_RADIUS + 1):
+                key = ((pc[0] + dx) % WORLD_CHUNKS_X, (pc[1] + dy) % WORLD_CHUNKS_Y)
+                if key not in self.chunks:
+                    self.chunks[key] = self._generate_chunk(*key)
 
-            img = random.choice(imgs)
-            self.obstacles.append(Obstacle(img=img, x=x, y=y, w=ow, h=oh))
-            placed += 1
+        # liste piatte usate da collisioni e disegno (ricostruite solo al cambio chunk)
+        self.obstacles = [ob for ch in self.chunks.values() for ob in ch.obstacles]
+        self.slots = [ch.slot for ch in self.chunks.values() if ch.slot is not None]
 
     def _random_weapon_kind(self) -> int:
         # 75% arma_01, 25% arma_02
         return 1 if random.random() < 0.75 else 2
 
-    def _spawn_slots(self):
-        margin_x = 200
-        margin_y = 200
-        avoid_start_r = 260
-
-        for ty in range(3):
-            for tx in range(3):
-                tile_x0 = tx * TILE_W
-                tile_y0 = ty * TILE_H
-
-                tries = 0
-                while True:
-                    tries += 1
-                    sx = random.uniform(tile_x0 + margin_x, tile_x0 + TILE_W - margin_x)
-                    sy = random.uniform(tile_y0 + margin_y, tile_y0 + TILE_H - margin_y)
-
-                    # evita start (centro)
-                    dx0 = shortest_delta(WORLD_W / 2, sx, WORLD_W)
-                    dy0 = shortest_delta(WORLD_H / 2, sy, WORLD_H)
-                    if (dx0 * dx0 + dy0 * dy0) ** 0.5 < avoid_start_r and tries < 200:
-                        continue
-
-                    # evita ostacoli (bbox approssimato)
-                    ok = True
-                    for ob in self.obstacles:
-                        dx = shortest_delta(sx, ob.x, WORLD_W)
-                        dy = shortest_delta(sy, ob.y, WORLD_H)
-                        if abs(dx) < (SLOT_W + ob.w) / 2 and abs(dy) < (SLOT_H + ob.h) / 2:
-                            ok = False
-                            break
-
-                    if ok or tries >= 400:
-                        self.slots.append(
-                            Slot(
-                                x=sx,
-                                y=sy,
-                                weapon_kind=self._random_weapon_kind(),
-                                weapon_active=True,
-                                respawn_at_ms=0,
-                            )
-                        )
-                        break
-
     # calcola speed wave
     def _duck_speed_for_wave(self, wave: int) -> float:
         return DUCK_SPEED_BASE + DUCK_SPEED_INC_PER_WAVE * (wave - 1)
@@ -1038,6 +1139,7 @@ class GameSession:
             ny = (self.py + dy) % WORLD_H
             if not self._collides_with_obstacles(self.px, ny):
                 self.py = ny
+        self._update_chunks()
 
         if self._blink_ms_left > 0:
             self._blink_ms_left = max(0, self._blink_ms_left - int(dt * 1000))
@@ -1055,15 +1157,15 @@ class GameSession:
 
         # bullet fuori schermo => deactivate
         margin = 30
-        for b in self.bullet_pool.bullets:
-            if not b.active:
-                continue
-
-            dx = shortest_delta(self.px, b.x, WORLD_W)
-            dy = shortest_delta(self.py, b.y, WORLD_H)
+        bpool = self.bullet_pool
+        bxs, bys = bpool.x, bpool.y
+        for k in range(len(bpool.active) - 1, -1, -1):
+            i = bpool.active[k]
+            dx = shortest_delta(self.px, bxs[i], WORLD_W)
+            dy = shortest_delta(self.py, bys[i], WORLD_H)
 
             if abs(dx) > (W / 2 + margin) or abs(dy) > (H / 2 + margin):
-                b.deactivate()
+                bpool.deactivate(i)
 
 
         # update papere (axis-separated vs ostacoli)
@@ -1077,12 +1179,6 @@ class GameSession:
             if en.active:
                 self._move_enemy_towards_player(en, dt, speed)
 
-        # pulizia cooldown quack per papere non più attive
-        if self._last_quack_ms:
-            for en in (self.ducks_normal.enemies + self.ducks_elite.enemies):
-                if (not en.active) and (id(en) in self._last_quack_ms):
-                    del self._last_quack_ms[id(en)]
-
 
         # evita che le papere camminino sugli ostacoli
         #for en in self.ducks_normal.enemies:
@@ -1178,42 +1274,28 @@ class GameSession:
         p_hit.height = max(1, p_hit.height - cut)
 
         near = 0
-
-        def is_near(en: Enemy) -> bool:
-            dx = shortest_delta(self.px, en.x, WORLD_W)
-            dy = shortest_delta(self.py, en.y, WORLD_H)
-            return (dx*dx + dy*dy) <= (ENERGY_DRAIN_RADIUS * ENERGY_DRAIN_RADIUS)
-
-        for en in self.ducks_normal.enemies:
-            if en.active and is_near(en):
-                near += 1
-        for en in self.ducks_elite.enemies:
-            if en.active and is_near(en):
+        near_r2 = ENERGY_DRAIN_RADIUS * ENERGY_DRAIN_RADIUS
+        vulnerable = self._blink_ms_left <= 0
+
+        # un solo passaggio: conta le papere vicine e fa starnazzare quelle col cooldown scaduto
+        # (max 1/sec ciascuna; il mixer poi limita voci e densità complessiva)
+        for pool in self._duck_pools:
+            for en in pool.enemies:
+                if not en.active:
+                    continue
+                dx = shortest_delta(self.px, en.x, WORLD_W)
+                dy = shortest_delta(self.py, en.y, WORLD_H)
+                if (dx * dx + dy * dy) > near_r2:
+                    continue
                 near += 1
+                if vulnerable and now_ms >= en.next_quack_ms:
+                    en.next_quack_ms = now_ms + QUACK_COOLDOWN_MS
+                    self.sfx.play("quack", now_ms=now_ms)
 
-        # drain energia + quack per papera (max 1/sec ciascuna)
-        if near > 0 and self._blink_ms_left <= 0:
-            # energia
+        # drain energia
+        if near > 0 and vulnerable:
             self._energy_drain_accum += dt * (ENERGY_DRAIN_RATE_PER_DUCK * near)
 
-            # quack: uno per papera "vicina" con cooldown 1000ms
-            if self.quacks:
-                # raccogli tutte le papere vicine (normali + elite)
-                near_enemies: list[Enemy] = []
-                for en in self.ducks_normal.enemies:
-                    if en.active and is_near(en):
-                        near_enemies.append(en)
-                for en in self.ducks_elite.enemies:
-                    if en.active and is_near(en):
-                        near_enemies.append(en)
-
-                for en in near_enemies:
-                    eid = id(en)
-                    last = self._last_quack_ms.get(eid, -10_000)
-                    if now_ms - last >= 1000:
-                        self._last_quack_ms[eid] = now_ms
-                        random.choice(self.quacks).play()
-
         # applica drain (float immediato)
         drain = self._energy_drain_accum
         if drain > 0:
@@ -1233,37 +1315,49 @@ class GameSession:
                 self._energy_drain_accum = 0.0
 
 
-        # bullet vs enemy usando griglia
-        bsize = 24
-
-        for b in self.bullet_pool.bullets:
-            if not b.active:
-                continue
-
-            dx = shortest_delta(self.px, b.x, WORLD_W)
-            dy = shortest_delta(self.py, b.y, WORLD_H)
-            br = pygame.Rect(int((W // 2) + dx - bsize // 2), int((H // 2) + dy - bsize // 2), bsize, bsize)
-
-            candidates = self.grid.query_rect(br)
-            for en in candidates:
-                if not getattr(en, "active", False):
+        # bullet vs enemy: test swept (segmento percorso in questo frame vs cerchio del corpo)
+        # sui candidati della griglia, così a BULLET_SPEED alto i colpi non "attraversano" le papere
+        hit_r = DUCK_BODY_R + BULLET_RADIUS
+        step_dt = bpool.last_dt
+        cx0 = W // 2
+        cy0 = H // 2
+        for k in range(len(bpool.active) - 1, -1, -1):
+            i = bpool.active[k]
+            x1 = cx0 + shortest_delta(self.px, bxs[i], WORLD_W)
+            y1 = cy0 + shortest_delta(self.py, bys[i], WORLD_H)
+            x0 = x1 - bpool.vx[i] * step_dt
+            y0 = y1 - bpool.vy[i] * step_dt
+
+            qr = pygame.Rect(
+                int(min(x0, x1) - BULLET_RADIUS), int(min(y0, y1) - BULLET_RADIUS),
+                int(abs(x1 - x0)) + 2 * BULLET_RADIUS, int(abs(y1 - y0)) + 2 * BULLET_RADIUS,
+            )
+            best = None
+            best_t = 2.0
+            for en in self.grid.query_rect(qr):
+                if not en.active:
                     continue
-                er = en.body_rect_local(self.px, self.py)
-                if br.colliderect(er):
-                    en.hit(1)
-                    b.hits_left -= 1
-                    if b.hits_left <= 0:
-                        b.deactivate()
-                    break
+                ex = cx0 + shortest_delta(self.px, en.x, WORLD_W)
+                ey = cy0 + shortest_delta(self.py, en.y, WORLD_H)
+                t = segment_circle_t(x0, y0, x1, y1, ex, ey, hit_r)
+                if 0.0 <= t < best_t:
+                    best_t = t
+                    best = en
+
+            # un colpo per frame per proiettile (il primo lungo la traiettoria)
+            if best is not None:
+                best.hit(1)
+                bpool.hits_left[i] -= 1
+                if bpool.hits_left[i] <= 0:
+                    bpool.deactivate(i)
 
 
         # collisione contro ostacoli: se collide, sparisce
-        bsize = 24  # coerente col fallback_size
-        for b in self.bullet_pool.bullets:
-            if not b.active:
-                continue
-            if self._bullet_hits_obstacle(b.x, b.y, bsize, bsize):
-                b.deactivate()
+        bsize = 2 * BULLET_RADIUS
+        for k in range(len(bpool.active) - 1, -1, -1):
+            i = bpool.active[k]
+            if self._bullet_hits_obstacle(bxs[i], bys[i], bsize, bsize):
+                bpool.deactivate(i)
 
         self._check_weapon_pickups()
 
@@ -1287,10 +1381,6 @@ class GameSession:
 
         for ty in range(start_ty, end_ty + 1):
             for tx in range(start_tx, end_tx + 1):
-                # world tile coordinate wrapped in 0..2
-                wtx = tx % 3
-                wty = ty % 3
-
                 # top-left of this tile in world coords (wrapped)
                 tile_world_x = tx * TILE_W
                 tile_world_y = ty * TILE_H
@@ -1380,16 +1470,14 @@ class GameSession:
             screen.blit(img, r)
 
         # draw bullets (sopra il mondo, sotto il player)
-        for b in self.bullet_pool.bullets:
-            if not b.active:
-                continue
-
-            dx = shortest_delta(self.px, b.x, WORLD_W)
-            dy = shortest_delta(self.py, b.y, WORLD_H)
+        bpool = self.bullet_pool
+        for i in bpool.active:
+            dx = shortest_delta(self.px, bpool.x[i], WORLD_W)
+            dy = shortest_delta(self.py, bpool.y[i], WORLD_H)
             sx = int((W // 2) + dx)
             sy = int((H // 2) + dy)
 
-            img_b = self.colpo1 if b.kind == 1 else self.colpo2
+            img_b = self.colpo1 if bpool.kind[i] == 1 else self.colpo2
             r = img_b.get_rect(center=(sx, sy))
 
             # culling semplice
@@ -1411,10 +1499,22 @@ class GameSession:
             screen.blit(img, prect)
 
     def draw_hud(self, screen: pygame.Surface, font50: pygame.font.Font):
-        # Labels
-        screen.blit(font50.render("ENERGIA", True, VERDE_SCURO), (35, 42))
-        screen.blit(font50.render("VITE", True, VERDE_SCURO), (35, 989))
-        screen.blit(font50.render(f"WAVE {self.wave}", True, VERDE_SCURO), (1610, 42))
+        if self._hud_font is not font50:
+            self._hud_font = font50
+            self._hud_labels = [
+                Label(font50, "ENERGIA", VERDE_SCURO, pos=(35, 42)),
+                Label(font50, "VITE", VERDE_SCURO, pos=(35, 989)),
+                Label(font50, "", VERDE_SCURO, pos=(1610, 42)),    # wave
+                Label(font50, "", VERDE_SCURO, pos=(1442, 986)),   # munizioni arma 1
+                Label(font50, "", VERDE_SCURO, pos=(1754, 986)),   # munizioni arma 2
+            ]
+        lbl_energy, lbl_lives, lbl_wave, lbl_ammo1, lbl_ammo2 = self._hud_labels
+
+        # Labels (ri-render solo quando cambia il valore)
+        lbl_energy.draw(screen)
+        lbl_lives.draw(screen)
+        lbl_wave.set_text(f"WAVE {self.wave}")
+        lbl_wave.draw(screen)
 
         # hearts (3 posizioni fisse; se vite < 3 non disegniamo quelli a destra)
         heart_positions = [(213, 987), (296, 987), (379, 987)]
@@ -1423,10 +1523,12 @@ class GameSession:
 
         # weapons icons + ammo counts
         screen.blit(self.arma1, (1328, 963))
-        screen.blit(font50.render(str(self.ammo1), True, VERDE_SCURO), (1442, 986))
+        lbl_ammo1.set_text(str(self.ammo1))
+        lbl_ammo1.draw(screen)
 
         screen.blit(self.arma2, (1617, 963))
-        screen.blit(font50.render(str(self.ammo2), True, VERDE_SCURO), (1754, 986))
+        lbl_ammo2.set_text(str(self.ammo2))
+        lbl_ammo2.draw(screen)
 
         # energy bar: 500px = 100 energia => 5px per punto
         bar_x, bar_y = 335, 36
@@ -1445,6 +1547,8 @@ class Game15Duck:
 
         pygame.init()
         pygame.mixer.init()
+        self.sfx = create_sfx()
+        self.prof = get_profiler()
 
         self.screen = pygame.display.set_mode((W, H), pygame.FULLSCREEN | pygame.SCALED)
         pygame.display.set_caption("Game 15 - Duck")
@@ -1460,8 +1564,8 @@ class Game15Duck:
         # Stato
         self.running = True
         self.state = "INTRO"  # INTRO -> MENU -> HELP -> GAME
-        self.props = load_json(PROPS_PATH)
-        self.primorun = bool(self.props.get("primorun", True))
+        self.props = PropertiesStore(PROPS_PATH, defaults={"primorun": True})
+        self.primorun = bool(self.props.get("primorun"))
 
         if not self.primorun:
             self.state = "MENU"
@@ -1501,6 +1605,13 @@ class Game15Duck:
             (11000, "non sono i buoni!", (W // 2, H * 7 // 8)),
         ]
         self.intro_end_ms = 16000  # 2s +3s +4s +2s +5s
+        self.intro_labels = [
+            (t_ms, Label(self.font60, line, BIANCO, pos=pos, anchor="center"))
+            for t_ms, line, pos in self.intro_lines
+        ]
+
+        # schermata GAME OVER: statica, ricomposta quando si entra nello stato
+        self.gameover_layer = StaticLayer((W, H), self._build_gameover)
 
     # -------------------------
     # Music control
@@ -1531,12 +1642,11 @@ class Game15Duck:
 
     def goto_game(self):
         self.ensure_music()
-        self.session = GameSession()
+        self.session = GameSession(sfx=self.sfx)
         self.state = "GAME"
 
     def quit_to_jacoplay(self):
-        pygame.quit()
-        raise SystemExit(int(self.best_score))
+        exit_with_score(self.best_score)
 
     # -------------------------
     # Event handling
@@ -1599,19 +1709,15 @@ class Game15Duck:
         now = pygame.time.get_ticks()
         dt = now - self.intro_t0
 
-        for t_ms, line, pos in self.intro_lines:
+        for t_ms, label in self.intro_labels:
             if dt >= t_ms:
-                surf, rect = render_centered(self.font60, line, BIANCO, pos)
-                self.screen.blit(surf, rect)
+                label.draw(self.screen)
 
         if dt >= self.intro_end_ms:
             if self.primorun:
                 self.primorun = False
                 self.props["primorun"] = False
-                try:
-                    save_json(PROPS_PATH, self.props)
-                except OSError:
-                    pass
+                self.props.save()
             self.goto_menu()
 
     def render_menu(self):
@@ -1625,7 +1731,8 @@ class Game15Duck:
     def render_game(self, dt: float):
         assert self.session is not None
         keys = pygame.key.get_pressed()
-        self.session.update(dt, keys)
+        with self.prof.section("session.update"):
+            self.session.update(dt, keys)
         # switch a GAMEOVER
         # salva wave raggiunta prima del GAMEOVER
         if getattr(self.session, "_game_over", False):
@@ -1633,19 +1740,25 @@ class Game15Duck:
             # quindi la "wave corrente" è wave-1.
             self.last_wave_reached = max(1, self.session.wave - 1)
             self.state = "GAMEOVER"
+            self.gameover_layer.invalidate()
             return
 
         # world
-        self.session.draw_world(self.screen)
+        with self.prof.section("draw_world"):
+            self.session.draw_world(self.screen)
 
         # HUD sopra
-        self.session.draw_hud(self.screen, self.font50)
+        with self.prof.section("draw_hud"):
+            self.session.draw_hud(self.screen, self.font50)
 
     # render GAMEOVER (metodo di classe, NON annidato)
     def render_gameover(self):
-        self.screen.blit(self.bkg_menu, (0, 0))
+        self.gameover_layer.draw(self.screen)
+
+    def _build_gameover(self, surface: pygame.Surface):
+        surface.blit(self.bkg_menu, (0, 0))
         surf, rect = render_centered(self.font70, "GAME OVER", VERDE_SCURO, (W // 2, H // 2))
-        self.screen.blit(surf, rect)
+        surface.blit(surf, rect)
 
         # testo wave affrontate
         surf2, rect2 = render_centered(
@@ -1654,7 +1767,7 @@ class Game15Duck:
             VERDE_SCURO,
             (W // 2, H // 2 + 90),
         )
-        self.screen.blit(surf2, rect2)
+        surface.blit(surf2, rect2)
         
 
     # input GAMEOVER (metodo di classe, NON annidato)
@@ -1670,7 +1783,10 @@ class Game15Duck:
     def run(self):
         while self.running:
             dt = self.clock.tick(FPS) / 1000.0
+            self.prof.begin_frame()
             events = pygame.event.get()
+            for e in events:
+                self.prof.handle_event(e)
 
             self.handle_common_events(events)
 
@@ -1688,27 +1804,21 @@ class Game15Duck:
             elif self.state == "GAME":
                 self.handle_game_events(events)
                 if self.session is None:
-                    self.session = GameSession()
+                    self.session = GameSession(sfx=self.sfx)
                 self.render_game(dt)
             elif self.state == "GAMEOVER":
                 self.handle_gameover_events(events)
                 self.render_gameover()
 
-
+            self.prof.end_frame()
+            self.prof.draw_overlay(self.screen)
             pygame.display.flip()
 
         self.quit_to_jacoplay()
 
 
-def parse_args(argv):
-    p = argparse.ArgumentParser()
-    p.add_argument("--score", type=int, default=0, help="Best score dalle sessioni precedenti")
-    return p.parse_args(argv)
-
-
 def main():
-    args = parse_args(sys.argv[1:])
-    game = Game15Duck(best_score=args.score)
+    game = Game15Duck(best_score=parse_score_arg(sys.argv[1:]))
     game.run()
 
 
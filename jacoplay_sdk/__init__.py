@@ -0,0 +1,29 @@
+# jacoplay_sdk
+# Moduli condivisi dai giochi Jacoplay.
+# I giochi girano come script separati (lanciati da Jacoplay.py): per importare il package
+# aggiungono la root del progetto a sys.path (vedi JACOPLAY_ROOT nei singoli giochi).
+
+import os
+
+# niente banner pygame su stdout: lo stdout dei giochi lo legge Jacoplay (punteggio), quello del benchmark è JSON
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from .assets import AssetCache, get_asset_cache
+from .loop import GameLoop, Scene
+from .props import PropertiesStore, load_json, save_json
+from .result import exit_with_score, parse_score_arg, report_score
+from .sfx import SfxManager, SoundClass
+from .telemetry import FrameProfiler, get_profiler
+from .ui import GlyphCache, Label, StaticLayer
+from .video import play_video
+
+__all__ = [
+    "AssetCache", "get_asset_cache",
+    "GameLoop", "Scene",
+    "PropertiesStore", "load_json", "save_json",
+    "exit_with_score", "parse_score_arg", "report_score",
+    "SfxManager", "SoundClass",
+    "FrameProfiler", "get_profiler",
+    "GlyphCache", "Label", "StaticLayer",
+    "play_video",
+]
@@ -0,0 +1,168 @@
+# jacoplay_sdk/assets.py
+# Cache degli asset condivisa dal processo: immagini, font e suoni caricati una volta sola.
+#
+# Uso tipico:
+#     assets = get_asset_cache()
+#     bkg = assets.image(BKG_PATH, alpha=False)                 # convert() invece di convert_alpha()
+#     tile = assets.image(TILE_PATH, alpha=None)                # convert_alpha() solo se il PNG ha alpha
+#     font = assets.font(FONT_PATH, 40)                         # SysFont se il file manca
+#     snd = assets.sound(SND_PATH)                              # None se il file manca o il mixer è spento
+#
+# - le surface restituite sono condivise: chi le modifica (set_alpha, fill, blit sopra) deve farne una copy()
+# - un file mancante produce un segnaposto (fallback_size) oppure None, e l'errore viene stampato
+#   su stderr una volta sola: lo stdout dei giochi lo legge Jacoplay
+# - per ogni voce si tiene la dimensione in byte (pixel per le surface, campioni per i suoni,
+#   file per i font): stats() riassume quanto occupa la cache
+
+import os
+import sys
+
+import pygame
+
+
+class AssetCache:
+    """
+    Immagini/font/suoni per path. Le chiavi includono le opzioni di caricamento
+    (alpha per le immagini, dimensione per i font), quindi lo stesso file può comparire più volte.
+    """
+
+    def __init__(self):
+        self._images: dict[tuple, pygame.Surface | None] = {}
+        self._fonts: dict[tuple, pygame.font.Font] = {}
+        self._sounds: dict[str, pygame.mixer.Sound | None] = {}
+        self._sizes: dict[tuple, int] = {}       # (tipo, chiave) -> byte
+        self.hits = 0
+        self.misses = 0
+
+    # -------------------------
+    # Caricamento
+    # -------------------------
+    def image(
+        self,
+        path: str,
+        alpha: bool | None = True,
+        fallback_size=None,
+        fallback_color=(255, 0, 255, 255),
+    ) -> pygame.Surface | None:
+        """
+        Immagine convertita per il display corrente (richiede pygame.display.set_mode già fatto).
+        alpha=None: convert_alpha() se il file ha un canale alpha, altrimenti convert() (blit più veloce).
+        Se il file non si carica: surface piena di fallback_color grande fallback_size, oppure None.
+        """
+        key = (path, alpha, fallback_size)
+        surf = self._images.get(key, False)
+        if surf is not False:
+            self.hits += 1
+            return surf
+        self.misses += 1
+        try:
+            img = pygame.image.load(path)
+            if alpha is None:
+                alpha = img.get_alpha() is not None or bool(img.get_flags() & pygame.SRCALPHA)
+            surf = img.convert_alpha() if alpha else img.convert()
+        except Exception as e:
+            print(f"Errore caricando {path}: {e}", file=sys.stderr)
+            surf = None
+            if fallback_size is not None:
+                surf = pygame.Surface(fallback_size, pygame.SRCALPHA if alpha else 0)
+                surf.fill(fallback_color)
+        self._images[key] = surf
+        self._sizes[("image", key)] = _surface_bytes(surf)
+        return surf
+
+    def font(self, path: str | None, size: int) -> pygame.font.Font:
+        """Font TTF del gioco; se manca, il font di sistema di pygame alla stessa dimensione."""
+        key = (path, size)
+        font = self._fonts.get(key)
+        if font is not None:
+            self.hits += 1
+            return font
+        self.misses += 1
+        nbytes = 0
+        try:
+            if path is None:
+                raise FileNotFoundError("nessun font indicato")
+            font = pygame.font.Font(path, size)
+            nbytes = os.path.getsize(path)
+        except Exception as e:
+            if path is not None:
+                print(f"Errore caricando il font {path}: {e}", file=sys.stderr)
+            font = pygame.font.SysFont(None, size)
+        self._fonts[key] = font
+        self._sizes[("font", key)] = nbytes
+        return font
+
+    def sound(self, path: str) -> pygame.mixer.Sound | None:
+        """Suono decodificato (tutto in memoria); None se il file manca o il mixer non è inizializzato."""
+        snd = self._sounds.get(path, False)
+        if snd is not False:
+            self.hits += 1
+            return snd
+        self.misses += 1
+        try:
+            snd = pygame.mixer.Sound(path)
+        except Exception as e:
+            print(f"Errore caricando {path}: {e}", file=sys.stderr)
+            snd = None
+        self._sounds[path] = snd
+        self._sizes[("sound", path)] = _sound_bytes(snd)
+        return snd
+
+    # -------------------------
+    # Gestione
+    # -------------------------
+    def forget(self, path: str) -> None:
+        """Rimuove dalla cache tutte le voci di un file (es. immagine rigenerata su disco)."""
+        for key in [k for k in self._images if k[0] == path]:
+            del self._images[key]
+            del self._sizes[("image", key)]
+        for key in [k for k in self._fonts if k[0] == path]:
+            del self._fonts[key]
+            del self._sizes[("font", key)]
+        if path in self._sounds:
+            del self._sounds[path]
+            del self._sizes[("sound", path)]
+
+    def clear(self) -> None:
+        self._images.clear()
+        self._fonts.clear()
+        self._sounds.clear()
+        self._sizes.clear()
+
+    def stats(self) -> dict:
+        """Numero di voci e byte occupati per tipo, più hit/miss della sessione."""
+        out = {kind: {"count": 0, "bytes": 0} for kind in ("image", "font", "sound")}
+        for (kind, _key), nbytes in self._sizes.items():
+            out[kind]["count"] += 1
+            out[kind]["bytes"] += nbytes
+        out["total_bytes"] = sum(v["bytes"] for v in out.values())
+        out["hits"] = self.hits
+        out["misses"] = self.misses
+        return out
+
+
+def _surface_bytes(surf: pygame.Surface | None) -> int:
+    if surf is None:
+        return 0
+    return surf.get_pitch() * surf.get_height()
+
+
+def _sound_bytes(snd: pygame.mixer.Sound | None) -> int:
+    if snd is None:
+        return 0
+    init = pygame.mixer.get_init()
+    if init is None:
+        return 0
+    freq, fmt, channels = init
+    return int(snd.get_length() * freq) * channels * (abs(fmt) // 8)
+
+
+_CACHE: AssetCache | None = None
+
+
+def get_asset_cache() -> AssetCache:
+    """Cache unica del processo (ogni gioco è un processo separato)."""
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = AssetCache()
+    return _CACHE
@@ -0,0 +1,553 @@
+# jacoplay_sdk/bench.py
+# Benchmark headless dei giochi (driver SDL dummy, niente finestra né audio reale).
+#
+#     python -m jacoplay_sdk.bench                       # tutti gli scenari, 1 minuto simulato ciascuno
+#     python -m jacoplay_sdk.bench duck cars --minutes 3 --out bench.json
+#     python -m jacoplay_sdk.bench left --script left_input.json
+#
+# Ogni scenario gira in un processo figlio (stato globale dei giochi e picco memoria isolati):
+# - tempo simulato a dt fisso: pygame.time.get_ticks, pygame.mixer.music.get_pos e i clock.tick
+#   dei loop bloccanti avanzano di dt ad ogni frame, senza attese reali
+# - input da script (sintetico di default, oppure registrato in JSON con --script)
+# - tempi update/draw dalle sezioni del profiler (jacoplay_sdk.telemetry), picco RSS del figlio,
+#   byte occupati dalla cache asset condivisa (jacoplay_sdk.assets)
+#
+# Formato script: {"period": 120, "events": [[frame, "keydown"|"keyup", "K_UP"], [frame, "click", [x, y]], ...]}
+# Gli eventi si ripetono ogni `period` frame (period 0 = nessuna ripetizione).
+# L'output è JSON, per confrontare le regressioni tra una release e l'altra.
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import importlib.util
+from time import perf_counter
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+JACOPLAY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GAMES_DIR = os.path.join(JACOPLAY_ROOT, "jacoplay_games")
+
+DEFAULT_DT_MS = 1000.0 / 60.0
+DEFAULT_MINUTES = 1.0
+BENCH_VERSION = 1
+
+# path degli script di gioco per scenario
+GAME_SCRIPTS = {
+    "duck": ("game_15_duck", "game_15_duck.py"),
+    "duck_fullpool": ("game_15_duck", "game_15_duck.py"),
+    "cars": ("game_06_cars", "game_06_cars.py"),
+    "dancing": ("game_01_dancing", "game_01_dancing.py"),
+    "left": ("game_12_left", "game_12_left.py"),
+    "dinowar": ("game_09_dinowar", "game_09_dinowar.py"),
+}
+
+
+
+def _duck_script(fire_every: int) -> dict:
+    """WASD in quadrato + un colpo ogni `fire_every` frame."""
+    return {"period": 240, "events": [
+        [0, "keydown", "K_d"], [60, "keyup", "K_d"],
+        [60, "keydown", "K_s"], [120, "keyup", "K_s"],
+        [120, "keydown", "K_a"], [180, "keyup", "K_a"],
+        [180, "keydown", "K_w"], [240, "keyup", "K_w"],
+    ] + [[f, "keydown", "K_SPACE"] for f in range(0, 240, fire_every)]
+      + [[f + 1, "keyup", "K_SPACE"] for f in range(0, 240, fire_every)]
+      + [[0, "mouse", [1400, 400]], [120, "mouse", [500, 700]]]}
+
+
+# input sintetici (frame a 60 fps)
+SYNTHETIC_SCRIPTS = {
+    # WASD in quadrato + fuoco continuo (carico della bench_version 1: confrontabile con i report precedenti)
+    "duck": _duck_script(6),
+    # come duck, fuoco due volte più fitto e munizioni illimitate: pool proiettili sempre pieno
+    "duck_fullpool": _duck_script(3),
+    # acceleratore sempre premuto, direzione assoluta che ruota
+    "cars": {"period": 480, "events": [
+        [0, "keydown", "K_UP"],
+        [0, "keydown", "K_d"], [120, "keyup", "K_d"],
+        [120, "keydown", "K_s"], [240, "keyup", "K_s"],
+        [240, "keydown", "K_a"], [360, "keyup", "K_a"],
+        [360, "keydown", "K_w"], [480, "keyup", "K_w"],
+    ]},
+    # Q/A/O/K a turno su ogni quarto (120 bpm)
+    "dancing": {"period": 120, "events": [
+        [0, "keydown", "K_q"], [8, "keyup", "K_q"],
+        [30, "keydown", "K_a"], [38, "keyup", "K_a"],
+        [60, "keydown", "K_o"], [68, "keyup", "K_o"],
+        [90, "keydown", "K_k"], [98, "keyup", "K_k"],
+    ]},
+    # salto e scivolata alternati
+    "left": {"period": 120, "events": [
+        [0, "keydown", "K_UP"], [5, "keyup", "K_UP"],
+        [60, "keydown", "K_DOWN"], [65, "keyup", "K_DOWN"],
+    ]},
+    # click sul primo leader, poi "completa turno" (l'AI gioca contro un utente passivo)
+    "dinowar": {"period": 240, "events": [
+        [0, "click", [385, 430]],
+        [200, "click", [1714, 528]],
+    ]},
+}
+
+
+class _BenchDone(Exception):
+    """Budget di frame esaurito: interrompe i loop bloccanti dei giochi."""
+
+
+# =========================
+# Input e tempo simulati (solo nel processo figlio)
+# =========================
+class _KeyState:
+    """Sostituto di pygame.key.get_pressed(): indicizzabile per key code."""
+
+    __slots__ = ("pressed",)
+
+    def __init__(self, pressed: set):
+        self.pressed = pressed
+
+    def __getitem__(self, key) -> bool:
+        return key in self.pressed
+
+
+class SimInput:
+    """Tempo a dt fisso + script di input. Genera gli eventi pygame del frame corrente."""
+
+    def __init__(self, script: dict, dt_ms: float):
+        import pygame
+        self.pg = pygame
+        self.dt_ms = dt_ms
+        self.ms = 0.0
+        self.frame = 0
+        self.music_start_ms = 0.0
+        self.pressed: set = set()
+        self.keys = _KeyState(self.pressed)
+        self.mouse_pos = (960, 540)
+
+        self.period = int(script.get("period", 0))
+        self.schedule: dict[int, list] = {}
+        for f, kind, arg in script.get("events", []):
+            if kind in ("keydown", "keyup"):
+                arg = getattr(pygame, arg)
+            elif kind in ("click", "mouse"):
+                arg = (int(arg[0]), int(arg[1]))
+            self.schedule.setdefault(int(f), []).append((kind, arg))
+
+    def install(self) -> None:
+        """Aggancia tempo/tastiera/mouse simulati alle API pygame usate dai giochi."""
+        pg = self.pg
+        real_music_play = pg.mixer.music.play
+        real_music_load = pg.mixer.music.load
+
+        def music_load(*args, **kwargs):
+            # le musiche non sempre sono nel repo: nel benchmark una traccia mancante resta muta
+            try:
+                real_music_load(*args, **kwargs)
+            except pg.error:
+                pass
+
+        def music_play(*args, **kwargs):
+            self.music_start_ms = self.ms
+            try:
+                real_music_play(*args, **kwargs)
+            except pg.error:
+                pass
+
+        pg.time.get_ticks = lambda: int(self.ms)
+        pg.key.get_pressed = lambda: self.keys
+        pg.mouse.get_pos = lambda: self.mouse_pos
+        pg.mixer.music.get_pos = lambda: int(self.ms - self.music_start_ms)
+        pg.mixer.music.load = music_load
+        pg.mixer.music.play = music_play
+
+    def step(self) -> list:
+        """Avanza di un frame e ritorna gli eventi dello script per questo frame."""
+        pg = self.pg
+        self.ms += self.dt_ms
+        f = self.frame % self.period if self.period else self.frame
+        self.frame += 1
+
+        out = []
+        for kind, arg in self.schedule.get(f, ()):
+            if kind == "keydown":
+                self.pressed.add(arg)
+                out.append(pg.event.Event(pg.KEYDOWN, key=arg, mod=0, unicode="", scancode=0))
+            elif kind == "keyup":
+                self.pressed.discard(arg)
+                out.append(pg.event.Event(pg.KEYUP, key=arg, mod=0, unicode="", scancode=0))
+            elif kind == "mouse":
+                self.mouse_pos = arg
+                out.append(pg.event.Event(pg.MOUSEMOTION, pos=arg, rel=(0, 0), buttons=(0, 0, 0)))
+            elif kind == "click":
+                self.mouse_pos = arg
+                out.append(pg.event.Event(pg.MOUSEBUTTONDOWN, pos=arg, button=1))
+                out.append(pg.event.Event(pg.MOUSEBUTTONUP, pos=arg, button=1))
+        return out
+
+
+class FakeClock:
+    """
+    pygame.time.Clock per i loop bloccanti: tick() avanza il tempo simulato e posta l'input dello script.
+    Registra anche il tempo reale tra due tick, così vengono misurati anche i loop che non usano
+    il profiler (animazioni, schermate di fine partita).
+    """
+
+    def __init__(self, sim: SimInput, max_frames: int):
+        self.sim = sim
+        self.max_frames = max_frames
+        self.intervals_ms: list[float] = []
+        self._last = None
+
+    def tick(self, framerate: float = 0) -> int:
+        now = perf_counter()
+        if self._last is not None:
+            self.intervals_ms.append((now - self._last) * 1000.0)
+        self._last = now
+        if self.sim.frame >= self.max_frames:
+            raise _BenchDone
+        for e in self.sim.step():
+            self.sim.pg.event.post(e)
+        return int(round(self.sim.dt_ms))
+
+    def get_time(self) -> int:
+        return int(round(self.sim.dt_ms))
+
+    def get_fps(self) -> float:
+        return 1000.0 / self.sim.dt_ms
+
+
+def _distribution(values: list) -> dict:
+    if not values:
+        return {"count": 0}
+    v = sorted(values)
+    n = len(v)
+
+    def pct(q):
+        return round(v[min(n - 1, max(0, int(q * n + 0.999999) - 1))], 3)
+
+    return {
+        "count": n,
+        "mean_ms": round(sum(v) / n, 3),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": round(v[-1], 3),
+    }
+
+
+def _load_game_module(scenario: str):
+    folder, filename = GAME_SCRIPTS[scenario]
+    path = os.path.join(GAMES_DIR, folder, filename)
+    spec = importlib.util.spec_from_file_location(os.path.splitext(filename)[0], path)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+# =========================
+# Scenari
+# =========================
+def _run_duck(mod, sim: SimInput, prof, frames: int, screen, full_pool: bool = False) -> dict:
+    """GameSession a wave 10 con pool papere pieno, fuoco continuo (full_pool: munizioni illimitate)."""
+    pg = sim.pg
+    font50 = pg.font.Font(mod.FONT_PATH, 50) if os.path.exists(mod.FONT_PATH) else pg.font.SysFont(None, 50)
+
+    def new_session():
+        s = mod.GameSession(sfx=mod.create_sfx())
+        s.wave = 10
+        if full_pool:
+            s.ammo1 = s.ammo2 = 1_000_000   # fuoco continuo: pool proiettili sempre pieno
+        while any(not e.active for pool in s._duck_pools for e in pool.enemies):
+            before = sum(e.active for pool in s._duck_pools for e in pool.enemies)
+            s._spawn_wave()
+            if sum(e.active for pool in s._duck_pools for e in pool.enemies) == before:
+                break
+        return s
+
+    session = new_session()
+    restarts = 0
+    for _ in range(frames):
+        events = sim.step()
+        prof.begin_frame()
+        session.handle_events(events)
+        with prof.section("session.update"):
+            session.update(sim.dt_ms / 1000.0, sim.keys)
+        with prof.section("draw_world"):
+            session.draw_world(screen)
+        with prof.section("draw_hud"):
+            session.draw_hud(screen, font50)
+        prof.end_frame()
+        if session._game_over:
+            session = new_session()
+            restarts += 1
+    return {"restarts": restarts}
+
+
+def _run_duck_fullpool(mod, sim: SimInput, prof, frames: int, screen) -> dict:
+    """Come duck, con munizioni illimitate e fuoco più fitto: misura il pool proiettili sempre pieno."""
+    return _run_duck(mod, sim, prof, frames, screen, full_pool=True)
+
+
+def _run_cars(mod, sim: SimInput, prof, frames: int, screen) -> dict:
+    """RaceState sul primo tracciato con 8 auto; a gara finita se ne avvia un'altra."""
+    game = mod.Game()
+    track_name = next(iter(game.tracks))
+
+    race = mod.RaceState(game, track_name)
+    restarts = 0
+    for _ in range(frames):
+        events = sim.step()
+        prof.begin_frame()
+        for e in events:
+            if e.type != sim.pg.KEYDOWN or e.key != sim.pg.K_ESCAPE:
+                race.handle_event(e)
+        with prof.section("RaceState.update"):
+            race.update(sim.dt_ms / 1000.0)
+        with prof.section("RaceState.draw"):
+            race.draw(game.logical)
+        prof.end_frame()
+        if race.results_pushed:
+            race = mod.RaceState(game, track_name)
+            restarts += 1
+    return {"restarts": restarts, "track": track_name}
+
+
+def _run_dancing(mod, sim: SimInput, prof, frames: int, screen) -> dict:
+    """GameCore con pressioni Q/A/O/K a tempo; a game over riparte."""
+    core = mod.GameCore(screen, 0)
+    restarts = 0
+    dt_ms = sim.dt_ms
+    for _ in range(frames):
+        events = sim.step()
+        prof.begin_frame()
+        for e in events:
+            core.handle_event(e)
+        with prof.section("GameCore.update"):
+            core.update(dt_ms)
+        with prof.section("GameCore.draw"):
+            core.draw()
+        prof.end_frame()
+        if core.game_finished:
+            core = mod.GameCore(screen, 0)
+            restarts += 1
+    return {"restarts": restarts}
+
+
+def _run_left(mod, sim: SimInput, prof, frames: int, screen) -> dict:
+    """RunnerSimulation a passo fisso con seed fisso (sequenza ostacoli ripetibile); a fine partita riparte."""
+    pg = sim.pg
+    assets = mod.get_assets()
+    seed = 0
+    game = mod.RunnerSimulation(assets, seed=seed)
+    results = {"ok": 0, "ko": 0}
+    dt = sim.dt_ms / 1000.0
+    for _ in range(frames):
+        events = sim.step()
+        prof.begin_frame()
+        inputs = [mod.input_for_key(e.key) for e in events if e.type == pg.KEYDOWN]
+        with prof.section("RunnerSimulation.step"):
+            game.step(dt, [i for i in inputs if i is not None])
+        with prof.section("RunnerSimulation.render"):
+            game.render(screen)
+        prof.end_frame()
+        if game.result is not None:
+            results[game.result] += 1
+            seed += 1
+            game = mod.RunnerSimulation(assets, seed=seed)
+    return {"results": results, "obstacle_seed_last": seed}
+
+
+def _run_dinowar(mod, sim: SimInput, prof, frames: int, screen) -> dict:
+    """start_match (scelta leader + loop partita + animazioni) con FakeClock, l'AI gioca contro un utente passivo."""
+    pg = sim.pg
+    scaler = mod.Scaler(screen)
+    cache = mod.AssetCache()
+    audio = mod.Audio(cache)
+    fonts = {
+        "title": pg.font.Font(mod.FONT_PATH, 40),
+        "energy": pg.font.Font(mod.FONT_PATH, 50),
+        "hp": pg.font.Font(mod.FONT_PATH, 18),
+        "shield": pg.font.Font(mod.FONT_PATH, 45),
+        "end": pg.font.Font(mod.FONT_PATH, 70),
+    }
+    all_cards = mod.load_cards_from_json(mod.JSON_PATH)
+    clock = FakeClock(sim, frames)
+    matches = 0
+    try:
+        while True:
+            mod.start_match(
+                scaler=scaler,
+                cache=cache,
+                audio=audio,
+                fonts=fonts,
+                faction_user=mod.FACTION_HERB,
+                all_cards=all_cards,
+                clock=clock,
+            )
+            matches += 1
+    except _BenchDone:
+        pass
+    return {"matches_completed": matches, "tick_frames": _distribution(clock.intervals_ms)}
+
+
+SCENARIOS = {
+    "duck": _run_duck,
+    "duck_fullpool": _run_duck_fullpool,
+    "cars": _run_cars,
+    "dancing": _run_dancing,
+    "left": _run_left,
+    "dinowar": _run_dinowar,
+}
+
+
+def _peak_rss_kb() -> int | None:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss   # macOS: byte, Linux: KiB
+
+
+def run_child(scenario: str, minutes: float, dt_ms: float, script: dict, trace_heap: bool) -> dict:
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    os.environ.pop("JACOPLAY_TELEMETRY", None)   # niente dump di sessione dal benchmark
+
+    import pygame
+    if JACOPLAY_ROOT not in sys.path:
+        sys.path.insert(0, JACOPLAY_ROOT)
+    from jacoplay_sdk.assets import get_asset_cache
+    from jacoplay_sdk.telemetry import get_profiler
+
+    pygame.init()
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        pass
+    screen = pygame.display.set_mode((1920, 1080))
+
+    sim = SimInput(script, dt_ms)
+    sim.install()
+    mod = _load_game_module(scenario)
+    prof = get_profiler()
+    frames = int(minutes * 60_000.0 / dt_ms)
+
+    if trace_heap:
+        import tracemalloc
+        tracemalloc.start()
+
+    t0 = perf_counter()
+    extra = SCENARIOS[scenario](mod, sim, prof, frames, screen)
+    wall = perf_counter() - t0
+
+    result = {
+        "frames": sim.frame,
+        "sim_seconds": round(sim.ms / 1000.0, 3),
+        "wall_seconds": round(wall, 3),
+        "sections": prof.summary()["sections"],
+        "peak_rss_kb": _peak_rss_kb(),
+        "assets": get_asset_cache().stats(),
+    }
+    if trace_heap:
+        result["py_heap_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    result.update(extra)
+    return result
+
+
+def run_parent(scenarios: list, minutes: float, dt_ms: float, script_path: str | None, trace_heap: bool) -> dict:
+    env = dict(os.environ)
+    env["SDL_VIDEODRIVER"] = "dummy"
+    env["SDL_AUDIODRIVER"] = "dummy"
+    env.pop("JACOPLAY_TELEMETRY", None)
+
+    try:
+        import pygame
+        pygame_version = pygame.version.ver
+    except ImportError:
+        pygame_version = None
+
+    report = {
+        "bench_version": BENCH_VERSION,
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame_version,
+        "platform": platform.platform(),
+        "dt_ms": round(dt_ms, 4),
+        "minutes": minutes,
+        "scenarios": {},
+    }
+    for name in scenarios:
+        cmd = [sys.executable, "-m", "jacoplay_sdk.bench", name, "--child",
+               "--minutes", str(minutes), "--dt-ms", str(dt_ms)]
+        if script_path:
+            cmd += ["--script", script_path]
+        if trace_heap:
+            cmd.append("--trace-heap")
+        proc = subprocess.run(cmd, cwd=JACOPLAY_ROOT, env=env, capture_output=True, text=True, check=False)
+
+        # il risultato è l'ultima riga JSON su stdout (i giochi possono stampare altro)
+        res = None
+        for line in reversed((proc.stdout or "").strip().splitlines()):
+            if line.startswith("{"):
+                try:
+                    res = json.loads(line)
+                    break
+                except ValueError:
+                    pass
+        if res is None:
+            res = {"error": f"exit code {proc.returncode}", "stderr": (proc.stderr or "")[-2000:]}
+        report["scenarios"][name] = res
+    return report
+
+
+def parse_args(argv):
+    p = argparse.ArgumentParser(description="Benchmark headless dei giochi Jacoplay")
+    p.add_argument("scenarios", nargs="*", default=[],
+                   help="scenari da eseguire: " + ", ".join(SCENARIOS) + " (default: tutti)")
+    p.add_argument("--minutes", type=float, default=DEFAULT_MINUTES, help="minuti simulati per scenario")
+    p.add_argument("--dt-ms", type=float, default=DEFAULT_DT_MS, help="passo fisso in ms")
+    p.add_argument("--script", default=None, help="script di input JSON (sostituisce quello sintetico)")
+    p.add_argument("--out", default=None, help="file JSON di output (default: stdout)")
+    p.add_argument("--trace-heap", action="store_true", help="misura anche il picco heap Python (tracemalloc, più lento)")
+    p.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = p.parse_args(argv)
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            p.error(f"scenario sconosciuto: {name}")
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    if args.child:
+        name = args.scenarios[0]
+        if args.script:
+            with open(args.script, "r", encoding="utf-8") as f:
+                script = json.load(f)
+        else:
+            script = SYNTHETIC_SCRIPTS[name]
+        res = run_child(name, args.minutes, args.dt_ms, script, args.trace_heap)
+        sys.stdout.write("\n" + json.dumps(res) + "\n")
+        return 0
+
+    names = args.scenarios or list(SCENARIOS)
+    report = run_parent(names, args.minutes, args.dt_ms, args.script, args.trace_heap)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0 if all("error" not in r for r in report["scenarios"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# jacoplay_sdk/loop.py
+# Game loop condiviso: logica a passo fisso con accumulatore, disegno una volta per frame, scene intercambiabili.
+#
+# Uso tipico:
+#     class GameScene(Scene):
+#         def handle_event(self, event): ...
+#         def update(self, dt): ...              # dt = passo fisso (1/60 s)
+#         def draw(self, screen): ...
+#         def next_scene(self): return self if not self.finito else GameOverScene(...)
+#
+#     loop = GameLoop(screen, clock)
+#     loop.run(GameScene())
+#     if loop.quit_requested: ...                # finestra chiusa (pygame.QUIT)
+#
+# Il profiler del processo (telemetry.get_profiler) misura ogni frame con le sezioni
+# "events", "update" e "draw"; F3 mostra l'overlay come nei loop scritti a mano.
+
+import pygame
+
+from .telemetry import get_profiler
+
+
+class Scene:
+    """
+    Una schermata del gioco. Tutti i metodi sono opzionali.
+    Con fixed_step = False update() viene chiamato una volta per frame con il dt reale
+    (menu, schermate di attesa); altrimenti a passo fisso, zero o più volte per frame.
+    """
+
+    fixed_step = True
+
+    def enter(self) -> None:
+        """Chiamato quando la scena diventa attiva."""
+
+    def exit(self) -> None:
+        """Chiamato quando la scena viene sostituita o il loop termina."""
+
+    def handle_event(self, event) -> None:
+        pass
+
+    def update(self, dt: float) -> None:
+        pass
+
+    def draw(self, screen: pygame.Surface) -> None:
+        pass
+
+    def next_scene(self):
+        """self = resta attiva, un'altra Scene = cambio scena, None = fine del loop."""
+        return self
+
+
+class GameLoop:
+    """
+    Passo fisso `step` (default 1/60 s). Dopo un frame lento si eseguono al massimo `max_steps`
+    passi: il tempo in eccesso si perde (niente spirale in cui la logica insegue il ritardo).
+    """
+
+    def __init__(self, screen: pygame.Surface, clock: pygame.time.Clock, fps: int = 60,
+                 step: float = 1.0 / 60.0, max_steps: int = 5):
+        self.screen = screen
+        self.clock = clock
+        self.fps = fps
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.quit_requested = False
+        self.prof = get_profiler()
+
+    def run(self, scene: Scene | None) -> None:
+        """Esegue le scene fino a next_scene() == None o alla chiusura della finestra."""
+        self.accumulator = 0.0
+        self.quit_requested = False
+        if scene is not None:
+            scene.enter()
+        while scene is not None:
+            self.frame(scene)
+            if self.quit_requested:
+                scene.exit()
+                return
+            nxt = scene.next_scene()
+            if nxt is not scene:
+                scene.exit()
+                self.accumulator = 0.0
+                if nxt is not None:
+                    nxt.enter()
+                scene = nxt
+
+    def frame(self, scene: Scene) -> None:
+        """Un frame completo: eventi, logica, disegno, flip."""
+        prof = self.prof
+        dt = self.clock.tick(self.fps) / 1000.0
+        prof.begin_frame()
+
+        for event in pygame.event.get():
+            if prof.handle_event(event):
+                continue
+            if event.type == pygame.QUIT:
+                self.quit_requested = True
+                continue
+            scene.handle_event(event)
+        prof.lap("events")
+
+        if scene.fixed_step:
+            step = self.step
+            self.accumulator = min(self.accumulator + dt, step * self.max_steps)
+            while self.accumulator >= step:
+                scene.update(step)
+                self.accumulator -= step
+        else:
+            scene.update(dt)
+        prof.lap("update")
+
+        scene.draw(self.screen)
+        prof.lap("draw")
+        prof.end_frame()
+        prof.draw_overlay(self.screen)
+        pygame.display.flip()
@@ -0,0 +1,85 @@
+# jacoplay_sdk/props.py
+# Properties dei giochi (file JSON in game_XX_data) e helper JSON condivisi.
+#
+# Uso tipico:
+#     props = PropertiesStore(PROPERTIES_PATH, defaults={"primorun": True})
+#     if props.get("primorun"):
+#         ...
+#         props["primorun"] = False
+#         props.save()
+#
+# - lettura tollerante: file mancante o rovinato -> default (l'errore va su stderr, mai su stdout)
+# - scrittura atomica (file temporaneo + os.replace): un crash a metà non lascia un JSON troncato
+
+import os
+import sys
+import json
+
+
+def load_json(path: str, default=None):
+    """Contenuto del file JSON; `default` ({} se None) se il file manca o non si legge."""
+    if default is None:
+        default = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except Exception as e:
+        print(f"Errore leggendo {path}: {e}", file=sys.stderr)
+        return default
+
+
+def save_json(path: str, data) -> bool:
+    """Scrive `data` in JSON (indentato, UTF-8). Ritorna False se la scrittura fallisce."""
+    tmp = path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+        return True
+    except Exception as e:
+        print(f"Errore salvando {path}: {e}", file=sys.stderr)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+
+
+class PropertiesStore:
+    """
+    Dizionario di properties legato a un file. I default valgono per le chiavi assenti dal file;
+    le modifiche restano in memoria finché non si chiama save().
+    """
+
+    def __init__(self, path: str, defaults: dict | None = None):
+        self.path = path
+        self.defaults = dict(defaults or {})
+        self.data: dict = {}
+        self.reload()
+
+    def reload(self) -> None:
+        data = load_json(self.path, {})
+        self.data = dict(self.defaults)
+        if isinstance(data, dict):
+            self.data.update(data)
+
+    def get(self, key: str, default=None):
+        return self.data.get(key, default)
+
+    def __getitem__(self, key: str):
+        return self.data[key]
+
+    def __setitem__(self, key: str, value) -> None:
+        self.data[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.data
+
+    def update(self, values: dict) -> None:
+        self.data.update(values)
+
+    def save(self) -> bool:
+        return save_json(self.path, self.data)
@@ -0,0 +1,53 @@
+# jacoplay_sdk/result.py
+# Canale del punteggio tra Jacoplay.py e i giochi.
+#
+# Jacoplay lancia ogni gioco come `python game_XX.py --score <best_score>` e, a processo terminato,
+# legge dallo stdout l'ultima riga che è un intero (o "SCORE: <n>"): quello è il nuovo best score.
+# Il codice di uscita non conta (e comunque non potrebbe superare 255).
+#
+# Uso tipico:
+#     best_score = parse_score_arg(sys.argv[1:])
+#     ...
+#     exit_with_score(best_score)
+
+import sys
+
+import pygame
+
+
+def parse_score_arg(argv: list[str] | None = None, default: int = 0) -> int:
+    """
+    Best score passato dal launcher: `--score N`, `--score=N` oppure un intero posizionale
+    (i giochi lanciati a mano con `python game_XX.py 1200`). Valori non validi -> default.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    value = None
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == "--score":
+            value = argv[i + 1] if i + 1 < len(argv) else None
+            i += 2
+            continue
+        if arg.startswith("--score="):
+            value = arg.split("=", 1)[1]
+        elif value is None and not arg.startswith("-"):
+            value = arg
+        i += 1
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def report_score(score) -> None:
+    """Scrive il punteggio su stdout nel formato che Jacoplay legge (ultima riga intera)."""
+    print(max(0, int(score)), flush=True)
+
+
+def exit_with_score(score, code: int = 0) -> None:
+    """Riporta il punteggio, chiude pygame e termina il processo."""
+    report_score(score)
+    pygame.quit()
+    raise SystemExit(code)
@@ -0,0 +1,178 @@
+# jacoplay_sdk/sfx.py
+# Gestore effetti sonori condiviso tra i giochi.
+# - budget fisso di voci (canali mixer riservati, allocati una volta sola)
+# - rate limit per classe di suono (es. "quack" al massimo ogni N ms)
+# - tetto di voci contemporanee per classe
+# - voice stealing: se tutte le voci sono occupate, si ruba quella a priorità più bassa (la più vecchia)
+# I suoni vengono decodificati una sola volta in register(); play() non alloca liste.
+
+import os
+import random
+
+import pygame
+
+
+class SoundClass:
+    """Una classe di effetti (varianti pre-decodificate + regole di mixing)."""
+
+    __slots__ = ("name", "sounds", "priority", "min_interval_ms", "max_voices", "last_play_ms")
+
+    def __init__(self, name: str, sounds: list, priority: int, min_interval_ms: int, max_voices: int):
+        self.name = name
+        self.sounds = sounds
+        self.priority = priority
+        self.min_interval_ms = min_interval_ms
+        self.max_voices = max_voices          # 0 = nessun limite (solo budget globale)
+        self.last_play_ms = -1_000_000
+
+
+class SfxManager:
+    """
+    Mixer SFX a voci limitate.
+
+    Le voci sono i canali [first_channel, first_channel + num_voices): vengono riservati
+    (pygame.mixer.set_reserved) così i Sound.play() "liberi" non li occupano.
+    Se il mixer non è inizializzato il manager resta disabilitato e play() non fa nulla.
+    """
+
+    def __init__(self, num_voices: int = 8, first_channel: int = 0):
+        self.enabled = bool(pygame.mixer.get_init())
+        self.classes: dict[str, SoundClass] = {}
+        self.channels: list[pygame.mixer.Channel] = []
+
+        # stato voce (liste fisse, indicizzate come self.channels)
+        self._voice_cls: list[SoundClass | None] = [None] * num_voices
+        self._voice_prio = [0] * num_voices
+        self._voice_start = [0] * num_voices
+
+        # contatori (debug / telemetria)
+        self.played = 0
+        self.dropped = 0
+        self.stolen = 0
+
+        if not self.enabled:
+            return
+        try:
+            need = first_channel + num_voices
+            if pygame.mixer.get_num_channels() < need:
+                pygame.mixer.set_num_channels(need)
+            pygame.mixer.set_reserved(need)
+            self.channels = [pygame.mixer.Channel(first_channel + i) for i in range(num_voices)]
+        except pygame.error:
+            self.enabled = False
+            self.channels = []
+
+    # -------------------------
+    # Registrazione
+    # -------------------------
+    def register(
+        self,
+        name: str,
+        sources,
+        priority: int = 0,
+        min_interval_ms: int = 0,
+        max_voices: int = 0,
+        volume: float = 1.0,
+    ) -> SoundClass:
+        """
+        Registra una classe di suoni. `sources` è una lista di path o di pygame.mixer.Sound già caricati.
+        I path mancanti o non decodificabili vengono ignorati (la classe resta muta).
+        """
+        sounds: list[pygame.mixer.Sound] = []
+        if self.enabled:
+            for src in sources:
+                snd = src
+                if isinstance(src, str):
+                    if not os.path.exists(src):
+                        continue
+                    try:
+                        snd = pygame.mixer.Sound(src)
+                    except pygame.error:
+                        continue
+                snd.set_volume(volume)
+                sounds.append(snd)
+
+        sc = SoundClass(name, sounds, priority, min_interval_ms, max_voices)
+        self.classes[name] = sc
+        return sc
+
+    def has(self, name: str) -> bool:
+        sc = self.classes.get(name)
+        return sc is not None and bool(sc.sounds)
+
+    # -------------------------
+    # Riproduzione
+    # -------------------------
+    def _pick_voice(self, sc: SoundClass) -> int:
+        """Indice della voce da usare, -1 se il suono va scartato."""
+        free = -1
+        same_busy = 0
+        victim = -1
+        victim_prio = 0
+        victim_start = 0
+
+        for i, ch in enumerate(self.channels):
+            if not ch.get_busy():
+                if free < 0:
+                    free = i
+                continue
+
+            if self._voice_cls[i] is sc:
+                same_busy += 1
+
+            # candidata al furto: priorità <= della richiesta, la più bassa e poi la più vecchia
+            p = self._voice_prio[i]
+            if p <= sc.priority:
+                st = self._voice_start[i]
+                if victim < 0 or p < victim_prio or (p == victim_prio and st < victim_start):
+                    victim = i
+                    victim_prio = p
+                    victim_start = st
+
+        if sc.max_voices and same_busy >= sc.max_voices:
+            return -1
+        if free >= 0:
+            return free
+        if victim >= 0:
+            self.stolen += 1
+        return victim
+
+    def play(self, name: str, volume: float = 1.0, now_ms: int | None = None) -> pygame.mixer.Channel | None:
+        """
+        Suona una variante della classe `name`. `volume` è il volume del canale (0..1).
+        Ritorna il canale usato oppure None se scartato (rate limit, tetto voci, budget pieno).
+        """
+        if not self.enabled:
+            return None
+        sc = self.classes.get(name)
+        if sc is None or not sc.sounds:
+            return None
+
+        if now_ms is None:
+            now_ms = pygame.time.get_ticks()
+        if now_ms - sc.last_play_ms < sc.min_interval_ms:
+            self.dropped += 1
+            return None
+
+        idx = self._pick_voice(sc)
+        if idx < 0:
+            self.dropped += 1
+            return None
+
+        snd = sc.sounds[0] if len(sc.sounds) == 1 else random.choice(sc.sounds)
+        ch = self.channels[idx]
+        ch.play(snd)  # Channel.play interrompe l'eventuale suono rubato
+        ch.set_volume(volume)
+
+        self._voice_cls[idx] = sc
+        self._voice_prio[idx] = sc.priority
+        self._voice_start[idx] = now_ms
+        sc.last_play_ms = now_ms
+        self.played += 1
+        return ch
+
+    def stop_all(self) -> None:
+        for ch in self.channels:
+            ch.stop()
+        for i in range(len(self._voice_cls)):
+            self._voice_cls[i] = None
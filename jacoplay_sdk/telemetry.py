@@ -0,0 +1,308 @@
+# jacoplay_sdk/telemetry.py
+# Telemetria di sessione e profiler del frame budget, condiviso tra i giochi.
+#
+# Uso tipico nel main loop:
+#     prof = get_profiler()
+#     while running:
+#         prof.begin_frame()
+#         for e in pygame.event.get():
+#             prof.handle_event(e)          # F3 = overlay on/off
+#         with prof.section("update"):
+#             session.update(dt)
+#         with prof.section("draw"):
+#             session.draw(screen)
+#         prof.end_frame()
+#         prof.draw_overlay(screen)
+#         pygame.display.flip()
+#
+# - ring buffer per-frame (ultimi N frame) per l'overlay
+# - istogramma per sezione su tutta la sessione per p50/p95/p99 all'uscita
+# - se la variabile d'ambiente JACOPLAY_TELEMETRY contiene un path, all'uscita del processo
+#   il riepilogo viene scritto lì in JSON (Jacoplay.py lo raccoglie a fine sessione)
+
+import os
+import json
+import atexit
+from array import array
+from time import perf_counter
+
+import pygame
+
+
+TELEMETRY_ENV = "JACOPLAY_TELEMETRY"
+OVERLAY_KEY = pygame.K_F3
+
+RING_FRAMES = 600              # 10 s a 60 fps
+HIST_BIN_MS = 0.1              # risoluzione istogramma
+HIST_MAX_MS = 250.0            # oltre -> ultimo bin (overflow)
+HIST_BINS = int(HIST_MAX_MS / HIST_BIN_MS) + 1
+
+FRAME_SECTION = "frame"        # intervallo tra due begin_frame (tempo frame reale, attesa tick inclusa)
+WORK_SECTION = "work"          # begin_frame -> end_frame (lavoro effettivo)
+
+OVERLAY_W, OVERLAY_H = 420, 230
+OVERLAY_GRAPH_H = 90
+OVERLAY_TEXT_REFRESH = 30      # ri-render del testo ogni N frame
+OVERLAY_TOP_N = 6
+BUDGET_MS = 1000.0 / 60.0
+
+
+class _Series:
+    """Campioni di una sezione: ring buffer (ultimi frame) + istogramma (sessione intera)."""
+
+    __slots__ = ("ring", "hist", "count", "total_ms", "max_ms")
+
+    def __init__(self, capacity: int):
+        self.ring = array("d", [-1.0]) * capacity     # -1 = sezione non eseguita in quel frame
+        self.hist = array("I", [0]) * HIST_BINS
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, slot: int, ms: float) -> None:
+        self.ring[slot] = ms
+        b = int(ms / HIST_BIN_MS)
+        self.hist[b if b < HIST_BINS else HIST_BINS - 1] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, q: float) -> float:
+        """Percentile (nearest-rank) dall'istogramma, in ms (centro del bin)."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(q * self.count + 0.999999))
+        acc = 0
+        for b, n in enumerate(self.hist):
+            acc += n
+            if acc >= rank:
+                return min(self.max_ms, (b + 0.5) * HIST_BIN_MS)
+        return self.max_ms
+
+    def recent_mean(self) -> float:
+        tot = 0.0
+        n = 0
+        for v in self.ring:
+            if v >= 0.0:
+                tot += v
+                n += 1
+        return tot / n if n else 0.0
+
+
+class _Scope:
+    """Timer riusabile per `with prof.section(name)` (nessuna allocazione per chiamata)."""
+
+    __slots__ = ("_prof", "_name", "_t0")
+
+    def __init__(self, prof: "FrameProfiler", name: str):
+        self._prof = prof
+        self._name = name
+        self._t0 = 0.0
+
+    def __enter__(self):
+        self._t0 = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._prof.add(self._name, (perf_counter() - self._t0) * 1000.0)
+        return False
+
+
+class FrameProfiler:
+    """
+    Timer con nome + ring buffer per frame. Le sezioni con lo stesso nome nello stesso frame si sommano.
+    Le sezioni non sono rientranti (non annidare due volte lo stesso nome).
+    """
+
+    def __init__(self, capacity: int = RING_FRAMES):
+        self.capacity = capacity
+        self.frames = 0
+        self.overlay_visible = False
+
+        self._series: dict[str, _Series] = {}
+        self._scopes: dict[str, _Scope] = {}
+        self._acc: dict[str, float] = {}
+        self._frame_t0 = None
+        self._lap_t0 = 0.0
+        self._in_frame = False
+        self._slot = 0
+
+        # overlay (lazy)
+        self._font = None
+        self._panel = None
+        self._text_surfs: list[pygame.Surface] = []
+
+    # -------------------------
+    # Misura
+    # -------------------------
+    def section(self, name: str) -> _Scope:
+        sc = self._scopes.get(name)
+        if sc is None:
+            sc = _Scope(self, name)
+            self._scopes[name] = sc
+        return sc
+
+    def add(self, name: str, ms: float) -> None:
+        """Aggiunge `ms` alla sezione `name` del frame corrente (per misure fatte a mano)."""
+        self._acc[name] = self._acc.get(name, 0.0) + ms
+
+    def lap(self, name: str) -> None:
+        """
+        Chiude una sezione "a tappe": il tempo dall'ultimo lap() (o da begin_frame) va in `name`.
+        Comodo nei main loop piatti (UPDATE / DISEGNO in sequenza) senza re-indentare i blocchi.
+        """
+        now = perf_counter()
+        self.add(name, (now - self._lap_t0) * 1000.0)
+        self._lap_t0 = now
+
+    def _series_for(self, name: str) -> _Series:
+        s = self._series.get(name)
+        if s is None:
+            s = _Series(self.capacity)
+            self._series[name] = s
+        return s
+
+    def begin_frame(self) -> None:
+        now = perf_counter()
+        if self._frame_t0 is not None:
+            # tempo frame reale (include clock.tick e flip del frame precedente)
+            self._series_for(FRAME_SECTION).record(self._slot, (now - self._frame_t0) * 1000.0)
+        self._frame_t0 = now
+        self._lap_t0 = now
+        self._in_frame = True
+        self._acc.clear()
+
+    def end_frame(self) -> None:
+        """Chiude il frame aperto da begin_frame(). Senza frame aperto non fa nulla."""
+        if not self._in_frame:
+            return
+        self._in_frame = False
+        slot = self._slot
+        self._series_for(WORK_SECTION).record(slot, (perf_counter() - self._frame_t0) * 1000.0)
+
+        acc = self._acc
+        for name, ms in acc.items():
+            self._series_for(name).record(slot, ms)
+        # sezioni non eseguite in questo frame: marcate nel ring (non entrano nell'istogramma)
+        for name, s in self._series.items():
+            if name not in acc and name != WORK_SECTION and name != FRAME_SECTION:
+                s.ring[slot] = -1.0
+
+        self.frames += 1
+        self._slot = (slot + 1) % self.capacity
+
+        if self.overlay_visible and self.frames % OVERLAY_TEXT_REFRESH == 0:
+            self._text_surfs = []  # forza il ri-render del testo
+
+    # -------------------------
+    # Riepilogo
+    # -------------------------
+    def summary(self) -> dict:
+        out = {}
+        for name, s in self._series.items():
+            if s.count == 0:
+                continue
+            out[name] = {
+                "count": s.count,
+                "mean_ms": round(s.total_ms / s.count, 3),
+                "p50_ms": round(s.percentile(0.50), 3),
+                "p95_ms": round(s.percentile(0.95), 3),
+                "p99_ms": round(s.percentile(0.99), 3),
+                "max_ms": round(s.max_ms, 3),
+            }
+        return {"frames": self.frames, "sections": out}
+
+    def dump(self, path: str | None = None) -> bool:
+        """Scrive il riepilogo JSON su `path` (default: $JACOPLAY_TELEMETRY). True se scritto."""
+        path = path or os.environ.get(TELEMETRY_ENV)
+        if not path or self.frames == 0:
+            return False
+        try:
+            d = os.path.dirname(path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+            return True
+        except OSError:
+            return False
+
+    # -------------------------
+    # Overlay
+    # -------------------------
+    def handle_event(self, event) -> bool:
+        """F3 mostra/nasconde l'overlay. True se l'evento è stato consumato."""
+        if event.type == pygame.KEYDOWN and event.key == OVERLAY_KEY:
+            self.overlay_visible = not self.overlay_visible
+            self._text_surfs = []
+            return True
+        return False
+
+    def _build_text(self) -> None:
+        if self._font is None:
+            self._font = pygame.font.SysFont(None, 24)
+        font = self._font
+        lines = []
+        fr = self._series.get(FRAME_SECTION)
+        if fr is not None:
+            mean = fr.recent_mean()
+            fps = 1000.0 / mean if mean > 0 else 0.0
+            lines.append(f"frame {mean:5.2f} ms  ({fps:4.0f} fps)")
+
+        ranked = []
+        for name, s in self._series.items():
+            if name == FRAME_SECTION:
+                continue
+            ranked.append((s.recent_mean(), name))
+        ranked.sort(reverse=True)
+        for mean, name in ranked[:OVERLAY_TOP_N]:
+            lines.append(f"{name[:22]:<22} {mean:6.2f} ms")
+
+        self._text_surfs = [font.render(t, True, (255, 255, 255)) for t in lines]
+
+    def draw_overlay(self, surface: pygame.Surface, pos: tuple[int, int] = (10, 10)) -> None:
+        if not self.overlay_visible:
+            return
+        if self._panel is None:
+            self._panel = pygame.Surface((OVERLAY_W, OVERLAY_H), pygame.SRCALPHA)
+        panel = self._panel
+        panel.fill((0, 0, 0, 170))
+
+        # grafico frame time (una colonna per frame, il più recente a destra)
+        fr = self._series.get(FRAME_SECTION)
+        if fr is not None:
+            scale = OVERLAY_GRAPH_H / (BUDGET_MS * 3.0)   # fondo scala = 3 frame di budget
+            base_y = OVERLAY_GRAPH_H + 4
+            n = min(OVERLAY_W - 8, self.capacity)
+            for i in range(n):
+                slot = (self._slot - n + i) % self.capacity
+                ms = fr.ring[slot]
+                if ms < 0.0:
+                    continue
+                h = min(OVERLAY_GRAPH_H, int(ms * scale))
+                col = (90, 220, 90) if ms <= BUDGET_MS * 1.05 else (240, 80, 60)
+                pygame.draw.line(panel, col, (4 + i, base_y), (4 + i, base_y - h))
+            budget_y = base_y - int(BUDGET_MS * scale)
+            pygame.draw.line(panel, (255, 255, 0), (4, budget_y), (OVERLAY_W - 4, budget_y))
+
+        if not self._text_surfs:
+            self._build_text()
+        y = OVERLAY_GRAPH_H + 12
+        for ts in self._text_surfs:
+            panel.blit(ts, (6, y))
+            y += ts.get_height()
+
+        surface.blit(panel, pos)
+
+
+_PROFILER: FrameProfiler | None = None
+
+
+def get_profiler() -> FrameProfiler:
+    """Profiler di processo (creato al primo uso; dump automatico all'uscita se JACOPLAY_TELEMETRY è impostata)."""
+    global _PROFILER
+    if _PROFILER is None:
+        _PROFILER = FrameProfiler()
+        atexit.register(_PROFILER.dump)
+    return _PROFILER
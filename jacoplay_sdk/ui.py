@@ -0,0 +1,173 @@
+# jacoplay_sdk/ui.py
+# UI "retained mode" condivisa tra i giochi: scritte e sfondi statici renderizzati una volta sola.
+#
+# - Label: testo pre-renderizzato (con ombra opzionale); font.render solo quando cambiano testo o colore,
+#   quindi set_text()/set_color() si possono chiamare a ogni frame
+# - StaticLayer: sfondo composto (immagini + scritte fisse) in una surface, ricomposto solo su invalidate()
+# - GlyphCache: scritte brevi e ripetute (numeri) renderizzate una volta per (font, testo, colore)
+#
+# Uso tipico:
+#     self.lbl_score = Label(font, "0", color=BIANCO, pos=(40, 30))
+#     ...
+#     self.lbl_score.set_text(str(self.score))   # ri-render solo se il punteggio è cambiato
+#     self.lbl_score.draw(screen)
+
+import pygame
+
+
+class Label:
+    """
+    Scritta pre-renderizzata.
+    `pos` è il punto di ancoraggio del testo (anchor = attributo di pygame.Rect: "topleft", "center", ...);
+    l'ombra (se shadow_color non è None) è spostata di shadow_offset e non cambia l'ancoraggio.
+    """
+
+    __slots__ = ("font", "text", "color", "pos", "anchor", "shadow_color", "shadow_offset",
+                 "_surf", "_rect", "_text_off", "renders")
+
+    def __init__(
+        self,
+        font: pygame.font.Font,
+        text: str = "",
+        color=(255, 255, 255),
+        pos=(0, 0),
+        anchor: str = "topleft",
+        shadow_color=None,
+        shadow_offset=(2, 2),
+    ):
+        self.font = font
+        self.text = text
+        self.color = color
+        self.pos = pos
+        self.anchor = anchor
+        self.shadow_color = shadow_color
+        self.shadow_offset = shadow_offset
+        self._surf: pygame.Surface | None = None
+        self._rect: pygame.Rect | None = None
+        self._text_off = (0, 0)
+        self.renders = 0          # quante volte è stato chiamato font.render (debug)
+
+    # -------------------------
+    # Stato
+    # -------------------------
+    def set_text(self, text: str) -> None:
+        if text != self.text:
+            self.text = text
+            self._surf = None
+            self._rect = None
+
+    def set_color(self, color) -> None:
+        if color != self.color:
+            self.color = color
+            self._surf = None        # la dimensione non cambia: il rect resta valido
+
+    def set_pos(self, pos, anchor: str | None = None) -> None:
+        if anchor is not None and anchor != self.anchor:
+            self.anchor = anchor
+            self._rect = None
+        if pos != self.pos:
+            self.pos = pos
+            self._rect = None
+
+    # -------------------------
+    # Render
+    # -------------------------
+    def _render(self) -> None:
+        text_surf = self.font.render(self.text, True, self.color)
+        self.renders += 1
+        if self.shadow_color is None:
+            self._surf = text_surf
+            self._text_off = (0, 0)
+            return
+        sx, sy = self.shadow_offset
+        shadow = self.font.render(self.text, True, self.shadow_color)
+        w, h = text_surf.get_size()
+        tx, ty = max(0, -sx), max(0, -sy)
+        surf = pygame.Surface((w + abs(sx), h + abs(sy)), pygame.SRCALPHA)
+        surf.blit(shadow, (tx + sx, ty + sy))
+        surf.blit(text_surf, (tx, ty))
+        self._surf = surf
+        self._text_off = (tx, ty)
+
+    @property
+    def surface(self) -> pygame.Surface:
+        if self._surf is None:
+            self._render()
+        return self._surf
+
+    @property
+    def rect(self) -> pygame.Rect:
+        """Rect del testo (senza ombra) in coordinate schermo: serve anche per hover/click."""
+        if self._rect is None:
+            w, h = self.font.size(self.text)
+            r = pygame.Rect(0, 0, w, h)
+            setattr(r, self.anchor, self.pos)
+            self._rect = r
+        return self._rect
+
+    def draw(self, surface: pygame.Surface) -> None:
+        surf = self.surface
+        r = self.rect
+        tx, ty = self._text_off
+        surface.blit(surf, (r.x - tx, r.y - ty))
+
+
+class StaticLayer:
+    """
+    Sfondo composto una volta sola. `build(surface)` disegna il contenuto statico (sfondi, overlay,
+    scritte fisse); viene richiamato solo al primo draw() dopo invalidate().
+    Con alpha=False la surface è opaca (blit più veloce): build deve coprirla tutta.
+    """
+
+    def __init__(self, size, build, alpha: bool = False):
+        self.size = size
+        self.build = build
+        self.alpha = alpha
+        self._surf: pygame.Surface | None = None
+        self.builds = 0
+
+    def invalidate(self) -> None:
+        self._surf = None
+
+    @property
+    def surface(self) -> pygame.Surface:
+        if self._surf is None:
+            if self.alpha:
+                surf = pygame.Surface(self.size, pygame.SRCALPHA)
+            else:
+                surf = pygame.Surface(self.size)
+                if pygame.display.get_surface() is not None:
+                    surf = surf.convert()
+            self.build(surf)
+            self._surf = surf
+            self.builds += 1
+        return self._surf
+
+    def draw(self, surface: pygame.Surface, pos=(0, 0)) -> None:
+        surface.blit(self.surface, pos)
+
+
+class GlyphCache:
+    """
+    Scritte brevi che tornano spesso (HP, contatori, punti): font.render una volta sola per (font, testo, colore).
+    Pensata per insiemi piccoli e ripetitivi; oltre max_entries la cache si svuota e riparte.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._surfs: dict[tuple, pygame.Surface] = {}
+        self.renders = 0
+
+    def render(self, font: pygame.font.Font, text: str, color) -> pygame.Surface:
+        key = (font, text, color)
+        surf = self._surfs.get(key)
+        if surf is None:
+            if len(self._surfs) >= self.max_entries:
+                self._surfs.clear()
+            surf = font.render(text, True, color)
+            self._surfs[key] = surf
+            self.renders += 1
+        return surf
+
+    def clear(self) -> None:
+        self._surfs.clear()
@@ -0,0 +1,68 @@
+# jacoplay_sdk/video.py
+# Riproduzione dei video di intro (python-vlc, opzionale).
+#
+# Se python-vlc non è installato o il file manca il video viene saltato: i giochi devono
+# funzionare anche senza. ESC o la chiusura della finestra pygame interrompono il video.
+
+import os
+import sys
+import time
+
+import pygame
+
+# Tenta di importare python-vlc per il video intro
+try:
+    import vlc
+except ImportError:
+    vlc = None
+
+
+def play_video(path: str, fullscreen: bool = True) -> bool:
+    """
+    Riproduce il video e ritorna quando è terminato o interrotto dall'utente.
+    Ritorna False se il video non è stato riprodotto (vlc assente o file mancante).
+    """
+    if vlc is None:
+        print("python-vlc non disponibile: salto il video di intro.", file=sys.stderr)
+        return False
+
+    if not os.path.exists(path):
+        print(f"Video intro non trovato: {path}", file=sys.stderr)
+        return False
+
+    instance = vlc.Instance()
+    player = instance.media_player_new()
+    player.set_media(instance.media_new(path))
+
+    if fullscreen:
+        try:
+            player.set_fullscreen(True)
+        except Exception:
+            pass
+
+    player.play()
+    time.sleep(0.2)  # piccolo delay per far partire il video
+
+    # Loop finché il video è in riproduzione
+    running = True
+    while running:
+        state = player.get_state()
+        if state in (vlc.State.Ended, vlc.State.Error, vlc.State.Stopped):
+            break
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                running = False
+
+        time.sleep(0.01)
+
+    player.stop()
+    # Esce da fullscreen se possibile
+    if fullscreen:
+        try:
+            player.set_fullscreen(False)
+        except Exception:
+            pass
+    return True